@@ -0,0 +1,263 @@
+# academia_core/access.py
+"""
+Alcance de autorización por request (AccessScope).
+
+Reúne en un solo objeto lo que antes consultaba cada chequeo de permisos por su
+cuenta (perfil, profesorados_permitidos, grupos, espacios del docente):
+
+- Se calcula una vez por request (AccessScopeMiddleware lo deja en
+  `request.access_scope`, perezoso).
+- Se guarda en la sesión junto con un número de versión por usuario que vive
+  en el cache de Django. Los cambios en UserProfile / grupos / asignaciones
+  docentes incrementan esa versión (ver signals.py) y la sesión se recalcula.
+- Además la copia de la sesión vence a los ACCESS_SCOPE_MAX_AGE segundos
+  (`calculado`). Con el cache LocMem de cada worker el incremento de versión
+  no llega a los demás procesos: el vencimiento es lo que acota cuánto sigue
+  valiendo un grupo o profesorado revocado. Con un cache compartido
+  (Redis/Memcached) la invalidación es inmediata.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import FrozenSet, Iterable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+SESSION_KEY = "access_scope"
+_VERSION_KEY = "access_scope:v:{}"
+
+ROLES_TODOS_LOS_PROFESORADOS = {"SECRETARIA"}
+ROLES_CON_PROFESORADOS = {"BEDEL", "TUTOR"}
+ROLES_PERSONAL = {"SECRETARIA", "BEDEL", "TUTOR", "DOCENTE"}
+# grupos de la UI (Title-case) y los de setup_roles (mayúsculas)
+GRUPOS_PERSONAL = {
+    "Secretaría",
+    "Bedel",
+    "Docente",
+    "Tutor",
+    "SECRETARIA",
+    "BEDEL",
+    "DOCENTE",
+    "TUTOR",
+}
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    user_id: Optional[int] = None
+    is_superuser: bool = False
+    is_staff: bool = False
+    rol: Optional[str] = None  # UserProfile.rol (ESTUDIANTE, DOCENTE, BEDEL, ...)
+    grupos: FrozenSet[str] = field(default_factory=frozenset)
+    profesorado_ids: FrozenSet[int] = field(default_factory=frozenset)
+    docente_id: Optional[int] = None
+    docente_espacio_ids: FrozenSet[int] = field(default_factory=frozenset)
+    docente_profesorado_ids: FrozenSet[int] = field(default_factory=frozenset)
+    estudiante_id: Optional[int] = None
+    estudiante_dni: Optional[str] = None
+    version: str = ""
+    calculado: float = 0.0  # time.time() del cálculo, para el vencimiento
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.user_id is not None
+
+    @property
+    def ve_todos_los_profesorados(self) -> bool:
+        return self.is_superuser or self.rol in ROLES_TODOS_LOS_PROFESORADOS
+
+    def en_grupos(self, nombres: Iterable[str]) -> bool:
+        return not self.grupos.isdisjoint(nombres)
+
+    @property
+    def es_personal(self) -> bool:
+        """
+        Personal del instituto (opera sobre cualquier estudiante): superusuario,
+        staff, rol de personal en el perfil o grupo de personal. No depende de
+        `ui_role`, que cae en "Estudiante" sin los grupos de la UI.
+        """
+        return (
+            self.is_superuser
+            or self.is_staff
+            or self.rol in ROLES_PERSONAL
+            or self.en_grupos(GRUPOS_PERSONAL)
+        )
+
+    @property
+    def es_estudiante(self) -> bool:
+        """Estudiante que opera sobre sí mismo (tiene un Estudiante vinculado)."""
+        return self.estudiante_id is not None and not self.es_personal
+
+    @property
+    def ui_role(self) -> str:
+        """Mismo criterio que ui.auth_views.resolve_role, sin consultar grupos."""
+        if not self.is_authenticated:
+            return "Estudiante"
+        if self.is_superuser:
+            return "Admin"
+        for nombre in ("Secretaría", "Bedel", "Docente", "Estudiante"):
+            if nombre in self.grupos:
+                return nombre
+        return "Estudiante"
+
+    # --- (de)serialización para la sesión (JSONSerializer) ---
+    def to_session(self) -> dict:
+        data = asdict(self)
+        for k, v in data.items():
+            if isinstance(v, frozenset):
+                data[k] = sorted(v)
+        return data
+
+    @classmethod
+    def from_session(cls, data: dict) -> "AccessScope":
+        kwargs = dict(data)
+        for k in (
+            "grupos",
+            "profesorado_ids",
+            "docente_espacio_ids",
+            "docente_profesorado_ids",
+        ):
+            kwargs[k] = frozenset(kwargs.get(k) or ())
+        return cls(**kwargs)
+
+
+ANONIMO = AccessScope()
+
+
+# ---------- versión por usuario ----------
+def max_age() -> int:
+    return getattr(settings, "ACCESS_SCOPE_MAX_AGE", 300)
+
+
+# La versión arranca en 1 (no en un valor al azar): con LocMem, los workers
+# que nunca vieron una invalidación coinciden entre sí y con la sesión, y no
+# recalculan ni reescriben la sesión al cambiar de worker.
+def version_actual(user_id: int) -> str:
+    key = _VERSION_KEY.format(user_id)
+    v = cache.get(key)
+    if v is None:
+        cache.add(key, 1, None)
+        v = cache.get(key, 1)
+    return str(v)
+
+
+def invalidar_scope(*user_ids: int) -> None:
+    for uid in user_ids:
+        if uid:
+            key = _VERSION_KEY.format(uid)
+            cache.add(key, 1, None)
+            try:
+                cache.incr(key)
+            except ValueError:  # se vació entre add e incr
+                cache.set(key, 2, None)
+
+
+# ---------- cálculo ----------
+def calcular_scope(user, version: str = "") -> AccessScope:
+    from .models import DocenteEspacio, UserProfile
+
+    if not getattr(user, "is_authenticated", False):
+        return ANONIMO
+
+    perfil = (
+        UserProfile.objects.filter(user_id=user.pk).select_related("estudiante").first()
+    )
+    grupos = frozenset(user.groups.values_list("name", flat=True))
+
+    rol = profs = docente_id = estudiante_id = estudiante_dni = None
+    espacio_ids, docente_prof_ids = frozenset(), frozenset()
+    if perfil:
+        rol = perfil.rol
+        if rol in ROLES_CON_PROFESORADOS:
+            profs = perfil.profesorados_permitidos.values_list("id", flat=True)
+        if perfil.docente_id:
+            docente_id = perfil.docente_id
+            asignaciones = list(
+                DocenteEspacio.objects.filter(docente_id=docente_id).values_list(
+                    "espacio_id", "espacio__plan__profesorado_id"
+                )
+            )
+            espacio_ids = frozenset(e for e, _ in asignaciones)
+            docente_prof_ids = frozenset(p for _, p in asignaciones)
+        if perfil.estudiante_id:
+            estudiante_id = perfil.estudiante_id
+            estudiante_dni = perfil.estudiante.dni
+
+    return AccessScope(
+        user_id=user.pk,
+        is_superuser=bool(user.is_superuser),
+        is_staff=bool(user.is_staff),
+        rol=rol,
+        grupos=grupos,
+        profesorado_ids=frozenset(profs or ()),
+        docente_id=docente_id,
+        docente_espacio_ids=espacio_ids,
+        docente_profesorado_ids=docente_prof_ids,
+        estudiante_id=estudiante_id,
+        estudiante_dni=estudiante_dni,
+        version=version,
+        calculado=time.time(),
+    )
+
+
+def _scope_para_request(request) -> AccessScope:
+    user = getattr(request, "user", None)
+    if not getattr(user, "is_authenticated", False):
+        return ANONIMO
+
+    version = version_actual(user.pk)
+    session = getattr(request, "session", None)
+    if session is not None:
+        data = session.get(SESSION_KEY)
+        if (
+            data
+            and data.get("user_id") == user.pk
+            and data.get("version") == version
+            and time.time() - (data.get("calculado") or 0) < max_age()
+        ):
+            return AccessScope.from_session(data)
+
+    scope = calcular_scope(user, version)
+    if session is not None:
+        session[SESSION_KEY] = scope.to_session()
+    return scope
+
+
+def get_access_scope(request) -> AccessScope:
+    """
+    Scope del request. Si el middleware no corrió (tests con RequestFactory,
+    comandos) se calcula acá y queda memoizado en el request.
+    """
+    scope = getattr(request, "access_scope", None)
+    if scope is None:
+        scope = _scope_para_request(request)
+        try:
+            request.access_scope = scope
+        except AttributeError:
+            pass
+    return scope
+
+
+class AccessScopeMiddleware:
+    """
+    Deja `request.access_scope` (perezoso). Va después de AuthenticationMiddleware.
+    Sirve en modo sync y async: bajo ASGI no obliga a Django a pasar las
+    vistas async a un thread. En código async, evaluarlo con sync_to_async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.access_scope = SimpleLazyObject(lambda: _scope_para_request(request))
+        # en modo async devuelve la corrutina de get_response: la espera el handler
+        return self.get_response(request)
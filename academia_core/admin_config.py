@@ -4,6 +4,7 @@ from datetime import date
 from django.contrib import admin
 from django.forms import ModelForm, ValidationError
 from django.utils.html import format_html
+from django.db import transaction
 from django.db.models import Q
 
 from .models import (
@@ -21,16 +22,17 @@ from .models import (
     Correlatividad,
     Horario,
     Condicion,
+    VentanaInscripcion,
+    CupoEspacio,
+    ListaEspera,
 )
+from .access import get_access_scope
 
 # ===================== Helpers de rol/alcance =====================
 
 
 def _rol(request):
-    try:
-        return request.user.perfil.rol
-    except Exception:
-        return None
+    return get_access_scope(request).rol
 
 
 def _profesorados_permitidos(request):
@@ -40,22 +42,26 @@ def _profesorados_permitidos(request):
     - SECRETARIA / superuser: todos
     - Otros (DOCENTE/ESTUDIANTE/sin perfil): ninguno (no deberían usar admin)
     """
-    user = getattr(request, "user", None)
-    if not user:
-        return Profesorado.objects.none()
-    if getattr(user, "is_superuser", False):
-        return Profesorado.objects.all()
-    perfil = getattr(user, "perfil", None)
-    if not perfil:
-        return Profesorado.objects.none()
-    if perfil.rol == "SECRETARIA":
+    scope = get_access_scope(request)
+    if scope.ve_todos_los_profesorados:
         return Profesorado.objects.all()
-    if perfil.rol in ("BEDEL", "TUTOR"):
-        return perfil.profesorados_permitidos.all()
+    if scope.rol in ("BEDEL", "TUTOR"):
+        return Profesorado.objects.filter(pk__in=scope.profesorado_ids)
     # Para DOCENTE/ESTUDIANTE dejamos sin alcance en admin
     return Profesorado.objects.none()
 
 
+def _profesorados_restringidos(request):
+    """
+    Ids de profesorado a los que hay que acotar el admin, o None si no se filtra.
+    Sale del AccessScope: no consulta la base.
+    """
+    scope = get_access_scope(request)
+    if scope.is_superuser or scope.rol not in ("BEDEL", "TUTOR"):
+        return None
+    return scope.profesorado_ids or None
+
+
 def _solo_lectura(request):
     """
     En admin: TUTOR es solo-lectura.
@@ -96,18 +102,18 @@ class EspacioAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        profs = _profesorados_permitidos(request)
-        if not request.user.is_superuser and profs.exists():
-            qs = qs.filter(plan__profesorado__in=profs)
+        prof_ids = _profesorados_restringidos(request)
+        if prof_ids:
+            qs = qs.filter(plan__profesorado_id__in=prof_ids)
         return qs
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
-        profs = _profesorados_permitidos(request)
+        prof_ids = _profesorados_restringidos(request)
         if db_field.name == "plan":
-            if not request.user.is_superuser and profs.exists():
+            if prof_ids:
                 kwargs["queryset"] = (
                     kwargs.get("queryset") or PlanEstudios.objects
-                ).filter(profesorado__in=profs)
+                ).filter(profesorado_id__in=prof_ids)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
     def plan_en_dos_lineas(self, obj):
@@ -185,17 +191,17 @@ class EPAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        profs = _profesorados_permitidos(request)
-        if not request.user.is_superuser and profs.exists():
-            qs = qs.filter(profesorado__in=profs)
+        prof_ids = _profesorados_restringidos(request)
+        if prof_ids:
+            qs = qs.filter(profesorado_id__in=prof_ids)
         return qs
 
     # Limitar selección de profesorado a los permitidos (Bedel/Tutor)
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "profesorado":
-            profs = _profesorados_permitidos(request)
-            if not request.user.is_superuser and profs.exists():
-                kwargs["queryset"] = profs
+            prof_ids = _profesorados_restringidos(request)
+            if prof_ids:
+                kwargs["queryset"] = _profesorados_permitidos(request)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
     # Solo-lectura para TUTOR / DOCENTE / ESTUDIANTE
@@ -259,7 +265,59 @@ class PlanEstudiosAdmin(admin.ModelAdmin):
     prepopulated_fields = {"resolucion_slug": ["resolucion"]}
 
 
+def _lugar(espacio_id, ciclo, estado):
+    """
+    (espacio, ciclo) del cupo que ocupa una cursada. Sólo ocupa lugar la que
+    está EN_CURSO, igual que cuenta `CupoEspacio.save`.
+    """
+    if not espacio_id or not ciclo or estado != EstadoInscripcion.EN_CURSO:
+        return None
+    return (espacio_id, ciclo)
+
+
+class InscripcionEspacioAdminForm(ModelForm):
+    """
+    El lugar en el cupo se valida con la fila del cupo bloqueada: el admin
+    corre el formulario y el guardado en una sola transacción, así que nadie
+    lo ocupa entre `clean` y `save_model`.
+    """
+
+    class Meta:
+        model = InscripcionEspacio
+        fields = "__all__"
+
+    def lugares(self):
+        """(lugar antes, lugar después) de guardar; None si no ocupa."""
+        antes = None
+        if self.instance.pk:
+            antes = _lugar(
+                self.initial.get("espacio"),
+                self.initial.get("anio_academico"),
+                self.initial.get("estado"),
+            )
+        espacio = self.cleaned_data.get("espacio")
+        despues = _lugar(
+            espacio.pk if espacio else None,
+            self.cleaned_data.get("anio_academico"),
+            self.cleaned_data.get("estado"),
+        )
+        return antes, despues
+
+    def clean(self):
+        from .cursada import lugar_libre
+
+        cleaned = super().clean()
+        antes, despues = self.lugares()
+        if despues and despues != antes and not lugar_libre(*despues):
+            raise ValidationError(
+                "El espacio no tiene cupo libre en ese ciclo. Inscribir desde "
+                "la inscripción a cursada para que quede en lista de espera."
+            )
+        return cleaned
+
+
 class InscripcionEspacioAdmin(admin.ModelAdmin):
+    form = InscripcionEspacioAdminForm
     list_display = [
         "inscripcion",
         "espacio",
@@ -275,6 +333,51 @@ class InscripcionEspacioAdmin(admin.ModelAdmin):
     ]
     raw_id_fields = ["inscripcion", "espacio"]
 
+    def save_model(self, request, obj, form, change):
+        from .cursada import liberar_lugar, tomar_lugar
+
+        antes, despues = form.lugares()
+        with transaction.atomic():
+            # mismo orden que cursada._insertar: primero el cupo
+            if despues and despues != antes:
+                tomar_lugar(*despues)
+            super().save_model(request, obj, form, change)
+            if antes and antes != despues:
+                # el lugar pasa al primero de la lista de espera (si hay cupo)
+                liberar_lugar(*antes, request.user.pk)
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, InscripcionEspacio.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        from .cursada import liberar_lugar
+
+        with transaction.atomic():
+            lugares = [
+                _lugar(*fila)
+                for fila in queryset.values_list(
+                    "espacio_id", "anio_academico", "estado"
+                )
+            ]
+            super().delete_queryset(request, queryset)
+            for lugar in filter(None, lugares):
+                liberar_lugar(*lugar, request.user.pk)
+
+
+class CupoEspacioAdmin(admin.ModelAdmin):
+    list_display = ["espacio", "anio_academico", "cupo", "ocupados"]
+    list_filter = ["anio_academico", "espacio__plan__profesorado"]
+    search_fields = ["espacio__nombre"]
+    raw_id_fields = ["espacio"]
+    readonly_fields = ["ocupados"]
+
+
+class ListaEsperaAdmin(admin.ModelAdmin):
+    list_display = ["espacio", "anio_academico", "inscripcion", "creado"]
+    list_filter = ["anio_academico", "espacio__plan__profesorado"]
+    search_fields = ["inscripcion__estudiante__apellido", "espacio__nombre"]
+    raw_id_fields = ["inscripcion", "espacio", "usuario"]
+
 
 class MovimientoAdmin(admin.ModelAdmin):
     list_display = ["inscripcion", "espacio", "tipo", "fecha", "condicion", "nota_num"]
@@ -314,10 +417,51 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 
 class HorarioAdmin(admin.ModelAdmin):
-    list_display = ["espacio", "dia_semana", "hora_inicio", "hora_fin", "docente"]
-    list_filter = ["dia_semana", "espacio__plan__profesorado", "docente"]
+    list_display = [
+        "espacio",
+        "dia_semana",
+        "hora_inicio",
+        "hora_fin",
+        "docente",
+        "borrador",
+    ]
+    list_filter = ["borrador", "dia_semana", "espacio__plan__profesorado", "docente"]
     search_fields = ["espacio__nombre", "docente__apellido"]
     raw_id_fields = ["espacio", "docente"]
+    actions = ["publicar_borradores"]
+
+    def publicar_borradores(self, request, queryset):
+        # los borradores los arma el comando generar_horarios (horarios.py)
+        from .horarios import publicar
+
+        n = publicar(
+            queryset.filter(borrador=True).values_list("espacio_id", flat=True)
+        )
+        self.message_user(
+            request, f"{n} horarios publicados (reemplazan a los anteriores)."
+        )
+
+    publicar_borradores.short_description = "Publicar borradores de estos espacios"
+
+
+class VentanaInscripcionAdmin(admin.ModelAdmin):
+    list_display = ["tipo", "profesorado", "plan", "inicio", "fin", "descripcion"]
+    list_filter = ["tipo", "profesorado"]
+    date_hierarchy = "inicio"
+    raw_id_fields = ["plan"]
+
+    # abrir/cerrar ventanas: permiso custom de CorePerms
+    def _puede(self, request):
+        return request.user.has_perm("academia_core.open_close_windows")
+
+    def has_add_permission(self, request):
+        return self._puede(request)
+
+    def has_change_permission(self, request, obj=None):
+        return self._puede(request)
+
+    def has_delete_permission(self, request, obj=None):
+        return self._puede(request)
 
 
 # Register your models here.
@@ -334,3 +478,6 @@ admin.site.register(DocenteEspacio, DocenteEspacioAdmin)
 admin.site.register(UserProfile, UserProfileAdmin)
 admin.site.register(Correlatividad)
 admin.site.register(Horario, HorarioAdmin)
+admin.site.register(VentanaInscripcion, VentanaInscripcionAdmin)
+admin.site.register(CupoEspacio, CupoEspacioAdmin)
+admin.site.register(ListaEspera, ListaEsperaAdmin)
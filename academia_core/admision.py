@@ -0,0 +1,286 @@
+# academia_core/admision.py
+"""
+Sala de espera para la apertura de ventanas de inscripción (control de
+admisión). Opcional: solo actúa con ADMISION_POR_PROFESORADO > 0.
+
+En las rutas de ADMISION_RUTAS (inscripción a materias / finales y sus APIs)
+cada profesorado admite hasta N estudiantes a la vez; el resto espera su
+turno. El personal (staff, Bedel, Secretaría, ...) no hace fila.
+
+- Al llegar, el estudiante recibe un ticket numerado por profesorado
+  (contador en el cache) en una cookie firmada (django.core.signing): el
+  número no se puede falsificar ni adelantar. El ticket lleva el id del
+  usuario y solo vale para ese usuario: compartir la cookie de un admitido
+  no hace pasar a otros por su lugar.
+- Los N lugares son claves `admision:<prof>:lugar:<i>` tomadas con
+  `cache.add` (atómico en LocMem y Redis) y que vencen tras ADMISION_TTL
+  segundos sin actividad; cada request del admitido las renueva. Al cerrar
+  sesión el lugar se libera en el momento (señal user_logged_out).
+- Mientras espera, el navegador consulta /api/admision/estado cada pocos
+  segundos (sin base: la cookie, el id de usuario de la sesión cacheada y
+  el cache). Entra cuando hay un lugar libre y su número está entre los
+  primeros en espera; los tickets que dejan de consultar se saltean.
+
+Sin lugar, las páginas responden 503 con la sala de espera y las APIs 503
+con {"en_espera": true, "posicion": n} y Retry-After. Con varios workers
+hace falta un cache compartido (REDIS_URL), igual que para AccessScope.
+"""
+from __future__ import annotations
+
+import secrets
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core import signing
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .access import get_access_scope
+
+COOKIE = "admision"
+_SALT = "academia_core.admision"
+_VIGENCIA_TICKET = 6 * 60 * 60
+ENCUESTA = 5  # segundos entre consultas de la sala de espera
+_VIVO = 3 * ENCUESTA  # un ticket que no consulta en este lapso se saltea
+_CABEZA = 20  # tickets del frente que se revisan por consulta
+
+RUTAS_POR_DEFECTO = (
+    "/inscribir/materias",
+    "/inscripciones/mesa-final",
+    "/api/cursada/",
+    "/api/async/cursada/",
+)
+
+
+def por_profesorado() -> int:
+    return getattr(settings, "ADMISION_POR_PROFESORADO", 0)
+
+
+def ttl() -> int:
+    return getattr(settings, "ADMISION_TTL", 300)
+
+
+def rutas():
+    return getattr(settings, "ADMISION_RUTAS", RUTAS_POR_DEFECTO)
+
+
+def _k(prof, *partes) -> str:
+    return ":".join(["admision", str(prof), *map(str, partes)])
+
+
+@dataclass(frozen=True)
+class Ticket:
+    prof: int
+    usuario: int
+    numero: int
+    token: str
+    lugar: Optional[int] = None
+
+    def firmar(self) -> str:
+        return signing.dumps(
+            [self.prof, self.usuario, self.numero, self.token, self.lugar],
+            salt=_SALT,
+        )
+
+    @classmethod
+    def leer(cls, valor: Optional[str], usuario_id) -> Optional["Ticket"]:
+        """El ticket de la cookie, o None si es inválido o de otro usuario."""
+        if not valor or usuario_id is None:
+            return None
+        try:
+            ticket = cls(*signing.loads(valor, salt=_SALT, max_age=_VIGENCIA_TICKET))
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+        return ticket if ticket.usuario == usuario_id else None
+
+
+def emitir(prof: int, usuario_id: int) -> Ticket:
+    clave = _k(prof, "emitidos")
+    cache.add(clave, 0, None)
+    numero = cache.incr(clave)
+    cache.set(_k(prof, "vivo", numero), 1, _VIVO)
+    return Ticket(prof, usuario_id, numero, secrets.token_urlsafe(8))
+
+
+def _avanzar_cabeza(prof: int, atendidos: int, emitidos: int) -> int:
+    """Saltea los tickets del frente que dejaron de consultar."""
+    hasta = min(emitidos, atendidos + _CABEZA)
+    claves = [_k(prof, "vivo", n) for n in range(atendidos + 1, hasta + 1)]
+    vivos = cache.get_many(claves) if claves else {}
+    saltear = 0
+    for clave in claves:
+        if clave in vivos:
+            break
+        saltear += 1
+    if saltear:
+        # carrera benigna: dos consultas pueden escribir el mismo valor
+        cache.set(_k(prof, "atendidos"), atendidos + saltear, None)
+    return atendidos + saltear
+
+
+def _libres(prof: int) -> List[int]:
+    claves = [_k(prof, "lugar", i) for i in range(por_profesorado())]
+    tomados = cache.get_many(claves)
+    return [i for i, clave in enumerate(claves) if clave not in tomados]
+
+
+def posicion(ticket: Ticket) -> int:
+    return max(1, ticket.numero - (cache.get(_k(ticket.prof, "atendidos")) or 0))
+
+
+def intentar(ticket: Ticket) -> Optional[Ticket]:
+    """El ticket con su lugar asignado, o None si todavía tiene que esperar."""
+    prof, numero = ticket.prof, ticket.numero
+    cache.set(_k(prof, "vivo", numero), 1, _VIVO)
+    estado = cache.get_many([_k(prof, "atendidos"), _k(prof, "emitidos")])
+    atendidos = estado.get(_k(prof, "atendidos"), 0)
+    if numero > atendidos + por_profesorado() + _CABEZA:
+        return None  # lejos del frente: ni mira los lugares
+    atendidos = _avanzar_cabeza(prof, atendidos, estado.get(_k(prof, "emitidos"), 0))
+    libres = _libres(prof)
+    if numero > atendidos + len(libres):
+        return None
+    for i in libres:
+        if cache.add(_k(prof, "lugar", i), ticket.token, ttl()):
+            if numero > atendidos:
+                cache.set(_k(prof, "atendidos"), numero, None)
+            cache.delete(_k(prof, "vivo", numero))
+            return replace(ticket, lugar=i)
+    return None
+
+
+def renovar(ticket: Ticket) -> bool:
+    """True si el ticket todavía tiene su lugar (y lo extiende otro TTL)."""
+    clave = _k(ticket.prof, "lugar", ticket.lugar)
+    return cache.get(clave) == ticket.token and cache.touch(clave, ttl())
+
+
+def liberar(ticket: Optional[Ticket]) -> None:
+    if ticket is not None and ticket.lugar is not None and renovar(ticket):
+        cache.delete(_k(ticket.prof, "lugar", ticket.lugar))
+
+
+def liberar_al_salir(request, user) -> None:
+    """Al cerrar sesión el lugar queda libre ya, sin esperar ADMISION_TTL."""
+    if request is not None and user is not None:
+        liberar(Ticket.leer(request.COOKIES.get(COOKIE), user.pk))
+
+
+def usuario_de_sesion(request) -> Optional[int]:
+    """
+    Id del usuario logueado leído de la sesión (cached_db: del cache), sin
+    cargar el User de la base. Para la consulta de la sala de espera.
+    """
+    valor = request.session.get(SESSION_KEY)
+    try:
+        return int(valor) if valor is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def profesorado_de(scope) -> int:
+    from .models import EstudianteProfesorado
+
+    return (
+        EstudianteProfesorado.objects.filter(estudiante_id=scope.estudiante_id)
+        .order_by("-cohorte", "-id")
+        .values_list("profesorado_id", flat=True)
+        .first()
+        or 0
+    )
+
+
+def poner_cookie(request, response, ticket: Ticket) -> None:
+    response.set_cookie(
+        COOKIE,
+        ticket.firmar(),
+        max_age=_VIGENCIA_TICKET,
+        httponly=True,
+        samesite="Lax",
+        secure=request.is_secure(),
+    )
+
+
+def respuesta_espera(request, ticket: Ticket):
+    datos = {
+        "en_espera": True,
+        "posicion": posicion(ticket),
+        "estado_url": reverse("ui:api_admision_estado"),
+        "reintentar_en": ENCUESTA,
+    }
+    if request.path.startswith("/api/") or "json" in request.headers.get("Accept", ""):
+        response = JsonResponse(datos, status=503)
+    else:
+        html = render_to_string(
+            "academia_core/sala_espera.html",
+            {**datos, "destino": request.get_full_path()},
+        )
+        response = HttpResponse(html, status=503)
+    response["Retry-After"] = str(ENCUESTA)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+class SalaDeEsperaMiddleware:
+    """
+    Control de admisión en ADMISION_RUTAS. Va después de AccessScopeMiddleware.
+    Sync y async (bajo ASGI la decisión corre en un thread solo en esas rutas).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._async = iscoroutinefunction(get_response)
+        if self._async:
+            markcoroutinefunction(self)
+
+    def _aplica(self, request) -> bool:
+        return por_profesorado() > 0 and request.path.startswith(tuple(rutas()))
+
+    def _controlar(self, request):
+        """Respuesta de espera, o None si pasa (y deja el ticket a renovar)."""
+        if not request.user.is_authenticated:
+            return None
+        scope = get_access_scope(request)
+        # el personal no hace fila; sin estudiante vinculado no hay profesorado
+        if scope.es_personal or scope.estudiante_id is None:
+            return None
+        ticket = Ticket.leer(request.COOKIES.get(COOKIE), request.user.pk)
+        if ticket and ticket.lugar is not None:
+            if renovar(ticket):
+                return None
+            ticket = None  # venció por inactividad: vuelve a la fila
+        if ticket is None:
+            ticket = emitir(profesorado_de(scope), request.user.pk)
+        admitido = intentar(ticket)
+        request._admision_ticket = admitido or ticket
+        return None if admitido else respuesta_espera(request, ticket)
+
+    def _terminar(self, request, response):
+        ticket = getattr(request, "_admision_ticket", None)
+        if ticket is not None:
+            poner_cookie(request, response, ticket)
+        return response
+
+    def __call__(self, request):
+        if self._async:
+            return self._acall(request)
+        if self._aplica(request):
+            espera = self._controlar(request)
+            if espera is not None:
+                return self._terminar(request, espera)
+        return self._terminar(request, self.get_response(request))
+
+    async def _acall(self, request):
+        if self._aplica(request):
+            espera = await sync_to_async(self._controlar)(request)
+            if espera is not None:
+                return self._terminar(request, espera)
+        return self._terminar(request, await self.get_response(request))
@@ -0,0 +1,259 @@
+# academia_core/api_v1.py
+"""
+API de solo lectura versionada: /api/v1/ (Django REST framework).
+
+- estudiantes, inscripciones (a carrera), espacios, correlatividades,
+  movimientos y horarios, como ReadOnlyModelViewSet.
+- Paginación por cursor (CursorPagination): cada página cuesta lo mismo y no
+  hay COUNT(*). `?limit=` cambia el tamaño (máx. 500).
+- Cada viewset trae sus relaciones con select_related / prefetch_related
+  según su serializer, así la cantidad de consultas no depende del tamaño de
+  la página (lo verifican los tests).
+- Alcance: los datos personales (estudiantes, inscripciones, movimientos)
+  se acotan con AccessScope igual que los exports; los catálogos (espacios,
+  correlatividades, horarios) los ve cualquier usuario autenticado.
+- Throttling por rol (RolThrottle): las tasas salen de
+  REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] y se pueden ajustar por variable
+  de entorno para los picos de inscripción (ver settings).
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Set
+
+from django.db.models import Exists, OuterRef, Prefetch
+from django.urls import include, path
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.routers import DefaultRouter
+from rest_framework.throttling import SimpleRateThrottle
+
+from . import busqueda
+from .access import ROLES_CON_PROFESORADOS, get_access_scope
+from .models import (
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Horario,
+    Movimiento,
+)
+from .serializers import (
+    CorrelatividadSerializer,
+    EspacioSerializer,
+    EstudianteSerializer,
+    HorarioSerializer,
+    InscripcionSerializer,
+    MovimientoSerializer,
+)
+
+
+# ---------- paginación ----------
+class CursorPaginacion(CursorPagination):
+    """El orden lo define cada viewset (`orden`), siempre terminado en "id"."""
+
+    page_size = 50
+    page_size_query_param = "limit"
+    max_page_size = 500
+    ordering = ("id",)
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, "orden", self.ordering)
+
+
+# ---------- throttling por rol ----------
+def grupo_throttle(scope) -> str:
+    """estudiante | docente | staff (el que define la tasa)."""
+    if scope.is_superuser or scope.ve_todos_los_profesorados:
+        return "staff"
+    if scope.rol in ROLES_CON_PROFESORADOS or scope.is_staff:
+        return "staff"
+    if scope.docente_id or scope.ui_role == "Docente":
+        return "docente"
+    return "estudiante"
+
+
+class RolThrottle(SimpleRateThrottle):
+    """
+    Un balde por usuario con la tasa de su rol (`api_v1_<grupo>`).
+    Usa el cache por defecto: con Redis el límite es global, con LocMem es
+    por proceso.
+    """
+
+    def __init__(self):
+        # la tasa depende del request: se resuelve en allow_request
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = "api_v1_" + grupo_throttle(get_access_scope(request))
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        ident = request.user.pk if request.user.is_authenticated else None
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": ident or self.get_ident(request),
+        }
+
+
+# ---------- alcance ----------
+def profesorados_visibles(scope) -> Optional[Set[int]]:
+    """None = todos; si no, los profesorados cuyos datos personales puede ver."""
+    if scope.is_superuser or scope.ve_todos_los_profesorados:
+        return None
+    if scope.rol in ROLES_CON_PROFESORADOS:
+        return set(scope.profesorado_ids)
+    return set(scope.docente_profesorado_ids)
+
+
+class BaseViewSet(viewsets.ReadOnlyModelViewSet):
+    pagination_class = CursorPaginacion
+    throttle_classes = [RolThrottle]
+    orden = ("id",)
+
+    # ?param=<id> -> campo ORM
+    filtros: Dict[str, str] = {}
+    # rutas al profesorado / estudiante para acotar datos personales;
+    # None = catálogo visible para todos
+    campo_profesorado: Optional[str] = None
+    campo_estudiante: Optional[str] = None
+
+    def filtrar_alcance(self, qs):
+        if self.campo_estudiante is None:
+            return qs
+        scope = get_access_scope(self.request)
+        profs = profesorados_visibles(scope)
+        if profs is None:
+            return qs
+        if not profs and scope.estudiante_id:
+            # estudiante: solo sus propios datos
+            return qs.filter(**{self.campo_estudiante: scope.estudiante_id})
+        return self.filtrar_profesorados(qs, profs)
+
+    def filtrar_profesorados(self, qs, profs):
+        return qs.filter(**{f"{self.campo_profesorado}__in": profs})
+
+    def get_queryset(self):
+        qs = self.filtrar_alcance(super().get_queryset())
+        filtros = {}
+        for param, campo in self.filtros.items():
+            valor = self.request.query_params.get(param)
+            if valor in (None, ""):
+                continue
+            if not valor.isdigit():
+                raise ValidationError({param: "Debe ser un número."})
+            filtros[campo] = int(valor)
+        return qs.filter(**filtros) if filtros else qs
+
+
+class EstudianteViewSet(BaseViewSet):
+    """?q=<texto> busca por apellido, nombre o DNI (índice de busqueda.py)."""
+
+    queryset = Estudiante.objects.prefetch_related(
+        Prefetch(
+            "inscripciones_carrera",
+            queryset=EstudianteProfesorado.objects.select_related(
+                "profesorado"
+            ).order_by("cohorte", "id"),
+        )
+    )
+    serializer_class = EstudianteSerializer
+    orden = ("apellido", "nombre", "id")
+    campo_estudiante = "pk"
+
+    def filtrar_profesorados(self, qs, profs):
+        return qs.filter(
+            Exists(
+                EstudianteProfesorado.objects.filter(
+                    estudiante=OuterRef("pk"), profesorado_id__in=profs
+                )
+            )
+        )
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        activo = self.request.query_params.get("activo")
+        if activo in ("0", "1"):
+            qs = qs.filter(activo=activo == "1")
+        return busqueda.filtrar_queryset(
+            qs, "estudiantes", self.request.query_params.get("q")
+        )
+
+
+class InscripcionViewSet(BaseViewSet):
+    queryset = EstudianteProfesorado.objects.select_related(
+        "estudiante", "profesorado", "plan"
+    )
+    serializer_class = InscripcionSerializer
+    filtros = {
+        "estudiante_id": "estudiante_id",
+        "profesorado_id": "profesorado_id",
+        "plan_id": "plan_id",
+        "cohorte": "cohorte",
+    }
+    campo_estudiante = "estudiante_id"
+    campo_profesorado = "profesorado_id"
+
+
+class EspacioViewSet(BaseViewSet):
+    queryset = EspacioCurricular.objects.select_related(
+        "plan__profesorado"
+    ).prefetch_related(
+        Prefetch(
+            "horarios",
+            queryset=Horario.objects.filter(borrador=False)
+            .select_related("docente")
+            .order_by("dia_semana", "hora_inicio"),
+        )
+    )
+    serializer_class = EspacioSerializer
+    orden = ("nombre", "id")
+    filtros = {"plan_id": "plan_id", "profesorado_id": "plan__profesorado_id"}
+
+
+class CorrelatividadViewSet(BaseViewSet):
+    queryset = Correlatividad.objects.select_related("espacio", "requiere_espacio")
+    serializer_class = CorrelatividadSerializer
+    filtros = {"plan_id": "plan_id", "espacio_id": "espacio_id"}
+
+
+class MovimientoViewSet(BaseViewSet):
+    queryset = Movimiento.objects.select_related(
+        "inscripcion__estudiante", "espacio", "condicion"
+    )
+    serializer_class = MovimientoSerializer
+    orden = ("-id",)
+    filtros = {
+        "estudiante_id": "inscripcion__estudiante_id",
+        "inscripcion_id": "inscripcion_id",
+        "espacio_id": "espacio_id",
+    }
+    campo_estudiante = "inscripcion__estudiante_id"
+    campo_profesorado = "inscripcion__profesorado_id"
+
+
+class HorarioViewSet(BaseViewSet):
+    queryset = Horario.objects.filter(borrador=False).select_related(
+        "espacio", "docente"
+    )
+    serializer_class = HorarioSerializer
+    filtros = {
+        "plan_id": "espacio__plan_id",
+        "espacio_id": "espacio_id",
+        "docente_id": "docente_id",
+        "dia": "dia_semana",
+    }
+
+
+router = DefaultRouter()
+router.register("estudiantes", EstudianteViewSet, basename="estudiantes")
+router.register("inscripciones", InscripcionViewSet, basename="inscripciones")
+router.register("espacios", EspacioViewSet, basename="espacios")
+router.register("correlatividades", CorrelatividadViewSet, basename="correlatividades")
+router.register("movimientos", MovimientoViewSet, basename="movimientos")
+router.register("horarios", HorarioViewSet, basename="horarios")
+
+app_name = "api_v1"
+urlpatterns = [path("", include(router.urls))]
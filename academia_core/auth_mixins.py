@@ -1,5 +1,7 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 
+from .access import get_access_scope
+
 
 class StaffOrGroupsRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """
@@ -10,11 +12,11 @@ class StaffOrGroupsRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     allowed_groups: tuple[str, ...] = ()
 
     def test_func(self):
-        u = self.request.user
-        if not u.is_authenticated:
+        scope = get_access_scope(self.request)
+        if not scope.is_authenticated:
             return False
-        if u.is_staff or u.is_superuser:
+        if scope.is_staff or scope.is_superuser:
             return True
         if not self.allowed_groups:
             return False
-        return u.groups.filter(name__in=self.allowed_groups).exists()
+        return scope.en_grupos(self.allowed_groups)
@@ -0,0 +1,419 @@
+# academia_core/benchmarks.py
+"""
+Benchmarks de los caminos calientes (comando `benchmark`).
+
+Se corren sobre la base configurada, que tiene que tener datos a escala
+(ver generar_datos_sinteticos). Cada caso se mide así:
+
+- una corrida con CaptureQueriesContext para contar consultas;
+- una corrida con tracemalloc para el pico de memoria (en KiB, solo lo que
+  asigna Python: no incluye la base ni las librerías en C);
+- `repeticiones` corridas cronometradas, sin instrumentar, después de
+  `calentamiento` corridas descartadas (caches de Django y de los índices
+  en memoria ya armados, como en un worker que viene atendiendo).
+
+Los casos lentos (auditar_datos recorre todos los movimientos) no corren
+por defecto: hay que nombrarlos.
+
+Todo corre dentro de una transacción que se revierte al final, y cada
+corrida dentro de un savepoint que también se revierte: los usuarios de
+prueba, los movimientos que guarda un caso y lo que corrige auditar_datos
+no quedan en la base.
+
+Los resultados se guardan en JSON (`guardar`) y se comparan con los de una
+corrida anterior (`comparar`). Hay regresión si el p95 supera el de la
+base en más de `tolerancia` (relativa) y de `margen_ms` (absoluto, para
+que el ruido en los casos de menos de un milisegundo no dispare), si hay
+más consultas que antes o si la memoria crece más de `tolerancia`.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import math
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse, set_urlconf
+
+from .models import (
+    Condicion,
+    Docente,
+    DocenteEspacio,
+    EstadoInscripcion,
+    Estudiante,
+    InscripcionEspacio,
+    Movimiento,
+    UserProfile,
+)
+
+BASELINE = Path(settings.BASE_DIR) / "benchmarks.json"
+URLS_CORE = __name__  # ver _con_urls_core
+
+
+def _urlpatterns():
+    from academia_project.urls import urlpatterns
+
+    return [*urlpatterns, path("", include("academia_core.urls"))]
+
+
+@dataclass
+class Medicion:
+    n: int = 0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    consultas: int = 0
+    memoria_kib: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class Caso:
+    nombre: str
+    preparar: Callable[["Muestra"], Callable[[], object]]
+    repeticiones: Optional[int] = None  # para los casos lentos
+    por_defecto: bool = True  # False: solo si se lo pide por nombre
+
+
+@dataclass
+class Muestra:
+    """Objetos de la base sobre los que corren los casos."""
+
+    cursada: InscripcionEspacio
+    admin: User
+    estudiante_user: User
+    docente_user: User
+    factory: RequestFactory = field(default_factory=RequestFactory)
+
+    @property
+    def insc(self):
+        return self.cursada.inscripcion
+
+    @property
+    def plan(self):
+        return self.cursada.espacio.plan
+
+    def request(self, user, path="/", **get):
+        request = self.factory.get(path, get)
+        request.user = user
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return request
+
+    def cliente(self, user) -> Client:
+        # como un navegador real: host permitido y HTTPS (SECURE_SSL_REDIRECT)
+        hosts = [h for h in settings.ALLOWED_HOSTS if h != "*"]
+        cliente = Client(SERVER_NAME=hosts[0].lstrip(".") if hosts else "testserver")
+        cliente.force_login(user)
+        return cliente
+
+
+def _usuario(username, rol, grupo=None, **perfil) -> User:
+    user = User.objects.create_user(username=username, password=None)
+    if grupo:
+        user.groups.add(Group.objects.get_or_create(name=grupo)[0])
+    UserProfile.objects.update_or_create(user=user, defaults={"rol": rol, **perfil})
+    user.refresh_from_db()
+    return user
+
+
+def muestra() -> Muestra:
+    """
+    El estudiante de la cohorte más vieja que sigue cursando (el que más
+    historia tiene) y un docente de prueba asignado a uno de sus espacios.
+    Se crean dentro de la transacción de `correr`, así que no quedan.
+    """
+    cursada = (
+        InscripcionEspacio.objects.filter(estado=EstadoInscripcion.EN_CURSO)
+        .select_related("inscripcion__estudiante", "espacio__plan__profesorado")
+        .order_by("inscripcion__cohorte", "id")
+        .first()
+    )
+    if cursada is None:
+        raise LookupError("no hay cursadas EN_CURSO")
+    docente = Docente.objects.create(
+        dni="bench-docente", apellido="Benchmark", nombre="Docente"
+    )
+    DocenteEspacio.objects.create(docente=docente, espacio=cursada.espacio)
+    return Muestra(
+        cursada=cursada,
+        admin=User.objects.create_superuser("bench-admin", password=None),
+        estudiante_user=_usuario(
+            "bench-estudiante",
+            "ESTUDIANTE",
+            "Estudiante",
+            estudiante=cursada.inscripcion.estudiante,
+        ),
+        docente_user=_usuario("bench-docente", "DOCENTE", "Docente", docente=docente),
+    )
+
+
+# ---------- casos ----------
+def _ok(respuesta):
+    """Una respuesta de error no es una medición válida del camino."""
+    if respuesta.status_code != 200:
+        raise AssertionError(f"HTTP {respuesta.status_code}")
+    return respuesta
+
+
+def _habilitado(m: Muestra):
+    from .eligibilidad import habilitado
+
+    est_id, plan_id, esp = m.insc.estudiante_id, m.plan.id, m.cursada.espacio
+    return lambda: habilitado(est_id, plan_id, esp, ciclo=m.cursada.anio_academico)
+
+
+def _api_habilitados(m: Muestra):
+    cliente = m.cliente(m.admin)
+    url = reverse("ui:api_cursada_habilitados")
+    datos = {
+        "est": m.insc.estudiante_id,
+        "plan": m.plan.id,
+        "ciclo": m.cursada.anio_academico,
+    }
+    return lambda: _ok(cliente.get(url, datos, secure=True))
+
+
+def _carton_ctx(m: Muestra):
+    from .views import _build_carton_ctx_base
+
+    prof, plan, dni = m.plan.profesorado, m.plan, m.insc.estudiante.dni
+    return lambda: _build_carton_ctx_base(prof, plan, dni)
+
+
+def _con_urls_core(fn):
+    """
+    academia_core/urls.py no está montado en academia_project/urls.py y los
+    templates del cartón y del home del alumno hacen {% url %} a sus rutas:
+    esas vistas se miden con un urlconf que las agrega (URLS_CORE).
+    """
+
+    def llamar():
+        set_urlconf(URLS_CORE)
+        try:
+            return fn()
+        finally:
+            set_urlconf(None)
+
+    return llamar
+
+
+def _carton_pdf(m: Muestra):
+    from .views import carton_generico_pdf
+
+    prof, plan = m.plan.profesorado, m.plan
+    args = (prof.slug, plan.resolucion_slug, m.insc.estudiante.dni)
+    return _con_urls_core(lambda: _ok(carton_generico_pdf(m.request(m.admin), *args)))
+
+
+def _alumno_home(m: Muestra):
+    from .views import alumno_home
+
+    return _con_urls_core(lambda: _ok(alumno_home(m.request(m.estudiante_user))))
+
+
+def _docente_espacio(m: Muestra):
+    from .views import docente_espacio_detalle
+
+    esp_id = m.cursada.espacio_id
+    return lambda: _ok(docente_espacio_detalle(m.request(m.docente_user), esp_id))
+
+
+def _movimiento_save(m: Muestra):
+    regular = Condicion.objects.get(codigo="REGULAR")
+
+    def guardar():
+        mov = Movimiento(
+            inscripcion=m.insc,
+            espacio=m.cursada.espacio,
+            tipo="REG",
+            condicion=regular,
+            nota_num=7,
+            fecha=m.cursada.fecha_inscripcion,
+        )
+        mov.full_clean()
+        mov.save()
+
+    return guardar
+
+
+def _auditar_datos(m: Muestra):
+    return lambda: call_command("auditar_datos", stdout=StringIO())
+
+
+def _listado(vista: str, **get):
+    def preparar(m: Muestra):
+        from . import views_api
+
+        funcion = getattr(views_api, vista)
+        return lambda: _ok(funcion(m.request(m.admin, **get)))
+
+    return preparar
+
+
+def _api_v1(recurso: str):
+    def preparar(m: Muestra):
+        cliente = m.cliente(m.admin)
+        url = f"/api/v1/{recurso}/"
+        return lambda: _ok(cliente.get(url, secure=True))
+
+    return preparar
+
+
+CASOS: List[Caso] = [
+    Caso("habilitado", _habilitado),
+    Caso("api_espacios_habilitados", _api_habilitados),
+    Caso("carton_ctx", _carton_ctx),
+    Caso("carton_pdf", _carton_pdf, repeticiones=10),
+    Caso("alumno_home", _alumno_home),
+    Caso("docente_espacio_detalle", _docente_espacio),
+    Caso("movimiento_full_clean_save", _movimiento_save),
+    # recorre todos los movimientos: minutos a escala, se corre a pedido
+    Caso("auditar_datos", _auditar_datos, repeticiones=3, por_defecto=False),
+    Caso("api_listar_estudiantes", _listado("api_listar_estudiantes")),
+    Caso("api_listar_espacios", _listado("api_listar_espacios_curriculares")),
+    Caso("api_listar_profesorados", _listado("api_listar_profesorados")),
+    Caso("api_v1_estudiantes", _api_v1("estudiantes")),
+    Caso("api_v1_movimientos", _api_v1("movimientos")),
+]
+
+
+# ---------- medición ----------
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano (p entre 0 y 100)."""
+    orden = sorted(valores)
+    return orden[max(0, math.ceil(p / 100 * len(orden)) - 1)]
+
+
+def _aislado(fn) -> None:
+    """Corre fn en un savepoint que se revierte."""
+    with transaction.atomic():
+        fn()
+        transaction.set_rollback(True)
+
+
+def medir(fn, repeticiones: int, calentamiento: int) -> Medicion:
+    for _ in range(calentamiento):
+        _aislado(fn)
+    with CaptureQueriesContext(connection) as ctx:
+        _aislado(fn)
+    consultas = len(ctx.captured_queries)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _aislado(fn)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        _aislado(fn)
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return Medicion(
+        n=repeticiones,
+        p50_ms=round(percentil(tiempos, 50), 3),
+        p95_ms=round(percentil(tiempos, 95), 3),
+        consultas=consultas,
+        memoria_kib=round(pico / 1024, 1),
+    )
+
+
+def _entorno() -> dict:
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "base": connection.vendor,
+        "estudiantes": Estudiante.objects.count(),
+        "movimientos": Movimiento.objects.count(),
+    }
+
+
+def correr(
+    nombres: Optional[List[str]] = None,
+    repeticiones: int = 30,
+    calentamiento: int = 3,
+    progreso: Optional[Callable[[str, Medicion], None]] = None,
+) -> dict:
+    """{"entorno": {...}, "casos": {nombre: Medicion como dict}}."""
+    casos = [c for c in CASOS if (c.nombre in nombres if nombres else c.por_defecto)]
+    resultados: Dict[str, dict] = {}
+    with transaction.atomic():
+        m = muestra()
+        for caso in casos:
+            try:
+                fn = caso.preparar(m)
+                med = medir(fn, caso.repeticiones or repeticiones, calentamiento)
+            except Exception as e:  # un caso roto no frena a los demás
+                med = Medicion(error=f"{type(e).__name__}: {e}"[:300])
+            resultados[caso.nombre] = asdict(med)
+            if progreso:
+                progreso(caso.nombre, med)
+        transaction.set_rollback(True)
+    return {"entorno": _entorno(), "casos": resultados}
+
+
+def guardar(resultado: dict, ruta: Path = BASELINE) -> None:
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def cargar(ruta: Path = BASELINE) -> dict:
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparar(
+    actual: dict, base: dict, tolerancia: float = 0.25, margen_ms: float = 1.0
+) -> List[str]:
+    """Regresiones de `actual` respecto de `base` (lista vacía si no hay)."""
+    regresiones = []
+    for nombre, antes in base.get("casos", {}).items():
+        ahora = actual["casos"].get(nombre)
+        if ahora is None:
+            continue  # no se corrió esta vez
+        if ahora["error"] and not antes.get("error"):
+            regresiones.append(f"{nombre}: falla ({ahora['error']})")
+            continue
+        if ahora["error"] or antes.get("error"):
+            continue
+        limite = max(antes["p95_ms"] * (1 + tolerancia), antes["p95_ms"] + margen_ms)
+        if ahora["p95_ms"] > limite:
+            regresiones.append(
+                f"{nombre}: p95 {ahora['p95_ms']:.1f} ms > {limite:.1f} ms "
+                f"(base {antes['p95_ms']:.1f} ms)"
+            )
+        if ahora["consultas"] > antes["consultas"]:
+            regresiones.append(
+                f"{nombre}: {ahora['consultas']} consultas (base {antes['consultas']})"
+            )
+        if ahora["memoria_kib"] > antes["memoria_kib"] * (1 + tolerancia) + 64:
+            regresiones.append(
+                f"{nombre}: memoria {ahora['memoria_kib']:.0f} KiB "
+                f"(base {antes['memoria_kib']:.0f} KiB)"
+            )
+    return regresiones
+
+
+def __getattr__(nombre):
+    # urlpatterns se arma recién cuando lo pide el resolver (URLS_CORE)
+    if nombre == "urlpatterns":
+        return _urlpatterns()
+    raise AttributeError(nombre)
@@ -0,0 +1,382 @@
+# academia_core/busqueda.py
+"""
+Índice de búsqueda en memoria (por proceso) de estudiantes, docentes y espacios.
+
+- Texto normalizado: sin acentos, en minúsculas ("Pérez" == "perez").
+- Cada término de la consulta se busca por prefijo de palabra (lista ordenada
+  de tokens + bisect); si no aparece, cae a similitud por trigramas (tolera
+  errores de tipeo: "perz" encuentra "perez").
+- Los términos se combinan con AND y los resultados salen rankeados
+  (palabra exacta > prefijo del apellido/nombre > prefijo > trigramas).
+
+El índice se arma la primera vez que se usa en el proceso y los post_save /
+post_delete lo actualizan de a una fila al confirmarse la transacción
+(transaction.on_commit, ver signals.py). Para que los demás
+workers se enteren, cada cambio incrementa una versión en el cache de Django;
+un worker que ve una versión distinta a la suya reconstruye su índice (hace
+falta un cache compartido, como para AccessScope y catálogos). Como red de
+seguridad para escrituras masivas sin señales, el índice se rehace a la hora.
+"""
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db.models import Q
+
+_NO_ALFANUM = re.compile(r"[^0-9a-z]+")
+_VERSION_KEY = "busqueda:v:{}"
+_EDAD_MAXIMA = 60 * 60
+_UMBRAL_TRIGRAMAS = 0.5
+# ids que `filtrar_queryset` pasa a un IN (...): con una o dos letras el
+# índice devuelve miles y SQLite tiene tope de variables por consulta
+LIMITE_FILTRO = 500
+# columnas indexadas de cada tipo, para filtrar en la base cuando se pasa
+CAMPOS_BASE = {
+    "estudiantes": ("apellido", "nombre", "dni", "email"),
+    "docentes": ("apellido", "nombre", "dni", "email"),
+    "espacios": ("nombre", "anio", "plan__resolucion", "plan__profesorado__nombre"),
+}
+
+
+def normalizar(texto) -> str:
+    """'  Pérez, MARÍA ' -> 'perez maria'"""
+    if not texto:
+        return ""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUM.sub(" ", texto.lower()).strip()
+
+
+def trigramas(token: str) -> Set[str]:
+    t = f"  {token} "
+    return {t[i : i + 3] for i in range(len(t) - 2)}
+
+
+class IndiceBusqueda:
+    """
+    Índice de un tipo de entidad. `cargar()` devuelve [(id, textos, datos)]:
+    `textos` son los campos a indexar en orden de importancia (el primero
+    rankea más alto) y `datos` el dict que se devuelve en el typeahead.
+    """
+
+    def __init__(self, nombre: str, cargar):
+        self.nombre = nombre
+        self._cargar = cargar
+        self._lock = threading.RLock()
+        self._listo = False
+        self._version = None
+        self._armado = 0.0
+        self._docs: Dict[int, Tuple[Tuple[str, ...], dict]] = {}
+        self._tokens: List[str] = []  # ordenados, únicos
+        self._por_token: Dict[str, Set[int]] = {}
+        self._por_trigrama: Dict[str, Set[str]] = {}
+
+    # ---------- versión compartida ----------
+    def _version_cache(self):
+        key = _VERSION_KEY.format(self.nombre)
+        v = cache.get(key)
+        if v is None:
+            cache.add(key, int(time.time() * 1000), None)
+            v = cache.get(key)
+        return v
+
+    def _incrementar_version(self):
+        key = _VERSION_KEY.format(self.nombre)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            v = int(time.time() * 1000)
+            cache.set(key, v, None)
+            return v
+
+    # ---------- armado ----------
+    def _limpiar(self):
+        self._docs, self._tokens = {}, []
+        self._por_token, self._por_trigrama = {}, {}
+
+    def reconstruir(self) -> None:
+        with self._lock:
+            version = self._version_cache()
+            self._limpiar()
+            tokens = set()
+            for pk, textos, datos in self._cargar():
+                tokens.update(self._agregar_doc(pk, textos, datos))
+            self._tokens = sorted(tokens)
+            self._listo, self._version, self._armado = True, version, time.time()
+
+    def _asegurar(self) -> None:
+        vencido = time.time() - self._armado > _EDAD_MAXIMA
+        if not self._listo or vencido or self._version != self._version_cache():
+            self.reconstruir()
+
+    def _agregar_doc(self, pk, textos: Iterable[str], datos: dict) -> Set[str]:
+        campos = tuple(normalizar(t) for t in textos)
+        self._docs[pk] = (campos, datos)
+        nuevos = set()
+        for campo in campos:
+            for token in campo.split():
+                ids = self._por_token.get(token)
+                if ids is None:
+                    ids = self._por_token[token] = set()
+                    nuevos.add(token)
+                    for tri in trigramas(token):
+                        self._por_trigrama.setdefault(tri, set()).add(token)
+                ids.add(pk)
+        return nuevos
+
+    def _quitar_doc(self, pk) -> None:
+        doc = self._docs.pop(pk, None)
+        if not doc:
+            return
+        for campo in doc[0]:
+            for token in campo.split():
+                ids = self._por_token.get(token)
+                if ids is None:
+                    continue
+                ids.discard(pk)
+                if not ids:
+                    del self._por_token[token]
+                    i = bisect.bisect_left(self._tokens, token)
+                    if i < len(self._tokens) and self._tokens[i] == token:
+                        del self._tokens[i]
+                    for tri in trigramas(token):
+                        tokens = self._por_trigrama.get(tri)
+                        if tokens is not None:
+                            tokens.discard(token)
+                            if not tokens:
+                                del self._por_trigrama[tri]
+
+    def actualizar(self, pk, fila: Optional[Tuple[Iterable[str], dict]]) -> None:
+        """Reemplaza (o borra si `fila` es None) un documento. Lo usan las señales."""
+        with self._lock:
+            if not self._listo:
+                self._incrementar_version()
+                return  # se arma completo en el primer uso
+            en_dia = self._version == self._version_cache()
+            self._quitar_doc(pk)
+            if fila is not None:
+                for token in self._agregar_doc(pk, *fila):
+                    bisect.insort(self._tokens, token)
+            nueva = self._incrementar_version()
+            if en_dia:
+                self._version = nueva
+
+    # ---------- consultas ----------
+    def _tokens_con_prefijo(self, prefijo: str) -> List[str]:
+        i = bisect.bisect_left(self._tokens, prefijo)
+        out = []
+        while i < len(self._tokens) and self._tokens[i].startswith(prefijo):
+            out.append(self._tokens[i])
+            i += 1
+        return out
+
+    def _tokens_parecidos(self, termino: str) -> Dict[str, float]:
+        tris = trigramas(termino)
+        conteo: Dict[str, int] = {}
+        for tri in tris:
+            for token in self._por_trigrama.get(tri, ()):
+                conteo[token] = conteo.get(token, 0) + 1
+        out = {}
+        for token, n in conteo.items():
+            sim = n / len(tris | trigramas(token))
+            if sim >= _UMBRAL_TRIGRAMAS:
+                out[token] = sim
+        return out
+
+    def _puntajes_termino(self, termino: str) -> Dict[int, float]:
+        puntajes: Dict[int, float] = {}
+        for token in self._tokens_con_prefijo(termino):
+            base = 3.0 if token == termino else 2.0
+            for pk in self._por_token[token]:
+                if puntajes.get(pk, 0) < base:
+                    puntajes[pk] = base
+        if puntajes:
+            return puntajes
+        for token, sim in self._tokens_parecidos(termino).items():
+            for pk in self._por_token[token]:
+                if puntajes.get(pk, 0) < sim:
+                    puntajes[pk] = sim
+        return puntajes
+
+    def buscar(self, consulta: str) -> List[int]:
+        """Ids que matchean todos los términos, ordenados por relevancia."""
+        terminos = normalizar(consulta).split()
+        if not terminos:
+            return []
+        with self._lock:
+            self._asegurar()
+            total: Optional[Dict[int, float]] = None
+            for termino in terminos:
+                puntajes = self._puntajes_termino(termino)
+                if total is None:
+                    total = puntajes
+                else:
+                    total = {
+                        pk: p + puntajes[pk]
+                        for pk, p in total.items()
+                        if pk in puntajes
+                    }
+                if not total:
+                    return []
+            docs = self._docs
+
+            def clave(pk):
+                campos = docs[pk][0]
+                # bonus si el primer campo (apellido / nombre) empieza con la consulta
+                bonus = 1 if campos and campos[0].startswith(terminos[0]) else 0
+                return (-(total[pk] + bonus), campos)
+
+            return sorted(total, key=clave)
+
+    def datos(self, ids: Iterable[int]) -> List[dict]:
+        with self._lock:
+            return [self._docs[pk][1] for pk in ids if pk in self._docs]
+
+
+# ---------- cargadores ----------
+def _fila_persona(obj) -> Tuple[Tuple[str, ...], dict]:
+    return (
+        (obj.apellido, obj.nombre, obj.dni, obj.email),
+        {
+            "id": obj.pk,
+            "label": f"{obj.apellido}, {obj.nombre} ({obj.dni})",
+            "apellido": obj.apellido,
+            "nombre": obj.nombre,
+            "dni": obj.dni,
+            "activo": obj.activo,
+        },
+    )
+
+
+def _fila_espacio(obj) -> Tuple[Tuple[str, ...], dict]:
+    prof = obj.plan.profesorado.nombre
+    return (
+        (obj.nombre, obj.anio, obj.plan.resolucion, prof),
+        {
+            "id": obj.pk,
+            "label": f"{obj.nombre} — {prof} (Res. {obj.plan.resolucion})",
+            "nombre": obj.nombre,
+            "anio": obj.anio,
+            "cuatrimestre": obj.cuatrimestre,
+            "plan_id": obj.plan_id,
+        },
+    )
+
+
+def _cargar_estudiantes():
+    from .models import Estudiante
+
+    campos = ("id", "apellido", "nombre", "dni", "email", "activo")
+    for e in Estudiante.objects.only(*campos).iterator(chunk_size=2000):
+        yield (e.pk, *_fila_persona(e))
+
+
+def _cargar_docentes():
+    from .models import Docente
+
+    campos = ("id", "apellido", "nombre", "dni", "email", "activo")
+    for d in Docente.objects.only(*campos).iterator(chunk_size=2000):
+        yield (d.pk, *_fila_persona(d))
+
+
+def _cargar_espacios():
+    from .models import EspacioCurricular
+
+    qs = EspacioCurricular.objects.select_related("plan__profesorado")
+    for e in qs.iterator(chunk_size=2000):
+        yield (e.pk, *_fila_espacio(e))
+
+
+INDICES: Dict[str, IndiceBusqueda] = {
+    "estudiantes": IndiceBusqueda("estudiantes", _cargar_estudiantes),
+    "docentes": IndiceBusqueda("docentes", _cargar_docentes),
+    "espacios": IndiceBusqueda("espacios", _cargar_espacios),
+}
+
+
+def buscar_ids(tipo: str, consulta: str) -> List[int]:
+    return INDICES[tipo].buscar(consulta)
+
+
+def buscar(
+    tipo: str,
+    consulta: str,
+    limit: int = 10,
+    offset: int = 0,
+    solo_activos: bool = False,
+):
+    """(items, hay_mas) para el typeahead."""
+    indice = INDICES[tipo]
+    ids = indice.buscar(consulta)
+    if solo_activos:
+        ids = [d["id"] for d in indice.datos(ids) if d.get("activo", True)]
+    return indice.datos(ids[offset : offset + limit]), len(ids) > offset + limit
+
+
+def item(tipo: str, pk) -> Optional[dict]:
+    """
+    Datos de typeahead de un solo id, leídos de la base (1 consulta, no arma
+    el índice): para renderizar del lado del servidor la selección inicial.
+    """
+    from .models import Docente, EspacioCurricular, Estudiante
+
+    qs, fila = {
+        "estudiantes": (Estudiante.objects.all(), _fila_persona),
+        "docentes": (Docente.objects.all(), _fila_persona),
+        "espacios": (
+            EspacioCurricular.objects.select_related("plan__profesorado"),
+            _fila_espacio,
+        ),
+    }[tipo]
+    try:
+        obj = qs.filter(pk=int(pk)).first()
+    except (TypeError, ValueError):
+        return None
+    return fila(obj)[1] if obj else None
+
+
+def filtrar_queryset(
+    qs, tipo: str, consulta: str, campo: str = "pk", limite: int = LIMITE_FILTRO
+):
+    """
+    Acota `qs` a los ids que matchean (`campo` apunta al id indexado). Si
+    matchean más de `limite` (una o dos letras, un apellido común) no arma un
+    IN con miles de parámetros: filtra en la base con icontains de cada
+    término (normalizado) sobre las mismas columnas, sin cortar resultados;
+    el listado pagina. Ese filtro no usa trigramas, y los acentos los ignora
+    la collation de MySQL (*_ai_ci), no SQLite.
+    """
+    consulta = (consulta or "").strip()
+    if not consulta:
+        return qs
+    ids = buscar_ids(tipo, consulta)
+    if len(ids) <= limite:
+        return qs.filter(**{f"{campo}__in": ids})
+    prefijo = "" if campo == "pk" else campo.removesuffix("_id") + "__"
+    for termino in normalizar(consulta).split():
+        condicion = Q()
+        for columna in CAMPOS_BASE[tipo]:
+            condicion |= Q(**{f"{prefijo}{columna}__icontains": termino})
+        qs = qs.filter(condicion)
+    return qs
+
+
+# ---------- actualización desde señales ----------
+# `pk` va aparte: después de un delete() la instancia queda con pk=None
+def actualizar_persona(tipo: str, pk: int, obj, borrado: bool = False) -> None:
+    INDICES[tipo].actualizar(pk, None if borrado else _fila_persona(obj))
+
+
+def actualizar_espacio(pk: int, obj, borrado: bool = False) -> None:
+    INDICES["espacios"].actualizar(pk, None if borrado else _fila_espacio(obj))
+
+
+def invalidar(tipo: str) -> None:
+    """Fuerza la reconstrucción en todos los procesos (p.ej. tras un .update())."""
+    INDICES[tipo]._incrementar_version()
@@ -0,0 +1,200 @@
+# academia_core/catalogo.py
+"""
+Cache de catálogos que casi no cambian: Profesorado, PlanEstudios,
+EspacioCurricular y Condicion.
+
+Cada familia tiene un contador de versión en el cache de Django (LocMem por
+defecto, Redis si está configurado; ver CACHES en settings). Las lecturas usan
+claves `catalogo:<familia>:<versión>:...` y los post_save/post_delete de esos
+modelos incrementan la versión (ver signals.py), así que un cambio se ve en la
+próxima lectura sin borrar claves a mano.
+
+Los contadores arrancan en el tiempo actual (ms) y no en 1: si el cache se
+vacía, la versión nueva nunca repite una anterior.
+
+Las escrituras masivas (`.update()`, `bulk_create`) no disparan señales: quien
+las haga debe llamar a `invalidar(...)`. Igual las entradas vencen a la hora.
+
+Se devuelven instancias de los modelos (listas, no querysets) para que los
+templates y formularios las usen igual que antes.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Dict, List
+
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .models import Condicion, EspacioCurricular, PlanEstudios, Profesorado
+
+FAMILIAS = ("profesorados", "planes", "espacios", "condiciones", "correlatividades")
+MODELO_A_FAMILIA = {
+    "Profesorado": "profesorados",
+    "PlanEstudios": "planes",
+    "EspacioCurricular": "espacios",
+    "Condicion": "condiciones",
+    "Correlatividad": "correlatividades",
+}
+_VERSION_KEY = "catalogo:v:{}"
+_MODIFICADO_KEY = "catalogo:ts:{}"
+_TTL = 60 * 60
+# Tope para los 304: el ETag y el Last-Modified llevan el tramo de tiempo
+# actual. Con LocMem y varios workers, uno que no vio un cambio sigue con la
+# versión vieja; al pasar de tramo el cliente recibe la respuesta completa.
+_EDAD_MAXIMA = 10 * 60
+
+
+def version(familia: str) -> int:
+    key = _VERSION_KEY.format(familia)
+    v = cache.get(key)
+    if v is None:
+        ahora = time.time()
+        if cache.add(key, int(ahora * 1000), None):
+            # contador nuevo: no sabemos qué cambió antes, "modificado ahora"
+            cache.set(_MODIFICADO_KEY.format(familia), ahora, None)
+        v = cache.get(key)
+    return v
+
+
+def ultima_modificacion(familia: str) -> float:
+    """
+    Timestamp del último cambio visto (o de cuando se creó el contador, que
+    es posterior: sirve como Last-Modified conservador).
+    """
+    ts = cache.get(_MODIFICADO_KEY.format(familia))
+    if ts is None:
+        version(familia)
+        ts = cache.get(_MODIFICADO_KEY.format(familia), time.time())
+    return ts
+
+
+def invalidar(*familias: str) -> None:
+    ahora = time.time()
+    for familia in familias:
+        key = _VERSION_KEY.format(familia)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(ahora * 1000), None)
+        cache.set(_MODIFICADO_KEY.format(familia), ahora, None)
+
+
+# ---------- GET condicional (ETag / Last-Modified) ----------
+def _tramo() -> int:
+    return int(time.time() // _EDAD_MAXIMA)
+
+
+def etag_familias(*familias: str) -> str:
+    versiones = "-".join(f"{f[:4]}{version(f)}" for f in familias)
+    return f"cat-{versiones}-t{_tramo()}"
+
+
+def modificado_familias(*familias: str) -> datetime:
+    ts = max(ultima_modificacion(f) for f in familias)
+    ts = max(ts, _tramo() * _EDAD_MAXIMA)  # idem ETag, para If-Modified-Since
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def respuesta_condicional(*familias: str):
+    """
+    Decorador para APIs de solo lectura que dependen de catálogos.
+    ETag y Last-Modified salen de los contadores de `familias` (solo cache,
+    sin consultas). Si el cliente ya tiene la versión, responde 304 sin
+    ejecutar la vista. `no-cache` hace que el navegador guarde la respuesta
+    pero revalide siempre (el 304 es barato). Un ETag vale a lo sumo
+    _EDAD_MAXIMA segundos, aunque la versión de este proceso no cambie.
+    """
+
+    def decorador(view):
+        condicionada = condition(
+            etag_func=lambda request, *a, **kw: etag_familias(*familias),
+            last_modified_func=lambda request, *a, **kw: modificado_familias(*familias),
+        )(view)
+
+        @wraps(view)
+        def _view(request, *args, **kwargs):
+            response = condicionada(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return _view
+
+    return decorador
+
+
+def _cacheado(familia: str, sufijo: str, cargar):
+    key = f"catalogo:{familia}:{version(familia)}:{sufijo}"
+    data = cache.get(key)
+    if data is None:
+        data = cargar()
+        cache.set(key, data, _TTL)
+    return data
+
+
+# ---------- lecturas ----------
+def profesorados() -> List[Profesorado]:
+    return _cacheado(
+        "profesorados",
+        "todos",
+        lambda: list(Profesorado.objects.order_by("nombre")),
+    )
+
+
+def planes_por_profesorado() -> Dict[int, List[PlanEstudios]]:
+    """{profesorado_id: [planes ordenados por resolución]} (1 consulta)."""
+
+    def cargar():
+        out: Dict[int, List[PlanEstudios]] = {}
+        for plan in PlanEstudios.objects.select_related("profesorado").order_by(
+            "resolucion"
+        ):
+            out.setdefault(plan.profesorado_id, []).append(plan)
+        return out
+
+    return _cacheado("planes", "por_profesorado", cargar)
+
+
+def planes_de_profesorado(profesorado_id: int) -> List[PlanEstudios]:
+    return planes_por_profesorado().get(int(profesorado_id), [])
+
+
+def espacios_de_plan(plan_id: int) -> List[EspacioCurricular]:
+    """Espacios del plan en el orden de la grilla (año, cuatrimestre, nombre)."""
+    plan_id = int(plan_id)
+    return _cacheado(
+        "espacios",
+        f"plan:{plan_id}",
+        lambda: list(
+            EspacioCurricular.objects.filter(plan_id=plan_id).order_by(
+                "anio", "cuatrimestre", "nombre"
+            )
+        ),
+    )
+
+
+def condiciones_por_tipo(tipo: str) -> List[Condicion]:
+    return _cacheado(
+        "condiciones",
+        f"tipo:{tipo}",
+        lambda: list(Condicion.objects.filter(tipo=tipo).order_by("nombre")),
+    )
+
+
+def por_nombre(items):
+    return sorted(items, key=lambda x: x.nombre)
+
+
+def opciones(field, items, queryset, label=str) -> None:
+    """
+    Llena un ModelChoiceField con items del catálogo sin consultar al renderizar.
+    Se valida contra ``queryset`` (la consulta real, 1 query al hacer clean), así
+    un worker con el catálogo atrasado no rechaza opciones recién creadas.
+    """
+    field.queryset = queryset
+    vacio = [("", field.empty_label)] if getattr(field, "empty_label", None) else []
+    field.choices = vacio + [(i.pk, label(i)) for i in items]
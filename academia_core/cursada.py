@@ -0,0 +1,795 @@
+# academia_core/cursada.py
+"""
+Inscripción a cursada: qué espacios puede cursar un estudiante y la
+inscripción en sí, con versión sincrónica (WSGI) y asincrónica (ASGI).
+
+La lectura son cinco consultas planas (inscripción a la carrera,
+movimientos, cursadas del ciclo, espacios del plan y correlatividades para
+CURSAR) y la evaluación es Python puro (`evaluar`), compartida por las dos
+versiones. Las reglas son las de models._cumple_correlativas /
+_tiene_regularizada / _tiene_aprobada, pero sin una consulta por requisito.
+
+Las versiones async usan la interfaz async del ORM (`afirst`, `async for`):
+no ocupan un thread mientras esperan a la base.
+
+Solo se inscribe con una ventana de cursada abierta para el plan (ver
+ventanas.py, sin consultas). La escritura no pregunta "¿ya existe?" antes
+de insertar: inserta y, si choca con `uniq_insc_est_esp_ciclo` (doble click,
+reintento, dos pestañas), devuelve la inscripción que ganó. Así dos
+requests simultáneos terminan en una sola fila y ninguno ve un
+IntegrityError.
+
+Cupo: si el espacio tiene CupoEspacio para el ciclo, la fila del cupo se
+bloquea (select_for_update) durante la inscripción y `ocupados` se
+incrementa en la misma transacción; nunca se cuentan inscripciones al
+escribir. Sin lugar, el pedido va a ListaEspera (EnListaEspera). Una baja
+libera el lugar bajo el mismo bloqueo y, si hay espera, se lo da al primero.
+Las altas, reactivaciones y borrados desde el admin pasan por
+`lugar_libre` / `tomar_lugar` / `liberar_lugar`, con el mismo bloqueo.
+
+`inscribir_cohorte` inscribe una cohorte entera (Bedelía, a principio de
+año) con las mismas reglas, pero en lote: una consulta por tabla para todos
+los estudiantes y un bulk_create por tabla. `cerrar_ciclo` es el cierre de
+fin de año (comando `cerrar_ciclo`): las cursadas que quedaron EN_CURSO
+pasan a FINALIZADA o BAJA con UPDATEs por conjunto.
+
+Los espacios habilitados traen `superpone_con`: con qué cursadas del ciclo
+se pisa el horario, desde el índice en memoria de superposiciones.py (sin
+consultas mientras el plan no cambie). Es un aviso, no bloquea.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Value,
+    When,
+)
+from django.utils import timezone
+
+from . import superposiciones, ventanas
+from .models import (
+    REG_OK_CODIGOS,
+    Correlatividad,
+    CupoEspacio,
+    EspacioCurricular,
+    EstadoInscripcion,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionEspacioEstadoLog,
+    ListaEspera,
+    Movimiento,
+)
+
+APROBADA_REG = {"PROMOCION", "APROBADO"}
+
+
+class InscripcionRechazada(Exception):
+    """`error` va tal cual en la respuesta JSON (texto o dict con el detalle)."""
+
+    def __init__(self, error, status: int = 400):
+        super().__init__(error)
+        self.error = error
+        self.status = status
+
+
+class EnListaEspera(Exception):
+    """Sin cupo: el pedido quedó en la lista de espera (`posicion` 1 = primero)."""
+
+    def __init__(self, espera_id: int, posicion: int):
+        super().__init__(posicion)
+        self.espera_id = espera_id
+        self.posicion = posicion
+
+
+@dataclass
+class EstadoAcademico:
+    inscripcion_id: Optional[int] = None
+    aprobadas: Set[int] = field(default_factory=set)
+    regularizadas: Set[int] = field(default_factory=set)  # incluye aprobadas
+    inscriptas: Set[int] = field(default_factory=set)  # cursadas del ciclo
+
+
+# (requisito, requiere_espacio_id, requiere_todos_hasta_anio)
+Regla = Tuple[str, Optional[int], Optional[int]]
+
+
+def ciclo_o_actual(ciclo: Optional[int]) -> int:
+    return ciclo or date.today().year
+
+
+def anio_num(anio: str) -> int:
+    """'2°' -> 2 (mismo criterio que EspacioCurricular.anio_num)."""
+    digitos = "".join(ch for ch in (anio or "") if ch.isdigit())
+    return int(digitos) if digitos else 0
+
+
+def puede_operar(scope, estudiante_id: int) -> bool:
+    """El estudiante solo opera sobre sí mismo; el personal, sobre cualquiera."""
+    return scope.es_personal or scope.estudiante_id == estudiante_id
+
+
+# ---------- consultas (las usan la versión sync y la async) ----------
+def _qs_inscripcion(estudiante_id: int, plan_id: int):
+    # la del plan exacto primero; si no, la de la carrera del plan (plan NULL)
+    return (
+        EstudianteProfesorado.objects.filter(
+            estudiante_id=estudiante_id, profesorado__planes__id=plan_id
+        )
+        .annotate(
+            _otro_plan=Case(
+                When(plan_id=plan_id, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("_otro_plan", "-cohorte")
+        .values_list("id", flat=True)
+    )
+
+
+def _qs_movimientos(inscripcion_id: int):
+    return Movimiento.objects.filter(inscripcion_id=inscripcion_id).values_list(
+        "espacio_id", "tipo", "condicion_id", "nota_num", "nota_texto"
+    )
+
+
+def _qs_inscriptas(inscripcion_id: int, ciclo: int):
+    return InscripcionEspacio.objects.filter(
+        inscripcion_id=inscripcion_id,
+        anio_academico=ciclo,
+        estado=EstadoInscripcion.EN_CURSO,
+    ).values_list("espacio_id", flat=True)
+
+
+def _qs_espacios(plan_id: int):
+    return (
+        EspacioCurricular.objects.filter(plan_id=plan_id)
+        .order_by("anio", "cuatrimestre", "nombre")
+        .values("id", "nombre", "anio", "cuatrimestre")
+    )
+
+
+def _qs_correlatividades(plan_id: int):
+    return Correlatividad.objects.filter(plan_id=plan_id, tipo="CURSAR").values_list(
+        "espacio_id", "requisito", "requiere_espacio_id", "requiere_todos_hasta_anio"
+    )
+
+
+# ---------- evaluación (sin consultas) ----------
+def _armar_estado(inscripcion_id, movimientos, inscriptas) -> EstadoAcademico:
+    estado = EstadoAcademico(inscripcion_id=inscripcion_id, inscriptas=set(inscriptas))
+    for esp_id, tipo, cond, nota_num, nota_texto in movimientos:
+        if tipo == "REG" and cond in REG_OK_CODIGOS:
+            estado.regularizadas.add(esp_id)
+        aprobada = (
+            (tipo == "REG" and cond in APROBADA_REG)
+            or (tipo == "FIN" and cond == "REGULAR" and (nota_num or 0) >= 6)
+            or (
+                tipo == "FIN"
+                and cond == "EQUIVALENCIA"
+                and (nota_texto or "").lower() == "equivalencia"
+            )
+        )
+        if aprobada:
+            estado.aprobadas.add(esp_id)
+    estado.regularizadas |= estado.aprobadas
+    return estado
+
+
+def _reglas_por_espacio(filas) -> Dict[int, List[Regla]]:
+    reglas: Dict[int, List[Regla]] = {}
+    for esp_id, requisito, req_id, hasta in filas:
+        reglas.setdefault(esp_id, []).append((requisito, req_id, hasta))
+    return reglas
+
+
+def evaluar(
+    espacio_id: int,
+    estado: EstadoAcademico,
+    reglas: Dict[int, List[Regla]],
+    anios: Dict[int, int],
+) -> Tuple[bool, object]:
+    """
+    (True, None) si puede cursar; si no, (False, motivo). `anios` es
+    {espacio_id: año} del plan (para "todas hasta N° año").
+    """
+    if espacio_id in estado.inscriptas:
+        return False, "ya_inscripto"
+    if espacio_id in estado.aprobadas:
+        return False, "ya_aprobado"
+    if espacio_id in estado.regularizadas:
+        return False, "ya_regular"
+
+    faltantes = []
+    for requisito, req_id, hasta in reglas.get(espacio_id, ()):
+        objetivo = estado.aprobadas if requisito == "APROBADA" else estado.regularizadas
+        if req_id:
+            if req_id not in objetivo:
+                faltantes.append(
+                    {
+                        "tipo": "CURSAR",
+                        "requisito": requisito,
+                        "requiere_espacio_id": req_id,
+                    }
+                )
+        elif hasta:
+            requeridos = {e for e, a in anios.items() if 1 <= a <= hasta}
+            if not requeridos <= objetivo:
+                faltantes.append(
+                    {
+                        "tipo": "CURSAR",
+                        "requisito": requisito,
+                        "requiere_todos_hasta_anio": int(hasta),
+                    }
+                )
+    if faltantes:
+        return False, {"motivo": "falta_correlativas", "faltantes": faltantes}
+    return True, None
+
+
+def _items(estado, espacios, reglas, indice=None) -> List[dict]:
+    """Un item por espacio; `superpone_con` son las cursadas del ciclo que
+    se pisan en horario con ese espacio (ver superposiciones.py)."""
+    anios = {e["id"]: anio_num(e["anio"]) for e in espacios}
+    items = []
+    for e in espacios:
+        ok, info = (
+            evaluar(e["id"], estado, reglas, anios)
+            if estado.inscripcion_id
+            else (False, "sin_inscripcion_carrera")
+        )
+        row = {**e, "habilitado": ok}
+        row["superpone_con"] = (
+            indice.choques(e["id"], estado.inscriptas) if indice else []
+        )
+        if not ok:
+            row["bloqueo"] = info
+        items.append(row)
+    return items
+
+
+def _validar_inscripcion(espacio_id, espacios, estado, reglas) -> None:
+    anios = {e["id"]: anio_num(e["anio"]) for e in espacios}
+    if espacio_id not in anios:
+        raise InscripcionRechazada("espacio_inexistente", status=404)
+    if not estado.inscripcion_id:
+        raise InscripcionRechazada("sin_inscripcion_carrera")
+    if espacio_id in estado.inscriptas:
+        return  # ya inscripto: _insertar devuelve la existente
+    ok, info = evaluar(espacio_id, estado, reglas, anios)
+    if not ok:
+        raise InscripcionRechazada(info)
+
+
+# ---------- versión sincrónica ----------
+def cargar(estudiante_id: int, plan_id: int, ciclo: Optional[int] = None):
+    """(estado, espacios, reglas) con cinco consultas."""
+    ciclo = ciclo_o_actual(ciclo)
+    insc_id = _qs_inscripcion(estudiante_id, plan_id).first()
+    movimientos, inscriptas = [], []
+    if insc_id:
+        movimientos = list(_qs_movimientos(insc_id))
+        inscriptas = list(_qs_inscriptas(insc_id, ciclo))
+    estado = _armar_estado(insc_id, movimientos, inscriptas)
+    espacios = list(_qs_espacios(plan_id))
+    reglas = _reglas_por_espacio(_qs_correlatividades(plan_id))
+    return estado, espacios, reglas
+
+
+def espacios_habilitados(
+    estudiante_id: int, plan_id: int, ciclo: Optional[int] = None
+) -> List[dict]:
+    indice = superposiciones.indice(plan_id)
+    return _items(*cargar(estudiante_id, plan_id, ciclo), indice)
+
+
+def _log(obj, usuario_id, nota):
+    InscripcionEspacioEstadoLog.objects.create(
+        insc_espacio=obj, estado=obj.estado, usuario_id=usuario_id, nota=nota
+    )
+
+
+def _cupo_bloqueado(espacio_id: int, ciclo: int):
+    """(id, cupo, ocupados) con la fila bloqueada hasta el commit, o None."""
+    return (
+        CupoEspacio.objects.select_for_update()
+        .filter(espacio_id=espacio_id, anio_academico=ciclo)
+        .values_list("id", "cupo", "ocupados")
+        .first()
+    )
+
+
+def _qs_existente(inscripcion_id, espacio_id, ciclo):
+    return InscripcionEspacio.objects.filter(
+        inscripcion_id=inscripcion_id, espacio_id=espacio_id, anio_academico=ciclo
+    )
+
+
+def _encolar(inscripcion_id, espacio_id, ciclo, usuario_id) -> Tuple[int, int]:
+    """(id, posición) en la lista de espera; repetirlo no agrega otra fila."""
+    try:
+        with transaction.atomic():
+            espera_id = ListaEspera.objects.create(
+                inscripcion_id=inscripcion_id,
+                espacio_id=espacio_id,
+                anio_academico=ciclo,
+                usuario_id=usuario_id,
+            ).id
+    except IntegrityError:
+        espera_id = (
+            ListaEspera.objects.filter(
+                inscripcion_id=inscripcion_id,
+                espacio_id=espacio_id,
+                anio_academico=ciclo,
+            )
+            .values_list("id", flat=True)
+            .get()
+        )
+    posicion = ListaEspera.objects.filter(
+        espacio_id=espacio_id, anio_academico=ciclo, id__lte=espera_id
+    ).count()
+    return espera_id, posicion
+
+
+def _insertar(
+    inscripcion_id: int, espacio_id: int, ciclo: int, usuario_id: Optional[int]
+) -> Tuple[InscripcionEspacio, bool]:
+    """
+    Insert-and-catch: (inscripción, creada). Si la fila ya existía (otro
+    request la insertó antes, aunque haya sido hace un instante) devuelve
+    esa. Una existente dada de baja no se reactiva acá. Sin cupo levanta
+    EnListaEspera.
+    """
+    try:
+        with transaction.atomic():
+            cupo = _cupo_bloqueado(espacio_id, ciclo)
+            lleno = cupo is not None and cupo[2] >= cupo[1]
+            if lleno:
+                obj = _qs_existente(inscripcion_id, espacio_id, ciclo).first()
+                if obj is None:
+                    espera = _encolar(inscripcion_id, espacio_id, ciclo, usuario_id)
+            else:
+                obj = InscripcionEspacio.objects.create(
+                    inscripcion_id=inscripcion_id,
+                    espacio_id=espacio_id,
+                    anio_academico=ciclo,
+                )
+                if cupo is not None:
+                    CupoEspacio.objects.filter(pk=cupo[0]).update(
+                        ocupados=F("ocupados") + 1
+                    )
+                _log(obj, usuario_id, "Alta por inscripción a cursada")
+                return obj, True
+    except IntegrityError:
+        obj = _qs_existente(inscripcion_id, espacio_id, ciclo).first()
+        if obj is None:
+            raise  # no era la unicidad
+    if obj is None:
+        raise EnListaEspera(*espera)
+    if obj.estado == EstadoInscripcion.BAJA:
+        raise InscripcionRechazada("dada_de_baja", status=409)
+    return obj, False
+
+
+def lugar_libre(espacio_id: int, ciclo: int) -> bool:
+    """
+    Para altas que no pasan por `_insertar` (admin): bloquea el cupo hasta el
+    commit y dice si queda lugar. Sin cupo siempre hay lugar.
+    """
+    cupo = _cupo_bloqueado(espacio_id, ciclo)
+    return cupo is None or cupo[2] < cupo[1]
+
+
+def tomar_lugar(espacio_id: int, ciclo: int) -> None:
+    """
+    Suma un lugar ocupado con el cupo bloqueado, en la transacción que guarda
+    la inscripción. Lleno, levanta InscripcionRechazada("sin_cupo"). Sin cupo
+    no hace nada.
+    """
+    cupo = _cupo_bloqueado(espacio_id, ciclo)
+    if cupo is None:
+        return
+    if cupo[2] >= cupo[1]:
+        raise InscripcionRechazada("sin_cupo", status=409)
+    CupoEspacio.objects.filter(pk=cupo[0]).update(ocupados=F("ocupados") + 1)
+
+
+def liberar_lugar(
+    espacio_id: int, ciclo: int, usuario_id: Optional[int] = None
+) -> Optional[InscripcionEspacio]:
+    """
+    Después de una baja: el lugar pasa al primero de la lista de espera (que
+    queda inscripto) o, si no hay nadie, se descuenta de `ocupados`. Devuelve
+    la inscripción promovida, si hubo. Sin cupo para el espacio no hace nada.
+    """
+    with transaction.atomic():
+        cupo = _cupo_bloqueado(espacio_id, ciclo)
+        if cupo is None:
+            return None
+        esperas = ListaEspera.objects.filter(
+            espacio_id=espacio_id, anio_academico=ciclo
+        ).order_by("id")
+        for espera in esperas:
+            espera.delete()
+            try:
+                with transaction.atomic():
+                    obj = InscripcionEspacio.objects.create(
+                        inscripcion_id=espera.inscripcion_id,
+                        espacio_id=espacio_id,
+                        anio_academico=ciclo,
+                    )
+            except IntegrityError:
+                continue  # ya tiene una fila en el ciclo (p. ej. una baja previa)
+            _log(obj, usuario_id, "Alta desde lista de espera")
+            return obj
+        CupoEspacio.objects.filter(pk=cupo[0], ocupados__gt=0).update(
+            ocupados=F("ocupados") - 1
+        )
+        return None
+
+
+def dar_de_baja(
+    insc_espacio_id: int, usuario_id: Optional[int] = None
+) -> Tuple[InscripcionEspacio, Optional[InscripcionEspacio]]:
+    """
+    (inscripción dada de baja, promovida desde la lista de espera o None).
+    Repetirla no vuelve a liberar el lugar.
+    """
+    obj = InscripcionEspacio.objects.filter(pk=insc_espacio_id).first()
+    if obj is None:
+        raise InscripcionRechazada("inscripcion_inexistente", status=404)
+    with transaction.atomic():
+        # mismo orden de bloqueo que _insertar: primero el cupo
+        _cupo_bloqueado(obj.espacio_id, obj.anio_academico)
+        obj = InscripcionEspacio.objects.select_for_update().get(pk=obj.pk)
+        if obj.estado == EstadoInscripcion.BAJA:
+            return obj, None
+        obj.estado = EstadoInscripcion.BAJA
+        obj.fecha_baja = date.today()
+        obj.save(update_fields=["estado", "fecha_baja"])
+        _log(obj, usuario_id, "Baja")
+        return obj, liberar_lugar(obj.espacio_id, obj.anio_academico, usuario_id)
+
+
+def inscribir(
+    estudiante_id: int,
+    plan_id: int,
+    espacio_id: int,
+    ciclo: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+) -> Tuple[InscripcionEspacio, bool]:
+    """
+    (inscripción, creada); repetirla devuelve la misma con creada=False.
+    Sin cupo levanta EnListaEspera.
+    """
+    if not ventanas.abierta(ventanas.CURSADA, plan_id=plan_id):
+        raise InscripcionRechazada("ventana_cerrada", status=403)
+    ciclo = ciclo_o_actual(ciclo)
+    estado, espacios, reglas = cargar(estudiante_id, plan_id, ciclo)
+    _validar_inscripcion(espacio_id, espacios, estado, reglas)
+    return _insertar(estado.inscripcion_id, espacio_id, ciclo, usuario_id)
+
+
+# ---------- inscripción masiva (cohorte) ----------
+@dataclass
+class ResultadoCohorte:
+    creadas: int = 0
+    existentes: int = 0  # ya estaban inscriptos en el ciclo
+    en_espera: int = 0
+    # (estudiante_id, espacio_id) -> motivo, como en `evaluar`
+    rechazadas: Dict[Tuple[int, int], object] = field(default_factory=dict)
+    estudiantes: int = 0
+
+
+def _inscripciones_cohorte(profesorado_id, plan_id, cohorte) -> Dict[int, int]:
+    """{inscripcion_id: estudiante_id}; por estudiante, la del plan exacto."""
+    filas = (
+        EstudianteProfesorado.objects.filter(
+            profesorado_id=profesorado_id, cohorte=cohorte
+        )
+        .filter(Q(plan_id=plan_id) | Q(plan__isnull=True))
+        .order_by("estudiante_id")
+        .values_list("id", "estudiante_id", "plan_id")
+    )
+    elegida: Dict[int, int] = {}
+    for insc_id, est_id, plan in filas:
+        if est_id not in elegida or plan == plan_id:
+            elegida[est_id] = insc_id
+    return {insc_id: est_id for est_id, insc_id in elegida.items()}
+
+
+def _movimientos_por_inscripcion(insc_ids) -> Dict[int, list]:
+    movs: Dict[int, list] = {i: [] for i in insc_ids}
+    filas = Movimiento.objects.filter(inscripcion_id__in=insc_ids).values_list(
+        "inscripcion_id", "espacio_id", "tipo", "condicion_id", "nota_num", "nota_texto"
+    )
+    for insc_id, *mov in filas.iterator(chunk_size=2000):
+        movs[insc_id].append(mov)
+    return movs
+
+
+def inscribir_cohorte(
+    profesorado_id: int,
+    plan_id: int,
+    cohorte: int,
+    espacio_ids: Iterable[int],
+    ciclo: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+) -> ResultadoCohorte:
+    """
+    Inscribe a todos los estudiantes de la cohorte en `espacio_ids` (del
+    plan) para el ciclo. Valida con `evaluar`, sin consultas por estudiante,
+    y escribe todo en una transacción: bulk_create(ignore_conflicts) de las
+    inscripciones (si alguien se inscribió en el medio, su fila queda) y de
+    sus logs. Respeta el cupo: lo que no entra va a la lista de espera.
+    No pide ventana abierta: es una operación de Bedelía.
+    """
+    ciclo = ciclo_o_actual(ciclo)
+    resultado = ResultadoCohorte()
+    espacios = list(_qs_espacios(plan_id))
+    anios = {e["id"]: anio_num(e["anio"]) for e in espacios}
+    pedidos = sorted(set(espacio_ids))
+    for esp_id in pedidos:
+        if esp_id not in anios:
+            raise InscripcionRechazada("espacio_inexistente", status=404)
+    reglas = _reglas_por_espacio(_qs_correlatividades(plan_id))
+    inscripciones = _inscripciones_cohorte(profesorado_id, plan_id, cohorte)
+    resultado.estudiantes = len(inscripciones)
+    if not inscripciones or not pedidos:
+        return resultado
+    movimientos = _movimientos_por_inscripcion(list(inscripciones))
+    nota = f"Alta por inscripción de la cohorte {cohorte}"
+
+    with transaction.atomic():
+        # mismo orden de bloqueo que _insertar: primero los cupos (por id)
+        cupos = {
+            esp_id: (cupo_id, cupo - ocupados)
+            for cupo_id, esp_id, cupo, ocupados in CupoEspacio.objects.select_for_update()
+            .filter(espacio_id__in=pedidos, anio_academico=ciclo)
+            .order_by("id")
+            .values_list("id", "espacio_id", "cupo", "ocupados")
+        }
+        previas: Dict[Tuple[int, int], str] = {
+            (insc_id, esp_id): estado
+            for insc_id, esp_id, estado in InscripcionEspacio.objects.filter(
+                inscripcion_id__in=list(inscripciones),
+                espacio_id__in=pedidos,
+                anio_academico=ciclo,
+            ).values_list("inscripcion_id", "espacio_id", "estado")
+        }
+
+        altas: Dict[int, Set[int]] = {esp_id: set() for esp_id in pedidos}
+        esperas: List[ListaEspera] = []
+        for insc_id, est_id in sorted(inscripciones.items()):
+            estado = _armar_estado(insc_id, movimientos[insc_id], ())
+            for esp_id in pedidos:
+                previa = previas.get((insc_id, esp_id))
+                if previa == EstadoInscripcion.EN_CURSO:
+                    resultado.existentes += 1
+                    continue
+                if previa == EstadoInscripcion.BAJA:
+                    resultado.rechazadas[est_id, esp_id] = "dada_de_baja"
+                    continue
+                ok, motivo = evaluar(esp_id, estado, reglas, anios)
+                if not ok:
+                    resultado.rechazadas[est_id, esp_id] = motivo
+                elif esp_id in cupos and len(altas[esp_id]) >= cupos[esp_id][1]:
+                    esperas.append(
+                        ListaEspera(
+                            inscripcion_id=insc_id,
+                            espacio_id=esp_id,
+                            anio_academico=ciclo,
+                            usuario_id=usuario_id,
+                        )
+                    )
+                else:
+                    altas[esp_id].add(insc_id)
+
+        InscripcionEspacio.objects.bulk_create(
+            [
+                InscripcionEspacio(
+                    inscripcion_id=insc_id, espacio_id=esp_id, anio_academico=ciclo
+                )
+                for esp_id, insc_ids in altas.items()
+                for insc_id in sorted(insc_ids)
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts no devuelve ids: se leen las filas nuevas
+        nuevas = [
+            (pk, esp_id)
+            for pk, insc_id, esp_id in InscripcionEspacio.objects.filter(
+                inscripcion_id__in=list(inscripciones),
+                espacio_id__in=pedidos,
+                anio_academico=ciclo,
+            ).values_list("id", "inscripcion_id", "espacio_id")
+            if (insc_id, esp_id) not in previas and insc_id in altas[esp_id]
+        ]
+        InscripcionEspacioEstadoLog.objects.bulk_create(
+            [
+                InscripcionEspacioEstadoLog(
+                    insc_espacio_id=pk,
+                    estado=EstadoInscripcion.EN_CURSO,
+                    usuario_id=usuario_id,
+                    nota=nota,
+                )
+                for pk, _ in nuevas
+            ],
+            batch_size=1000,
+        )
+        ListaEspera.objects.bulk_create(esperas, batch_size=1000, ignore_conflicts=True)
+        por_espacio: Dict[int, int] = {}
+        for _, esp_id in nuevas:
+            por_espacio[esp_id] = por_espacio.get(esp_id, 0) + 1
+        for esp_id, n in por_espacio.items():
+            if esp_id in cupos:
+                CupoEspacio.objects.filter(pk=cupos[esp_id][0]).update(
+                    ocupados=F("ocupados") + n
+                )
+
+    resultado.creadas = len(nuevas)
+    resultado.en_espera = len(esperas)
+    return resultado
+
+
+# ---------- cierre de ciclo ----------
+@dataclass
+class ResumenCierre:
+    anio: int
+    finalizadas: int = 0  # EN_CURSO con su REG cargado -> FINALIZADA
+    bajas: int = 0  # EN_CURSO sin condición de cursada -> BAJA
+    # {profesorado: (finalizadas, bajas)}
+    por_profesorado: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    ejecutado: bool = False
+
+
+def _qs_sin_cerrar(anio: int, profesorado_id: Optional[int] = None):
+    """EN_CURSO del ciclo, con `con_reg`: tiene un REG desde ese año."""
+    con_reg = Exists(
+        Movimiento.objects.filter(
+            inscripcion_id=OuterRef("inscripcion_id"),
+            espacio_id=OuterRef("espacio_id"),
+            tipo="REG",
+        ).filter(Q(fecha__isnull=True) | Q(fecha__gte=date(anio, 1, 1)))
+    )
+    qs = InscripcionEspacio.objects.filter(
+        anio_academico=anio, estado=EstadoInscripcion.EN_CURSO
+    )
+    if profesorado_id:
+        qs = qs.filter(espacio__plan__profesorado_id=profesorado_id)
+    return qs.annotate(con_reg=con_reg)
+
+
+def _resumir(anio, profesorado_id) -> ResumenCierre:
+    resumen = ResumenCierre(anio=anio)
+    filas = (
+        _qs_sin_cerrar(anio, profesorado_id)
+        .order_by()
+        .values("espacio__plan__profesorado__nombre")
+        .annotate(
+            fin=Count("pk", filter=Q(con_reg=True)),
+            baja=Count("pk", filter=Q(con_reg=False)),
+        )
+        .order_by("espacio__plan__profesorado__nombre")
+    )
+    for fila in filas:
+        resumen.por_profesorado[fila["espacio__plan__profesorado__nombre"]] = (
+            fila["fin"],
+            fila["baja"],
+        )
+        resumen.finalizadas += fila["fin"]
+        resumen.bajas += fila["baja"]
+    return resumen
+
+
+def _pasar(ids, estado, nota, usuario_id, lote, **campos) -> None:
+    """UPDATE por lotes de ids y los logs con bulk_create."""
+    ahora = timezone.now()
+    for i in range(0, len(ids), lote):
+        parte = ids[i : i + lote]
+        InscripcionEspacio.objects.filter(pk__in=parte).update(
+            estado=estado, updated_at=ahora, **campos
+        )
+        InscripcionEspacioEstadoLog.objects.bulk_create(
+            [
+                InscripcionEspacioEstadoLog(
+                    insc_espacio_id=pk, estado=estado, usuario_id=usuario_id, nota=nota
+                )
+                for pk in parte
+            ]
+        )
+
+
+def cerrar_ciclo(
+    anio: int,
+    profesorado_id: Optional[int] = None,
+    ejecutar: bool = False,
+    usuario_id: Optional[int] = None,
+    lote: int = 2000,
+) -> ResumenCierre:
+    """
+    Cierre del ciclo `anio`: cada cursada que sigue EN_CURSO pasa a
+    FINALIZADA si tiene un movimiento REG cargado (desde el 1/1 de ese año) o
+    a BAJA si no. Sin `ejecutar` solo cuenta (dry-run). Ejecutado, todo va en
+    una transacción: un SELECT de ids por destino y UPDATEs por lotes de
+    `lote` ids, sin save() por fila. Repetirlo no hace nada: ya no quedan
+    EN_CURSO en el ciclo.
+    """
+    resumen = _resumir(anio, profesorado_id)
+    if not ejecutar or not (resumen.finalizadas or resumen.bajas):
+        return resumen
+    with transaction.atomic():
+        qs = _qs_sin_cerrar(anio, profesorado_id).select_for_update(of=("self",))
+        finalizar = list(qs.filter(con_reg=True).values_list("pk", flat=True))
+        bajar = list(qs.filter(con_reg=False).values_list("pk", flat=True))
+        _pasar(
+            finalizar,
+            EstadoInscripcion.FINALIZADA,
+            f"Cierre del ciclo {anio}: condición de cursada cargada",
+            usuario_id,
+            lote,
+        )
+        _pasar(
+            bajar,
+            EstadoInscripcion.BAJA,
+            f"Cierre del ciclo {anio}: sin condición de cursada",
+            usuario_id,
+            lote,
+            fecha_baja=timezone.localdate(),
+            motivo_baja=f"Cierre del ciclo {anio}",
+        )
+    resumen.finalizadas, resumen.bajas = len(finalizar), len(bajar)
+    resumen.ejecutado = True
+    return resumen
+
+
+# ---------- versión asincrónica (ORM async) ----------
+async def acargar(estudiante_id: int, plan_id: int, ciclo: Optional[int] = None):
+    ciclo = ciclo_o_actual(ciclo)
+    insc_id = await _qs_inscripcion(estudiante_id, plan_id).afirst()
+    movimientos, inscriptas = [], []
+    if insc_id:
+        movimientos = [m async for m in _qs_movimientos(insc_id)]
+        inscriptas = [e async for e in _qs_inscriptas(insc_id, ciclo)]
+    estado = _armar_estado(insc_id, movimientos, inscriptas)
+    espacios = [e async for e in _qs_espacios(plan_id)]
+    reglas = _reglas_por_espacio([c async for c in _qs_correlatividades(plan_id)])
+    return estado, espacios, reglas
+
+
+async def aespacios_habilitados(
+    estudiante_id: int, plan_id: int, ciclo: Optional[int] = None
+) -> List[dict]:
+    indice = await superposiciones.aindice(plan_id)
+    return _items(*(await acargar(estudiante_id, plan_id, ciclo)), indice)
+
+
+async def ainscribir(
+    estudiante_id: int,
+    plan_id: int,
+    espacio_id: int,
+    ciclo: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+) -> Tuple[InscripcionEspacio, bool]:
+    if not await ventanas.aabierta(ventanas.CURSADA, plan_id=plan_id):
+        raise InscripcionRechazada("ventana_cerrada", status=403)
+    ciclo = ciclo_o_actual(ciclo)
+    estado, espacios, reglas = await acargar(estudiante_id, plan_id, ciclo)
+    _validar_inscripcion(espacio_id, espacios, estado, reglas)
+    # el ORM async no tiene transacciones: el insert + log va en un thread
+    return await sync_to_async(_insertar)(
+        estado.inscripcion_id, espacio_id, ciclo, usuario_id
+    )
@@ -0,0 +1,191 @@
+# academia_core/exportar.py
+"""
+Exportaciones en streaming (CSV / NDJSON) de estudiantes, inscripciones,
+movimientos y correlatividades.
+
+Las filas se leen con `.values_list(...).iterator(chunk_size=...)` y se
+serializan de a tandas dentro de un generador, así la memoria no crece con
+el tamaño del export y el primer byte sale enseguida.
+
+MySQL no tiene cursores del lado del servidor en Django (el driver trae todo
+el resultado a memoria aunque se use .iterator()), así que ahí se recorre por
+tandas de pk (`pk > último`), que mantiene la memoria acotada igual.
+"""
+from __future__ import annotations
+
+import csv
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Exists, OuterRef
+
+from .models import (
+    Correlatividad,
+    Estudiante,
+    EstudianteProfesorado,
+    Movimiento,
+)
+
+CHUNK_SIZE = 2000
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+# (encabezado, campo ORM)
+Columnas = Sequence[Tuple[str, str]]
+
+
+def _estudiantes_de_profesorados(qs, prof_ids):
+    return qs.filter(
+        Exists(
+            EstudianteProfesorado.objects.filter(
+                estudiante=OuterRef("pk"), profesorado_id__in=prof_ids
+            )
+        )
+    )
+
+
+# nombre -> (queryset base, columnas, filtro por profesorados)
+EXPORTS: Dict[str, Tuple[Callable, Columnas, Callable]] = {
+    "estudiantes": (
+        lambda: Estudiante.objects.all(),
+        (
+            ("id", "id"),
+            ("dni", "dni"),
+            ("apellido", "apellido"),
+            ("nombre", "nombre"),
+            ("fecha_nacimiento", "fecha_nacimiento"),
+            ("email", "email"),
+            ("telefono", "telefono"),
+            ("localidad", "localidad"),
+            ("activo", "activo"),
+        ),
+        _estudiantes_de_profesorados,
+    ),
+    "inscripciones": (
+        lambda: EstudianteProfesorado.objects.all(),
+        (
+            ("id", "id"),
+            ("estudiante_id", "estudiante_id"),
+            ("dni", "estudiante__dni"),
+            ("apellido", "estudiante__apellido"),
+            ("nombre", "estudiante__nombre"),
+            ("profesorado_id", "profesorado_id"),
+            ("profesorado", "profesorado__nombre"),
+            ("plan_id", "plan_id"),
+            ("resolucion", "plan__resolucion"),
+            ("cohorte", "cohorte"),
+            ("legajo_estado", "legajo_estado"),
+            ("condicion_admin", "condicion_admin"),
+        ),
+        lambda qs, ids: qs.filter(profesorado_id__in=ids),
+    ),
+    "movimientos": (
+        lambda: Movimiento.objects.all(),
+        (
+            ("id", "id"),
+            ("inscripcion_id", "inscripcion_id"),
+            ("dni", "inscripcion__estudiante__dni"),
+            ("apellido", "inscripcion__estudiante__apellido"),
+            ("nombre", "inscripcion__estudiante__nombre"),
+            ("profesorado_id", "inscripcion__profesorado_id"),
+            ("espacio_id", "espacio_id"),
+            ("espacio", "espacio__nombre"),
+            ("tipo", "tipo"),
+            ("fecha", "fecha"),
+            ("condicion", "condicion_id"),
+            ("nota_num", "nota_num"),
+            ("nota_texto", "nota_texto"),
+            ("folio", "folio"),
+            ("libro", "libro"),
+        ),
+        lambda qs, ids: qs.filter(inscripcion__profesorado_id__in=ids),
+    ),
+    "correlatividades": (
+        lambda: Correlatividad.objects.all(),
+        (
+            ("id", "id"),
+            ("plan_id", "plan_id"),
+            ("espacio_id", "espacio_id"),
+            ("espacio", "espacio__nombre"),
+            ("tipo", "tipo"),
+            ("requisito", "requisito"),
+            ("requiere_espacio_id", "requiere_espacio_id"),
+            ("requiere_espacio", "requiere_espacio__nombre"),
+            ("requiere_todos_hasta_anio", "requiere_todos_hasta_anio"),
+        ),
+        lambda qs, ids: qs.filter(plan__profesorado_id__in=ids),
+    ),
+}
+
+
+def queryset_export(
+    nombre: str, prof_ids: Optional[Iterable[int]] = None, **filtros
+) -> Tuple[object, Columnas]:
+    base, columnas, por_profesorados = EXPORTS[nombre]
+    qs = base()
+    if prof_ids is not None:
+        qs = por_profesorados(qs, list(prof_ids))
+    if filtros:
+        qs = qs.filter(**filtros)
+    return qs, columnas
+
+
+def iterar_filas(qs, campos: List[str], chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """Tuplas de `campos` ordenadas por pk, sin cargar el resultado entero."""
+    qs = qs.order_by("pk")
+    if connections[qs.db].vendor != "mysql":
+        yield from qs.values_list(*campos).iterator(chunk_size=chunk_size)
+        return
+
+    # MySQL: tandas por pk (el primer campo de cada export es "id")
+    ultimo = None
+    while True:
+        tanda = qs if ultimo is None else qs.filter(pk__gt=ultimo)
+        filas = list(tanda.values_list(*campos)[:chunk_size])
+        yield from filas
+        if len(filas) < chunk_size:
+            return
+        ultimo = filas[-1][0]
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve lo escrito en vez de guardarlo."""
+
+    def write(self, value):
+        return value
+
+
+def _tandas(filas: Iterable, n: int) -> Iterator[list]:
+    tanda = []
+    for fila in filas:
+        tanda.append(fila)
+        if len(tanda) >= n:
+            yield tanda
+            tanda = []
+    if tanda:
+        yield tanda
+
+
+def generar_csv(filas: Iterable, encabezados: Sequence[str], por_tanda=500):
+    writer = csv.writer(_Eco())
+    # BOM: Excel abre bien los acentos
+    yield "\ufeff" + writer.writerow(encabezados)
+    for tanda in _tandas(filas, por_tanda):
+        yield "".join(writer.writerow(f) for f in tanda)
+
+
+def generar_ndjson(filas: Iterable, encabezados: Sequence[str], por_tanda=500):
+    enc = DjangoJSONEncoder(ensure_ascii=False)
+    for tanda in _tandas(filas, por_tanda):
+        yield "".join(enc.encode(dict(zip(encabezados, f))) + "\n" for f in tanda)
+
+
+def generar_export(formato: str, qs, columnas: Columnas):
+    encabezados = [c for c, _ in columnas]
+    filas = iterar_filas(qs, [campo for _, campo in columnas])
+    if formato == "csv":
+        return generar_csv(filas, encabezados)
+    return generar_ndjson(filas, encabezados)
@@ -4,6 +4,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.urls import reverse
+from . import catalogo
 from .models import EstudianteProfesorado
 
 # Estos imports pueden no existir aún; los “try” evitan que truene la importación.
@@ -225,32 +226,37 @@ class CargaNotaForm(forms.ModelForm):
         self.fields["espacio"].queryset = EspacioCurricular.objects.none()
         self.fields["condicion"].queryset = Condicion.objects.none()
 
+        plan_id = None
         if "inscripcion" in self.data:
             try:
                 inscripcion_id = int(self.data.get("inscripcion"))
-                inscripcion = EstudianteProfesorado.objects.get(id=inscripcion_id)
-                self.fields["espacio"].queryset = EspacioCurricular.objects.filter(
-                    plan=inscripcion.plan
-                ).order_by("nombre")
+                plan_id = (
+                    EstudianteProfesorado.objects.filter(id=inscripcion_id)
+                    .values_list("plan_id", flat=True)
+                    .get()
+                )
             except (ValueError, TypeError, EstudianteProfesorado.DoesNotExist):
                 pass
         elif self.instance.pk and self.instance.inscripcion:
-            self.fields["espacio"].queryset = EspacioCurricular.objects.filter(
-                plan=self.instance.inscripcion.plan
-            ).order_by("nombre")
+            plan_id = self.instance.inscripcion.plan_id
+        if plan_id:
+            catalogo.opciones(
+                self.fields["espacio"],
+                catalogo.por_nombre(catalogo.espacios_de_plan(plan_id)),
+                EspacioCurricular.objects.filter(plan_id=plan_id),
+            )
 
+        tipo = None
         if "tipo" in self.data:
-            try:
-                tipo = self.data.get("tipo")
-                self.fields["condicion"].queryset = Condicion.objects.filter(
-                    tipo=tipo
-                ).order_by("nombre")
-            except (ValueError, TypeError):
-                pass
+            tipo = self.data.get("tipo")
         elif self.instance.pk and self.instance.tipo:
-            self.fields["condicion"].queryset = Condicion.objects.filter(
-                tipo=self.instance.tipo
-            ).order_by("nombre")
+            tipo = self.instance.tipo
+        if tipo:
+            catalogo.opciones(
+                self.fields["condicion"],
+                catalogo.condiciones_por_tipo(tipo),
+                Condicion.objects.filter(tipo=tipo),
+            )
 
 
 # --- FORMULARIO FALTANTE ---
@@ -1,5 +1,6 @@
 from django import forms
 from django.forms import ModelChoiceField, ModelMultipleChoiceField
+from academia_core import catalogo
 from academia_core.models import (
     Profesorado,
     PlanEstudios,
@@ -39,6 +40,11 @@ class CorrelatividadForm(forms.Form):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        catalogo.opciones(
+            self.fields["profesorado"],
+            catalogo.profesorados(),
+            Profesorado.objects.all(),
+        )
 
         # Get data from either self.data (POST) or initial (GET)
         data_source = self.data if self.data else self.initial
@@ -47,9 +53,11 @@ class CorrelatividadForm(forms.Form):
         if "profesorado" in data_source:
             try:
                 profesorado_id = int(data_source.get("profesorado"))
-                self.fields["plan"].queryset = PlanEstudios.objects.filter(
-                    profesorado_id=profesorado_id
-                ).order_by("resolucion")
+                catalogo.opciones(
+                    self.fields["plan"],
+                    catalogo.planes_de_profesorado(profesorado_id),
+                    PlanEstudios.objects.filter(profesorado_id=profesorado_id),
+                )
             except (ValueError, TypeError):
                 pass  # Invalid input, leave queryset empty
 
@@ -57,21 +65,18 @@ class CorrelatividadForm(forms.Form):
         if "plan" in data_source:
             try:
                 plan_id = int(data_source.get("plan"))
-                # Filter materias for the main selection
-                self.fields["materia_principal"].queryset = (
-                    EspacioCurricular.objects.filter(plan_id=plan_id).order_by("nombre")
-                )
-
-                # Filter correlativas (all other spaces in the same plan)
-                all_other_spaces_in_plan = EspacioCurricular.objects.filter(
-                    plan_id=plan_id
-                ).order_by("nombre")
-                self.fields["correlativas_regulares"].queryset = (
-                    all_other_spaces_in_plan
-                )
-                self.fields["correlativas_aprobadas"].queryset = (
-                    all_other_spaces_in_plan
-                )
+                # Materia principal y correlativas: todos los espacios del plan
+                espacios = catalogo.por_nombre(catalogo.espacios_de_plan(plan_id))
+                for nombre in (
+                    "materia_principal",
+                    "correlativas_regulares",
+                    "correlativas_aprobadas",
+                ):
+                    catalogo.opciones(
+                        self.fields[nombre],
+                        espacios,
+                        EspacioCurricular.objects.filter(plan_id=plan_id),
+                    )
 
             except (ValueError, TypeError):
                 pass  # Invalid input, leave querysets empty
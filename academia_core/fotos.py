@@ -0,0 +1,177 @@
+# academia_core/fotos.py
+"""
+Variantes (derivados) de la foto del estudiante.
+
+El original queda donde lo guarda `estudiante_foto_path`
+(media/estudiantes/<dni>/foto.<ext>) y las variantes se cachean en disco al lado:
+
+    media/estudiantes/<dni>/variantes/<stem>_<variante>.<ext>
+
+- lista:   miniatura cuadrada para listados (JPEG + WebP)
+- detalle: tamaño ficha (JPEG + WebP)
+- pdf:     JPEG chico en escala de grises para xhtml2pdf (cartón)
+
+La generación es perezosa: si la variante no existe o es más vieja que el
+original, se (re)genera al pedir la URL. El comando `generar_variantes_fotos`
+hace el backfill masivo.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+CARPETA_VARIANTES = "variantes"
+
+# nombre -> (ancho, alto, recortar, escala_grises, formatos)
+VARIANTES: Dict[str, Tuple[int, int, bool, bool, Tuple[str, ...]]] = {
+    "lista": (64, 64, True, False, ("jpg", "webp")),
+    "detalle": (320, 400, False, False, ("jpg", "webp")),
+    "pdf": (220, 280, True, True, ("jpg",)),
+}
+
+_PIL_FORMATOS = {
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", {"quality": 78, "method": 4}),
+}
+_CALIDAD_PDF = 70
+
+
+def ruta_relativa_variante(nombre_original: str, variante: str, fmt: str) -> str:
+    """'estudiantes/123/foto.png' -> 'estudiantes/123/variantes/foto_lista.webp'"""
+    carpeta, archivo = os.path.split(nombre_original)
+    stem = os.path.splitext(archivo)[0]
+    return "/".join(
+        p for p in (carpeta, CARPETA_VARIANTES, f"{stem}_{variante}.{fmt}") if p
+    )
+
+
+def _ruta_absoluta(nombre_relativo: str) -> str:
+    return os.path.join(settings.MEDIA_ROOT, *nombre_relativo.split("/"))
+
+
+def _url(nombre_relativo: str) -> str:
+    return settings.MEDIA_URL.rstrip("/") + "/" + nombre_relativo
+
+
+def _vigente(destino: str, origen: str) -> bool:
+    try:
+        return os.path.getmtime(destino) >= os.path.getmtime(origen)
+    except OSError:
+        return False
+
+
+def _render(img: Image.Image, variante: str) -> Image.Image:
+    ancho, alto, recortar, grises, _ = VARIANTES[variante]
+    if recortar:
+        out = ImageOps.fit(img, (ancho, alto), Image.Resampling.LANCZOS)
+    else:
+        out = img.copy()
+        out.thumbnail((ancho, alto), Image.Resampling.LANCZOS)
+    if grises:
+        out = ImageOps.grayscale(out)
+    return out
+
+
+def generar_variantes_en_disco(
+    origen: str, media_root: str, nombre_original: str, forzar: bool = False
+) -> int:
+    """
+    Genera (o refresca) todas las variantes de una foto.
+    Trabaja solo con rutas de archivo para poder correr en un pool de procesos
+    sin tocar la base. Devuelve cuántos archivos escribió.
+    """
+    pendientes = []
+    for variante, (_, _, _, _, formatos) in VARIANTES.items():
+        for fmt in formatos:
+            rel = ruta_relativa_variante(nombre_original, variante, fmt)
+            destino = os.path.join(media_root, *rel.split("/"))
+            if forzar or not _vigente(destino, origen):
+                pendientes.append((variante, fmt, destino))
+    if not pendientes:
+        return 0
+
+    with Image.open(origen) as src:
+        src = ImageOps.exif_transpose(src)
+        if src.mode not in ("RGB", "L"):
+            src = src.convert("RGB")
+        renders = {}
+        for variante, fmt, destino in pendientes:
+            if variante not in renders:
+                renders[variante] = _render(src, variante)
+            pil_fmt, opts = _PIL_FORMATOS[fmt]
+            if variante == "pdf":
+                opts = {**opts, "quality": _CALIDAD_PDF}
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            tmp = f"{destino}.tmp"
+            renders[variante].save(tmp, pil_fmt, **opts)
+            os.replace(tmp, destino)
+    return len(pendientes)
+
+
+def generar_variantes(foto, forzar: bool = False) -> int:
+    """Genera las variantes de un ImageFieldFile (Estudiante.foto)."""
+    if not foto or not foto.name:
+        return 0
+    origen = _ruta_absoluta(foto.name)
+    if not os.path.exists(origen):
+        return 0
+    return generar_variantes_en_disco(
+        origen, str(settings.MEDIA_ROOT), foto.name, forzar=forzar
+    )
+
+
+def variante_url(foto, variante: str, fmt: str = "jpg") -> str:
+    """
+    URL de la variante pedida; la genera si falta o quedó vieja.
+    Si algo falla devuelve la URL del original (nunca rompe un template),
+    salvo para webp: ahí devuelve "" y el template omite el `<source>`, así
+    el navegador usa el `<img>` en vez de un JPEG declarado como webp.
+    """
+    if not foto or not foto.name:
+        return ""
+    rel = ruta_relativa_variante(foto.name, variante, fmt)
+    try:
+        if not _vigente(_ruta_absoluta(rel), _ruta_absoluta(foto.name)):
+            generar_variantes(foto)
+        if os.path.exists(_ruta_absoluta(rel)):
+            return _url(rel)
+    except Exception:
+        logger.exception("No se pudo generar la variante %s de %s", variante, foto.name)
+    if fmt == "webp":
+        return ""
+    try:
+        return foto.url
+    except Exception:
+        return ""
+
+
+def borrar_variantes(nombre_original: Optional[str]) -> None:
+    if not nombre_original:
+        return
+    for variante, (_, _, _, _, formatos) in VARIANTES.items():
+        for fmt in formatos:
+            ruta = _ruta_absoluta(
+                ruta_relativa_variante(nombre_original, variante, fmt)
+            )
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+
+def fotos_en_disco(nombres: Iterable[str]) -> List[Tuple[str, str]]:
+    """[(ruta_absoluta, nombre_relativo)] de las fotos que existen en MEDIA_ROOT."""
+    out = []
+    for nombre in nombres:
+        if not nombre:
+            continue
+        ruta = _ruta_absoluta(nombre)
+        if os.path.exists(ruta):
+            out.append((ruta, nombre))
+    return out
@@ -0,0 +1,351 @@
+# academia_core/horarios.py
+"""
+Generador de horarios por plan y cuatrimestre (borradores de Horario).
+
+Cada espacio del cuatrimestre necesita `EspacioCurricular.horas` horas
+cátedra semanales (MINUTOS_HORA) repartidas en sesiones de hasta
+MAXIMO_SESION horas, a lo sumo una por día. Restricciones duras:
+
+- un docente (DocenteEspacio vigente) no puede estar en dos lugares a la vez;
+- los espacios del mismo año del plan no se superponen (los cursa el mismo
+  grupo);
+- los horarios que ya existen y no se regeneran (otros planes del docente,
+  anuales ya armados) quedan fijos y se respetan.
+
+El solver tiene dos etapas y un límite de tiempo:
+
+1. Construcción con propagación: cada sesión tiene su dominio de lugares
+   (día, módulo) sin choques; se ubica primero la de dominio más chico
+   (MRV) y al ubicarla se podan los dominios de las sesiones relacionadas
+   (forward checking). Si un dominio queda vacío, la sesión va al lugar con
+   menos choques y sigue la etapa 2.
+2. Búsqueda local (min-conflicts): mientras queden choques y tiempo, se
+   mueve una sesión en conflicto al lugar que menos choca, con algún paso
+   al azar para salir de mínimos locales. Se guarda la mejor solución.
+
+`generar` no escribe; `guardar_borrador` reemplaza los borradores de esos
+espacios y `publicar` los pasa a definitivos (acción del admin). Los
+borradores no aparecen en el bundle del plan ni en la API.
+"""
+from __future__ import annotations
+
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from . import plan_bundle
+from .cursada import anio_num
+from .models import DocenteEspacio, EspacioCurricular, Horario
+
+MINUTOS_HORA = 40  # hora cátedra
+MAXIMO_SESION = 3  # horas seguidas por sesión
+DIAS = (1, 2, 3, 4, 5)  # Horario.DIAS: lunes a viernes
+INICIO = dtime(18, 0)
+FIN = dtime(23, 20)  # 8 horas cátedra
+PROBABILIDAD_AL_AZAR = 0.1
+
+Lugar = Tuple[int, int]  # (índice de día, módulo de inicio)
+
+
+@dataclass(frozen=True)
+class Sesion:
+    espacio_id: int
+    anio: int
+    docentes: Tuple[int, ...]
+    largo: int  # en módulos
+
+
+@dataclass
+class Grilla:
+    dias: Sequence[int] = DIAS
+    inicio: dtime = INICIO
+    fin: dtime = FIN
+    minutos: int = MINUTOS_HORA
+
+    @property
+    def modulos(self) -> int:
+        total = _minutos(self.fin) - _minutos(self.inicio)
+        return max(0, total // self.minutos)
+
+    def hora(self, modulo: int) -> dtime:
+        base = datetime.combine(date.min, self.inicio)
+        return (base + timedelta(minutes=modulo * self.minutos)).time()
+
+    def modulos_de(self, desde: dtime, hasta: dtime) -> range:
+        """Módulos de la grilla que se pisan con [desde, hasta)."""
+        ini = (_minutos(desde) - _minutos(self.inicio)) // self.minutos
+        fin = -(-(_minutos(hasta) - _minutos(self.inicio)) // self.minutos)
+        return range(max(0, ini), min(self.modulos, fin))
+
+
+@dataclass
+class Resultado:
+    sesiones: List[Sesion]
+    lugares: Dict[int, Lugar]  # índice de sesión -> lugar
+    grilla: Grilla
+    conflictos: int = 0  # sesiones que todavía chocan
+    iteraciones: int = 0
+    segundos: float = 0.0
+    sin_docente: List[int] = field(default_factory=list)  # espacio_ids
+
+    def bloques(self) -> List[dict]:
+        """Filas para Horario (dia_semana, hora_inicio, hora_fin, docente)."""
+        filas = []
+        for i, (d, m) in sorted(self.lugares.items()):
+            s = self.sesiones[i]
+            filas.append(
+                {
+                    "espacio_id": s.espacio_id,
+                    "dia_semana": self.grilla.dias[d],
+                    "hora_inicio": self.grilla.hora(m),
+                    "hora_fin": self.grilla.hora(m + s.largo),
+                    "docente_id": s.docentes[0] if s.docentes else None,
+                }
+            )
+        return filas
+
+
+def _minutos(t: dtime) -> int:
+    return t.hour * 60 + t.minute
+
+
+def partir(horas: int) -> List[int]:
+    """Horas semanales en sesiones parejas de hasta MAXIMO_SESION: 5 -> [3, 2]."""
+    if horas <= 0:
+        return []
+    n = -(-horas // MAXIMO_SESION)
+    base, resto = divmod(horas, n)
+    return [base + 1] * resto + [base] * (n - resto)
+
+
+# ---------- datos ----------
+def _espacios(plan_id: int, cuatrimestre: str):
+    """(id, anio, horas, cuatrimestre) a generar: los anuales, una sola vez."""
+    qs = EspacioCurricular.objects.filter(
+        plan_id=plan_id, cuatrimestre__in=[cuatrimestre, "A"]
+    ).values_list("id", "anio", "horas", "cuatrimestre")
+    armados = set(
+        Horario.objects.filter(
+            espacio__plan_id=plan_id, espacio__cuatrimestre="A"
+        ).values_list("espacio_id", flat=True)
+    )
+    return [f for f in qs if not (f[3] == "A" and f[0] in armados)]
+
+
+def _docentes(espacio_ids) -> Dict[int, Tuple[int, ...]]:
+    hoy = date.today()
+    docentes: Dict[int, List[int]] = defaultdict(list)
+    filas = (
+        DocenteEspacio.objects.filter(espacio_id__in=espacio_ids)
+        .filter(Q(hasta__isnull=True) | Q(hasta__gte=hoy))
+        .order_by("docente__apellido", "docente_id")
+        .values_list("espacio_id", "docente_id")
+    )
+    for esp_id, doc_id in filas:
+        docentes[esp_id].append(doc_id)
+    return {e: tuple(ds) for e, ds in docentes.items()}
+
+
+def _fijos(plan_id, cuatrimestre, variables, docentes, grilla):
+    """Claves ocupadas por horarios que no se regeneran (docentes y años)."""
+    todos = {d for ds in docentes.values() for d in ds}
+    filas = (
+        Horario.objects.filter(espacio__cuatrimestre__in=[cuatrimestre, "A"])
+        .filter(Q(docente_id__in=todos) | Q(espacio__plan_id=plan_id))
+        .exclude(espacio_id__in=variables)
+        .values_list(
+            "espacio__plan_id",
+            "espacio__anio",
+            "docente_id",
+            "dia_semana",
+            "hora_inicio",
+            "hora_fin",
+        )
+    )
+    ocupado: Dict[tuple, int] = defaultdict(int)
+    for plan, anio, doc, dia, ini, fin in filas:
+        if dia not in grilla.dias:
+            continue
+        d = grilla.dias.index(dia)
+        for k in grilla.modulos_de(ini, fin):
+            if doc in todos:
+                ocupado["d", doc, d, k] += 1
+            if plan == plan_id:
+                ocupado["a", anio_num(anio), d, k] += 1
+    return ocupado
+
+
+# ---------- solver ----------
+class _Solver:
+    def __init__(self, sesiones, grilla, fijos, rnd):
+        self.sesiones = sesiones
+        self.rnd = rnd
+        self.ocupado: Dict[tuple, int] = defaultdict(int, fijos)
+        self.lugares: Dict[int, Lugar] = {}
+        self.posibles: List[List[Lugar]] = [
+            [
+                (d, m)
+                for d in range(len(grilla.dias))
+                for m in range(grilla.modulos - s.largo + 1)
+            ]
+            for s in sesiones
+        ]
+        self._claves: Dict[Tuple[int, Lugar], FrozenSet[tuple]] = {}
+
+    def claves(self, i: int, lugar: Lugar) -> FrozenSet[tuple]:
+        clave = (i, lugar)
+        if clave not in self._claves:
+            s, (d, m) = self.sesiones[i], lugar
+            modulos = range(m, m + s.largo)
+            self._claves[clave] = frozenset(
+                [("a", s.anio, d, k) for k in modulos]
+                + [("d", doc, d, k) for doc in s.docentes for k in modulos]
+                + [("e", s.espacio_id, d)]  # una sesión por día
+            )
+        return self._claves[clave]
+
+    def costo(self, i: int, lugar: Lugar) -> int:
+        return sum(self.ocupado[c] for c in self.claves(i, lugar))
+
+    def poner(self, i: int, lugar: Lugar) -> None:
+        self.lugares[i] = lugar
+        for c in self.claves(i, lugar):
+            self.ocupado[c] += 1
+
+    def sacar(self, i: int) -> Lugar:
+        lugar = self.lugares.pop(i)
+        for c in self.claves(i, lugar):
+            self.ocupado[c] -= 1
+        return lugar
+
+    def mejor(self, i: int, evitar: Optional[Lugar] = None) -> Lugar:
+        costos = [(self.costo(i, p), p) for p in self.posibles[i] if p != evitar]
+        if not costos:
+            return evitar
+        minimo = min(c for c, _ in costos)
+        return self.rnd.choice([p for c, p in costos if c == minimo])
+
+    def construir(self) -> None:
+        dominios = {
+            i: {p for p in self.posibles[i] if self.costo(i, p) == 0}
+            for i in range(len(self.sesiones))
+        }
+        # a igual dominio, primero las sesiones largas
+        while dominios:
+            i = min(dominios, key=lambda j: (len(dominios[j]), -self.sesiones[j].largo))
+            dominio = dominios.pop(i)
+            lugar = self.rnd.choice(sorted(dominio)) if dominio else self.mejor(i)
+            self.poner(i, lugar)
+            tomadas = self.claves(i, lugar)
+            for j, dom in dominios.items():
+                dominios[j] = {p for p in dom if not (self.claves(j, p) & tomadas)}
+
+    def en_conflicto(self) -> List[int]:
+        malas = []
+        for i in list(self.lugares):
+            lugar = self.sacar(i)
+            if self.costo(i, lugar):
+                malas.append(i)
+            self.poner(i, lugar)
+        return malas
+
+    def mejorar(self, limite: float) -> Tuple[Dict[int, Lugar], int, int]:
+        malas = self.en_conflicto()
+        mejor, mejor_n, iteraciones = dict(self.lugares), len(malas), 0
+        while malas and time.monotonic() < limite:
+            iteraciones += 1
+            i = self.rnd.choice(malas)
+            actual = self.sacar(i)
+            if self.rnd.random() < PROBABILIDAD_AL_AZAR:
+                self.poner(i, self.rnd.choice(self.posibles[i]))
+            else:
+                self.poner(i, self.mejor(i, evitar=actual))
+            malas = self.en_conflicto()
+            if len(malas) < mejor_n:
+                mejor, mejor_n = dict(self.lugares), len(malas)
+        return mejor, mejor_n, iteraciones
+
+
+def generar(
+    plan_id: int,
+    cuatrimestre: str,
+    grilla: Optional[Grilla] = None,
+    segundos: float = 5.0,
+    semilla: Optional[int] = None,
+) -> Resultado:
+    """Propuesta de horarios para el plan y cuatrimestre ("1" o "2")."""
+    t0 = time.monotonic()
+    grilla = grilla or Grilla()
+    espacios = _espacios(plan_id, cuatrimestre)
+    variables = [e[0] for e in espacios]
+    docentes = _docentes(variables)
+    sesiones = [
+        Sesion(esp_id, anio_num(anio), docentes.get(esp_id, ()), largo)
+        for esp_id, anio, horas, _ in espacios
+        for largo in partir(horas)
+        if largo <= grilla.modulos
+    ]
+    resultado = Resultado(
+        sesiones=sesiones,
+        lugares={},
+        grilla=grilla,
+        sin_docente=sorted(e for e in variables if e not in docentes),
+    )
+    if not sesiones:
+        return resultado
+    solver = _Solver(
+        sesiones,
+        grilla,
+        _fijos(plan_id, cuatrimestre, variables, docentes, grilla),
+        random.Random(semilla),
+    )
+    solver.construir()
+    resultado.lugares, resultado.conflictos, resultado.iteraciones = solver.mejorar(
+        t0 + segundos
+    )
+    resultado.segundos = time.monotonic() - t0
+    return resultado
+
+
+def guardar_borrador(resultado: Resultado) -> int:
+    """Reemplaza los borradores de esos espacios por la propuesta."""
+    espacio_ids = {s.espacio_id for s in resultado.sesiones}
+    with transaction.atomic():
+        Horario.objects.filter(espacio_id__in=espacio_ids, borrador=True).delete()
+        creados = Horario.objects.bulk_create(
+            [Horario(borrador=True, **fila) for fila in resultado.bloques()]
+        )
+    return len(creados)
+
+
+def publicar(espacio_ids) -> int:
+    """
+    Los borradores de esos espacios pasan a ser sus horarios (los anteriores
+    se borran). Devuelve cuántos se publicaron.
+    """
+    espacio_ids = set(
+        Horario.objects.filter(espacio_id__in=espacio_ids, borrador=True)
+        .values_list("espacio_id", flat=True)
+        .distinct()
+    )
+    if not espacio_ids:
+        return 0
+    with transaction.atomic():
+        Horario.objects.filter(espacio_id__in=espacio_ids, borrador=False).delete()
+        n = Horario.objects.filter(espacio_id__in=espacio_ids, borrador=True).update(
+            borrador=False
+        )
+        planes = set(
+            EspacioCurricular.objects.filter(pk__in=espacio_ids).values_list(
+                "plan_id", flat=True
+            )
+        )
+        # update() no dispara post_save: el bundle del plan se renueva a mano
+        transaction.on_commit(lambda: plan_bundle.invalidar_plan(*planes))
+    return n
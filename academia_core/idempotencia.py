@@ -0,0 +1,187 @@
+# academia_core/idempotencia.py
+"""
+Claves de idempotencia para POSTs que el cliente puede reintentar
+(doble click, timeout, reconexión).
+
+El cliente manda un `Idempotency-Key` (header, o `idempotency_key` en el
+form) único por operación. La primera respuesta (< 500) se guarda en
+ClaveIdempotencia por (usuario, clave); los reintentos la reciben tal cual
+sin volver a ejecutar nada. La misma clave con otros datos es un error (422).
+
+Guardar usa insert-and-catch sobre `uniq_idem_usuario_clave`: si dos
+reintentos corren a la vez, los dos ejecutan la operación (que por eso
+también tiene que ser idempotente, ver cursada.inscribir) y queda guardada
+la primera respuesta.
+
+Uso: `@idempotente` debajo de `@login_required` / `@require_POST`, en vistas
+sync o async que devuelven JsonResponse. Las claves vencidas (VIGENCIA) se
+borran con `purgar`, desde el comando periódico purgar_idempotencia.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+from typing import Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.utils import timezone
+
+from .models import ClaveIdempotencia
+
+HEADER = "Idempotency-Key"
+CAMPO = "idempotency_key"
+LARGO_MAXIMO = 100
+VIGENCIA = timedelta(hours=24)
+
+
+class ClaveInvalida(ValueError):
+    pass
+
+
+class ClaveReutilizada(Exception):
+    """La clave ya se usó con otros datos."""
+
+
+def clave_de(request) -> Optional[str]:
+    clave = (request.headers.get(HEADER) or request.POST.get(CAMPO) or "").strip()
+    if not clave:
+        return None
+    if len(clave) > LARGO_MAXIMO:
+        raise ClaveInvalida(f"{HEADER} admite hasta {LARGO_MAXIMO} caracteres")
+    return clave
+
+
+def huella(request) -> str:
+    datos = sorted((k, v) for k, v in request.POST.lists() if k != CAMPO)
+    crudo = json.dumps([request.path, datos], sort_keys=True)
+    return hashlib.sha256(crudo.encode()).hexdigest()
+
+
+def _resolver(fila, huella_pedido) -> Optional[Tuple[int, dict]]:
+    if fila is None:
+        return None
+    estado_http, respuesta, huella_guardada = fila
+    if huella_guardada != huella_pedido:
+        raise ClaveReutilizada()
+    return estado_http, respuesta
+
+
+def _qs(usuario_id, clave):
+    return ClaveIdempotencia.objects.filter(
+        usuario_id=usuario_id, clave=clave
+    ).values_list("estado_http", "respuesta", "huella")
+
+
+def respuesta_guardada(usuario_id, clave, huella_pedido) -> Optional[Tuple[int, dict]]:
+    """(estado_http, json) de la primera ejecución, o None si es nueva."""
+    return _resolver(_qs(usuario_id, clave).first(), huella_pedido)
+
+
+def guardar(usuario_id, clave, huella_pedido, estado_http: int, respuesta: dict):
+    if estado_http >= 500:
+        return  # un error del servidor se puede reintentar de verdad
+    try:
+        with transaction.atomic():
+            ClaveIdempotencia.objects.create(
+                usuario_id=usuario_id,
+                clave=clave,
+                huella=huella_pedido,
+                estado_http=estado_http,
+                respuesta=respuesta,
+            )
+    except IntegrityError:
+        pass  # otro reintento simultáneo ya la guardó
+
+
+async def arespuesta_guardada(usuario_id, clave, huella_pedido):
+    return _resolver(await _qs(usuario_id, clave).afirst(), huella_pedido)
+
+
+async def aguardar(usuario_id, clave, huella_pedido, estado_http, respuesta):
+    if estado_http >= 500:
+        return
+    try:
+        # insert suelto en autocommit: no hace falta transacción
+        await ClaveIdempotencia.objects.acreate(
+            usuario_id=usuario_id,
+            clave=clave,
+            huella=huella_pedido,
+            estado_http=estado_http,
+            respuesta=respuesta,
+        )
+    except IntegrityError:
+        pass
+
+
+def _preparar(request):
+    """(clave, huella, None) o (None, None, respuesta de error)."""
+    try:
+        clave = clave_de(request)
+    except ClaveInvalida as e:
+        return None, None, HttpResponseBadRequest(str(e))
+    if not clave:
+        return None, None, None
+    return clave, huella(request), None
+
+
+def _guardable(respuesta):
+    if isinstance(respuesta, JsonResponse) and respuesta.status_code < 500:
+        return respuesta.status_code, json.loads(respuesta.content)
+    return None
+
+
+def _reutilizada():
+    return JsonResponse({"ok": False, "error": "clave_reutilizada"}, status=422)
+
+
+def idempotente(vista):
+    """Repite la primera respuesta a los reintentos con la misma clave."""
+    if iscoroutinefunction(vista):
+
+        @wraps(vista)
+        async def envoltura(request, *args, **kwargs):
+            clave, h, error = _preparar(request)
+            if error or not clave:
+                return error or await vista(request, *args, **kwargs)
+            usuario_id = (await request.auser()).pk
+            try:
+                previa = await arespuesta_guardada(usuario_id, clave, h)
+            except ClaveReutilizada:
+                return _reutilizada()
+            if previa:
+                return JsonResponse(previa[1], status=previa[0])
+            respuesta = await vista(request, *args, **kwargs)
+            if datos := _guardable(respuesta):
+                await aguardar(usuario_id, clave, h, *datos)
+            return respuesta
+
+        return envoltura
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        clave, h, error = _preparar(request)
+        if error or not clave:
+            return error or vista(request, *args, **kwargs)
+        try:
+            previa = respuesta_guardada(request.user.pk, clave, h)
+        except ClaveReutilizada:
+            return _reutilizada()
+        if previa:
+            return JsonResponse(previa[1], status=previa[0])
+        respuesta = vista(request, *args, **kwargs)
+        if datos := _guardable(respuesta):
+            guardar(request.user.pk, clave, h, *datos)
+        return respuesta
+
+    return envoltura
+
+
+def purgar(antes_de=None) -> int:
+    """Borra las claves más viejas que VIGENCIA. Devuelve cuántas."""
+    limite = antes_de or timezone.now() - VIGENCIA
+    borradas, _ = ClaveIdempotencia.objects.filter(creado__lt=limite).delete()
+    return borradas
@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide los caminos calientes (p50/p95, consultas y pico de memoria) sobre "
+        "la base configurada y los compara con una corrida guardada. Cargar "
+        "antes datos a escala con generar_datos_sinteticos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "casos",
+            nargs="*",
+            help="Casos a correr (por defecto, todos menos los lentos): "
+            + ", ".join(
+                c.nombre if c.por_defecto else f"{c.nombre} (lento)"
+                for c in benchmarks.CASOS
+            ),
+        )
+        parser.add_argument("--repeticiones", type=int, default=30)
+        parser.add_argument("--calentamiento", type=int, default=3)
+        parser.add_argument(
+            "--baseline",
+            default=str(benchmarks.BASELINE),
+            help="JSON con la corrida de referencia",
+        )
+        parser.add_argument(
+            "--guardar",
+            action="store_true",
+            help="Guarda esta corrida como referencia (no compara)",
+        )
+        parser.add_argument(
+            "--tolerancia",
+            type=float,
+            default=0.25,
+            help="Aumento relativo permitido de p95 y memoria (default 0.25)",
+        )
+        parser.add_argument(
+            "--margen-ms",
+            type=float,
+            default=1.0,
+            help="Aumento absoluto de p95 que nunca cuenta como regresión",
+        )
+        parser.add_argument("--json", action="store_true", help="Salida JSON")
+
+    def handle(self, *args, **opts):
+        validos = {c.nombre for c in benchmarks.CASOS}
+        desconocidos = set(opts["casos"]) - validos
+        if desconocidos:
+            raise CommandError(f"Casos desconocidos: {', '.join(sorted(desconocidos))}")
+        ruta = Path(opts["baseline"])
+        base = None
+        if not opts["guardar"] and ruta.exists():
+            base = benchmarks.cargar(ruta)
+
+        def progreso(nombre, med):
+            if opts["json"]:
+                return
+            if med.error:
+                self.stdout.write(self.style.WARNING(f"{nombre:<28} ERROR {med.error}"))
+                return
+            self.stdout.write(
+                f"{nombre:<28} p50 {med.p50_ms:>9.2f} ms  p95 {med.p95_ms:>9.2f} ms  "
+                f"{med.consultas:>5} consultas  {med.memoria_kib:>9.0f} KiB"
+            )
+
+        try:
+            resultado = benchmarks.correr(
+                opts["casos"] or None,
+                repeticiones=max(1, opts["repeticiones"]),
+                calentamiento=max(0, opts["calentamiento"]),
+                progreso=progreso,
+            )
+        except LookupError as e:
+            raise CommandError(
+                f"La base no tiene datos para medir ({e}): "
+                "correr antes generar_datos_sinteticos."
+            )
+        if opts["json"]:
+            self.stdout.write(json.dumps(resultado, ensure_ascii=False, indent=2))
+
+        if opts["guardar"]:
+            benchmarks.guardar(resultado, ruta)
+            self.stdout.write(self.style.SUCCESS(f"Referencia guardada en {ruta}."))
+            return
+        if base is None:
+            self.stdout.write(f"Sin referencia en {ruta}: usar --guardar para crearla.")
+            return
+        regresiones = benchmarks.comparar(
+            resultado, base, opts["tolerancia"], opts["margen_ms"]
+        )
+        if regresiones:
+            raise CommandError(
+                "Regresiones respecto de la referencia:\n  " + "\n  ".join(regresiones)
+            )
+        self.stdout.write(self.style.SUCCESS("Sin regresiones."))
@@ -0,0 +1,58 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.cursada import cerrar_ciclo
+from academia_core.models import Profesorado
+
+
+class Command(BaseCommand):
+    help = (
+        "Cierre de ciclo: las cursadas que siguen EN_CURSO en el año pasan a "
+        "FINALIZADA (con condición REG cargada) o BAJA (sin condición)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("anio", type=int, help="Año académico a cerrar")
+        parser.add_argument(
+            "--profesorado", type=int, help="ID de profesorado (por defecto, todos)"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo muestra cuántas cursadas cambiarían, sin escribir",
+        )
+        parser.add_argument(
+            "--forzar",
+            action="store_true",
+            help="Permite cerrar el año en curso (o uno futuro)",
+        )
+        parser.add_argument(
+            "--lote", type=int, default=2000, help="IDs por UPDATE (default 2000)"
+        )
+
+    def handle(self, *args, **opts):
+        anio, prof_id = opts["anio"], opts["profesorado"]
+        if anio >= date.today().year and not opts["forzar"]:
+            raise CommandError(
+                f"{anio} no terminó todavía; usá --forzar para cerrarlo igual."
+            )
+        if prof_id and not Profesorado.objects.filter(pk=prof_id).exists():
+            raise CommandError(f"Profesorado no encontrado: {prof_id}")
+
+        resumen = cerrar_ciclo(
+            anio,
+            profesorado_id=prof_id,
+            ejecutar=not opts["dry_run"],
+            lote=max(1, opts["lote"]),
+        )
+
+        for nombre, (fin, baja) in resumen.por_profesorado.items():
+            self.stdout.write(f"  {nombre}: {fin} finalizadas, {baja} bajas")
+        total = f"{resumen.finalizadas} finalizadas, {resumen.bajas} bajas"
+        if opts["dry_run"]:
+            self.stdout.write(f"[dry-run] Ciclo {anio}: cambiarían {total}.")
+        elif resumen.ejecutado:
+            self.stdout.write(self.style.SUCCESS(f"Ciclo {anio} cerrado: {total}."))
+        else:
+            self.stdout.write(f"Ciclo {anio}: no quedan cursadas EN_CURSO.")
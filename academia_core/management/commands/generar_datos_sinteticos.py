@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.sinteticos import generar
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un instituto sintético (profesorados, planes con correlativas, "
+        "estudiantes, cursadas, finales y movimientos) para medir a escala. "
+        "Usar en una base aparte, nunca en producción."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala",
+            type=int,
+            default=1,
+            help="Cantidad de profesorados (cada uno con --estudiantes estudiantes)",
+        )
+        parser.add_argument(
+            "--estudiantes", type=int, default=1000, help="Por profesorado"
+        )
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument(
+            "--anio", type=int, help="Ciclo en curso (por defecto, el actual)"
+        )
+        parser.add_argument(
+            "--lote", type=int, default=5000, help="Filas por bulk_create"
+        )
+
+    def handle(self, *args, **opts):
+        if opts["escala"] < 1 or opts["estudiantes"] < 0:
+            raise CommandError("--escala debe ser >= 1 y --estudiantes >= 0.")
+        t0 = time.perf_counter()
+        resumen = generar(
+            escala=opts["escala"],
+            semilla=opts["semilla"],
+            estudiantes=opts["estudiantes"],
+            anio=opts["anio"],
+            lote=max(1, opts["lote"]),
+        )
+        segundos = time.perf_counter() - t0
+        for modelo, n in resumen.filas.items():
+            self.stdout.write(f"  {modelo:<24} {n:>10}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{resumen.total} filas en {segundos:.1f}s "
+                f"({resumen.total / max(segundos, 1e-9):.0f} filas/s)."
+            )
+        )
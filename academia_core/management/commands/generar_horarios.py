@@ -0,0 +1,102 @@
+from datetime import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.horarios import DIAS, FIN, INICIO, MINUTOS_HORA, Grilla
+from academia_core.horarios import generar, guardar_borrador
+from academia_core.models import EspacioCurricular, Horario, PlanEstudios
+
+
+def _hora(valor: str) -> time:
+    try:
+        return time.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Hora inválida (use HH:MM): {valor}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un borrador de horarios para un plan y cuatrimestre sin "
+        "choques de docentes ni de espacios del mismo año."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--plan", type=int, required=True, help="ID del plan")
+        parser.add_argument("--cuatrimestre", choices=["1", "2"], required=True)
+        parser.add_argument(
+            "--dias",
+            default=",".join(map(str, DIAS)),
+            help="Días con clases, 1=lunes ... 6=sábado (default 1-5)",
+        )
+        parser.add_argument("--inicio", default=INICIO.strftime("%H:%M"))
+        parser.add_argument("--fin", default=FIN.strftime("%H:%M"))
+        parser.add_argument(
+            "--minutos", type=int, default=MINUTOS_HORA, help="Minutos por hora"
+        )
+        parser.add_argument(
+            "--segundos", type=float, default=5.0, help="Tiempo máximo del solver"
+        )
+        parser.add_argument("--semilla", type=int, help="Para repetir un resultado")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Muestra la propuesta sin guardarla"
+        )
+
+    def handle(self, *args, **opts):
+        if not PlanEstudios.objects.filter(pk=opts["plan"]).exists():
+            raise CommandError(f"Plan no encontrado: {opts['plan']}")
+        try:
+            dias = tuple(int(d) for d in opts["dias"].split(",") if d.strip())
+        except ValueError:
+            raise CommandError("--dias: números separados por coma (1=lunes)")
+        grilla = Grilla(
+            dias=dias,
+            inicio=_hora(opts["inicio"]),
+            fin=_hora(opts["fin"]),
+            minutos=opts["minutos"],
+        )
+        if not grilla.modulos or not dias:
+            raise CommandError("La grilla no tiene módulos disponibles.")
+
+        resultado = generar(
+            opts["plan"],
+            opts["cuatrimestre"],
+            grilla=grilla,
+            segundos=opts["segundos"],
+            semilla=opts["semilla"],
+        )
+        nombres = dict(
+            EspacioCurricular.objects.filter(
+                pk__in={s.espacio_id for s in resultado.sesiones}
+            ).values_list("pk", "nombre")
+        )
+        dias_label = dict(Horario.DIAS)
+        for b in sorted(
+            resultado.bloques(), key=lambda b: (b["dia_semana"], b["hora_inicio"])
+        ):
+            self.stdout.write(
+                f"{dias_label.get(b['dia_semana'], b['dia_semana']):<10} "
+                f"{b['hora_inicio']:%H:%M}-{b['hora_fin']:%H:%M}  "
+                f"{nombres.get(b['espacio_id'], b['espacio_id'])}"
+            )
+        for esp_id in resultado.sin_docente:
+            self.stdout.write(
+                self.style.WARNING(f"Sin docente asignado: {nombres.get(esp_id)}")
+            )
+        resumen = (
+            f"{len(resultado.sesiones)} sesiones, {resultado.conflictos} con choques, "
+            f"{resultado.iteraciones} iteraciones, {resultado.segundos:.2f}s."
+        )
+        if resultado.conflictos:
+            self.stdout.write(self.style.WARNING(resumen))
+        else:
+            self.stdout.write(resumen)
+
+        if opts["dry_run"]:
+            return
+        n = guardar_borrador(resultado)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{n} horarios guardados como borrador: revisarlos y publicarlos "
+                "desde el admin (Horarios → Publicar borradores)."
+            )
+        )
@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from academia_core.fotos import fotos_en_disco, generar_variantes_en_disco
+from academia_core.models import Estudiante
+
+
+class Command(BaseCommand):
+    help = "Genera (backfill) las variantes de las fotos de estudiantes en un pool de procesos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--procesos",
+            type=int,
+            default=os.cpu_count() or 2,
+            help="Cantidad de procesos del pool (default: CPUs disponibles)",
+        )
+        parser.add_argument(
+            "--forzar",
+            action="store_true",
+            help="Regenera aunque la variante esté al día",
+        )
+
+    def handle(self, *args, **opts):
+        nombres = (
+            Estudiante.objects.exclude(foto="")
+            .exclude(foto__isnull=True)
+            .values_list("foto", flat=True)
+        )
+        fotos = fotos_en_disco(nombres.iterator())
+        if not fotos:
+            self.stdout.write("No hay fotos para procesar.")
+            return
+
+        media_root = str(settings.MEDIA_ROOT)
+        escritos = errores = 0
+        # Los workers solo reciben rutas: no tocan la base ni necesitan django.setup()
+        with ProcessPoolExecutor(max_workers=max(1, opts["procesos"])) as pool:
+            futuros = {
+                pool.submit(
+                    generar_variantes_en_disco, ruta, media_root, nombre, opts["forzar"]
+                ): nombre
+                for ruta, nombre in fotos
+            }
+            for fut in as_completed(futuros):
+                try:
+                    escritos += fut.result()
+                except Exception as exc:
+                    errores += 1
+                    self.stderr.write(f"{futuros[fut]}: {exc}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fotos: {len(fotos)} · variantes escritas: {escritos} · errores: {errores}"
+            )
+        )
@@ -0,0 +1,100 @@
+import json
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.mesas import Turno, planificar
+from academia_core.models import EspacioCurricular
+
+
+def _fecha(valor: str) -> date:
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida (use AAAA-MM-DD): {valor}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Propone fechas de mesas de final para un turno sin que un estudiante "
+        "tenga dos finales el mismo día (no guarda nada)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", required=True, help="Inicio del turno")
+        parser.add_argument("--hasta", required=True, help="Fin del turno")
+        parser.add_argument(
+            "--dias",
+            default="1,2,3,4,5",
+            help="Días de la semana con mesas, 1=lunes ... 6=sábado (default 1-5)",
+        )
+        parser.add_argument(
+            "--excluir", nargs="*", default=[], help="Fechas sin mesas (feriados)"
+        )
+        parser.add_argument("--por-dia", type=int, help="Máximo de mesas por fecha")
+        parser.add_argument("--profesorado", type=int, help="ID de profesorado")
+        parser.add_argument("--plan", type=int, help="ID de plan")
+        parser.add_argument("--json", action="store_true", help="Salida JSON")
+
+    def handle(self, *args, **opts):
+        try:
+            dias = tuple(int(d) - 1 for d in opts["dias"].split(",") if d.strip())
+        except ValueError:
+            raise CommandError("--dias: números separados por coma (1=lunes)")
+        turno = Turno(
+            desde=_fecha(opts["desde"]),
+            hasta=_fecha(opts["hasta"]),
+            dias=dias,
+            excluir={_fecha(f) for f in opts["excluir"]},
+        )
+        if not turno.fechas():
+            raise CommandError("El turno no tiene fechas disponibles.")
+
+        t0 = time.perf_counter()
+        propuesta = planificar(
+            turno,
+            profesorado_id=opts["profesorado"],
+            plan_id=opts["plan"],
+            por_dia=opts["por_dia"],
+        )
+        ms = (time.perf_counter() - t0) * 1000
+        nombres = {
+            e.pk: str(e)
+            for e in EspacioCurricular.objects.filter(
+                pk__in=list(propuesta.estudiantes)
+            )
+        }
+
+        def item(esp_id):
+            return {
+                "espacio_id": esp_id,
+                "espacio": nombres.get(esp_id, str(esp_id)),
+                "estudiantes": len(propuesta.estudiantes[esp_id]),
+            }
+
+        calendario = [
+            (fecha, [item(e) for e in ids]) for fecha, ids in propuesta.calendario()
+        ]
+        if opts["json"]:
+            datos = {
+                "calendario": [
+                    {"fecha": f.isoformat(), "mesas": mesas} for f, mesas in calendario
+                ],
+                "sin_fecha": [item(e) for e in propuesta.sin_fecha],
+            }
+            self.stdout.write(json.dumps(datos, ensure_ascii=False, indent=2))
+            return
+
+        for fecha, mesas in calendario:
+            self.stdout.write(f"{fecha:%a %d/%m/%Y}")
+            for m in mesas:
+                self.stdout.write(f"  {m['espacio']} ({m['estudiantes']} estudiantes)")
+        for esp_id in propuesta.sin_fecha:
+            self.stdout.write(
+                self.style.WARNING(f"Sin fecha posible: {item(esp_id)['espacio']}")
+            )
+        self.stdout.write(
+            f"{len(propuesta.estudiantes)} mesas, {propuesta.aristas} pares con "
+            f"estudiantes en común, {len(calendario)} fechas usadas ({ms:.0f} ms)."
+        )
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from academia_core.idempotencia import VIGENCIA, purgar
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra las claves de idempotencia (ClaveIdempotencia) más viejas que "
+        "su vigencia. Correrlo periódicamente (cron / timer), p. ej. cada hora."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--horas",
+            type=int,
+            default=int(VIGENCIA.total_seconds() // 3600),
+            help="Antigüedad mínima de las claves a borrar (default: la vigencia)",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["horas"] < 1:
+            raise CommandError("--horas debe ser >= 1.")
+        limite = timezone.now() - timedelta(hours=opts["horas"])
+        borradas = purgar(antes_de=limite)
+        self.stdout.write(
+            self.style.SUCCESS(f"{borradas} claves de idempotencia borradas.")
+        )
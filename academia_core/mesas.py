@@ -0,0 +1,203 @@
+# academia_core/mesas.py
+"""
+Planificación de mesas de final: propone una fecha por espacio dentro de un
+turno sin que un estudiante tenga dos finales el mismo día.
+
+1. `pendientes`: qué estudiantes tienen cada espacio para rendir, con una
+   sola consulta de movimientos (REGULAR vigente, dos años como en
+   models._tiene_regularidad_vigente, y no aprobada; misma regla que
+   cursada._armar_estado).
+2. `grafo`: un espacio por nodo y una arista entre dos espacios que
+   comparten al menos un estudiante.
+3. `asignar`: coloreo DSatur, donde los colores son las fechas del turno.
+   Va primero el espacio con más fechas ya prohibidas por sus vecinos y, a
+   igual saturación, el de más vecinos. Entre las fechas posibles elige la
+   más alejada de las de sus vecinos (para dar días de estudio entre un
+   final y otro, hasta SEPARACION_MAXIMA días), después la menos cargada,
+   después de nuevo la más alejada y por último la más temprana.
+   Con `por_dia` hay un máximo de mesas por fecha. Lo que no entra queda en
+   `sin_fecha`.
+
+No escribe nada: devuelve una Propuesta (ver el comando planificar_mesas).
+Para un instituto entero (cientos de espacios) tarda milisegundos.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+from .cursada import _armar_estado
+from .models import Movimiento
+
+VIGENCIA_REGULARIDAD = timedelta(days=730)
+DIAS_HABILES = (0, 1, 2, 3, 4)  # lunes a viernes (date.weekday)
+SEPARACION_MAXIMA = 3  # más días entre finales no suma
+
+
+@dataclass
+class Turno:
+    desde: date
+    hasta: date
+    dias: Tuple[int, ...] = DIAS_HABILES
+    excluir: Set[date] = field(default_factory=set)  # feriados, etc.
+
+    def fechas(self) -> List[date]:
+        fechas, d = [], self.desde
+        while d <= self.hasta:
+            if d.weekday() in self.dias and d not in self.excluir:
+                fechas.append(d)
+            d += timedelta(days=1)
+        return fechas
+
+
+@dataclass
+class Propuesta:
+    asignacion: Dict[int, date]  # espacio_id -> fecha
+    sin_fecha: List[int]
+    estudiantes: Dict[int, Set[int]]  # espacio_id -> estudiantes que rinden
+    aristas: int = 0
+
+    def calendario(self) -> List[Tuple[date, List[int]]]:
+        por_fecha: Dict[date, List[int]] = defaultdict(list)
+        for esp_id, fecha in self.asignacion.items():
+            por_fecha[fecha].append(esp_id)
+        return sorted((f, sorted(ids)) for f, ids in por_fecha.items())
+
+
+def pendientes(
+    turno_desde: date,
+    profesorado_id: Optional[int] = None,
+    plan_id: Optional[int] = None,
+) -> Dict[int, Set[int]]:
+    """{espacio_id: {estudiante_id}} con regularidad vigente al inicio del turno."""
+    limite = turno_desde - VIGENCIA_REGULARIDAD
+    filtro = {}
+    if plan_id:
+        filtro["espacio__plan_id"] = plan_id
+    elif profesorado_id:
+        filtro["espacio__plan__profesorado_id"] = profesorado_id
+    con_regular = Movimiento.objects.filter(
+        tipo="REG", condicion_id="REGULAR", fecha__gte=limite, **filtro
+    )
+    # todos los movimientos de esas inscripciones (para saber qué aprobaron)
+    filas = (
+        Movimiento.objects.filter(
+            inscripcion_id__in=con_regular.values("inscripcion_id")
+        )
+        .order_by()
+        .values_list(
+            "inscripcion_id",
+            "inscripcion__estudiante_id",
+            "espacio_id",
+            "tipo",
+            "condicion_id",
+            "nota_num",
+            "nota_texto",
+            "fecha",
+            "espacio__plan_id",
+            "espacio__plan__profesorado_id",
+        )
+    )
+    movs: Dict[Tuple[int, int], list] = defaultdict(list)
+    vigentes: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+    for fila in filas:
+        insc_id, est_id, esp_id, tipo, cond, nota_num, nota_texto, fecha = fila[:8]
+        movs[insc_id, est_id].append((esp_id, tipo, cond, nota_num, nota_texto))
+        if (
+            tipo == "REG"
+            and cond == "REGULAR"
+            and fecha
+            and fecha >= limite
+            and (not plan_id or fila[8] == plan_id)
+            and (not profesorado_id or fila[9] == profesorado_id)
+        ):
+            vigentes[insc_id, est_id].add(esp_id)
+
+    resultado: Dict[int, Set[int]] = defaultdict(set)
+    for clave, regulares in vigentes.items():
+        aprobadas = _armar_estado(clave[0], movs[clave], ()).aprobadas
+        for esp_id in regulares - aprobadas:
+            resultado[esp_id].add(clave[1])
+    return dict(resultado)
+
+
+def grafo(estudiantes: Dict[int, Set[int]]) -> Dict[int, Set[int]]:
+    """Vecinos de cada espacio: los que comparten algún estudiante."""
+    por_estudiante: Dict[int, List[int]] = defaultdict(list)
+    for esp_id, ests in estudiantes.items():
+        for est_id in ests:
+            por_estudiante[est_id].append(esp_id)
+    vecinos: Dict[int, Set[int]] = {esp_id: set() for esp_id in estudiantes}
+    for esps in por_estudiante.values():
+        for a, b in combinations(esps, 2):
+            vecinos[a].add(b)
+            vecinos[b].add(a)
+    return vecinos
+
+
+def _elegir(posibles, ocupadas, carga, fechas) -> Optional[int]:
+    def puntaje(i):
+        separacion = min(
+            (abs((fechas[i] - fechas[j]).days) for j in ocupadas),
+            default=SEPARACION_MAXIMA,
+        )
+        return (-min(separacion, SEPARACION_MAXIMA), carga[i], -separacion, i)
+
+    return min(posibles, key=puntaje, default=None)
+
+
+def asignar(
+    vecinos: Dict[int, Set[int]], fechas: List[date], por_dia: Optional[int] = None
+) -> Tuple[Dict[int, int], List[int]]:
+    """DSatur: ({espacio_id: índice de fecha}, espacios sin fecha posible)."""
+    color: Dict[int, int] = {}
+    sin_fecha: List[int] = []
+    prohibidas: Dict[int, Set[int]] = {v: set() for v in vecinos}
+    carga = [0] * len(fechas)
+    # heap de (-saturación, -grado, id); las entradas viejas se descartan
+    heap = [(0, -len(vs), v) for v, vs in vecinos.items()]
+    heapq.heapify(heap)
+    pendiente = set(vecinos)
+    while heap:
+        sat, _, v = heapq.heappop(heap)
+        if v not in pendiente or -sat != len(prohibidas[v]):
+            continue
+        pendiente.discard(v)
+        posibles = [
+            i
+            for i in range(len(fechas))
+            if i not in prohibidas[v] and (por_dia is None or carga[i] < por_dia)
+        ]
+        elegida = _elegir(posibles, prohibidas[v], carga, fechas)
+        if elegida is None:
+            sin_fecha.append(v)
+            continue
+        color[v] = elegida
+        carga[elegida] += 1
+        for w in vecinos[v]:
+            if w in pendiente and elegida not in prohibidas[w]:
+                prohibidas[w].add(elegida)
+                heapq.heappush(heap, (-len(prohibidas[w]), -len(vecinos[w]), w))
+    return color, sorted(sin_fecha)
+
+
+def planificar(
+    turno: Turno,
+    profesorado_id: Optional[int] = None,
+    plan_id: Optional[int] = None,
+    por_dia: Optional[int] = None,
+) -> Propuesta:
+    estudiantes = pendientes(turno.desde, profesorado_id, plan_id)
+    vecinos = grafo(estudiantes)
+    fechas = turno.fechas()
+    color, sin_fecha = asignar(vecinos, fechas, por_dia)
+    return Propuesta(
+        asignacion={esp_id: fechas[i] for esp_id, i in color.items()},
+        sin_fecha=sin_fecha,
+        estudiantes=estudiantes,
+        aristas=sum(len(vs) for vs in vecinos.values()) // 2,
+    )
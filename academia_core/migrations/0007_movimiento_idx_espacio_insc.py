@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0006_requisitosingreso"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profesorado",
+            name="plan",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="academia_core.planestudios",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movimiento",
+            index=models.Index(
+                fields=["espacio", "inscripcion", "fecha"],
+                name="idx_mov_esp_insc_fecha",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def backfill_slugs(apps, schema_editor):
+    """Completa Profesorado.slug y PlanEstudios.resolucion_slug vacíos."""
+    Profesorado = apps.get_model("academia_core", "Profesorado")
+    PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
+
+    for p in Profesorado.objects.filter(slug__isnull=True) | Profesorado.objects.filter(
+        slug=""
+    ):
+        p.slug = slugify(p.nombre)
+        p.save(update_fields=["slug"])
+
+    for plan in PlanEstudios.objects.filter(
+        resolucion_slug__isnull=True
+    ) | PlanEstudios.objects.filter(resolucion_slug=""):
+        plan.resolucion_slug = slugify((plan.resolucion or "").replace("/", "-"))
+        plan.save(update_fields=["resolucion_slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0007_movimiento_idx_espacio_insc"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0008_backfill_slugs"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClaveIdempotencia",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("clave", models.CharField(max_length=100)),
+                ("huella", models.CharField(max_length=64)),
+                ("estado_http", models.PositiveSmallIntegerField()),
+                ("respuesta", models.JSONField()),
+                ("creado", models.DateTimeField(auto_now_add=True, db_index=True)),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("usuario", "clave"), name="uniq_idem_usuario_clave"
+                    )
+                ],
+            },
+        ),
+    ]
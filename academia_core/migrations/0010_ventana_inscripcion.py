@@ -0,0 +1,75 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0009_clave_idempotencia"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VentanaInscripcion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[("CURSADA", "Cursada"), ("FINAL", "Mesa de final")],
+                        max_length=10,
+                    ),
+                ),
+                ("inicio", models.DateTimeField()),
+                ("fin", models.DateTimeField()),
+                (
+                    "descripcion",
+                    models.CharField(blank=True, default="", max_length=120),
+                ),
+                (
+                    "plan",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="academia_core.planestudios",
+                    ),
+                ),
+                (
+                    "profesorado",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="academia_core.profesorado",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ventana de inscripción",
+                "verbose_name_plural": "Ventanas de inscripción",
+                "ordering": ["-inicio"],
+                "indexes": [
+                    models.Index(
+                        fields=["tipo", "fin"], name="academia_co_tipo_e2b791_idx"
+                    )
+                ],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(("fin__gt", models.F("inicio"))),
+                        name="ventana_fin_posterior",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0010_ventana_inscripcion"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CupoEspacio",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("anio_academico", models.PositiveIntegerField()),
+                ("cupo", models.PositiveIntegerField()),
+                ("ocupados", models.PositiveIntegerField(default=0, editable=False)),
+                (
+                    "espacio",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cupos",
+                        to="academia_core.espaciocurricular",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cupo de espacio",
+                "verbose_name_plural": "Cupos de espacios",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("espacio", "anio_academico"), name="uniq_cupo_esp_ciclo"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ListaEspera",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("anio_academico", models.PositiveIntegerField()),
+                ("creado", models.DateTimeField(auto_now_add=True)),
+                (
+                    "espacio",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="academia_core.espaciocurricular",
+                    ),
+                ),
+                (
+                    "inscripcion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="esperas",
+                        to="academia_core.estudianteprofesorado",
+                    ),
+                ),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Lista de espera",
+                "verbose_name_plural": "Listas de espera",
+                "ordering": ["espacio", "anio_academico", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["espacio", "anio_academico", "id"],
+                        name="academia_co_espacio_0b926b_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("inscripcion", "espacio", "anio_academico"),
+                        name="uniq_espera_est_esp_ciclo",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0011_cupo_lista_espera"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="inscripcionespacio",
+            name="estado",
+            field=models.CharField(
+                choices=[
+                    ("EN_CURSO", "En curso"),
+                    ("BAJA", "Baja"),
+                    ("FINALIZADA", "Finalizada"),
+                ],
+                default="EN_CURSO",
+                max_length=10,
+            ),
+        ),
+    ]
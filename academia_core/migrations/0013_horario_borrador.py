@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academia_core", "0012_estado_finalizada"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="horario",
+            name="borrador",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
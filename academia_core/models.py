@@ -10,11 +10,13 @@ from django.core.exceptions import ValidationError, FieldError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.db.models import F, Q
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
 
+from .fotos import variante_url, generar_variantes, borrar_variantes
+
 
 # --- Choices administrativos ---
 class LegajoEstado(models.TextChoices):
@@ -120,6 +122,27 @@ class Estudiante(models.Model):
         except Exception:
             return ""
 
+    # --- Variantes de la foto (ver academia_core/fotos.py) ---
+    @property
+    def foto_lista_url(self):
+        return variante_url(self.foto, "lista")
+
+    @property
+    def foto_lista_webp_url(self):
+        return variante_url(self.foto, "lista", "webp")
+
+    @property
+    def foto_detalle_url(self):
+        return variante_url(self.foto, "detalle")
+
+    @property
+    def foto_detalle_webp_url(self):
+        return variante_url(self.foto, "detalle", "webp")
+
+    @property
+    def foto_pdf_url(self):
+        return variante_url(self.foto, "pdf")
+
     # --- Accesos convenientes ---
     @property
     def cursadas_qs(self):
@@ -635,6 +658,13 @@ class Movimiento(models.Model):
 
     class Meta:
         ordering = ["-fecha", "-creado"]
+        indexes = [
+            # último movimiento por alumno dentro de un espacio (detalle docente)
+            models.Index(
+                fields=["espacio", "inscripcion", "fecha"],
+                name="idx_mov_esp_insc_fecha",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 name="nota_num_rango_valido",
@@ -781,6 +811,8 @@ class Movimiento(models.Model):
 class EstadoInscripcion(models.TextChoices):
     EN_CURSO = "EN_CURSO", "En curso"
     BAJA = "BAJA", "Baja"
+    # cerrada por el cierre de ciclo con su condición de cursada (REG) cargada
+    FINALIZADA = "FINALIZADA", "Finalizada"
 
 
 class InscripcionEspacio(models.Model):
@@ -898,9 +930,121 @@ class InscripcionEspacioEstadoLog(models.Model):
         ordering = ["-fecha"]
 
 
+class CupoEspacio(models.Model):
+    """
+    Cupo de un espacio en un ciclo lectivo. `ocupados` es un contador que
+    solo se toca desde cursada.py, con la fila bloqueada (select_for_update)
+    mientras se compara con `cupo` y se incrementa o descuenta con F(), nunca
+    contando inscripciones al escribir. Sin fila de cupo el espacio no tiene
+    límite.
+    """
+
+    espacio = models.ForeignKey(
+        EspacioCurricular, on_delete=models.CASCADE, related_name="cupos"
+    )
+    anio_academico = models.PositiveIntegerField()
+    cupo = models.PositiveIntegerField()
+    ocupados = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        verbose_name = "Cupo de espacio"
+        verbose_name_plural = "Cupos de espacios"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["espacio", "anio_academico"], name="uniq_cupo_esp_ciclo"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.espacio} {self.anio_academico}: {self.ocupados}/{self.cupo}"
+
+    def inscriptos_en_curso(self) -> int:
+        return InscripcionEspacio.objects.filter(
+            espacio_id=self.espacio_id,
+            anio_academico=self.anio_academico,
+            estado=EstadoInscripcion.EN_CURSO,
+        ).count()
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            # un cupo nuevo arranca con los ya inscriptos
+            self.ocupados = self.inscriptos_en_curso()
+        super().save(*args, **kwargs)
+
+
+class ListaEspera(models.Model):
+    """
+    Pedidos de inscripción a un espacio sin cupo, en orden de llegada (id).
+    Cuando alguien se da de baja, el primero pasa a InscripcionEspacio y su
+    fila se borra (cursada.dar_de_baja).
+    """
+
+    inscripcion = models.ForeignKey(
+        EstudianteProfesorado, on_delete=models.CASCADE, related_name="esperas"
+    )
+    espacio = models.ForeignKey(EspacioCurricular, on_delete=models.CASCADE)
+    anio_academico = models.PositiveIntegerField()
+    creado = models.DateTimeField(auto_now_add=True)
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    class Meta:
+        ordering = ["espacio", "anio_academico", "id"]
+        verbose_name = "Lista de espera"
+        verbose_name_plural = "Listas de espera"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["inscripcion", "espacio", "anio_academico"],
+                name="uniq_espera_est_esp_ciclo",
+            ),
+        ]
+        indexes = [models.Index(fields=["espacio", "anio_academico", "id"])]
+
+    def __str__(self):
+        return f"{self.inscripcion} · {self.espacio} [{self.anio_academico}]"
+
+
+class ClaveIdempotencia(models.Model):
+    """
+    Respuesta ya dada a un POST con `Idempotency-Key` (por usuario): un
+    reintento con la misma clave recibe la misma respuesta sin volver a
+    ejecutar la operación. `huella` es un hash del cuerpo, para rechazar la
+    misma clave con otros datos. Ver idempotencia.py.
+    """
+
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    clave = models.CharField(max_length=100)
+    huella = models.CharField(max_length=64)
+    estado_http = models.PositiveSmallIntegerField()
+    respuesta = models.JSONField()
+    creado = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["usuario", "clave"], name="uniq_idem_usuario_clave"
+            ),
+        ]
+
+
 # ===================== Signals =====================
 
 
+@receiver(post_save, sender=Estudiante)
+def _generar_variantes_foto(sender, instance, **kwargs):
+    # Solo escribe si falta alguna variante o el original es más nuevo
+    try:
+        generar_variantes(instance.foto)
+    except Exception:
+        pass
+
+
+@receiver(post_delete, sender=Estudiante)
+def _borrar_variantes_foto(sender, instance, **kwargs):
+    borrar_variantes(getattr(instance.foto, "name", None))
+
+
 @receiver(post_save, sender=Movimiento)
 def _recalc_promedio_on_mov(sender, instance, **kwargs):
     try:
@@ -1098,11 +1242,63 @@ class Horario(models.Model):
         on_delete=models.SET_NULL,
         related_name="horarios",
     )
+    # propuesto por el generador (horarios.py), todavía sin publicar
+    borrador = models.BooleanField(default=False, db_index=True)
 
     def __str__(self):
         return f"{self.espacio.nombre} - {self.get_dia_semana_display()} ({self.hora_inicio} - {self.hora_fin})"
 
 
+class VentanaInscripcion(models.Model):
+    """
+    Período en que se aceptan inscripciones (a cursada o a mesas de final).
+    Sin profesorado ni plan vale para toda la institución; con plan, solo
+    para ese plan. Qué ventanas están abiertas se consulta en ventanas.py
+    (cacheado en memoria), no con consultas sobre este modelo.
+    """
+
+    class Tipo(models.TextChoices):
+        CURSADA = "CURSADA", "Cursada"
+        FINAL = "FINAL", "Mesa de final"
+
+    tipo = models.CharField(max_length=10, choices=Tipo.choices)
+    profesorado = models.ForeignKey(
+        Profesorado, null=True, blank=True, on_delete=models.CASCADE
+    )
+    plan = models.ForeignKey(
+        PlanEstudios, null=True, blank=True, on_delete=models.CASCADE
+    )
+    inicio = models.DateTimeField()
+    fin = models.DateTimeField()
+    descripcion = models.CharField(max_length=120, blank=True, default="")
+
+    class Meta:
+        ordering = ["-inicio"]
+        verbose_name = "Ventana de inscripción"
+        verbose_name_plural = "Ventanas de inscripción"
+        indexes = [models.Index(fields=["tipo", "fin"])]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(fin__gt=F("inicio")), name="ventana_fin_posterior"
+            ),
+        ]
+
+    def __str__(self):
+        alcance = self.plan or self.profesorado or "Todos"
+        return f"{self.get_tipo_display()} · {alcance} ({self.inicio:%d/%m} - {self.fin:%d/%m})"
+
+    def clean(self):
+        if self.inicio and self.fin and self.fin <= self.inicio:
+            raise ValidationError("El fin debe ser posterior al inicio.")
+        if self.plan_id:
+            # el plan define el profesorado
+            if self.profesorado_id and self.plan.profesorado_id != self.profesorado_id:
+                raise ValidationError(
+                    "El plan seleccionado no pertenece al profesorado."
+                )
+            self.profesorado_id = self.plan.profesorado_id
+
+
 class CorePerms(models.Model):
     """
     Modelo NO gestionado, solo para colgar permisos custom.
@@ -0,0 +1,181 @@
+# academia_core/paginacion.py
+"""
+Paginación por cursor (keyset) y campos a demanda para las APIs de listado.
+
+En lugar de OFFSET, cada página continúa "después de" la última fila de la
+anterior según un orden total (ej. apellido, nombre, id). El cursor es esa
+tupla de valores firmada con django.core.signing, así que el cliente no puede
+armarlo a mano y cada página cuesta lo mismo sin importar cuán lejos esté.
+
+Uso típico en una vista:
+
+    campos = parsear_campos(request, CAMPOS, DEFAULT)
+    items, siguiente = paginar_keyset(qs, ("apellido", "nombre", "id"),
+                                      request, CAMPOS, campos)
+    return JsonResponse({"items": items, "next_cursor": siguiente})
+
+Los errores de parámetros (cursor adulterado, campo desconocido, limit
+inválido) se informan con ParametroInvalido, que la vista traduce a 400.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+
+PAGE_SIZE = 50
+PAGE_SIZE_MAX = 500
+_SALT = "academia_core.paginacion"
+_ALIAS = "_pag_"
+
+# nombre de salida -> campo ORM ("espacio__nombre") o expresión (Concat(...))
+Campos = Dict[str, object]
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def parsear_campos(request, campos: Campos, default: Sequence[str]) -> List[str]:
+    """`?fields=id,dni` -> ["id", "dni"] (validados contra `campos`)."""
+    raw = (request.GET.get("fields") or "").strip()
+    if not raw:
+        return list(default)
+    pedidos = [c.strip() for c in raw.split(",") if c.strip()]
+    desconocidos = [c for c in pedidos if c not in campos]
+    if desconocidos:
+        raise ParametroInvalido(
+            f"Campos desconocidos: {', '.join(desconocidos)}. "
+            f"Disponibles: {', '.join(campos)}"
+        )
+    return pedidos
+
+
+def parsear_limit(request, default: int = PAGE_SIZE) -> int:
+    raw = request.GET.get("limit")
+    if raw in (None, ""):
+        return default
+    try:
+        n = int(raw)
+    except (TypeError, ValueError):
+        raise ParametroInvalido("limit debe ser un número")
+    if n < 1:
+        raise ParametroInvalido("limit debe ser mayor a 0")
+    return min(n, PAGE_SIZE_MAX)
+
+
+def _a_json(v):
+    if isinstance(v, (datetime.date, datetime.datetime)):
+        return v.isoformat()
+    return v
+
+
+def codificar_cursor(valores: Iterable) -> str:
+    return signing.dumps([_a_json(v) for v in valores], salt=_SALT, compress=True)
+
+
+def decodificar_cursor(cursor: str, n: int) -> list:
+    try:
+        valores = signing.loads(cursor, salt=_SALT)
+    except signing.BadSignature:
+        raise ParametroInvalido("cursor inválido")
+    if not isinstance(valores, list) or len(valores) != n:
+        raise ParametroInvalido("cursor inválido")
+    return valores
+
+
+def _orden(campo: str) -> Tuple[str, bool]:
+    return (campo[1:], True) if campo.startswith("-") else (campo, False)
+
+
+def _es_nullable(model, nombre: str) -> bool:
+    if "__" in nombre:
+        return True  # a través de relaciones puede venir NULL
+    try:
+        return model._meta.get_field(nombre).null
+    except FieldDoesNotExist:
+        return True
+
+
+def filtro_despues_de(model, orden: Sequence[str], valores: Sequence) -> Q:
+    """
+    Q de las filas que van después de `valores` en `orden` (NULLs al final):
+    (a > va) | (a = va & b > vb) | (a = va & b = vb & c > vc) ...
+    """
+    resultado = Q(pk__in=[])
+    iguales = Q()
+    for campo, valor in zip(orden, valores):
+        nombre, desc = _orden(campo)
+        if valor is None:
+            # después de un NULL solo hay NULLs: no aporta rama "mayor"
+            iguales &= Q(**{f"{nombre}__isnull": True})
+            continue
+        mayor = Q(**{f"{nombre}__{'lt' if desc else 'gt'}": valor})
+        if _es_nullable(model, nombre):
+            mayor |= Q(**{f"{nombre}__isnull": True})
+        resultado |= iguales & mayor
+        iguales &= Q(**{nombre: valor})
+    return resultado
+
+
+def paginar_keyset(
+    qs,
+    orden: Sequence[str],
+    request,
+    campos: Campos,
+    pedidos: Sequence[str],
+    transformar: Optional[Dict[str, Callable]] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Devuelve (items, next_cursor). Una sola consulta con LIMIT n+1.
+    Las columnas de `orden` se traen siempre (hacen falta para el cursor) y se
+    quitan de la salida si no fueron pedidas.
+    """
+    limit = parsear_limit(request)
+    claves_orden = [_orden(c)[0] for c in orden]
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        valores = decodificar_cursor(cursor, len(orden))
+        qs = qs.filter(filtro_despues_de(qs.model, orden, valores))
+
+    planos: List[str] = []
+    expresiones: Dict[str, object] = {}
+    for nombre in dict.fromkeys([*pedidos, *claves_orden]):
+        fuente: Union[str, object] = campos.get(nombre, nombre)
+        if fuente == nombre:
+            planos.append(nombre)
+        else:
+            # alias propio: values(espacio=...) chocaría con el campo del modelo
+            expresiones[_ALIAS + nombre] = (
+                F(fuente) if isinstance(fuente, str) else fuente
+            )
+
+    ordering = []
+    for c in orden:
+        nombre, desc = _orden(c)
+        # nulls_last solo donde hace falta: en MySQL agrega un IS NULL al ORDER BY
+        extra = {"nulls_last": True} if _es_nullable(qs.model, nombre) else {}
+        ordering.append(F(nombre).desc(**extra) if desc else F(nombre).asc(**extra))
+    filas = list(qs.order_by(*ordering).values(*planos, **expresiones)[: limit + 1])
+
+    siguiente = None
+    if len(filas) > limit:
+        filas = filas[:limit]
+        ultima = filas[-1]
+        siguiente = codificar_cursor(ultima[c] for c in claves_orden)
+
+    transformar = transformar or {}
+    items = []
+    for fila in filas:
+        item = {}
+        for nombre in pedidos:
+            v = fila[nombre] if nombre in fila else fila[_ALIAS + nombre]
+            if nombre in transformar:
+                v = transformar[nombre](v)
+            item[nombre] = v
+        items.append(item)
+    return items, siguiente
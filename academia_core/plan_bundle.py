@@ -0,0 +1,141 @@
+# academia_core/plan_bundle.py
+"""
+"Bundle" de un plan de estudios para la pantalla de inscripción a materias:
+espacios + correlatividades (para cursar) + horarios en una sola respuesta.
+
+- Se arma con tres consultas (espacios, correlatividades, horarios).
+- Cada plan tiene una versión en el cache de Django; los cambios en
+  PlanEstudios / EspacioCurricular / Correlatividad / Horario la renuevan
+  (ver signals.py). La versión es la base del ETag y de la clave del bundle
+  cacheado, así que nunca se sirve uno viejo.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from django.core.cache import cache
+
+from .models import Correlatividad, EspacioCurricular, Horario, PlanEstudios
+
+_VERSION_KEY = "plan_bundle:v:{}"
+_BUNDLE_KEY = "plan_bundle:{}:{}"
+_TTL = 60 * 60 * 24
+
+_REQUISITO_A_CLAVE = {"REGULARIZADA": "regular", "APROBADA": "aprobada"}
+
+
+# Arranca en 1 (no al azar): con LocMem, los workers que no vieron cambios
+# dan el mismo ETag y el navegador no vuelve a bajar su copia local.
+def version_plan(plan_id: int) -> str:
+    key = _VERSION_KEY.format(plan_id)
+    v = cache.get(key)
+    if v is None:
+        cache.add(key, 1, None)
+        v = cache.get(key, 1)
+    return str(v)
+
+
+def invalidar_plan(*plan_ids: int) -> None:
+    for pid in plan_ids:
+        if pid:
+            key = _VERSION_KEY.format(pid)
+            cache.add(key, 1, None)
+            try:
+                cache.incr(key)
+            except ValueError:  # se vació entre add e incr
+                cache.set(key, 2, None)
+
+
+def etag_plan(plan_id: int, version: Optional[str] = None) -> str:
+    return f'"plan-{plan_id}-{version or version_plan(plan_id)}"'
+
+
+def _hora(t) -> str:
+    return t.strftime("%H:%M") if t else ""
+
+
+def armar_bundle(plan_id: int) -> Optional[dict]:
+    """
+    Construye el bundle del plan (3 consultas). None si el plan no existe.
+    """
+    espacios = list(
+        EspacioCurricular.objects.filter(plan_id=plan_id)
+        .order_by("anio", "cuatrimestre", "nombre")
+        .values("id", "nombre", "anio", "cuatrimestre", "horas", "formato")
+    )
+    if not espacios and not PlanEstudios.objects.filter(pk=plan_id).exists():
+        return None
+
+    correlatividades = {
+        str(e["id"]): {"regular": [], "aprobada": [], "hasta_anio": []}
+        for e in espacios
+    }
+    corr_qs = (
+        Correlatividad.objects.filter(plan_id=plan_id, tipo="CURSAR")
+        .order_by("requiere_espacio__nombre")
+        .values_list(
+            "espacio_id",
+            "requisito",
+            "requiere_espacio_id",
+            "requiere_espacio__nombre",
+            "requiere_todos_hasta_anio",
+        )
+    )
+    for esp_id, requisito, req_id, req_nombre, hasta_anio in corr_qs:
+        corr = correlatividades.get(str(esp_id))
+        if corr is None:
+            continue
+        if req_id:
+            clave = _REQUISITO_A_CLAVE.get(requisito)
+            if clave:
+                corr[clave].append({"id": req_id, "label": req_nombre})
+        elif hasta_anio:
+            corr["hasta_anio"].append(
+                {"anio": hasta_anio, "requisito": _REQUISITO_A_CLAVE.get(requisito)}
+            )
+
+    horarios = {}
+    hor_qs = (
+        Horario.objects.filter(espacio__plan_id=plan_id, borrador=False)
+        .order_by("dia_semana", "hora_inicio")
+        .values_list(
+            "espacio_id",
+            "dia_semana",
+            "hora_inicio",
+            "hora_fin",
+            "docente__apellido",
+            "docente__nombre",
+        )
+    )
+    dias = dict(Horario.DIAS)
+    for esp_id, dia, ini, fin, doc_ape, doc_nom in hor_qs:
+        horarios.setdefault(str(esp_id), []).append(
+            {
+                "dia": dia,
+                "dia_label": dias.get(dia, ""),
+                "inicio": _hora(ini),
+                "fin": _hora(fin),
+                "docente": f"{doc_ape}, {doc_nom}" if doc_ape else "",
+            }
+        )
+
+    return {
+        "plan_id": plan_id,
+        "espacios": espacios,
+        "correlatividades": correlatividades,
+        "horarios": horarios,
+    }
+
+
+def bundle_cacheado(plan_id: int, version: Optional[str] = None) -> Optional[dict]:
+    """Bundle desde el cache (clave por versión); lo arma si falta."""
+    version = version or version_plan(plan_id)
+    key = _BUNDLE_KEY.format(plan_id, version)
+    data = cache.get(key)
+    if data is None:
+        data = armar_bundle(plan_id)
+        if data is None:
+            return None
+        data["version"] = version
+        cache.set(key, data, _TTL)
+    return data
@@ -0,0 +1,176 @@
+# academia_core/serializers.py
+"""
+Serializers de la API de solo lectura /api/v1/ (ver api_v1.py).
+
+Los anidados leen relaciones que el viewset ya trae con select_related /
+prefetch_related: si se agrega un campo relacionado acá, hay que sumarlo al
+queryset del viewset (los tests de api_v1 cuentan consultas).
+"""
+from rest_framework import serializers
+
+from .models import (
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Horario,
+    Movimiento,
+)
+
+
+class PersonaBreveSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    dni = serializers.CharField()
+    apellido = serializers.CharField()
+    nombre = serializers.CharField()
+
+
+class RefSerializer(serializers.Serializer):
+    """{id, nombre} de un catálogo."""
+
+    id = serializers.IntegerField()
+    nombre = serializers.CharField()
+
+
+class PlanRefSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    resolucion = serializers.CharField()
+
+
+class EspacioRefSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    nombre = serializers.CharField()
+    anio = serializers.CharField()
+    cuatrimestre = serializers.CharField()
+
+
+class CarreraEstudianteSerializer(serializers.ModelSerializer):
+    profesorado = RefSerializer()
+
+    class Meta:
+        model = EstudianteProfesorado
+        fields = ("id", "profesorado", "plan_id", "cohorte", "legajo_estado")
+
+
+class EstudianteSerializer(serializers.ModelSerializer):
+    carreras = CarreraEstudianteSerializer(source="inscripciones_carrera", many=True)
+
+    class Meta:
+        model = Estudiante
+        fields = (
+            "id",
+            "dni",
+            "apellido",
+            "nombre",
+            "email",
+            "telefono",
+            "localidad",
+            "activo",
+            "carreras",
+        )
+
+
+class InscripcionSerializer(serializers.ModelSerializer):
+    estudiante = PersonaBreveSerializer()
+    profesorado = RefSerializer()
+    plan = PlanRefSerializer(allow_null=True)
+
+    class Meta:
+        model = EstudianteProfesorado
+        fields = (
+            "id",
+            "estudiante",
+            "profesorado",
+            "plan",
+            "cohorte",
+            "legajo_estado",
+            "condicion_admin",
+        )
+
+
+class HorarioBreveSerializer(serializers.ModelSerializer):
+    docente = PersonaBreveSerializer(allow_null=True)
+
+    class Meta:
+        model = Horario
+        fields = ("id", "dia_semana", "hora_inicio", "hora_fin", "docente")
+
+
+class EspacioSerializer(serializers.ModelSerializer):
+    plan = PlanRefSerializer()
+    profesorado = RefSerializer(source="plan.profesorado")
+    horarios = HorarioBreveSerializer(many=True)
+
+    class Meta:
+        model = EspacioCurricular
+        fields = (
+            "id",
+            "nombre",
+            "anio",
+            "cuatrimestre",
+            "horas",
+            "formato",
+            "libre_habilitado",
+            "plan",
+            "profesorado",
+            "horarios",
+        )
+
+
+class CorrelatividadSerializer(serializers.ModelSerializer):
+    espacio = EspacioRefSerializer()
+    requiere_espacio = EspacioRefSerializer(allow_null=True)
+
+    class Meta:
+        model = Correlatividad
+        fields = (
+            "id",
+            "plan_id",
+            "espacio",
+            "tipo",
+            "requisito",
+            "requiere_espacio",
+            "requiere_todos_hasta_anio",
+        )
+
+
+class MovimientoSerializer(serializers.ModelSerializer):
+    estudiante = PersonaBreveSerializer(source="inscripcion.estudiante")
+    profesorado_id = serializers.IntegerField(source="inscripcion.profesorado_id")
+    espacio = EspacioRefSerializer()
+    condicion = serializers.CharField(source="condicion.nombre", allow_null=True)
+
+    class Meta:
+        model = Movimiento
+        fields = (
+            "id",
+            "inscripcion_id",
+            "estudiante",
+            "profesorado_id",
+            "espacio",
+            "tipo",
+            "fecha",
+            "condicion",
+            "nota_num",
+            "nota_texto",
+            "folio",
+            "libro",
+        )
+
+
+class HorarioSerializer(serializers.ModelSerializer):
+    espacio = EspacioRefSerializer()
+    plan_id = serializers.IntegerField(source="espacio.plan_id")
+    docente = PersonaBreveSerializer(allow_null=True)
+
+    class Meta:
+        model = Horario
+        fields = (
+            "id",
+            "espacio",
+            "plan_id",
+            "dia_semana",
+            "hora_inicio",
+            "hora_fin",
+            "docente",
+        )
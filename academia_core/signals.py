@@ -1,10 +1,14 @@
 # academia_core/signals.py
 
 from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.dispatch import receiver
 
 # ¡Importante! Faltaba importar las señales de autenticación
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 # No obtengas los modelos aquí arriba
 
@@ -47,3 +51,201 @@ def _on_logout(sender, user, **kwargs):
         )
     except Exception:
         pass
+
+
+# Sala de espera: el que sale libera su lugar (ver admision.py)
+@receiver(user_logged_out)
+def _liberar_admision(sender, request, user, **kwargs):
+    from .admision import liberar_al_salir
+
+    liberar_al_salir(request, user)
+
+
+# Cambios en profesorados/planes invalidan el resolver de URLs de cartón
+@receiver(post_save, sender="academia_core.Profesorado")
+@receiver(post_delete, sender="academia_core.Profesorado")
+@receiver(post_save, sender="academia_core.PlanEstudios")
+@receiver(post_delete, sender="academia_core.PlanEstudios")
+def _invalidar_slugs_carton(sender, **kwargs):
+    from .slugs import invalidar_slugs
+
+    invalidar_slugs()
+
+
+# ---------- Versión del AccessScope (ver access.py) ----------
+def _bump_scope(*user_ids):
+    from .access import invalidar_scope
+
+    invalidar_scope(*user_ids)
+
+
+@receiver(post_save, sender="academia_core.UserProfile")
+@receiver(post_delete, sender="academia_core.UserProfile")
+def _scope_por_perfil(sender, instance, **kwargs):
+    _bump_scope(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def _scope_por_usuario(sender, instance, created, **kwargs):
+    if not created:
+        _bump_scope(instance.pk)
+
+
+def _scope_por_m2m(instance, action, reverse, pk_set, user_ids_de):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        _bump_scope(*user_ids_de([instance.pk]))
+    elif pk_set:
+        _bump_scope(*user_ids_de(pk_set))
+    elif action == "post_clear":
+        # clear() desde el lado inverso no informa pk_set: invalidamos a todos
+        _bump_scope(*user_ids_de(None))
+
+
+@receiver(m2m_changed)
+def _scope_por_grupos_o_profesorados(sender, instance, action, reverse, pk_set, **kw):
+    User = get_user_model()
+    UserProfile = apps.get_model("academia_core", "UserProfile")
+
+    if sender is User.groups.through:
+        _scope_por_m2m(
+            instance,
+            action,
+            reverse,
+            pk_set,
+            lambda ids: (
+                ids
+                if ids is not None
+                else User.objects.values_list("pk", flat=True).iterator()
+            ),
+        )
+    elif sender is UserProfile.profesorados_permitidos.through:
+
+        def users_de_perfiles(ids):
+            qs = UserProfile.objects.all()
+            if ids is not None:
+                qs = qs.filter(pk__in=ids)
+            return qs.values_list("user_id", flat=True)
+
+        _scope_por_m2m(instance, action, reverse, pk_set, users_de_perfiles)
+
+
+@receiver(post_save, sender="academia_core.DocenteEspacio")
+@receiver(post_delete, sender="academia_core.DocenteEspacio")
+def _scope_por_asignacion_docente(sender, instance, **kwargs):
+    UserProfile = apps.get_model("academia_core", "UserProfile")
+    _bump_scope(
+        *UserProfile.objects.filter(docente_id=instance.docente_id).values_list(
+            "user_id", flat=True
+        )
+    )
+
+
+# ---------- Versión del bundle de planes (ver plan_bundle.py) ----------
+def _bump_planes(*plan_ids):
+    from .plan_bundle import invalidar_plan
+
+    invalidar_plan(*plan_ids)
+
+
+@receiver(post_save, sender="academia_core.PlanEstudios")
+@receiver(post_delete, sender="academia_core.PlanEstudios")
+def _bundle_por_plan(sender, instance, **kwargs):
+    _bump_planes(instance.pk)
+
+
+@receiver(post_save, sender="academia_core.EspacioCurricular")
+@receiver(post_delete, sender="academia_core.EspacioCurricular")
+@receiver(post_save, sender="academia_core.Correlatividad")
+@receiver(post_delete, sender="academia_core.Correlatividad")
+def _bundle_por_espacio_o_correlatividad(sender, instance, **kwargs):
+    _bump_planes(instance.plan_id)
+
+
+@receiver(post_save, sender="academia_core.Horario")
+@receiver(post_delete, sender="academia_core.Horario")
+def _bundle_por_horario(sender, instance, **kwargs):
+    EspacioCurricular = apps.get_model("academia_core", "EspacioCurricular")
+    _bump_planes(
+        *EspacioCurricular.objects.filter(pk=instance.espacio_id).values_list(
+            "plan_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender="academia_core.Docente")
+def _bundle_por_docente(sender, instance, created, **kwargs):
+    # el bundle muestra el nombre del docente de cada horario
+    if created:
+        return
+    Horario = apps.get_model("academia_core", "Horario")
+    _bump_planes(
+        *Horario.objects.filter(docente_id=instance.pk)
+        .values_list("espacio__plan_id", flat=True)
+        .distinct()
+    )
+
+
+# ---------- Versión del cache de catálogos (ver catalogo.py) ----------
+@receiver(post_save, sender="academia_core.Profesorado")
+@receiver(post_delete, sender="academia_core.Profesorado")
+@receiver(post_save, sender="academia_core.PlanEstudios")
+@receiver(post_delete, sender="academia_core.PlanEstudios")
+@receiver(post_save, sender="academia_core.EspacioCurricular")
+@receiver(post_delete, sender="academia_core.EspacioCurricular")
+@receiver(post_save, sender="academia_core.Condicion")
+@receiver(post_delete, sender="academia_core.Condicion")
+@receiver(post_save, sender="academia_core.Correlatividad")
+@receiver(post_delete, sender="academia_core.Correlatividad")
+def _invalidar_catalogo(sender, **kwargs):
+    from .catalogo import MODELO_A_FAMILIA, invalidar
+
+    familias = [MODELO_A_FAMILIA[sender.__name__]]
+    if sender.__name__ == "Profesorado":
+        # los planes cacheados llevan su profesorado (str del plan)
+        familias.append("planes")
+    invalidar(*familias)
+
+
+# ---------- Índice de búsqueda en memoria (ver busqueda.py) ----------
+@receiver(post_save, sender="academia_core.Estudiante")
+@receiver(post_delete, sender="academia_core.Estudiante")
+@receiver(post_save, sender="academia_core.Docente")
+@receiver(post_delete, sender="academia_core.Docente")
+def _busqueda_por_persona(sender, instance, **kwargs):
+    from .busqueda import actualizar_persona
+
+    tipo = "estudiantes" if sender.__name__ == "Estudiante" else "docentes"
+    borrado = kwargs["signal"] is post_delete
+    pk = instance.pk
+    transaction.on_commit(lambda: actualizar_persona(tipo, pk, instance, borrado))
+
+
+@receiver(post_save, sender="academia_core.EspacioCurricular")
+@receiver(post_delete, sender="academia_core.EspacioCurricular")
+def _busqueda_por_espacio(sender, instance, **kwargs):
+    from .busqueda import actualizar_espacio
+
+    borrado = kwargs["signal"] is post_delete
+    pk = instance.pk
+    transaction.on_commit(lambda: actualizar_espacio(pk, instance, borrado))
+
+
+@receiver(post_save, sender="academia_core.Profesorado")
+@receiver(post_save, sender="academia_core.PlanEstudios")
+def _busqueda_por_plan_o_profesorado(sender, **kwargs):
+    # los espacios se indexan con la resolución y el nombre del profesorado
+    from .busqueda import invalidar
+
+    transaction.on_commit(lambda: invalidar("espacios"))
+
+
+# ---------- Ventanas de inscripción en memoria (ver ventanas.py) ----------
+@receiver(post_save, sender="academia_core.VentanaInscripcion")
+@receiver(post_delete, sender="academia_core.VentanaInscripcion")
+def _invalidar_ventanas(sender, **kwargs):
+    from .ventanas import invalidar
+
+    # después del commit: si no, otro proceso podría recargar la versión vieja
+    transaction.on_commit(invalidar)
@@ -0,0 +1,470 @@
+# academia_core/sinteticos.py
+"""
+Datos sintéticos de un instituto para medir a escala (comando
+generar_datos_sinteticos). No es para producción: va en una base aparte.
+
+Por cada unidad de `escala` se crea un profesorado con un plan de cuatro
+años armado sobre parsed_correlatividades.json (mismos espacios por año,
+formatos y correlativas para CURSAR; los años que el archivo no trae repiten
+el último con otro nombre) y `estudiantes` estudiantes de cohortes de los
+últimos siete años. Cada estudiante cursa año por año los espacios cuyas
+correlativas cumple, hasta el ciclo `anio` o hasta que abandona:
+
+- la cursada termina en baja, libre, promoción o regular;
+- con regular rinde hasta tres finales (en diciembre, marzo y julio) y cada
+  intento es una InscripcionFinal y un Movimiento FIN;
+- las cursadas del ciclo `anio` quedan EN_CURSO, sin movimientos.
+
+Los FIN usan la condición REGULAR con nota, que es lo que cuentan como
+aprobado models._tiene_aprobada y cursada._armar_estado.
+
+Todo sale de un random.Random(semilla): misma semilla y misma base vacía,
+mismos datos. Los ids se asignan acá (a partir del máximo existente) para
+no tener que releer lo insertado; se escribe con bulk_create en lotes de
+`lote` filas y al final se ajustan las secuencias. bulk_create no dispara
+señales, así que se invalidan a mano los caches en memoria (busqueda,
+catalogo, plan_bundle).
+"""
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from . import busqueda, catalogo, plan_bundle
+from .models import (
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    EstadoInscripcion,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionFinal,
+    Movimiento,
+    PlanEstudios,
+    Profesorado,
+)
+
+PLANTILLA = Path(settings.BASE_DIR) / "parsed_correlatividades.json"
+PREFIJO = "Profesorado Sintético"
+DOMINIO = "sintetico.invalid"  # marca a los estudiantes generados
+DNI_BASE = 60_000_000
+ANIOS_CARRERA = 4
+COHORTES = 7
+
+FORMATOS = {"A": "Asignatura", "M": "Módulo", "S": "Seminario", "T": "Taller"}
+CONDICIONES = [
+    ("REGULAR", "Regular", "REG"),
+    ("PROMOCION", "Promoción", "REG"),
+    ("LIBRE", "Libre", "REG"),
+]
+
+# probabilidades acumuladas del resultado de una cursada
+P_BAJA, P_LIBRE, P_PROMOCION = 0.08, 0.22, 0.37
+P_ABANDONO = 0.12  # por año, deja la carrera
+P_APRUEBA, P_AUSENTE = 0.65, 0.12  # por intento de final
+# (mes, día) de los turnos de final después de la cursada
+TURNOS = [(12, 10), (3, 1), (7, 20)]
+
+APELLIDOS = (
+    "González Rodríguez Gómez Fernández López Díaz Martínez Pérez García "
+    "Sánchez Romero Sosa Torres Álvarez Ruiz Ramírez Flores Acosta Benítez "
+    "Medina Suárez Herrera Aguirre Pereyra Gutiérrez Giménez Molina Silva "
+    "Castro Rojas Ortiz Núñez Luna Juárez Cabrera Ríos Ferreyra Godoy Morales"
+).split()
+NOMBRES = (
+    "María Juan Sofía Martina Lucía Valentina Camila Agustina Julieta Micaela "
+    "Florencia Mateo Santiago Tomás Lucas Joaquín Franco Facundo Nicolás Ana "
+    "Milagros Rocío Carolina Gonzalo Matías Ezequiel Brenda Paula Emilia Luis"
+).split()
+
+
+@dataclass
+class Espacio:
+    id: int
+    anio: int
+    cuatrimestre: str
+    regularizadas: Tuple[int, ...] = ()
+    aprobadas: Tuple[int, ...] = ()
+
+
+@dataclass
+class Resumen:
+    filas: Dict[str, int] = field(default_factory=dict)
+
+    def sumar(self, modelo, n: int) -> None:
+        nombre = modelo._meta.object_name
+        self.filas[nombre] = self.filas.get(nombre, 0) + n
+
+    @property
+    def total(self) -> int:
+        return sum(self.filas.values())
+
+
+def _plantilla(ruta: Path = PLANTILLA) -> List[List[dict]]:
+    with open(ruta, encoding="utf-8") as f:
+        return [anio["espacios"] for anio in json.load(f)["years"]]
+
+
+def _malla(plantilla: List[List[dict]], rng: random.Random) -> List[dict]:
+    """
+    Espacios de un plan de ANIOS_CARRERA años. Las correlativas se guardan
+    como (año, posición) para resolverlas a ids después.
+    """
+    posicion = {
+        e["name"]: (a, i)
+        for a, espacios in enumerate(plantilla, start=1)
+        for i, e in enumerate(espacios)
+    }
+    malla = []
+    for anio in range(1, ANIOS_CARRERA + 1):
+        base = min(anio, len(plantilla))
+        for i, e in enumerate(plantilla[base - 1]):
+            cuatri = "A" if e["format"] == "A" and rng.random() < 0.5 else "12"[i % 2]
+
+            def previas(clave):
+                # misma distancia en años que en la plantilla
+                refs = (
+                    posicion.get(r["name"]) for r in e["correlativas_cursar"][clave]
+                )
+                return tuple(
+                    (anio - (base - a), j) for a, j in filter(None, refs) if a < base
+                )
+
+            malla.append(
+                {
+                    "anio": anio,
+                    "pos": i,
+                    "nombre": e["name"] if anio == base else f"{e['name']} ({anio}°)",
+                    "formato": FORMATOS.get(e["format"], e["format"]),
+                    "cuatrimestre": cuatri,
+                    "horas": rng.choice((3, 4, 4, 5, 6)),
+                    "regularizadas": previas("regularizadas"),
+                    "aprobadas": previas("aprobadas"),
+                }
+            )
+    return malla
+
+
+class _Escritor:
+    """bulk_create en lotes, respetando el orden padre -> hijo entre tablas."""
+
+    ORDEN = (
+        Profesorado,
+        PlanEstudios,
+        EspacioCurricular,
+        Correlatividad,
+        Estudiante,
+        EstudianteProfesorado,
+        InscripcionEspacio,
+        Movimiento,
+        InscripcionFinal,
+    )
+
+    def __init__(self, lote: int, resumen: Resumen):
+        self.lote = lote
+        self.resumen = resumen
+        self.pendientes = {m: [] for m in self.ORDEN}
+        self.ids = {m: (m.objects.aggregate(n=Max("pk"))["n"] or 0) for m in self.ORDEN}
+        self.primer_id = {m: n + 1 for m, n in self.ids.items()}
+
+    def nuevo_id(self, modelo) -> int:
+        self.ids[modelo] += 1
+        return self.ids[modelo]
+
+    def agregar(self, obj) -> None:
+        cola = self.pendientes[type(obj)]
+        cola.append(obj)
+        if len(cola) >= self.lote:
+            self.vaciar()
+
+    def vaciar(self) -> None:
+        for modelo in self.ORDEN:
+            cola = self.pendientes[modelo]
+            if cola:
+                modelo.objects.bulk_create(cola, batch_size=self.lote)
+                self.resumen.sumar(modelo, len(cola))
+                cola.clear()
+
+    def ajustar_secuencias(self) -> None:
+        sql = connection.ops.sequence_reset_sql(no_style(), self.ORDEN)
+        with connection.cursor() as cursor:
+            for sentencia in sql:
+                cursor.execute(sentencia)
+
+
+def _cursar(
+    w: _Escritor,
+    rng: random.Random,
+    insc_id: int,
+    esp: Espacio,
+    ciclo: int,
+    anio_actual: int,
+    hoy: date,
+    estado: Dict[str, set],
+) -> None:
+    cursada_id = w.nuevo_id(InscripcionEspacio)
+    if ciclo >= anio_actual:
+        w.agregar(
+            InscripcionEspacio(
+                id=cursada_id,
+                inscripcion_id=insc_id,
+                espacio_id=esp.id,
+                anio_academico=ciclo,
+            )
+        )
+        return
+    r = rng.random()
+    if r < P_BAJA:
+        w.agregar(
+            InscripcionEspacio(
+                id=cursada_id,
+                inscripcion_id=insc_id,
+                espacio_id=esp.id,
+                anio_academico=ciclo,
+                estado=EstadoInscripcion.BAJA,
+                fecha_baja=date.today(),  # se corrige al final (_fechar_cursadas)
+                motivo_baja="Abandono",
+            )
+        )
+        return
+    w.agregar(
+        InscripcionEspacio(
+            id=cursada_id,
+            inscripcion_id=insc_id,
+            espacio_id=esp.id,
+            anio_academico=ciclo,
+            estado=EstadoInscripcion.FINALIZADA,
+        )
+    )
+    cierre = date(ciclo, 7, 5) if esp.cuatrimestre == "1" else date(ciclo, 11, 25)
+    if r < P_LIBRE:
+        cond, nota = "LIBRE", rng.randint(1, 5)
+    elif r < P_PROMOCION:
+        cond, nota = "PROMOCION", rng.randint(8, 10)
+    else:
+        cond, nota = "REGULAR", rng.randint(6, 9)
+    w.agregar(
+        Movimiento(
+            id=w.nuevo_id(Movimiento),
+            inscripcion_id=insc_id,
+            espacio_id=esp.id,
+            tipo="REG",
+            fecha=cierre,
+            condicion_id=cond,
+            nota_num=nota,
+        )
+    )
+    if cond == "LIBRE":
+        return
+    estado["regularizadas"].add(esp.id)
+    if cond == "PROMOCION":
+        estado["aprobadas"].add(esp.id)
+        return
+
+    for intento, (mes, dia) in enumerate(TURNOS):
+        fecha = date(ciclo + (intento > 0), mes, dia)
+        if fecha >= hoy:
+            break
+        r = rng.random()
+        ausente = r < P_AUSENTE
+        aprobo = not ausente and r < P_AUSENTE + P_APRUEBA
+        nota = None if ausente else rng.randint(6, 10) if aprobo else rng.randint(1, 5)
+        w.agregar(
+            InscripcionFinal(
+                id=w.nuevo_id(InscripcionFinal),
+                inscripcion_cursada_id=cursada_id,
+                fecha_examen=fecha,
+                estado=(
+                    "AUSENTE" if ausente else "APROBADO" if aprobo else "DESAPROBADO"
+                ),
+                nota_final=nota,
+                ausente=ausente,
+            )
+        )
+        w.agregar(
+            Movimiento(
+                id=w.nuevo_id(Movimiento),
+                inscripcion_id=insc_id,
+                espacio_id=esp.id,
+                tipo="FIN",
+                fecha=fecha,
+                condicion_id="REGULAR",
+                nota_num=nota,
+                ausente=ausente,
+            )
+        )
+        if aprobo:
+            estado["aprobadas"].add(esp.id)
+            break
+
+
+def _puede(esp: Espacio, estado: Dict[str, set]) -> bool:
+    return (
+        set(esp.regularizadas) <= estado["regularizadas"]
+        and set(esp.aprobadas) <= estado["aprobadas"]
+    )
+
+
+def _fechar_cursadas(primer_id: int, anio_actual: int) -> None:
+    # fecha_inscripcion es auto_now_add: se lleva a marzo de cada ciclo con
+    # dos UPDATE por año (las bajas, a mayo), así se cumplen los CHECK
+    nuevas = InscripcionEspacio.objects.filter(id__gte=primer_id)
+    ciclos = nuevas.values_list("anio_academico", flat=True).distinct()
+    for ciclo in sorted(set(ciclos)):
+        if ciclo >= anio_actual:
+            continue
+        del_ciclo = nuevas.filter(anio_academico=ciclo)
+        del_ciclo.filter(estado=EstadoInscripcion.BAJA).update(
+            fecha_inscripcion=date(ciclo, 3, 10), fecha_baja=date(ciclo, 5, 15)
+        )
+        del_ciclo.exclude(estado=EstadoInscripcion.BAJA).update(
+            fecha_inscripcion=date(ciclo, 3, 10)
+        )
+
+
+def generar(
+    escala: int = 1,
+    semilla: int = 1,
+    estudiantes: int = 1000,
+    anio: Optional[int] = None,
+    lote: int = 5000,
+    plantilla: Optional[List[List[dict]]] = None,
+) -> Resumen:
+    """Genera `escala` profesorados con `estudiantes` estudiantes cada uno."""
+    rng = random.Random(semilla)
+    hoy = date.today()
+    anio = anio or hoy.year
+    if anio < hoy.year:
+        hoy = date(anio, 12, 31)
+    plantilla = plantilla or _plantilla()
+    resumen = Resumen()
+
+    with transaction.atomic():
+        for codigo, nombre, tipo in CONDICIONES:
+            Condicion.objects.get_or_create(
+                codigo=codigo, defaults={"nombre": nombre, "tipo": tipo}
+            )
+        w = _Escritor(lote, resumen)
+        n_prof = Profesorado.objects.filter(nombre__startswith=PREFIJO).count()
+        n_est = Estudiante.objects.filter(email__endswith="@" + DOMINIO).count()
+
+        for p in range(n_prof + 1, n_prof + escala + 1):
+            prof_id = w.nuevo_id(Profesorado)
+            plan_id = w.nuevo_id(PlanEstudios)
+            nombre = f"{PREFIJO} {p:03d}"
+            w.agregar(
+                Profesorado(
+                    id=prof_id,
+                    nombre=nombre,
+                    slug=f"profesorado-sintetico-{p:03d}",
+                    plan_vigente=f"{1000 + p}-{anio % 100}",
+                )
+            )
+            w.agregar(
+                PlanEstudios(
+                    id=plan_id,
+                    profesorado_id=prof_id,
+                    resolucion=f"{1000 + p}/{anio % 100}",
+                    resolucion_slug=f"{1000 + p}-{anio % 100}",
+                    nombre=f"Plan {anio}",
+                )
+            )
+
+            malla = _malla(plantilla, rng)
+            ids = {(e["anio"], e["pos"]): w.nuevo_id(EspacioCurricular) for e in malla}
+            espacios: Dict[int, List[Espacio]] = {}
+            for e in malla:
+                esp_id = ids[e["anio"], e["pos"]]
+                w.agregar(
+                    EspacioCurricular(
+                        id=esp_id,
+                        plan_id=plan_id,
+                        anio=f"{e['anio']}°",
+                        cuatrimestre=e["cuatrimestre"],
+                        nombre=e["nombre"],
+                        horas=e["horas"],
+                        formato=e["formato"],
+                    )
+                )
+                reqs = {}
+                for requisito, clave in (
+                    ("REGULARIZADA", "regularizadas"),
+                    ("APROBADA", "aprobadas"),
+                ):
+                    reqs[clave] = tuple(ids[r] for r in e[clave] if r in ids)
+                    for req_id in reqs[clave]:
+                        w.agregar(
+                            Correlatividad(
+                                id=w.nuevo_id(Correlatividad),
+                                plan_id=plan_id,
+                                espacio_id=esp_id,
+                                tipo="CURSAR",
+                                requisito=requisito,
+                                requiere_espacio_id=req_id,
+                            )
+                        )
+                espacios.setdefault(e["anio"], []).append(
+                    Espacio(esp_id, e["anio"], e["cuatrimestre"], **reqs)
+                )
+
+            for _ in range(estudiantes):
+                n_est += 1
+                est_id = w.nuevo_id(Estudiante)
+                cohorte = anio - rng.randrange(COHORTES)
+                w.agregar(
+                    Estudiante(
+                        id=est_id,
+                        dni=str(DNI_BASE + n_est),
+                        apellido=rng.choice(APELLIDOS),
+                        nombre=rng.choice(NOMBRES),
+                        email=f"e{n_est}@{DOMINIO}",
+                        fecha_nacimiento=date(cohorte - 19, 1, 1)
+                        + timedelta(days=rng.randrange(365 * 6)),
+                        activo=rng.random() > 0.05,
+                    )
+                )
+                insc_id = w.nuevo_id(EstudianteProfesorado)
+                w.agregar(
+                    EstudianteProfesorado(
+                        id=insc_id,
+                        estudiante_id=est_id,
+                        profesorado_id=prof_id,
+                        plan_id=plan_id,
+                        cohorte=cohorte,
+                        legajo=f"S{n_est:07d}",
+                    )
+                )
+                estado = {"regularizadas": set(), "aprobadas": set()}
+                for k in range(ANIOS_CARRERA):
+                    ciclo = cohorte + k
+                    if ciclo > anio:
+                        break
+                    for esp in espacios.get(k + 1, ()):
+                        if _puede(esp, estado):
+                            _cursar(w, rng, insc_id, esp, ciclo, anio, hoy, estado)
+                    if rng.random() < P_ABANDONO:
+                        break
+        w.vaciar()
+        _fechar_cursadas(w.primer_id[InscripcionEspacio], anio)
+        w.ajustar_secuencias()
+
+        def invalidar():
+            busqueda.invalidar("estudiantes")
+            busqueda.invalidar("espacios")
+            catalogo.invalidar(*catalogo.FAMILIAS)
+            plan_bundle.invalidar_plan(
+                *range(w.primer_id[PlanEstudios], w.ids[PlanEstudios] + 1)
+            )
+
+        transaction.on_commit(invalidar)
+    return resumen
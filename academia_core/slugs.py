@@ -0,0 +1,54 @@
+# academia_core/slugs.py
+"""
+Resolución de URLs de cartón: (prof_slug, res_slug) -> (profesorado_id, plan_id).
+
+Usa las columnas indexadas Profesorado.slug y PlanEstudios.resolucion_slug
+(una sola consulta) y cachea el resultado en el cache de Django. Las claves
+llevan un número de versión que se incrementa al guardar/borrar un Profesorado
+o un PlanEstudios (ver signals.py), así nunca se sirve un slug viejo.
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+
+from .models import PlanEstudios
+
+_VERSION_KEY = "carton_slugs:version"
+_TTL = 60 * 60 * 24
+_NO_EXISTE = (0, 0)  # cacheamos también los fallos para no reconsultar
+
+
+def _version() -> int:
+    v = cache.get(_VERSION_KEY)
+    if v is None:
+        v = 1
+        cache.add(_VERSION_KEY, v, None)
+    return v
+
+
+def invalidar_slugs() -> None:
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 2, None)
+
+
+def resolver_carton(prof_slug: str, res_slug: str) -> Optional[Tuple[int, int]]:
+    """
+    Devuelve (profesorado_id, plan_id) o None si no existe la combinación.
+    0 consultas si está en cache, 1 si no.
+    """
+    key = f"carton_slugs:{_version()}:{prof_slug}:{res_slug}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = (
+            PlanEstudios.objects.filter(
+                profesorado__slug=prof_slug, resolucion_slug=res_slug
+            )
+            .values_list("profesorado_id", "id")
+            .first()
+        ) or _NO_EXISTE
+        cache.set(key, tuple(ids), _TTL)
+    return None if tuple(ids) == _NO_EXISTE else tuple(ids)
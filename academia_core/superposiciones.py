@@ -0,0 +1,134 @@
+# academia_core/superposiciones.py
+"""
+Superposición de horarios entre espacios de un plan, sin consultas por request.
+
+Cada proceso guarda en memoria, por plan, un índice con los bloques de
+Horario publicados (no los borradores de horarios.py) de cada espacio y,
+ya calculado, con qué otros espacios del plan se pisa cada uno. El índice
+lleva la versión del plan de plan_bundle.py, que se renueva con cualquier
+cambio en Horario / EspacioCurricular (ver signals.py): si la versión
+cambió, se rearma con una consulta. Con varios workers hace falta un cache
+compartido, igual que para el bundle.
+
+La comparación es un barrido (`superposiciones`): los bloques se ordenan
+por minuto de la semana y se mantiene un heap con los que siguen abiertos,
+así que cuesta O(n log n + k) para n bloques y k choques en vez de comparar
+todos los pares. Un espacio del 1° cuatrimestre no choca con uno del 2°; un
+anual choca con los dos.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from asgiref.sync import sync_to_async
+
+from . import plan_bundle
+from .models import Horario
+
+ANUAL = "A"
+
+# (espacio_id, cuatrimestre, inicio, fin) en minutos desde el lunes 00:00
+Bloque = Tuple[int, str, int, int]
+
+
+def _minuto_semana(dia: int, t) -> int:
+    return (dia - 1) * 24 * 60 + t.hour * 60 + t.minute
+
+
+def _mismo_periodo(a: str, b: str) -> bool:
+    return a == b or ANUAL in (a, b) or not (a and b)
+
+
+def superposiciones(bloques: Iterable[Bloque]) -> Set[Tuple[int, int]]:
+    """Pares (a, b), a < b, de espacios con algún bloque superpuesto."""
+    pares: Set[Tuple[int, int]] = set()
+    abiertos: List[Tuple[int, int, str]] = []  # heap de (fin, espacio, cuatri)
+    for esp_id, cuatri, inicio, fin in sorted(bloques, key=lambda b: (b[2], b[3])):
+        while abiertos and abiertos[0][0] <= inicio:
+            heapq.heappop(abiertos)
+        for _, otro, otro_cuatri in abiertos:
+            if otro != esp_id and _mismo_periodo(cuatri, otro_cuatri):
+                pares.add((min(esp_id, otro), max(esp_id, otro)))
+        heapq.heappush(abiertos, (fin, esp_id, cuatri))
+    return pares
+
+
+@dataclass(frozen=True)
+class Indice:
+    plan_id: int
+    version: str
+    bloques: Dict[int, Tuple[Bloque, ...]]
+    vecinos: Dict[int, FrozenSet[int]]
+
+    def choques(self, espacio_id: int, con: Iterable[int]) -> List[int]:
+        """Espacios de `con` que se superponen con `espacio_id`."""
+        vecinos = self.vecinos.get(espacio_id, frozenset())
+        return sorted(vecinos.intersection(con))
+
+    def pares(self, espacio_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """Pares superpuestos dentro de un conjunto de espacios."""
+        ids = set(espacio_ids)
+        return sorted(
+            (a, b) for a in ids for b in self.vecinos.get(a, ()) if a < b and b in ids
+        )
+
+
+def _armar(plan_id: int, version: str) -> Indice:
+    filas = (
+        Horario.objects.filter(espacio__plan_id=plan_id, borrador=False)
+        .order_by()
+        .values_list(
+            "espacio_id",
+            "espacio__cuatrimestre",
+            "dia_semana",
+            "hora_inicio",
+            "hora_fin",
+        )
+    )
+    bloques: Dict[int, List[Bloque]] = {}
+    for esp_id, cuatri, dia, ini, fin in filas:
+        inicio, final = _minuto_semana(dia, ini), _minuto_semana(dia, fin)
+        if final > inicio:
+            bloques.setdefault(esp_id, []).append((esp_id, cuatri, inicio, final))
+    vecinos: Dict[int, Set[int]] = {}
+    for a, b in superposiciones(b for bs in bloques.values() for b in bs):
+        vecinos.setdefault(a, set()).add(b)
+        vecinos.setdefault(b, set()).add(a)
+    return Indice(
+        plan_id=plan_id,
+        version=version,
+        bloques={e: tuple(bs) for e, bs in bloques.items()},
+        vecinos={e: frozenset(vs) for e, vs in vecinos.items()},
+    )
+
+
+_lock = threading.Lock()
+_indices: Dict[int, Indice] = {}
+
+
+def _vigente(plan_id: int, version: str):
+    indice = _indices.get(plan_id)
+    return indice if indice is not None and indice.version == version else None
+
+
+def _recargar(plan_id: int, version: str) -> Indice:
+    with _lock:
+        indice = _vigente(plan_id, version)  # otro thread ya lo rearmó
+        if indice is None:
+            indice = _indices[plan_id] = _armar(plan_id, version)
+        return indice
+
+
+def indice(plan_id: int) -> Indice:
+    version = plan_bundle.version_plan(plan_id)
+    return _vigente(plan_id, version) or _recargar(plan_id, version)
+
+
+async def aindice(plan_id: int) -> Indice:
+    version = plan_bundle.version_plan(plan_id)
+    return _vigente(plan_id, version) or await sync_to_async(_recargar)(
+        plan_id, version
+    )
@@ -1,4 +1,4 @@
-from django.test import TestCase, Client
+from django.test import TestCase, TransactionTestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
@@ -298,3 +298,2040 @@ class PanelViewTest(TestCase):
         response = self.client.get(reverse("panel_docente"))
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "panel_docente.html")
+
+
+class FotoVariantesTest(TestCase):
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_variantes_generadas_al_guardar_y_cacheadas(self):
+        import io
+        import os
+        from unittest import mock
+
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from PIL import Image
+
+        from academia_core.fotos import ruta_relativa_variante
+
+        buf = io.BytesIO()
+        Image.new("RGB", (1200, 1600), "red").save(buf, "PNG")
+        with override_settings(MEDIA_ROOT=self.tmp):
+            est = Estudiante.objects.create(
+                dni="999",
+                apellido="Foto",
+                nombre="Test",
+                foto=SimpleUploadedFile("x.png", buf.getvalue()),
+            )
+            rel = ruta_relativa_variante(est.foto.name, "pdf", "jpg")
+            ruta = os.path.join(self.tmp, rel)
+            self.assertTrue(os.path.exists(ruta))
+            with Image.open(ruta) as img:
+                self.assertEqual(img.mode, "L")
+                self.assertEqual(img.size, (220, 280))
+            self.assertTrue(est.foto_lista_webp_url.endswith("foto_lista.webp"))
+
+            mtime = os.path.getmtime(ruta)
+            self.assertTrue(est.foto_pdf_url.endswith(rel))
+            self.assertEqual(os.path.getmtime(ruta), mtime)
+
+            # sin variante webp no hay <source>: el jpg cae al original
+            for fmt in ("jpg", "webp"):
+                os.remove(
+                    os.path.join(
+                        self.tmp, ruta_relativa_variante(est.foto.name, "lista", fmt)
+                    )
+                )
+            with mock.patch(
+                "academia_core.fotos.generar_variantes", side_effect=OSError
+            ):
+                self.assertEqual(est.foto_lista_webp_url, "")
+                self.assertEqual(est.foto_lista_url, est.foto.url)
+
+
+class DocenteEspacioDetalleTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from academia_core.models import DocenteEspacio
+
+        cls.prof = Profesorado.objects.create(nombre="Profesorado Detalle")
+        cls.plan = PlanEstudios.objects.create(profesorado=cls.prof, resolucion="1/20")
+        cls.espacio = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Didáctica", anio="1°", cuatrimestre="1"
+        )
+        reg = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+        prom = Condicion.objects.create(
+            codigo="PROMOCION", nombre="Promoción", tipo="REG"
+        )
+        desa = Condicion.objects.create(
+            codigo="DESAPROBADO_TP", nombre="Desaprobado", tipo="REG"
+        )
+        casos = [
+            ("A", 2023, [(prom, 8, "2023-07-01")]),
+            ("B", 2023, [(reg, 7, "2023-07-01")]),
+            ("C", 2024, [(reg, 7, "2023-07-01"), (desa, 2, "2024-07-01")]),
+        ]
+        for i, (ape, cohorte, movs) in enumerate(casos):
+            est = Estudiante.objects.create(dni=f"5{i}", apellido=ape, nombre="X")
+            insc = EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=cls.prof, plan=cls.plan, cohorte=cohorte
+            )
+            Movimiento.objects.bulk_create(
+                [
+                    Movimiento(
+                        inscripcion=insc,
+                        espacio=cls.espacio,
+                        tipo="REG",
+                        condicion=c,
+                        nota_num=n,
+                        fecha=f,
+                    )
+                    for c, n, f in movs
+                ]
+            )
+        cls.user = User.objects.create_user(username="doc", password="x")
+        cls.docente = Docente.objects.create(dni="1", apellido="D", nombre="D")
+        DocenteEspacio.objects.create(docente=cls.docente, espacio=cls.espacio)
+        cls.user.perfil.rol = "DOCENTE"
+        cls.user.perfil.docente = cls.docente
+        cls.user.perfil.save()
+
+    def _get(self, **params):
+        from django.test import RequestFactory
+
+        from academia_core.views import docente_espacio_detalle
+
+        request = RequestFactory().get("/", params)
+        request.user = self.user
+        request.session = self.client.session
+        return docente_espacio_detalle(request, self.espacio.id)
+
+    def test_resumen_y_orden_por_estado(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertIn("Total: 3", html)
+        self.assertIn("Aprobadas: 1", html)
+        self.assertIn("Desaprobadas: 1", html)
+        self.assertIn("Pendientes: 1", html)
+        # Pendiente (B) antes que Desaprobada (C) antes que Aprobada (A)
+        self.assertLess(html.index("<td>B, X</td>"), html.index("<td>C, X</td>"))
+        self.assertLess(html.index("<td>C, X</td>"), html.index("<td>A, X</td>"))
+
+    def test_filtros_cohorte_anio_estado(self):
+        html = self._get(cohorte="2023").content.decode()
+        self.assertIn("Total: 2", html)
+        html = self._get(anio="2024").content.decode()
+        self.assertIn("Total: 1", html)
+        self.assertIn("<td>C, X</td>", html)
+        html = self._get(estado="Aprobada").content.decode()
+        self.assertIn("<td>A, X</td>", html)
+        self.assertNotIn("<td>B, X</td>", html)
+
+
+class CartonSlugResolverTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.prof = Profesorado.objects.create(
+            nombre="Profesorado de Educación Primaria"
+        )
+        self.plan = PlanEstudios.objects.create(
+            profesorado=self.prof, resolucion="1935/14"
+        )
+
+    def test_resuelve_con_una_consulta_y_luego_desde_cache(self):
+        from academia_core.slugs import resolver_carton
+
+        with self.assertNumQueries(1):
+            ids = resolver_carton("profesorado-de-educacion-primaria", "1935-14")
+        self.assertEqual(ids, (self.prof.id, self.plan.id))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                resolver_carton("profesorado-de-educacion-primaria", "1935-14"), ids
+            )
+        self.assertIsNone(resolver_carton("no-existe", "1935-14"))
+
+    def test_se_invalida_al_guardar(self):
+        from academia_core.slugs import resolver_carton
+
+        self.assertIsNotNone(resolver_carton(self.prof.slug, "1935-14"))
+        self.plan.resolucion_slug = "1935-14-bis"
+        self.plan.save()
+        self.assertIsNone(resolver_carton(self.prof.slug, "1935-14"))
+        self.assertEqual(
+            resolver_carton(self.prof.slug, "1935-14-bis"), (self.prof.id, self.plan.id)
+        )
+
+
+class AccessScopeTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import Group
+        from django.core.cache import cache
+
+        cache.clear()
+        self.prof = Profesorado.objects.create(nombre="Profesorado Scope")
+        self.user = User.objects.create_user(username="bedel", password="x")
+        self.user.perfil.rol = "BEDEL"
+        self.user.perfil.save()
+        self.user.perfil.profesorados_permitidos.add(self.prof)
+        self.user.groups.add(Group.objects.create(name="Bedel"))
+        self.client.login(username="bedel", password="x")
+
+    def _scope(self, session=None):
+        from django.test import RequestFactory
+
+        from academia_core.access import get_access_scope
+
+        request = RequestFactory().get("/")
+        request.user = self.user
+        request.session = session or self.client.session
+        return get_access_scope(request)
+
+    def test_scope_se_cachea_en_la_sesion(self):
+        from academia_core.access import SESSION_KEY
+
+        self.client.get(reverse("ui:dashboard"))
+        data = self.client.session[SESSION_KEY]
+        self.assertEqual(data["rol"], "BEDEL")
+        self.assertEqual(data["profesorado_ids"], [self.prof.id])
+        session = self.client.session
+        session.keys()  # fuerza la carga antes de contar consultas
+        with self.assertNumQueries(0):
+            scope = self._scope(session)
+        self.assertEqual(scope.ui_role, "Bedel")
+
+    def test_cambios_de_perfil_o_grupos_invalidan(self):
+        from django.contrib.auth.models import Group
+
+        self.client.get(reverse("ui:dashboard"))
+        otro = Profesorado.objects.create(nombre="Otro Scope")
+        self.user.perfil.profesorados_permitidos.add(otro)
+        self.assertEqual(self._scope().profesorado_ids, {self.prof.id, otro.id})
+
+        self.client.get(reverse("ui:dashboard"))
+        self.user.groups.add(Group.objects.create(name="Secretaría"))
+        self.assertEqual(self._scope().ui_role, "Secretaría")
+
+    def test_otro_worker_sin_invalidaciones_usa_la_sesion(self):
+        from django.core.cache import cache
+
+        cache.clear()  # sin las invalidaciones del setUp
+        self.client.get(reverse("ui:dashboard"))
+        cache.clear()  # otro worker: su LocMem no tiene la versión
+        session = self.client.session
+        session.keys()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._scope(session).profesorado_ids, {self.prof.id})
+        self.assertFalse(session.modified)
+
+    def test_copia_de_la_sesion_vence(self):
+        from unittest import mock
+
+        self.client.get(reverse("ui:dashboard"))
+        # revocado en otro worker (LocMem propio): la versión de acá no cambia
+        with mock.patch("academia_core.access.invalidar_scope"):
+            self.user.perfil.profesorados_permitidos.clear()
+        self.assertEqual(self._scope().profesorado_ids, {self.prof.id})
+        with self.settings(ACCESS_SCOPE_MAX_AGE=0):
+            self.assertEqual(self._scope().profesorado_ids, set())
+
+
+class KeysetPaginacionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # apellidos repetidos para que el desempate por (nombre, id) importe
+        Estudiante.objects.bulk_create(
+            Estudiante(dni=f"70{i:03d}", apellido=f"Ap{i % 3}", nombre=f"N{i % 2}")
+            for i in range(12)
+        )
+        Estudiante.objects.create(
+            dni="70999", apellido="Zeta", nombre="X", activo=False
+        )
+
+    def _get(self, view, *args, **params):
+        from django.test import RequestFactory
+
+        return view(RequestFactory().get("/", params), *args)
+
+    def test_recorre_todas_las_paginas_sin_repetir(self):
+        import json
+
+        from academia_core.views_api import api_listar_estudiantes
+
+        vistos, cursor, paginas = [], None, 0
+        while True:
+            params = {"limit": 5, "fields": "id,apellido"}
+            if cursor:
+                params["cursor"] = cursor
+            data = json.loads(self._get(api_listar_estudiantes, **params).content)
+            self.assertLessEqual(len(data["items"]), 5)
+            self.assertEqual(set(data["items"][0]), {"id", "apellido"})
+            vistos += [i["id"] for i in data["items"]]
+            paginas += 1
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        esperados = list(
+            Estudiante.objects.filter(activo=True)
+            .order_by("apellido", "nombre", "id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(vistos, esperados)
+        self.assertEqual(paginas, 3)
+
+    def test_movimientos_con_fecha_nula_al_final(self):
+        import json
+
+        from academia_core.views_api import api_get_movimientos_estudiante
+
+        est = Estudiante.objects.create(dni="71000", apellido="Mov", nombre="Uno")
+        prof = Profesorado.objects.create(nombre="Prof Keyset")
+        plan = PlanEstudios.objects.create(profesorado=prof, resolucion="K/1")
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=est, profesorado=prof, plan=plan, cohorte=2023
+        )
+        esp = EspacioCurricular.objects.create(
+            plan=plan, nombre="Keyset", anio="1°", cuatrimestre="1"
+        )
+        cond = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+        fechas = ["2023-03-01", None, "2024-07-01", "2023-03-01", None]
+        Movimiento.objects.bulk_create(
+            Movimiento(
+                inscripcion=insc, espacio=esp, tipo="REG", fecha=f, condicion=cond
+            )
+            for f in fechas
+        )
+
+        vistos, cursor = [], None
+        while True:
+            params = {"limit": 2, "fields": "id,fecha"}
+            if cursor:
+                params["cursor"] = cursor
+            data = json.loads(
+                self._get(api_get_movimientos_estudiante, est.id, **params).content
+            )
+            vistos += [(i["fecha"], i["id"]) for i in data["items"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(len(vistos), 5)
+        self.assertEqual(
+            [f for f, _ in vistos][:3], ["2024-07-01", "2023-03-01", "2023-03-01"]
+        )
+        self.assertEqual([f for f, _ in vistos][3:], [None, None])
+
+    def test_parametros_invalidos(self):
+        from academia_core.views_api import api_listar_docentes
+
+        self.assertEqual(self._get(api_listar_docentes, cursor="nope").status_code, 400)
+        self.assertEqual(
+            self._get(api_listar_docentes, fields="id,sueldo").status_code, 400
+        )
+        self.assertEqual(self._get(api_listar_docentes, limit="0").status_code, 400)
+
+
+class ExportarStreamingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prof = Profesorado.objects.create(nombre="Prof Export")
+        otro = Profesorado.objects.create(nombre="Prof Ajeno")
+        plan = PlanEstudios.objects.create(profesorado=cls.prof, resolucion="E/1")
+        plan_otro = PlanEstudios.objects.create(profesorado=otro, resolucion="E/2")
+        for i in range(5):
+            est = Estudiante.objects.create(
+                dni=f"80{i:03d}", apellido="Éxport", nombre=f"N{i}"
+            )
+            EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=cls.prof, plan=plan, cohorte=2024
+            )
+        ajeno = Estudiante.objects.create(dni="80999", apellido="Ajeno", nombre="X")
+        EstudianteProfesorado.objects.create(
+            estudiante=ajeno, profesorado=otro, plan=plan_otro, cohorte=2024
+        )
+        cls.user = User.objects.create_user(username="bedel_exp", password="x")
+        cls.user.perfil.rol = "BEDEL"
+        cls.user.perfil.save()
+        cls.user.perfil.profesorados_permitidos.add(cls.prof)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _get(self, entidad, **params):
+        url = reverse("ui:api_exportar", args=[entidad])
+        return self.client.get(url, params)
+
+    def test_csv_en_streaming_acotado_al_profesorado(self):
+        import csv
+        import io
+
+        response = self._get("estudiantes", formato="csv")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        contenido = b"".join(response.streaming_content).decode("utf-8-sig")
+        filas = list(csv.DictReader(io.StringIO(contenido)))
+        self.assertEqual(len(filas), 5)
+        self.assertEqual({f["apellido"] for f in filas}, {"Éxport"})
+
+    def test_ndjson_y_permisos(self):
+        import json
+
+        response = self._get("inscripciones")
+        lineas = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lineas), 5)
+        self.assertEqual(json.loads(lineas[0])["profesorado"], "Prof Export")
+
+        self.assertEqual(self._get("sueldos").status_code, 404)
+        self.user.perfil.rol = "ESTUDIANTE"
+        self.user.perfil.save()
+        self.assertEqual(self._get("estudiantes").status_code, 403)
+
+    def test_iterar_filas_por_tandas(self):
+        from academia_core.exportar import iterar_filas
+
+        filas = list(
+            iterar_filas(Estudiante.objects.all(), ["id", "dni"], chunk_size=2)
+        )
+        self.assertEqual(len(filas), 6)
+        self.assertEqual([f[0] for f in filas], sorted(f[0] for f in filas))
+
+
+class CatalogoCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prof = Profesorado.objects.create(nombre="Prof Catálogo")
+        cls.plan = PlanEstudios.objects.create(profesorado=cls.prof, resolucion="C/1")
+        cls.esp = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Didáctica", anio="1°", cuatrimestre="1"
+        )
+        Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_lecturas_cacheadas_e_invalidadas_por_signals(self):
+        from academia_core import catalogo
+
+        self.assertEqual(
+            [e.nombre for e in catalogo.espacios_de_plan(self.plan.id)], ["Didáctica"]
+        )
+        with self.assertNumQueries(0):
+            catalogo.espacios_de_plan(self.plan.id)
+            catalogo.espacios_de_plan(self.plan.id)
+
+        EspacioCurricular.objects.create(
+            plan=self.plan, nombre="Pedagogía", anio="1°", cuatrimestre="2"
+        )
+        self.assertEqual(len(catalogo.espacios_de_plan(self.plan.id)), 2)
+
+        self.assertEqual(catalogo.planes_de_profesorado(self.prof.id), [self.plan])
+        self.prof.nombre = "Prof Renombrado"
+        self.prof.save()
+        plan = catalogo.planes_de_profesorado(self.prof.id)[0]
+        self.assertIn("Prof Renombrado", str(plan))
+
+    def test_formulario_de_carga_sin_consultas_de_catalogo(self):
+        from academia_core import catalogo
+        from academia_core.forms_carga import CargaNotaForm
+
+        catalogo.condiciones_por_tipo("REG")
+        with self.assertNumQueries(0):
+            form = CargaNotaForm(data={"tipo": "REG"})
+            html = form.fields["condicion"].widget.render("condicion", "REGULAR")
+        self.assertIn('value="REGULAR" selected', html)
+
+    def test_catalogo_atrasado_no_rechaza_opciones_nuevas(self):
+        from academia_core import catalogo
+        from academia_core.forms_carga import CargaNotaForm
+
+        catalogo.condiciones_por_tipo("REG")
+        # bulk_create no dispara signals: simula otro worker con el caché viejo
+        Condicion.objects.bulk_create(
+            [Condicion(codigo="REG_NUEVA", nombre="Regular nueva", tipo="REG")]
+        )
+        form = CargaNotaForm(data={"tipo": "REG"})
+        self.assertNotIn("REG_NUEVA", dict(form.fields["condicion"].choices))
+        self.assertEqual(form.fields["condicion"].clean("REG_NUEVA").pk, "REG_NUEVA")
+
+
+class BusquedaIndiceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.perez = Estudiante.objects.create(
+            dni="30111222", apellido="Pérez", nombre="María"
+        )
+        cls.peralta = Estudiante.objects.create(
+            dni="30999888", apellido="Peralta", nombre="Juan"
+        )
+        cls.gomez = Estudiante.objects.create(
+            dni="31000111", apellido="Gómez", nombre="Pedro"
+        )
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()  # versión nueva: el índice se rearma con los datos del test
+
+    def test_sin_acentos_por_prefijo_y_rankeado(self):
+        from academia_core.busqueda import buscar_ids
+
+        self.assertEqual(buscar_ids("estudiantes", "perez"), [self.perez.id])
+        self.assertEqual(buscar_ids("estudiantes", "MARIA PEREZ"), [self.perez.id])
+        self.assertEqual(buscar_ids("estudiantes", "3099"), [self.peralta.id])
+        # apellido que empieza con "pe" antes que el nombre "Pedro"
+        self.assertEqual(
+            buscar_ids("estudiantes", "pe"),
+            [self.peralta.id, self.perez.id, self.gomez.id],
+        )
+        # error de tipeo: cae a trigramas
+        self.assertEqual(buscar_ids("estudiantes", "gomes"), [self.gomez.id])
+
+    def test_signals_actualizan_el_indice(self):
+        from academia_core.busqueda import buscar_ids
+
+        buscar_ids("estudiantes", "x")  # arma el índice
+        with self.captureOnCommitCallbacks(execute=True):
+            nueva = Estudiante.objects.create(
+                dni="32000000", apellido="Núñez", nombre="Ana"
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(buscar_ids("estudiantes", "nunez"), [nueva.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            nueva.apellido = "Ibáñez"
+            nueva.save()
+        self.assertEqual(buscar_ids("estudiantes", "nunez"), [])
+        self.assertEqual(buscar_ids("estudiantes", "ibanez"), [nueva.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            nueva.delete()
+        self.assertEqual(buscar_ids("estudiantes", "ibanez"), [])
+
+    def test_typeahead_y_listado(self):
+        from django.contrib.auth.models import Group
+
+        user = User.objects.create_user(username="bedel_bus", password="x")
+        user.groups.add(Group.objects.create(name="Bedel"))
+        self.client.login(username="bedel_bus", password="x")
+
+        data = self.client.get(reverse("ui:api_buscar"), {"q": "pérez"}).json()
+        self.assertEqual([i["id"] for i in data["items"]], [self.perez.id])
+        self.assertFalse(data["has_more"])
+
+        data = self.client.get(reverse("ui:api_buscar"), {"q": "pe", "limit": 2}).json()
+        self.assertEqual(len(data["items"]), 2)
+        self.assertTrue(data["has_more"])
+
+        response = self.client.get(reverse("ui:estudiantes_list"), {"q": "perez"})
+        self.assertEqual(list(response.context["items"]), [self.perez])
+
+        user.groups.clear()  # rol Estudiante: no puede listar personas
+        self.assertEqual(self.client.get(reverse("ui:api_buscar")).status_code, 403)
+
+    def test_buscar_staff_con_grupos_de_setup_roles(self):
+        from django.contrib.auth.models import Group
+
+        user = User.objects.create_user(
+            username="bedel_mayus", password="x", is_staff=True
+        )
+        user.groups.add(Group.objects.create(name="BEDEL"))
+        self.client.force_login(user)
+        response = self.client.get(reverse("ui:api_buscar"), {"q": "perez"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i["id"] for i in response.json()["items"]], [self.perez.id])
+
+    def test_filtrar_queryset_sin_in_gigante(self):
+        from academia_core.busqueda import filtrar_queryset
+
+        qs = filtrar_queryset(Estudiante.objects.all(), "estudiantes", "pe", limite=3)
+        self.assertEqual(len(qs), 3)
+        # más que el límite: filtra en la base, sin IN y sin cortar resultados
+        # (SQLite no ignora acentos: "Pérez" solo aparece con MySQL)
+        qs = filtrar_queryset(Estudiante.objects.all(), "estudiantes", "pe", limite=2)
+        self.assertNotIn(" IN ", str(qs.query))
+        self.assertTrue({self.peralta.id, self.gomez.id} <= {e.id for e in qs})
+        inscripciones = filtrar_queryset(
+            EstudianteProfesorado.objects.all(),
+            "estudiantes",
+            "pe",
+            campo="estudiante_id",
+            limite=2,
+        )
+        self.assertIn("apellido", str(inscripciones.query))
+
+
+class ApiV1Test(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import time
+
+        from academia_core.models import Correlatividad, Horario
+
+        cls.prof = Profesorado.objects.create(nombre="Prof API")
+        cls.otro_prof = Profesorado.objects.create(nombre="Otro API")
+        plan = PlanEstudios.objects.create(profesorado=cls.prof, resolucion="A/1")
+        otro_plan = PlanEstudios.objects.create(
+            profesorado=cls.otro_prof, resolucion="A/2"
+        )
+        docente = Docente.objects.create(dni="20000001", apellido="Doc", nombre="Uno")
+        cond = Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+
+        espacios = [
+            EspacioCurricular.objects.create(
+                plan=plan, nombre=f"Materia {i}", anio="1°", cuatrimestre="1"
+            )
+            for i in range(6)
+        ]
+        for i, esp in enumerate(espacios):
+            Horario.objects.create(
+                espacio=esp,
+                dia_semana=1 + i % 5,
+                hora_inicio=time(8),
+                hora_fin=time(10),
+                docente=docente,
+            )
+            if i:
+                Correlatividad.objects.create(
+                    plan=plan,
+                    espacio=esp,
+                    tipo="CURSAR",
+                    requisito="REGULARIZADA",
+                    requiere_espacio=espacios[i - 1],
+                )
+
+        cls.estudiantes = []
+        for i in range(8):
+            est = Estudiante.objects.create(
+                dni=f"6000000{i}", apellido=f"Api{i}", nombre="Est"
+            )
+            p, pl = (cls.prof, plan) if i % 2 == 0 else (cls.otro_prof, otro_plan)
+            insc = EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=p, plan=pl, cohorte=2024
+            )
+            Movimiento.objects.bulk_create(
+                Movimiento(
+                    inscripcion=insc,
+                    espacio=espacios[0],
+                    tipo="REG",
+                    fecha="2024-07-01",
+                    condicion=cond,
+                )
+                for _ in range(2)
+            )
+            cls.estudiantes.append(est)
+
+        User.objects.create_superuser(username="admin_api", password="x")
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()  # baldes de throttling y versiones de scope
+
+    def _contar(self, url, limit):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"limit": limit})
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries), response.json()
+
+    def test_consultas_fijas_sin_importar_el_tamanio_de_pagina(self):
+        # usuario (sesión) + página + un prefetch por relación "many"
+        esperadas = {
+            "estudiantes": 3,
+            "inscripciones": 2,
+            "espacios": 3,
+            "correlatividades": 2,
+            "movimientos": 2,
+            "horarios": 2,
+        }
+        self.client.login(username="admin_api", password="x")
+        for nombre, n in esperadas.items():
+            url = reverse(f"api_v1:{nombre}-list")
+            self.client.get(url)  # calienta sesión y AccessScope
+            chica, data = self._contar(url, 1)
+            grande, data_grande = self._contar(url, 100)
+            self.assertEqual((nombre, chica), (nombre, n))
+            self.assertEqual((nombre, grande), (nombre, n))
+            self.assertEqual(len(data["results"]), 1)
+            self.assertIsNotNone(data["next"])
+            self.assertGreater(len(data_grande["results"]), 1)
+
+    def test_cursor_recorre_todo_sin_repetir(self):
+        self.client.login(username="admin_api", password="x")
+        url, vistos = reverse("api_v1:estudiantes-list") + "?limit=3", []
+        while url:
+            data = self.client.get(url).json()
+            vistos += [e["id"] for e in data["results"]]
+            url = data["next"]
+        self.assertEqual(sorted(vistos), sorted(e.id for e in self.estudiantes))
+        self.assertEqual(len(vistos), len(set(vistos)))
+
+    def test_alcance_y_throttle_por_rol(self):
+        from unittest import mock
+
+        from academia_core.api_v1 import RolThrottle
+
+        bedel = User.objects.create_user(username="bedel_api", password="x")
+        bedel.perfil.rol = "BEDEL"
+        bedel.perfil.save()
+        bedel.perfil.profesorados_permitidos.add(self.prof)
+        self.client.login(username="bedel_api", password="x")
+        data = self.client.get(reverse("api_v1:inscripciones-list")).json()
+        self.assertEqual(
+            {i["profesorado"]["id"] for i in data["results"]}, {self.prof.id}
+        )
+        # los catálogos no se acotan
+        data = self.client.get(reverse("api_v1:espacios-list")).json()
+        self.assertEqual(len(data["results"]), 6)
+
+        alumno = User.objects.create_user(username="alumno_api", password="x")
+        alumno.perfil.estudiante = self.estudiantes[1]
+        alumno.perfil.save()
+        self.client.login(username="alumno_api", password="x")
+        rates = {**RolThrottle.THROTTLE_RATES, "api_v1_estudiante": "2/min"}
+        with mock.patch.object(RolThrottle, "THROTTLE_RATES", rates):
+            data = self.client.get(reverse("api_v1:movimientos-list")).json()
+            self.assertEqual(
+                {m["estudiante"]["id"] for m in data["results"]},
+                {self.estudiantes[1].id},
+            )
+            self.client.get(reverse("api_v1:movimientos-list"))
+            response = self.client.get(reverse("api_v1:movimientos-list"))
+        self.assertEqual(response.status_code, 429)
+
+
+def _ventana_cursada_abierta(**kwargs):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from academia_core.models import VentanaInscripcion
+
+    ahora = timezone.now()
+    return VentanaInscripcion.objects.create(
+        tipo="CURSADA",
+        inicio=ahora - timedelta(days=1),
+        fin=ahora + timedelta(days=1),
+        **kwargs,
+    )
+
+
+class CursadaInscripcionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from academia_core.models import Correlatividad
+
+        prof = Profesorado.objects.create(nombre="Prof Cursada")
+        cls.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="C/1")
+        cls.a = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Pedagogía", anio="1°", cuatrimestre="1"
+        )
+        cls.b = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Didáctica", anio="2°", cuatrimestre="1"
+        )
+        cls.c = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Práctica", anio="2°", cuatrimestre="2"
+        )
+        Correlatividad.objects.create(
+            plan=cls.plan,
+            espacio=cls.b,
+            tipo="CURSAR",
+            requisito="REGULARIZADA",
+            requiere_espacio=cls.a,
+        )
+        Correlatividad.objects.create(
+            plan=cls.plan,
+            espacio=cls.c,
+            tipo="CURSAR",
+            requisito="APROBADA",
+            requiere_todos_hasta_anio=1,
+        )
+        cls.est = Estudiante.objects.create(dni="35000000", apellido="Cur", nombre="Sa")
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=cls.est, profesorado=prof, plan=cls.plan, cohorte=2024
+        )
+        regular = Condicion.objects.create(
+            codigo="REGULAR", nombre="Regular", tipo="REG"
+        )
+        Movimiento.objects.create(
+            inscripcion=insc, espacio=cls.a, tipo="REG", condicion=regular
+        )
+        cls.user = User.objects.create_superuser(username="admin_cur", password="x")
+        _ventana_cursada_abierta()
+
+    def setUp(self):
+        from academia_core import ventanas
+
+        ventanas.invalidar()  # setUpTestData no dispara on_commit
+
+    def test_habilitados_sync_y_async_coinciden(self):
+        from asgiref.sync import async_to_sync
+
+        from academia_core import cursada
+
+        items = {
+            i["id"]: i for i in cursada.espacios_habilitados(self.est.id, self.plan.id)
+        }
+        self.assertEqual(items[self.a.id]["bloqueo"], "ya_regular")
+        self.assertTrue(items[self.b.id]["habilitado"])
+        self.assertEqual(
+            items[self.c.id]["bloqueo"]["faltantes"][0]["requiere_todos_hasta_anio"], 1
+        )
+        asincronos = async_to_sync(cursada.aespacios_habilitados)(
+            self.est.id, self.plan.id
+        )
+        self.assertEqual(list(items.values()), asincronos)
+
+    def test_inscribir_sync(self):
+        self.client.force_login(self.user)
+        url = reverse("ui:api_cursada_inscribir")
+        datos = {"estudiante_id": self.est.id, "plan_id": self.plan.id}
+        response = self.client.post(url, {**datos, "espacio_id": self.b.id})
+        self.assertEqual(response.status_code, 201, response.content)
+        insc = InscripcionEspacio.objects.get()
+        self.assertEqual(insc.espacio, self.b)
+        self.assertEqual(insc.estado_logs.get().usuario, self.user)
+
+        # repetirla devuelve la misma inscripción
+        response = self.client.post(url, {**datos, "espacio_id": self.b.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], insc.id)
+        self.assertFalse(response.json()["creada"])
+        response = self.client.post(url, {**datos, "espacio_id": self.c.id})
+        self.assertEqual(response.json()["error"]["motivo"], "falta_correlativas")
+
+        response = self.client.get(
+            reverse("ui:api_cursada_habilitados"),
+            {"est": self.est.id, "plan": self.plan.id},
+        )
+        items = {i["id"]: i for i in response.json()["items"]}
+        self.assertEqual(items[self.b.id]["bloqueo"], "ya_inscripto")
+
+    async def test_inscribir_async(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            reverse("ui:api_async_cursada_inscribir"),
+            {
+                "estudiante_id": self.est.id,
+                "plan_id": self.plan.id,
+                "espacio_id": self.b.id,
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(
+            await InscripcionEspacio.objects.filter(pk=response.json()["id"]).aexists()
+        )
+        response = await self.async_client.get(
+            reverse("ui:api_async_cursada_habilitados"),
+            {"est": self.est.id, "plan": self.plan.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 3)
+
+    def test_idempotency_key(self):
+        from academia_core.models import ClaveIdempotencia
+
+        self.client.force_login(self.user)
+        url = reverse("ui:api_cursada_inscribir")
+        datos = {
+            "estudiante_id": self.est.id,
+            "plan_id": self.plan.id,
+            "espacio_id": self.b.id,
+        }
+        primera = self.client.post(url, datos, HTTP_IDEMPOTENCY_KEY="k-1")
+        self.assertEqual(primera.status_code, 201)
+        with self.assertNumQueries(2):  # sesión + clave guardada
+            reintento = self.client.post(url, datos, HTTP_IDEMPOTENCY_KEY="k-1")
+        self.assertEqual(reintento.status_code, 201)
+        self.assertEqual(reintento.json(), primera.json())
+        self.assertEqual(ClaveIdempotencia.objects.count(), 1)
+
+        otra = self.client.post(
+            url, {**datos, "espacio_id": self.c.id}, HTTP_IDEMPOTENCY_KEY="k-1"
+        )
+        self.assertEqual(otra.status_code, 422)
+
+    def test_purgar_idempotencia(self):
+        from datetime import timedelta
+        from io import StringIO
+
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        from academia_core.models import ClaveIdempotencia
+
+        self.client.force_login(self.user)
+        url = reverse("ui:api_cursada_inscribir")
+        for clave, esp in (("vieja", self.b), ("nueva", self.c)):
+            datos = {
+                "estudiante_id": self.est.id,
+                "plan_id": self.plan.id,
+                "espacio_id": esp.id,
+            }
+            self.client.post(url, datos, HTTP_IDEMPOTENCY_KEY=clave)
+        ClaveIdempotencia.objects.filter(clave="vieja").update(
+            creado=timezone.now() - timedelta(hours=25)
+        )
+        salida = StringIO()
+        call_command("purgar_idempotencia", stdout=salida)
+        self.assertIn("1 claves", salida.getvalue())
+        self.assertEqual(
+            list(ClaveIdempotencia.objects.values_list("clave", flat=True)), ["nueva"]
+        )
+
+    def test_estudiante_solo_opera_sobre_si_mismo(self):
+        from django.contrib.auth.models import Group
+
+        otro = Estudiante.objects.create(dni="35000001", apellido="Otro", nombre="Est")
+        alumno = User.objects.create_user(username="alumno_cur", password="x")
+        alumno.groups.add(Group.objects.create(name="Estudiante"))
+        alumno.perfil.estudiante = self.est
+        alumno.perfil.save()
+        self.client.force_login(alumno)
+        url = reverse("ui:api_cursada_habilitados")
+        self.assertEqual(
+            self.client.get(
+                url, {"est": self.est.id, "plan": self.plan.id}
+            ).status_code,
+            200,
+        )
+        self.assertEqual(
+            self.client.get(url, {"est": otro.id, "plan": self.plan.id}).status_code,
+            403,
+        )
+
+    def test_staff_con_grupo_de_setup_roles_opera_sobre_cualquiera(self):
+        from django.contrib.auth.models import Group
+
+        staff = User.objects.create_user(
+            username="bedel_mayus", password="x", is_staff=True
+        )
+        staff.groups.add(Group.objects.create(name="BEDEL"))
+        self.client.force_login(staff)
+        datos = {
+            "estudiante_id": self.est.id,
+            "plan_id": self.plan.id,
+            "espacio_id": self.b.id,
+        }
+        alta = self.client.post(reverse("ui:api_cursada_inscribir"), datos)
+        self.assertEqual(alta.status_code, 201)
+        baja = self.client.post(
+            reverse("ui:api_cursada_baja"), {"insc_espacio_id": alta.json()["id"]}
+        )
+        self.assertEqual(baja.status_code, 200)
+
+
+class CursadaConcurrenciaTest(TransactionTestCase):
+    """Requests simultáneos contra el insert-and-catch de cursada._insertar."""
+
+    HILOS = 8
+
+    def setUp(self):
+        from django.db import connection
+
+        if connection.vendor == "sqlite" and (
+            connection.is_in_memory_db()
+            or connection.settings_dict["OPTIONS"].get("transaction_mode")
+            != "IMMEDIATE"
+        ):
+            # sqlite en memoria bloquea la tabla entera entre conexiones, y sin
+            # IMMEDIATE no espera (select_for_update no bloquea en sqlite)
+            self.skipTest("hace falta MySQL o sqlite en archivo con IMMEDIATE")
+        prof = Profesorado.objects.create(nombre="Prof Concurrencia")
+        self.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="K/1")
+        self.esp = EspacioCurricular.objects.create(
+            plan=self.plan, nombre="Pedagogía", anio="1°", cuatrimestre="1"
+        )
+        self.ests = []
+        for i in range(self.HILOS):
+            est = Estudiante.objects.create(
+                dni=f"3600000{i}", apellido=f"Conc{i}", nombre="Est"
+            )
+            EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=prof, plan=self.plan, cohorte=2024
+            )
+            self.ests.append(est)
+        self.user = User.objects.create_superuser(username="admin_conc", password="x")
+        _ventana_cursada_abierta()
+
+    def _en_paralelo(self, estudiantes, clave=None, ciclo=None):
+        import threading
+
+        from django.db import connection
+
+        url = reverse("ui:api_cursada_inscribir")
+        largada = threading.Barrier(len(estudiantes))
+        respuestas, errores = [], []
+
+        def hilo(est):
+            try:
+                cliente = Client()
+                cliente.force_login(self.user)
+                extra = {"HTTP_IDEMPOTENCY_KEY": clave} if clave else {}
+                datos = {
+                    "estudiante_id": est.id,
+                    "plan_id": self.plan.id,
+                    "espacio_id": self.esp.id,
+                }
+                if ciclo:
+                    datos["ciclo"] = ciclo
+                largada.wait()
+                respuestas.append(cliente.post(url, datos, **extra))
+            except Exception as e:  # pragma: no cover - se informa abajo
+                errores.append(e)
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=hilo, args=(e,)) for e in estudiantes]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        self.assertEqual(errores, [])
+        return respuestas
+
+    def test_mismo_estudiante(self):
+        respuestas = self._en_paralelo([self.ests[0]] * self.HILOS)
+        self.assertEqual(InscripcionEspacio.objects.count(), 1)
+        codigos = sorted(r.status_code for r in respuestas)
+        self.assertEqual(codigos, [200] * (self.HILOS - 1) + [201])
+        self.assertEqual(
+            {r.json()["id"] for r in respuestas}, {InscripcionEspacio.objects.get().id}
+        )
+
+    def test_mismo_estudiante_con_clave(self):
+        respuestas = self._en_paralelo([self.ests[0]] * self.HILOS, clave="doble")
+        self.assertEqual(InscripcionEspacio.objects.count(), 1)
+        self.assertTrue(all(r.status_code in (200, 201) for r in respuestas))
+
+    def test_cupo_sin_sobreventa(self):
+        from academia_core.models import CupoEspacio, ListaEspera
+
+        cupo = CupoEspacio.objects.create(espacio=self.esp, anio_academico=2025, cupo=3)
+        respuestas = self._en_paralelo(self.ests, ciclo=2025)
+        codigos = sorted(r.status_code for r in respuestas)
+        self.assertEqual(codigos, [201] * 3 + [202] * (self.HILOS - 3))
+        cupo.refresh_from_db()
+        self.assertEqual(cupo.ocupados, 3)
+        self.assertEqual(cupo.inscriptos_en_curso(), 3)
+        self.assertEqual(ListaEspera.objects.count(), self.HILOS - 3)
+        posiciones = sorted(
+            r.json()["posicion"] for r in respuestas if r.status_code == 202
+        )
+        self.assertEqual(posiciones, list(range(1, self.HILOS - 2)))
+
+    def test_distintos_estudiantes(self):
+        respuestas = self._en_paralelo(self.ests)
+        self.assertEqual([r.status_code for r in respuestas], [201] * self.HILOS)
+        self.assertEqual(InscripcionEspacio.objects.count(), self.HILOS)
+
+
+class VentanasTest(TestCase):
+    def setUp(self):
+        from academia_core import ventanas
+
+        self.prof = Profesorado.objects.create(nombre="Prof Ventanas")
+        self.otro_prof = Profesorado.objects.create(nombre="Otro Prof")
+        self.plan = PlanEstudios.objects.create(profesorado=self.prof, resolucion="V/1")
+        self.otro_plan = PlanEstudios.objects.create(
+            profesorado=self.otro_prof, resolucion="V/2"
+        )
+        ventanas.invalidar()
+
+    def _crear(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return _ventana_cursada_abierta(**kwargs)
+
+    def test_alcance_por_plan_y_profesorado(self):
+        from academia_core import ventanas
+
+        self.assertFalse(ventanas.abierta(ventanas.CURSADA, plan_id=self.plan.id))
+        self._crear(profesorado=self.prof)
+        self.assertTrue(ventanas.abierta(ventanas.CURSADA, plan_id=self.plan.id))
+        self.assertFalse(ventanas.abierta(ventanas.CURSADA, plan_id=self.otro_plan.id))
+        self.assertFalse(ventanas.abierta(ventanas.FINAL, plan_id=self.plan.id))
+        self.assertTrue(ventanas.abierta(ventanas.CURSADA))  # "alguna abierta"
+
+        self._crear(plan=self.otro_plan)
+        self.assertTrue(ventanas.abierta(ventanas.CURSADA, plan_id=self.otro_plan.id))
+        self.assertTrue(
+            ventanas.abierta(ventanas.CURSADA, profesorado_id=self.otro_prof.id)
+        )
+
+    def test_sin_consultas_una_vez_cargadas(self):
+        from datetime import timedelta
+
+        from academia_core import ventanas
+
+        v = self._crear()
+        ventanas.abierta(ventanas.CURSADA)
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                self.assertTrue(
+                    ventanas.abierta(ventanas.CURSADA, plan_id=self.plan.id)
+                )
+            # abrir/cerrar por reloj tampoco consulta
+            self.assertFalse(
+                ventanas.abierta(ventanas.CURSADA, cuando=v.fin + timedelta(seconds=1))
+            )
+            self.assertEqual(
+                ventanas.proxima(
+                    ventanas.CURSADA, cuando=v.inicio - timedelta(days=1)
+                ).id,
+                v.id,
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            v.delete()
+        self.assertFalse(ventanas.abierta(ventanas.CURSADA))
+
+    def test_inscribir_fuera_de_ventana(self):
+        from academia_core import cursada
+
+        esp = EspacioCurricular.objects.create(
+            plan=self.plan, nombre="Pedagogía", anio="1°", cuatrimestre="1"
+        )
+        with self.assertRaises(cursada.InscripcionRechazada) as ctx:
+            cursada.inscribir(1, self.plan.id, esp.id)
+        self.assertEqual(
+            (ctx.exception.error, ctx.exception.status), ("ventana_cerrada", 403)
+        )
+
+
+class CupoListaEsperaTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from academia_core.models import CupoEspacio
+
+        prof = Profesorado.objects.create(nombre="Prof Cupo")
+        cls.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="Q/1")
+        cls.esp = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Laboratorio", anio="1°", cuatrimestre="1"
+        )
+        cls.ests = []
+        for i in range(3):
+            est = Estudiante.objects.create(
+                dni=f"3700000{i}", apellido=f"Cupo{i}", nombre="Est"
+            )
+            EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=prof, plan=cls.plan, cohorte=2024
+            )
+            cls.ests.append(est)
+        cls.cupo = CupoEspacio.objects.create(
+            espacio=cls.esp, anio_academico=2025, cupo=1
+        )
+        cls.user = User.objects.create_superuser(username="admin_cupo", password="x")
+        _ventana_cursada_abierta()
+
+    def setUp(self):
+        from academia_core import ventanas
+
+        ventanas.invalidar()
+        self.client.force_login(self.user)
+
+    def _inscribir(self, est):
+        return self.client.post(
+            reverse("ui:api_cursada_inscribir"),
+            {
+                "estudiante_id": est.id,
+                "plan_id": self.plan.id,
+                "espacio_id": self.esp.id,
+                "ciclo": 2025,
+            },
+        )
+
+    def test_espera_y_promocion_por_baja(self):
+        from academia_core.models import ListaEspera
+
+        primera = self._inscribir(self.ests[0])
+        self.assertEqual(primera.status_code, 201)
+        self.assertEqual(self._inscribir(self.ests[1]).json()["posicion"], 1)
+        self.assertEqual(self._inscribir(self.ests[2]).json()["posicion"], 2)
+        # reintentar no duplica el lugar en la espera
+        self.assertEqual(self._inscribir(self.ests[1]).json()["posicion"], 1)
+        # el ya inscripto recibe su inscripción aunque no haya cupo
+        self.assertEqual(
+            self._inscribir(self.ests[0]).json()["id"], primera.json()["id"]
+        )
+
+        baja = self.client.post(
+            reverse("ui:api_cursada_baja"), {"insc_espacio_id": primera.json()["id"]}
+        )
+        self.assertEqual(baja.status_code, 200)
+        promovida = InscripcionEspacio.objects.get(pk=baja.json()["promovida"])
+        self.assertEqual(promovida.inscripcion.estudiante, self.ests[1])
+        self.assertEqual(promovida.estado_logs.get().nota, "Alta desde lista de espera")
+        self.assertEqual(
+            list(ListaEspera.objects.values_list("inscripcion__estudiante", flat=True)),
+            [self.ests[2].id],
+        )
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 1)
+
+        # repetir la baja no libera otro lugar
+        baja = self.client.post(
+            reverse("ui:api_cursada_baja"), {"insc_espacio_id": primera.json()["id"]}
+        )
+        self.assertIsNone(baja.json()["promovida"])
+        self.assertEqual(ListaEspera.objects.count(), 1)
+
+    def test_baja_sin_espera_libera_el_lugar(self):
+        from academia_core import cursada
+
+        insc = self._inscribir(self.ests[0]).json()["id"]
+        obj, promovida = cursada.dar_de_baja(insc)
+        self.assertIsNone(promovida)
+        self.assertEqual(obj.estado, "BAJA")
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 0)
+        self.assertEqual(self._inscribir(self.ests[1]).status_code, 201)
+
+    def _admin_post(self, url, est, estado="EN_CURSO", **extra):
+        datos = {
+            "inscripcion": est.inscripciones_carrera.get().id,
+            "espacio": self.esp.id,
+            "anio_academico": 2025,
+            "estado": estado,
+            "fecha_baja": "",
+            "motivo_baja": "",
+            **extra,
+        }
+        return self.client.post(url, datos)
+
+    def test_admin_mantiene_el_contador(self):
+        from datetime import date
+
+        add = reverse("admin:academia_core_inscripcionespacio_add")
+        self.assertEqual(self._admin_post(add, self.ests[0]).status_code, 302)
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 1)
+
+        # lleno: el admin no sobrevende
+        response = self._admin_post(add, self.ests[1])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "no tiene cupo libre")
+        self.assertEqual(InscripcionEspacio.objects.count(), 1)
+
+        # baja y reactivación
+        obj = InscripcionEspacio.objects.get()
+        change = reverse("admin:academia_core_inscripcionespacio_change", args=[obj.pk])
+        hoy = date.today().isoformat()
+        self._admin_post(change, self.ests[0], "BAJA", fecha_baja=hoy)
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 0)
+        self.assertEqual(self._inscribir(self.ests[1]).status_code, 201)
+        response = self._admin_post(change, self.ests[0])
+        self.assertContains(response, "no tiene cupo libre")
+        obj.refresh_from_db()
+        self.assertEqual(obj.estado, "BAJA")
+
+        # borrar una cursada en curso libera el lugar
+        otra = InscripcionEspacio.objects.get(estado="EN_CURSO")
+        delete = reverse(
+            "admin:academia_core_inscripcionespacio_delete", args=[otra.pk]
+        )
+        self.client.post(delete, {"post": "yes"})
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 0)
+        self._admin_post(change, self.ests[0])
+        obj.refresh_from_db()
+        self.assertEqual(obj.estado, "EN_CURSO")
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 1)
+
+        # una cursada finalizada ya no ocupa lugar: borrarla no lo libera
+        fin = InscripcionEspacio.objects.create(
+            inscripcion=self.ests[1].inscripciones_carrera.get(),
+            espacio=self.esp,
+            anio_academico=2025,
+            estado="FINALIZADA",
+        )
+        delete = reverse("admin:academia_core_inscripcionespacio_delete", args=[fin.pk])
+        self.client.post(delete, {"post": "yes"})
+        self.assertFalse(InscripcionEspacio.objects.filter(pk=fin.pk).exists())
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 1)
+
+
+class SalaDeEsperaTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import Group
+        from django.core.cache import cache
+
+        cache.clear()  # lugares y contadores de la fila de otros tests
+
+        prof = Profesorado.objects.create(nombre="Prof Sala")
+        self.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="S/1")
+        grupo = Group.objects.create(name="Estudiante")
+        self.clientes = []
+        for i in range(2):
+            est = Estudiante.objects.create(
+                dni=f"3800000{i}", apellido=f"Sala{i}", nombre="Est"
+            )
+            EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=prof, plan=self.plan, cohorte=2024
+            )
+            user = User.objects.create_user(username=f"sala{i}", password="x")
+            user.groups.add(grupo)
+            user.perfil.estudiante = est
+            user.perfil.save()
+            cliente = Client()
+            cliente.force_login(user)
+            self.clientes.append((cliente, est))
+        self.url = reverse("ui:api_cursada_habilitados")
+        self.estado_url = reverse("ui:api_admision_estado")
+
+    def _get(self, i):
+        cliente, est = self.clientes[i]
+        return cliente.get(self.url, {"est": est.id, "plan": self.plan.id})
+
+    def test_admite_n_y_hace_esperar_al_resto(self):
+        from academia_core import admision
+
+        with self.settings(ADMISION_POR_PROFESORADO=1):
+            self.assertEqual(self._get(0).status_code, 200)
+            espera = self._get(1)
+            self.assertEqual(espera.status_code, 503)
+            self.assertEqual(espera["Retry-After"], str(admision.ENCUESTA))
+            self.assertEqual(espera.json()["posicion"], 1)
+
+            segundo = self.clientes[1][0]
+            with self.assertNumQueries(0):  # la consulta no toca sesión ni base
+                estado = segundo.get(self.estado_url)
+            self.assertFalse(estado.json()["admitido"])
+
+            # el primero deja de usar el sitio (vence su lugar)
+            primero = self.clientes[0][0]
+            usuario = User.objects.get(username="sala0").pk
+            ticket = admision.Ticket.leer(primero.cookies["admision"].value, usuario)
+            admision.liberar(ticket)
+            self.assertTrue(segundo.get(self.estado_url).json()["admitido"])
+            self.assertEqual(self._get(1).status_code, 200)
+            # el primero perdió el lugar: vuelve a la fila
+            self.assertEqual(self._get(0).status_code, 503)
+            pagina = primero.get(reverse("ui:inscribir_materias"))
+            self.assertEqual(pagina.status_code, 503)
+            self.assertContains(pagina, self.estado_url, status_code=503)
+
+    def test_inactiva_personal_y_ticket_falsificado(self):
+        self.assertEqual(self._get(0).status_code, 200)
+        self.assertEqual(self._get(1).status_code, 200)  # sin ADMISION: no hay fila
+        with self.settings(ADMISION_POR_PROFESORADO=1):
+            staff = Client()
+            staff.force_login(User.objects.create_superuser("sala_admin", "", "x"))
+            cliente, est = self.clientes[0]
+            self.assertEqual(
+                staff.get(self.url, {"est": est.id, "plan": self.plan.id}).status_code,
+                200,
+            )
+            self.assertEqual(self._get(0).status_code, 200)
+            # un ticket alterado no vale: el segundo no puede "robar" el lugar
+            segundo = self.clientes[1][0]
+            segundo.cookies["admision"] = cliente.cookies["admision"].value + "x"
+            self.assertEqual(self._get(1).status_code, 503)
+            self.assertEqual(Client().get(self.estado_url).status_code, 400)
+
+    def test_personal_no_hace_fila_y_logout_libera(self):
+        from django.contrib.auth.models import Group
+
+        grupo = Group.objects.create(name="BEDEL")
+        staff = []
+        for i in range(2):
+            user = User.objects.create_user(
+                username=f"sala_bedel{i}", password="x", is_staff=True
+            )
+            user.groups.add(grupo)
+            cliente = Client()
+            cliente.force_login(user)
+            staff.append(cliente)
+        est = self.clientes[0][1]
+        with self.settings(ADMISION_POR_PROFESORADO=1):
+            for cliente in staff:
+                response = cliente.get(self.url, {"est": est.id, "plan": self.plan.id})
+                self.assertEqual(response.status_code, 200)
+
+            self.assertEqual(self._get(0).status_code, 200)
+            self.assertEqual(self._get(1).status_code, 503)
+            self.clientes[0][0].post(reverse("logout"))
+            segundo = self.clientes[1][0]
+            self.assertTrue(segundo.get(self.estado_url).json()["admitido"])
+
+    def test_ticket_compartido_no_admite_a_otro(self):
+        with self.settings(ADMISION_POR_PROFESORADO=1):
+            self.assertEqual(self._get(0).status_code, 200)
+            admitido = self.clientes[0][0].cookies["admision"].value
+            segundo = self.clientes[1][0]
+            segundo.cookies["admision"] = admitido
+            self.assertEqual(self._get(1).status_code, 503)
+            segundo.cookies["admision"] = admitido
+            estado = segundo.get(self.estado_url)
+            self.assertEqual(estado.json()["error"], "sin_ticket")
+            # el dueño sigue adentro
+            self.assertEqual(self._get(0).status_code, 200)
+
+
+class InscripcionCohorteTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from academia_core.models import Correlatividad, CupoEspacio
+
+        cls.prof = Profesorado.objects.create(nombre="Prof Cohorte")
+        cls.plan = PlanEstudios.objects.create(profesorado=cls.prof, resolucion="C/1")
+        cls.esp1 = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Pedagogía", anio="1°", cuatrimestre="1"
+        )
+        cls.esp_cupo = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Taller", anio="1°", cuatrimestre="2"
+        )
+        cls.esp2 = EspacioCurricular.objects.create(
+            plan=cls.plan, nombre="Didáctica", anio="2°", cuatrimestre="1"
+        )
+        Correlatividad.objects.create(
+            plan=cls.plan,
+            espacio=cls.esp2,
+            tipo="CURSAR",
+            requisito="REGULARIZADA",
+            requiere_todos_hasta_anio=1,
+        )
+        cls.cupo = CupoEspacio.objects.create(
+            espacio=cls.esp_cupo, anio_academico=2025, cupo=4
+        )
+        cls.inscs = {}
+        for cohorte, n in ((2025, 6), (2026, 20)):
+            for i in range(n):
+                est = Estudiante.objects.create(
+                    dni=f"39{cohorte}{i:03d}", apellido=f"Coh{i}", nombre="Est"
+                )
+                cls.inscs.setdefault(cohorte, []).append(
+                    EstudianteProfesorado.objects.create(
+                        estudiante=est,
+                        profesorado=cls.prof,
+                        plan=cls.plan,
+                        cohorte=cohorte,
+                    )
+                )
+
+    def _inscribir(self, cohorte, espacios, ciclo=2025):
+        from academia_core import cursada
+
+        return cursada.inscribir_cohorte(
+            self.prof.id, self.plan.id, cohorte, espacios, ciclo=ciclo
+        )
+
+    def test_lote_con_existentes_baja_cupo_y_correlativas(self):
+        from academia_core.models import InscripcionEspacioEstadoLog, ListaEspera
+
+        inscs = self.inscs[2025]
+        InscripcionEspacio.objects.create(
+            inscripcion=inscs[0], espacio=self.esp1, anio_academico=2025
+        )
+        InscripcionEspacio.objects.create(
+            inscripcion=inscs[1],
+            espacio=self.esp1,
+            anio_academico=2025,
+            estado="BAJA",
+            fecha_baja="2099-01-01",
+        )
+        res = self._inscribir(2025, [self.esp1.id, self.esp_cupo.id, self.esp2.id])
+
+        self.assertEqual(res.estudiantes, 6)
+        self.assertEqual(res.existentes, 1)
+        self.assertEqual(res.creadas, 4 + 4)  # esp1: 6 - existente - baja
+        self.assertEqual(res.en_espera, 2)
+        self.assertEqual(
+            res.rechazadas[inscs[1].estudiante_id, self.esp1.id], "dada_de_baja"
+        )
+        self.assertEqual(
+            res.rechazadas[inscs[2].estudiante_id, self.esp2.id]["motivo"],
+            "falta_correlativas",
+        )
+        self.assertEqual(
+            InscripcionEspacioEstadoLog.objects.filter(
+                insc_espacio__espacio__plan=self.plan
+            ).count(),
+            8,
+        )
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 4)
+        self.assertEqual(ListaEspera.objects.filter(espacio=self.esp_cupo).count(), 2)
+
+        # repetirla no duplica nada
+        otra = self._inscribir(2025, [self.esp1.id, self.esp_cupo.id])
+        self.assertEqual((otra.creadas, otra.existentes), (0, 9))
+        self.cupo.refresh_from_db()
+        self.assertEqual(self.cupo.ocupados, 4)
+
+    def test_consultas_no_dependen_del_tamano(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as chica:
+            self._inscribir(2025, [self.esp1.id], ciclo=2030)
+        with CaptureQueriesContext(connection) as grande:
+            res = self._inscribir(2026, [self.esp1.id], ciclo=2030)
+        self.assertEqual(res.creadas, 20)
+        self.assertEqual(len(chica), len(grande))
+
+    def test_espacio_de_otro_plan(self):
+        from academia_core import cursada
+
+        otro = PlanEstudios.objects.create(profesorado=self.prof, resolucion="C/2")
+        ajeno = EspacioCurricular.objects.create(
+            plan=otro, nombre="Ajeno", anio="1°", cuatrimestre="1"
+        )
+        with self.assertRaises(cursada.InscripcionRechazada):
+            self._inscribir(2025, [ajeno.id])
+        self.assertFalse(InscripcionEspacio.objects.exists())
+
+
+class CierreCicloTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        prof = Profesorado.objects.create(nombre="Prof Cierre")
+        cls.prof = prof
+        plan = PlanEstudios.objects.create(profesorado=prof, resolucion="Z/1")
+        cls.esp = EspacioCurricular.objects.create(
+            plan=plan, nombre="Filosofía", anio="1°", cuatrimestre="A"
+        )
+        regular = Condicion.objects.create(
+            codigo="REGULAR", nombre="Regular", tipo="REG"
+        )
+        cls.cursadas = []
+        for i in range(4):
+            est = Estudiante.objects.create(
+                dni=f"4200000{i}", apellido=f"Cierre{i}", nombre="Est"
+            )
+            insc = EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=prof, plan=plan, cohorte=2023
+            )
+            cls.cursadas.append(
+                InscripcionEspacio.objects.create(
+                    inscripcion=insc, espacio=cls.esp, anio_academico=2023
+                )
+            )
+        # 0: REG del ciclo; 1: REG de un cursado anterior (no cuenta); 2: de baja
+        for c, fecha in (
+            (cls.cursadas[0], "2023-11-30"),
+            (cls.cursadas[1], "2021-11-30"),
+        ):
+            Movimiento.objects.create(
+                inscripcion=c.inscripcion,
+                espacio=cls.esp,
+                tipo="REG",
+                fecha=fecha,
+                condicion=regular,
+            )
+        InscripcionEspacio.objects.filter(pk=cls.cursadas[2].pk).update(
+            estado="BAJA", fecha_baja="2099-01-01"
+        )
+
+    def _estados(self):
+        return [InscripcionEspacio.objects.get(pk=c.pk).estado for c in self.cursadas]
+
+    def test_dry_run_no_escribe(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        salida = StringIO()
+        call_command("cerrar_ciclo", "2023", "--dry-run", stdout=salida)
+        self.assertIn("cambiarían 1 finalizadas, 2 bajas", salida.getvalue())
+        self.assertIn("Prof Cierre: 1 finalizadas, 2 bajas", salida.getvalue())
+        self.assertEqual(self._estados(), ["EN_CURSO", "EN_CURSO", "BAJA", "EN_CURSO"])
+
+    def test_cierre_por_conjunto_y_logs(self):
+        from academia_core import cursada
+        from academia_core.models import InscripcionEspacioEstadoLog
+
+        with self.assertNumQueries(9):  # resumen, atomic, 2 selects, 2x(update+logs)
+            resumen = cursada.cerrar_ciclo(2023, ejecutar=True)
+        self.assertEqual((resumen.finalizadas, resumen.bajas), (1, 2))
+        self.assertEqual(self._estados(), ["FINALIZADA", "BAJA", "BAJA", "BAJA"])
+        baja = InscripcionEspacio.objects.get(pk=self.cursadas[3].pk)
+        self.assertEqual(baja.motivo_baja, "Cierre del ciclo 2023")
+        self.assertIsNotNone(baja.fecha_baja)
+        self.assertEqual(
+            InscripcionEspacioEstadoLog.objects.filter(
+                nota__startswith="Cierre del ciclo 2023"
+            ).count(),
+            3,
+        )
+        # repetirlo no cambia nada
+        self.assertFalse(cursada.cerrar_ciclo(2023, ejecutar=True).ejecutado)
+
+    def test_no_cierra_el_anio_en_curso_sin_forzar(self):
+        from datetime import date
+
+        from django.core.management import CommandError, call_command
+
+        with self.assertRaises(CommandError):
+            call_command("cerrar_ciclo", str(date.today().year))
+
+
+class MesasPlanificacionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        prof = Profesorado.objects.create(nombre="Prof Mesas")
+        plan = PlanEstudios.objects.create(profesorado=prof, resolucion="M/1")
+        cls.prof = prof
+        cls.esps = [
+            EspacioCurricular.objects.create(
+                plan=plan, nombre=f"Mesa {i}", anio="1°", cuatrimestre="1"
+            )
+            for i in range(4)
+        ]
+        regular = Condicion.objects.create(
+            codigo="REGULAR", nombre="Regular", tipo="REG"
+        )
+        # est0: 0,1,2 (triángulo); est1: 2,3; est2: 3 aprobada por final; est3: 0 vencida
+        casos = {
+            0: [(0, "2024-11-01"), (1, "2024-11-01"), (2, "2024-11-01")],
+            1: [(2, "2024-11-01"), (3, "2024-11-01")],
+            2: [(3, "2024-11-01")],
+            3: [(0, "2020-11-01")],
+        }
+        cls.ests = []
+        for i, movs in casos.items():
+            est = Estudiante.objects.create(
+                dni=f"4300000{i}", apellido=f"Mesa{i}", nombre="Est"
+            )
+            insc = EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=prof, plan=plan, cohorte=2023
+            )
+            cls.ests.append(est)
+            for esp, fecha in movs:
+                Movimiento.objects.create(
+                    inscripcion=insc,
+                    espacio=cls.esps[esp],
+                    tipo="REG",
+                    fecha=fecha,
+                    condicion=regular,
+                )
+            if i == 2:
+                Movimiento.objects.create(
+                    inscripcion=insc,
+                    espacio=cls.esps[3],
+                    tipo="FIN",
+                    fecha="2025-02-20",
+                    condicion=regular,  # como lo lee cursada._armar_estado
+                    nota_num=8,
+                )
+
+    def test_pendientes_y_calendario_sin_choques(self):
+        from datetime import date
+
+        from academia_core import mesas
+
+        with self.assertNumQueries(1):
+            pend = mesas.pendientes(date(2025, 7, 1), profesorado_id=self.prof.id)
+        e = [x.id for x in self.esps]
+        s = [x.id for x in self.ests]
+        self.assertEqual(
+            pend,
+            {e[0]: {s[0]}, e[1]: {s[0]}, e[2]: {s[0], s[1]}, e[3]: {s[1]}},
+        )
+
+        turno = mesas.Turno(date(2025, 7, 7), date(2025, 7, 11))  # lun a vie
+        propuesta = mesas.planificar(turno, profesorado_id=self.prof.id)
+        self.assertEqual(propuesta.sin_fecha, [])
+        fechas = propuesta.asignacion
+        self.assertEqual(len({fechas[e[0]], fechas[e[1]], fechas[e[2]]}), 3)
+        self.assertNotEqual(fechas[e[2]], fechas[e[3]])
+        # con tres días, los finales del triángulo quedan separados al máximo
+        self.assertEqual(
+            sorted([fechas[e[0]], fechas[e[1]], fechas[e[2]]]),
+            [date(2025, 7, 7), date(2025, 7, 9), date(2025, 7, 11)],
+        )
+
+    def test_dsatur_sin_fechas_suficientes_y_tope_por_dia(self):
+        from datetime import date, timedelta
+
+        from academia_core import mesas
+
+        triangulo = {1: {2, 3}, 2: {1, 3}, 3: {1, 2}, 4: set()}
+        fechas = [date(2025, 7, 7), date(2025, 7, 8)]
+        color, sin_fecha = mesas.asignar(triangulo, fechas)
+        self.assertEqual(len(sin_fecha), 1)
+        self.assertEqual(len(color), 3)
+        color, sin_fecha = mesas.asignar({1: set(), 2: set(), 3: set()}, fechas, 1)
+        self.assertEqual(len(sin_fecha), 1)
+
+        # un instituto entero: 600 mesas, miles de pares en conflicto
+        import random
+        import time
+
+        rnd = random.Random(7)
+        estudiantes = {e: set() for e in range(600)}
+        for est in range(4000):
+            for esp in rnd.sample(range(600), 4):
+                estudiantes[esp].add(est)
+        vecinos = mesas.grafo(estudiantes)
+        fechas = [date(2025, 7, 1) + timedelta(days=i) for i in range(60)]
+        t0 = time.perf_counter()
+        color, sin_fecha = mesas.asignar(vecinos, fechas)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(sin_fecha, [])
+        for v, vs in vecinos.items():
+            self.assertTrue(all(color[v] != color[w] for w in vs))
+
+    def test_comando(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        salida = StringIO()
+        call_command(
+            "planificar_mesas",
+            "--desde=2025-07-07",
+            "--hasta=2025-07-11",
+            f"--profesorado={self.prof.id}",
+            "--excluir",
+            "2025-07-09",
+            stdout=salida,
+        )
+        self.assertIn("4 mesas", salida.getvalue())
+        self.assertNotIn("09/07/2025", salida.getvalue())
+
+
+class HorariosGeneradorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import time
+
+        from academia_core.models import DocenteEspacio, Horario
+
+        prof = Profesorado.objects.create(nombre="Prof Horarios")
+        cls.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="H/1")
+        otro = PlanEstudios.objects.create(profesorado=prof, resolucion="H/2")
+
+        def esp(plan, nombre, anio, cuatri, horas):
+            return EspacioCurricular.objects.create(
+                plan=plan, nombre=nombre, anio=anio, cuatrimestre=cuatri, horas=horas
+            )
+
+        cls.primero = [esp(cls.plan, f"P{i}", "1°", "1", 4) for i in range(4)]
+        cls.anual = esp(cls.plan, "Práctica I", "1°", "A", 3)
+        cls.segundo = [esp(cls.plan, f"S{i}", "2°", "1", 3) for i in range(3)]
+        cls.segundo_cuatri = esp(cls.plan, "Otro cuatri", "1°", "2", 4)
+        ajeno = esp(otro, "Ajeno", "1°", "1", 3)
+
+        cls.docente = Docente.objects.create(
+            dni="900", apellido="Compartido", nombre="D"
+        )
+        for e in (cls.primero[0], cls.segundo[0], ajeno):
+            DocenteEspacio.objects.create(docente=cls.docente, espacio=e)
+        # el docente ya da clase en otro plan el lunes de 18 a 20
+        Horario.objects.create(
+            espacio=ajeno,
+            dia_semana=1,
+            hora_inicio=time(18, 0),
+            hora_fin=time(20, 0),
+            docente=cls.docente,
+        )
+
+    def _choca(self, a, b):
+        return (
+            a["dia_semana"] == b["dia_semana"]
+            and a["hora_inicio"] < b["hora_fin"]
+            and b["hora_inicio"] < a["hora_fin"]
+        )
+
+    def test_genera_sin_choques_y_publica(self):
+        from datetime import time
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from academia_core import horarios, plan_bundle
+        from academia_core.models import Horario
+
+        res = horarios.generar(self.plan.id, "1", segundos=2, semilla=1)
+        self.assertEqual(res.conflictos, 0)
+        bloques = res.bloques()
+        anios = {e.id: e.anio for e in [*self.primero, self.anual, *self.segundo]}
+        self.assertNotIn(self.segundo_cuatri.id, {b["espacio_id"] for b in bloques})
+        fijo = {"dia_semana": 1, "hora_inicio": time(18), "hora_fin": time(20)}
+        for i, a in enumerate(bloques):
+            if a["docente_id"] == self.docente.id:
+                self.assertFalse(self._choca(a, fijo))
+            for b in bloques[i + 1 :]:
+                if anios[a["espacio_id"]] == anios[b["espacio_id"]] or (
+                    a["docente_id"] and a["docente_id"] == b["docente_id"]
+                ):
+                    self.assertFalse(self._choca(a, b), (a, b))
+                if a["espacio_id"] == b["espacio_id"]:
+                    self.assertNotEqual(a["dia_semana"], b["dia_semana"])
+        # 4 horas cátedra de 40' = 160 minutos por semana
+        p0 = [b for b in bloques if b["espacio_id"] == self.primero[0].id]
+        self.assertEqual(
+            sum(
+                (b["hora_fin"].hour * 60 + b["hora_fin"].minute)
+                - (b["hora_inicio"].hour * 60 + b["hora_inicio"].minute)
+                for b in p0
+            ),
+            160,
+        )
+
+        n = horarios.guardar_borrador(res)
+        self.assertEqual(Horario.objects.filter(borrador=True).count(), n)
+        self.assertEqual(plan_bundle.armar_bundle(self.plan.id)["horarios"], {})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(horarios.publicar([self.primero[0].id]), len(p0))
+        bundle = plan_bundle.armar_bundle(self.plan.id)
+        self.assertEqual(len(bundle["horarios"][str(self.primero[0].id)]), len(p0))
+
+        # el anual ya armado no se regenera en el otro cuatrimestre
+        horarios.publicar([self.anual.id])
+        out = StringIO()
+        call_command(
+            "generar_horarios",
+            plan=self.plan.id,
+            cuatrimestre="2",
+            dry_run=True,
+            stdout=out,
+        )
+        self.assertIn("Otro cuatri", out.getvalue())
+        res2 = horarios.generar(self.plan.id, "2", segundos=1, semilla=1)
+        self.assertEqual(
+            {s.espacio_id for s in res2.sesiones}, {self.segundo_cuatri.id}
+        )
+
+    def test_sin_lugar_devuelve_choques_dentro_del_tiempo(self):
+        import time as reloj
+        from datetime import time
+
+        from academia_core import horarios
+
+        grilla = horarios.Grilla(dias=(1,), inicio=time(18), fin=time(20))  # 3 módulos
+        t0 = reloj.monotonic()
+        res = horarios.generar(self.plan.id, "1", grilla=grilla, segundos=0.3)
+        self.assertLess(reloj.monotonic() - t0, 2)
+        self.assertGreater(res.conflictos, 0)
+        self.assertEqual(horarios.partir(5), [3, 2])
+        self.assertEqual(horarios.partir(4), [2, 2])
+
+
+class SuperposicionesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import date, time
+
+        from academia_core.models import Horario
+
+        prof = Profesorado.objects.create(nombre="Prof Superpos")
+        cls.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="S/1")
+
+        def esp(nombre, cuatri, *bloques, borrador=False):
+            e = EspacioCurricular.objects.create(
+                plan=cls.plan, nombre=nombre, anio="1°", cuatrimestre=cuatri
+            )
+            for dia, ini, fin in bloques:
+                Horario.objects.create(
+                    espacio=e,
+                    dia_semana=dia,
+                    hora_inicio=time(ini),
+                    hora_fin=time(fin),
+                    borrador=borrador,
+                )
+            return e
+
+        cls.a = esp("A", "1", (1, 18, 20), (3, 18, 20))
+        cls.b = esp("B", "1", (3, 19, 21))
+        cls.c = esp("C", "2", (1, 18, 20))  # otro cuatrimestre
+        cls.d = esp("D", "A", (1, 20, 22))  # empieza cuando termina A
+        cls.e = esp("E", "1", (2, 18, 19))
+        esp("Borrador", "1", (2, 18, 19), borrador=True)
+
+        cls.est = Estudiante.objects.create(dni="36000000", apellido="Sup", nombre="E")
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=cls.est, profesorado=prof, plan=cls.plan, cohorte=2024
+        )
+        InscripcionEspacio.objects.create(
+            inscripcion=insc, espacio=cls.a, anio_academico=date.today().year
+        )
+
+    def test_barrido(self):
+        from academia_core.superposiciones import superposiciones
+
+        bloques = [
+            (1, "1", 0, 120),
+            (2, "1", 60, 180),  # pisa a 1
+            (3, "2", 60, 180),  # otro cuatrimestre
+            (4, "A", 120, 200),  # toca a 1 justo al final y pisa a 2 y 3
+            (5, "1", 1440, 1500),  # martes
+        ]
+        self.assertEqual(superposiciones(bloques), {(1, 2), (2, 4), (3, 4)})
+
+    def test_indice_y_habilitados(self):
+        from asgiref.sync import async_to_sync
+
+        from academia_core import cursada, superposiciones
+        from academia_core.models import Horario
+
+        indice = superposiciones.indice(self.plan.id)
+        self.assertEqual(indice.choques(self.b.id, [self.a.id]), [self.a.id])
+        self.assertEqual(indice.pares([self.a.id, self.c.id, self.d.id, self.e.id]), [])
+        with self.assertNumQueries(0):
+            self.assertIs(superposiciones.indice(self.plan.id), indice)
+
+        items = {
+            i["id"]: i for i in cursada.espacios_habilitados(self.est.id, self.plan.id)
+        }
+        self.assertEqual(items[self.b.id]["superpone_con"], [self.a.id])
+        self.assertEqual(items[self.c.id]["superpone_con"], [])
+        asincronos = async_to_sync(cursada.aespacios_habilitados)(
+            self.est.id, self.plan.id
+        )
+        self.assertEqual(list(items.values()), asincronos)
+
+        # un cambio en Horario renueva la versión del plan y el índice
+        Horario.objects.filter(espacio=self.e).update(dia_semana=1)
+        Horario.objects.filter(espacio=self.e).first().save()
+        nuevo = superposiciones.indice(self.plan.id)
+        self.assertIsNot(nuevo, indice)
+        self.assertEqual(nuevo.choques(self.e.id, [self.a.id, self.c.id]), [self.a.id])
+
+
+class DatosSinteticosTest(TestCase):
+    def _movimientos(self, prof):
+        return list(
+            Movimiento.objects.filter(inscripcion__profesorado=prof)
+            .order_by("id")
+            .values_list(
+                "inscripcion__estudiante__apellido",
+                "espacio__nombre",
+                "tipo",
+                "fecha",
+                "condicion_id",
+                "nota_num",
+            )
+        )
+
+    def test_determinista_y_consistente(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from academia_core import busqueda, cursada, sinteticos
+        from academia_core.models import InscripcionFinal
+
+        salida = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "generar_datos_sinteticos",
+                estudiantes=30,
+                semilla=7,
+                anio=2025,
+                lote=50,
+                stdout=salida,
+            )
+        self.assertIn("filas en", salida.getvalue())
+        with self.captureOnCommitCallbacks(execute=True):
+            segundo = sinteticos.generar(estudiantes=30, semilla=7, anio=2025)
+        primero, otro = Profesorado.objects.filter(
+            nombre__startswith=sinteticos.PREFIJO
+        ).order_by("nombre")
+        self.assertEqual(otro.nombre, f"{sinteticos.PREFIJO} 002")
+        self.assertEqual(segundo.filas["Estudiante"], 30)
+        movs = self._movimientos(primero)
+        self.assertTrue(movs)
+        self.assertEqual(movs, self._movimientos(otro))
+
+        plan = primero.planes.get()
+        self.assertEqual(
+            set(plan.espacios.values_list("anio", flat=True)), {"1°", "2°", "3°", "4°"}
+        )
+        self.assertTrue(plan.correlatividades.exists())
+        # solo el ciclo en curso queda EN_CURSO y cada final tiene su FIN
+        cursadas = InscripcionEspacio.objects.filter(inscripcion__profesorado=primero)
+        self.assertFalse(
+            cursadas.filter(estado="EN_CURSO").exclude(anio_academico=2025)
+        )
+        self.assertFalse(
+            cursadas.filter(fecha_inscripcion__year__gt=2025).exclude(
+                anio_academico=2025
+            )
+        )
+        self.assertEqual(
+            InscripcionFinal.objects.filter(
+                inscripcion_cursada__inscripcion__profesorado=primero
+            ).count(),
+            Movimiento.objects.filter(
+                inscripcion__profesorado=primero, tipo="FIN"
+            ).count(),
+        )
+
+        # los datos se leen con las reglas de siempre y los índices se renovaron
+        aprobado = Movimiento.objects.filter(
+            inscripcion__profesorado=primero, tipo="FIN", nota_num__gte=6
+        ).first()
+        estado = cursada.cargar(aprobado.inscripcion.estudiante_id, plan.id, 2025)[0]
+        self.assertIn(aprobado.espacio_id, estado.aprobadas)
+        self.assertTrue(busqueda.buscar_ids("estudiantes", movs[0][0]))
+
+
+class BenchmarkTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from academia_core import sinteticos
+
+        sinteticos.generar(estudiantes=15, semilla=3)
+
+    def test_guarda_compara_y_no_deja_rastros(self):
+        import json
+        import tempfile
+        from io import StringIO
+        from pathlib import Path
+
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        casos = ["habilitado", "api_espacios_habilitados", "movimiento_full_clean_save"]
+        movimientos = Movimiento.objects.count()
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = Path(tmp) / "base.json"
+            opciones = {"repeticiones": 3, "calentamiento": 0, "baseline": str(ruta)}
+            call_command(
+                "benchmark", *casos, guardar=True, stdout=StringIO(), **opciones
+            )
+            base = json.loads(ruta.read_text())
+            for nombre in casos:
+                self.assertEqual(base["casos"][nombre]["error"], "", nombre)
+                self.assertGreater(base["casos"][nombre]["consultas"], 0)
+                self.assertGreater(base["casos"][nombre]["p95_ms"], 0)
+
+            salida = StringIO()
+            call_command("benchmark", *casos, tolerancia=100, stdout=salida, **opciones)
+            self.assertIn("Sin regresiones", salida.getvalue())
+
+            base["casos"]["habilitado"]["consultas"] = 1
+            base["casos"]["movimiento_full_clean_save"]["p95_ms"] = 0.001
+            ruta.write_text(json.dumps(base))
+            with self.assertRaisesMessage(CommandError, "habilitado: "):
+                call_command("benchmark", *casos, stdout=StringIO(), **opciones)
+
+        # todo corre en una transacción revertida
+        self.assertEqual(Movimiento.objects.count(), movimientos)
+        self.assertFalse(User.objects.filter(username__startswith="bench-").exists())
+
+    def test_percentil(self):
+        from academia_core.benchmarks import percentil
+
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 95), 95)
+        self.assertEqual(percentil([7.0], 95), 7.0)
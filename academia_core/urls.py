@@ -35,6 +35,7 @@ from .views_api import (
     api_get_estudiante_detalle,
     api_get_docente_detalle,
     api_get_espacio_curricular_detalle,
+    api_listar_espacios_curriculares,
     api_get_movimientos_estudiante,
     api_espacios_habilitados,
     api_inscribir_espacio,
@@ -42,6 +43,7 @@ from .views_api import (
     api_get_planes_for_profesorado,
     api_get_espacios_for_plan,
     api_correlatividades_por_materia,  # NEW IMPORT
+    api_exportar,
 )
 
 # CBVs ya existentes
@@ -170,6 +172,11 @@ urlpatterns = [
         api_get_docente_detalle,
         name="api_get_docente_detalle",
     ),
+    path(
+        "api/espacios-curriculares/",
+        api_listar_espacios_curriculares,
+        name="api_listar_espacios_curriculares",
+    ),
     path(
         "api/espacios-curriculares/<int:pk>/",
         api_get_espacio_curricular_detalle,
@@ -203,6 +210,7 @@ urlpatterns = [
         api_get_espacios_for_plan,
         name="api_get_espacios_for_plan",
     ),
+    path("api/exportar/<str:entidad>/", api_exportar, name="api_exportar"),
     # ---------------- Guardados (POST) --------------
     path(
         "panel/inscripciones/<int:insc_prof_id>/cursadas/crear/",
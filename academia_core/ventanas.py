@@ -0,0 +1,166 @@
+# academia_core/ventanas.py
+"""
+Ventanas de inscripción abiertas (VentanaInscripcion), sin consultas por request.
+
+Cada proceso guarda en memoria las ventanas que todavía no terminaron (son
+pocas) y el mapa plan -> profesorado; si una ventana está abierta se decide
+en Python con la hora actual, así que abrir o cerrar "por reloj" no requiere
+recargar nada.
+
+Un cambio en VentanaInscripcion (post_save / post_delete, ver signals.py)
+incrementa una versión en el cache de Django; cada proceso compara esa
+versión (y la de los planes en catalogo.py) con la suya y recarga si
+cambió. Igual que en busqueda.py, con varios workers hace falta un cache
+compartido, y como red de seguridad la copia se recarga cada diez minutos.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import catalogo
+from .models import PlanEstudios, VentanaInscripcion
+
+CURSADA = VentanaInscripcion.Tipo.CURSADA
+FINAL = VentanaInscripcion.Tipo.FINAL
+
+_VERSION_KEY = "ventanas:v"
+_EDAD_MAXIMA = 10 * 60
+
+
+@dataclass(frozen=True)
+class Ventana:
+    id: int
+    tipo: str
+    profesorado_id: Optional[int]
+    plan_id: Optional[int]
+    inicio: datetime
+    fin: datetime
+    descripcion: str
+
+    def abierta(self, cuando: datetime) -> bool:
+        return self.inicio <= cuando < self.fin
+
+
+class _Copia:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.armada = 0.0
+        self.ventanas: Tuple[Ventana, ...] = ()
+        self.planes: Dict[int, int] = {}
+
+
+_copia = _Copia()
+
+
+def _version_cache():
+    v = cache.get(_VERSION_KEY)
+    if v is None:
+        cache.add(_VERSION_KEY, int(time.time() * 1000), None)
+        v = cache.get(_VERSION_KEY)
+    return v, catalogo.version("planes")
+
+
+def invalidar() -> None:
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _vencida(version) -> bool:
+    return _copia.version != version or time.time() - _copia.armada > _EDAD_MAXIMA
+
+
+def _recargar(version) -> None:
+    with _copia.lock:
+        if not _vencida(version):
+            return  # otro thread ya la recargó
+        filas = VentanaInscripcion.objects.filter(fin__gt=timezone.now()).values_list(
+            "id", "tipo", "profesorado_id", "plan_id", "inicio", "fin", "descripcion"
+        )
+        _copia.ventanas = tuple(
+            sorted((Ventana(*f) for f in filas), key=lambda v: v.inicio)
+        )
+        _copia.planes = dict(PlanEstudios.objects.values_list("id", "profesorado_id"))
+        _copia.version, _copia.armada = version, time.time()
+
+
+def _asegurar() -> None:
+    version = _version_cache()
+    if _vencida(version):
+        _recargar(version)
+
+
+async def _aasegurar() -> None:
+    version = _version_cache()
+    if _vencida(version):
+        await sync_to_async(_recargar)(version)
+
+
+def _aplica(v: Ventana, tipo, plan_id, profesorado_id) -> bool:
+    if v.tipo != tipo:
+        return False
+    if plan_id is not None:
+        if v.plan_id:
+            return v.plan_id == plan_id
+        return not v.profesorado_id or v.profesorado_id == _copia.planes.get(plan_id)
+    if profesorado_id is not None:
+        return not v.profesorado_id or v.profesorado_id == profesorado_id
+    return True
+
+
+def _abiertas(tipo, plan_id, profesorado_id, cuando) -> List[Ventana]:
+    cuando = cuando or timezone.now()
+    return [
+        v
+        for v in _copia.ventanas
+        if v.abierta(cuando) and _aplica(v, tipo, plan_id, profesorado_id)
+    ]
+
+
+def abiertas(
+    tipo: str,
+    plan_id: Optional[int] = None,
+    profesorado_id: Optional[int] = None,
+    cuando: Optional[datetime] = None,
+) -> List[Ventana]:
+    """
+    Ventanas de `tipo` abiertas para ese plan/profesorado. Sin plan ni
+    profesorado, todas las abiertas de ese tipo (para el menú).
+    """
+    _asegurar()
+    return _abiertas(tipo, plan_id, profesorado_id, cuando)
+
+
+def abierta(tipo: str, plan_id=None, profesorado_id=None, cuando=None) -> bool:
+    return bool(abiertas(tipo, plan_id, profesorado_id, cuando))
+
+
+async def aabierta(tipo: str, plan_id=None, profesorado_id=None, cuando=None) -> bool:
+    await _aasegurar()
+    return bool(_abiertas(tipo, plan_id, profesorado_id, cuando))
+
+
+def proxima(
+    tipo: str, plan_id=None, profesorado_id=None, cuando=None
+) -> Optional[Ventana]:
+    """La próxima ventana que abre (para avisar "abre el ...")."""
+    _asegurar()
+    cuando = cuando or timezone.now()
+    return next(
+        (
+            v
+            for v in _copia.ventanas
+            if v.inicio > cuando and _aplica(v, tipo, plan_id, profesorado_id)
+        ),
+        None,
+    )
@@ -10,7 +10,19 @@ from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, render, redirect
 from django.template.loader import get_template
 from django.utils.text import slugify
-from django.db.models import Q
+from django.core.paginator import Paginator
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
 
 from xhtml2pdf import pisa
 
@@ -23,7 +35,13 @@ from .models import (
     Movimiento,
     Docente,
     DocenteEspacio,
+    InscripcionEspacio,
 )
+from . import busqueda
+from .access import get_access_scope
+from .slugs import resolver_carton
+
+DOCENTE_DETALLE_PAGE_SIZE = 50
 
 
 # ---------- Helpers de formato ----------
@@ -51,59 +69,49 @@ def _link_callback(uri):
 
 
 # ---------- Permisos ----------
-def _puede_ver_carton(user, prof, dni):
-    if not user.is_authenticated:
+def _puede_ver_carton(request, prof, dni):
+    scope = get_access_scope(request)
+    if not scope.is_authenticated:
         return False
     # superuser / staff
-    if getattr(user, "is_superuser", False) or getattr(user, "is_staff", False):
+    if scope.is_superuser or scope.is_staff:
         return True
 
-    perfil = getattr(user, "perfil", None)
-    if not perfil:
-        return False
-
-    if perfil.rol == "SECRETARIA":
+    if scope.rol == "SECRETARIA":
         return True
 
-    if perfil.rol == "ESTUDIANTE":
-        return bool(perfil.estudiante) and perfil.estudiante.dni == dni
+    if scope.rol == "ESTUDIANTE":
+        return bool(scope.estudiante_dni) and scope.estudiante_dni == dni
 
-    if perfil.rol in ("BEDEL", "TUTOR"):
-        return prof in perfil.profesorados_permitidos.all()
+    if scope.rol in ("BEDEL", "TUTOR"):
+        return prof.id in scope.profesorado_ids
 
-    if perfil.rol == "DOCENTE" and perfil.docente:
+    if scope.rol == "DOCENTE" and scope.docente_id:
         # puede ver cartones del profesorado donde dicta algún espacio
-        return perfil.docente.espacios.filter(profesorado=prof).exists()
+        return prof.id in scope.docente_profesorado_ids
 
     return False
 
 
-# ---------- Helpers para slugs (sin necesitar campos en DB) ----------
-def _get_prof_by_slug(prof_slug: str) -> Profesorado:
-    for p in Profesorado.objects.all():
-        if slugify(p.nombre) == prof_slug:
-            return p
-    raise Profesorado.DoesNotExist
-
-
-def _get_plan_by_res_slug(prof: Profesorado, res_slug: str) -> PlanEstudios:
-    # "1935-14" -> "1935/14"
-    resol = (res_slug or "").replace("-", "/")
-    return PlanEstudios.objects.get(profesorado=prof, resolucion=resol)
+# ---------- Helpers para slugs (columnas Profesorado.slug / PlanEstudios.resolucion_slug) ----------
+def _get_prof_y_plan_by_slugs(prof_slug: str, res_slug: str):
+    """
+    Resuelve la URL del cartón con el resolver cacheado (ver slugs.py)
+    y trae plan + profesorado en una sola consulta.
+    """
+    ids = resolver_carton(prof_slug, res_slug)
+    if ids is None:
+        raise PlanEstudios.DoesNotExist
+    plan = PlanEstudios.objects.select_related("profesorado").get(pk=ids[1])
+    return plan.profesorado, plan
 
 
 def _ensure_slug_attrs(prof: Profesorado, plan: PlanEstudios):
-    # Les agregamos atributos .slug y .resolucion_slug en runtime para los templates
-    try:
-        prof.slug = getattr(prof, "slug", slugify(prof.nombre))
-    except Exception:
+    # Filas viejas pueden tener los slugs en NULL: completamos en runtime para los templates
+    if not prof.slug:
         prof.slug = slugify(prof.nombre)
-    try:
-        plan.resolucion_slug = getattr(
-            plan, "resolucion_slug", (plan.resolucion or "").replace("/", "-")
-        )
-    except Exception:
-        plan.resolucion_slug = (plan.resolucion or "").replace("/", "-")
+    if not plan.resolucion_slug:
+        plan.resolucion_slug = slugify((plan.resolucion or "").replace("/", "-"))
 
 
 # ---------- Builder base (reutilizable) ----------
@@ -119,7 +127,7 @@ def _build_carton_ctx_base(prof, plan, dni: str):
     )
 
     # Espacios del plan
-    espacios = EspacioCurricular.objects.filter(profesorado=prof, plan=plan).order_by(
+    espacios = EspacioCurricular.objects.filter(plan=plan).order_by(
         "anio", "cuatrimestre", "nombre"
     )
 
@@ -210,7 +218,7 @@ def _build_carton_ctx(dni: str):
 @login_required
 def carton_primaria_por_dni(request, dni):
     ctx = _build_carton_ctx(dni)
-    if not _puede_ver_carton(request.user, ctx["profesorado"], dni):
+    if not _puede_ver_carton(request, ctx["profesorado"], dni):
         return HttpResponseForbidden("No tenés permiso para ver este cartón.")
     return render(request, "carton_primaria.html", ctx)
 
@@ -218,8 +226,9 @@ def carton_primaria_por_dni(request, dni):
 @login_required
 def carton_primaria_pdf(request, dni):
     ctx = _build_carton_ctx(dni)
-    if not _puede_ver_carton(request.user, ctx["profesorado"], dni):
+    if not _puede_ver_carton(request, ctx["profesorado"], dni):
         return HttpResponseForbidden("No tenés permiso para ver este cartón.")
+    ctx["para_pdf"] = True  # usa la variante chica en grises de la foto
     html = get_template("carton_primaria.html").render(ctx)
     out = io.BytesIO()
     pisa.CreatePDF(html, dest=out, encoding="utf-8", link_callback=_link_callback)
@@ -236,11 +245,10 @@ def carton_por_prof_y_plan(request, prof_slug, res_slug, dni):
     /carton/profesorado-de-educacion-primaria/1935-14/40000002/
     """
     try:
-        prof = _get_prof_by_slug(prof_slug)
-        plan = _get_plan_by_res_slug(prof, res_slug)
+        prof, plan = _get_prof_y_plan_by_slugs(prof_slug, res_slug)
     except Exception:
         return HttpResponseForbidden("Plan o profesorado inválido.")
-    if not _puede_ver_carton(request.user, prof, dni):
+    if not _puede_ver_carton(request, prof, dni):
         return HttpResponseForbidden("No tenés permiso para ver este cartón.")
     ctx = _build_carton_ctx_base(prof, plan, dni)
     return render(request, "carton_primaria.html", ctx)
@@ -250,13 +258,13 @@ def carton_por_prof_y_plan(request, prof_slug, res_slug, dni):
 @login_required
 def carton_generico_pdf(request, prof_slug, res_slug, dni):
     try:
-        prof = _get_prof_by_slug(prof_slug)
-        plan = _get_plan_by_res_slug(prof, res_slug)
+        prof, plan = _get_prof_y_plan_by_slugs(prof_slug, res_slug)
     except Exception:
         return HttpResponseForbidden("Plan o profesorado inválido.")
-    if not _puede_ver_carton(request.user, prof, dni):
+    if not _puede_ver_carton(request, prof, dni):
         return HttpResponseForbidden("No tenés permiso para ver este cartón.")
     ctx = _build_carton_ctx_base(prof, plan, dni)
+    ctx["para_pdf"] = True  # usa la variante chica en grises de la foto
     html = get_template("carton_primaria.html").render(ctx)
     out = io.BytesIO()
     pisa.CreatePDF(html, dest=out, encoding="utf-8", link_callback=_link_callback)
@@ -345,13 +353,12 @@ def alumno_home(request):
         todas = []
 
         if plan:
-            # Slugs para templates (aunque no haya campos en DB)
-            ins.profesorado.slug = slugify(ins.profesorado.nombre)
-            plan.resolucion_slug = (plan.resolucion or "").replace("/", "-")
+            # Slugs para templates
+            _ensure_slug_attrs(ins.profesorado, plan)
 
-            espacios = EspacioCurricular.objects.filter(
-                profesorado=ins.profesorado, plan=plan
-            ).order_by("anio", "cuatrimestre", "nombre")
+            espacios = EspacioCurricular.objects.filter(plan=plan).order_by(
+                "anio", "cuatrimestre", "nombre"
+            )
 
             for e in espacios:
                 movs = list(ins.movimientos.filter(espacio=e).order_by("fecha", "id"))
@@ -419,6 +426,73 @@ def alumno_home(request):
 # ---------- Panel DOCENTE ----------
 
 
+# Equivalentes en SQL de _es_aprobada / _es_desaprobada (por código de Condición)
+_NOTAS_TEXTO_APROBADAS = [str(n) for n in range(6, 11)]
+Q_MOV_APROBADO = (
+    Q(tipo="FIN", condicion__codigo="EQUIVALENCIA")
+    | Q(
+        tipo="FIN",
+        condicion__codigo__in=("REGULAR", "FINAL_REGULAR", "LIBRE"),
+        nota_num__gte=6,
+    )
+    | (
+        Q(tipo="REG", condicion__codigo__in=("PROMOCION", "APROBADO"))
+        & (
+            Q(nota_num__gte=6)
+            | Q(nota_num__isnull=True, nota_texto__in=_NOTAS_TEXTO_APROBADAS)
+        )
+    )
+)
+Q_MOV_DESAPROBADO = Q(tipo="REG", condicion__codigo__startswith="DESAPROBADO") | Q(
+    nota_num__lt=6
+)
+
+ESTADO_PENDIENTE, ESTADO_DESAPROBADA, ESTADO_APROBADA = 0, 1, 2
+ESTADOS_ESPACIO = {
+    ESTADO_PENDIENTE: "Pendiente",
+    ESTADO_DESAPROBADA: "Desaprobada",
+    ESTADO_APROBADA: "Aprobada",
+}
+
+
+def _inscripciones_con_estado(esp):
+    """
+    Inscripciones con movimientos en `esp`, anotadas con:
+      - ult_mov_id: último movimiento (fecha, id) en el espacio
+      - estado_orden: 0 Pendiente / 1 Desaprobada / 2 Aprobada
+    Todo se resuelve en la base (subconsultas), sin recorrer movimientos en Python.
+    """
+    movs_esp = Movimiento.objects.filter(espacio=esp, inscripcion=OuterRef("pk"))
+    ultimo = movs_esp.order_by(F("fecha").desc(nulls_last=True), "-id").values("id")[:1]
+    return (
+        EstudianteProfesorado.objects.filter(Exists(movs_esp))
+        .annotate(ult_mov_id=Subquery(ultimo))
+        .annotate(
+            estado_orden=Case(
+                When(
+                    Exists(movs_esp.filter(Q_MOV_APROBADO)),
+                    then=Value(ESTADO_APROBADA),
+                ),
+                When(
+                    Exists(
+                        Movimiento.objects.filter(
+                            Q_MOV_DESAPROBADO, pk=OuterRef("ult_mov_id")
+                        )
+                    ),
+                    then=Value(ESTADO_DESAPROBADA),
+                ),
+                default=Value(ESTADO_PENDIENTE),
+                output_field=IntegerField(),
+            )
+        )
+    )
+
+
+def _int_o_none(v):
+    v = (v or "").strip()
+    return int(v) if v.isdigit() else None
+
+
 @login_required
 def docente_espacio_detalle(request, espacio_id: int):
     perfil = getattr(request.user, "perfil", None)
@@ -427,63 +501,74 @@ def docente_espacio_detalle(request, espacio_id: int):
 
     # el docente debe tener asignado este espacio
     de = get_object_or_404(
-        DocenteEspacio, docente=perfil.docente, espacio_id=espacio_id
+        DocenteEspacio.objects.select_related("espacio__plan__profesorado"),
+        docente=perfil.docente,
+        espacio_id=espacio_id,
     )
     esp = de.espacio
-    prof = esp.profesorado
+    prof = esp.plan.profesorado
 
     q = (request.GET.get("q") or "").strip()
+    cohorte = _int_o_none(request.GET.get("cohorte"))
+    anio = _int_o_none(request.GET.get("anio"))
+    estado = (request.GET.get("estado") or "").strip()
+
+    qs = _inscripciones_con_estado(esp)
+    qs = busqueda.filtrar_queryset(qs, "estudiantes", q, campo="estudiante_id")
+    if cohorte:
+        qs = qs.filter(cohorte=cohorte)
+    if anio:
+        # cursó ese año académico o tuvo movimientos en ese año
+        qs = qs.filter(
+            Exists(
+                InscripcionEspacio.objects.filter(
+                    inscripcion=OuterRef("pk"), espacio=esp, anio_academico=anio
+                )
+            )
+            | Exists(
+                Movimiento.objects.filter(
+                    inscripcion=OuterRef("pk"), espacio=esp, fecha__year=anio
+                )
+            )
+        )
+
+    # resumen: una sola consulta agregada sobre el conjunto filtrado
+    resumen = qs.aggregate(
+        total=Count("pk"),
+        aprobadas=Count("pk", filter=Q(estado_orden=ESTADO_APROBADA)),
+        desaprobadas=Count("pk", filter=Q(estado_orden=ESTADO_DESAPROBADA)),
+        pendientes=Count("pk", filter=Q(estado_orden=ESTADO_PENDIENTE)),
+    )
+
+    estado_cod = next((k for k, v in ESTADOS_ESPACIO.items() if v == estado), None)
+    if estado_cod is not None:
+        qs = qs.filter(estado_orden=estado_cod)
 
-    # movimientos del espacio (trae estudiante/inscripción)
-    movs_qs = (
-        Movimiento.objects.filter(espacio=esp)
-        .select_related("inscripcion__estudiante")
-        .order_by("inscripcion_id", "fecha", "id")
+    # pendientes primero, luego apellido/nombre; paginado en la base
+    qs = qs.select_related("estudiante").order_by(
+        "estado_orden", "estudiante__apellido", "estudiante__nombre", "pk"
+    )
+    page_obj = Paginator(qs, DOCENTE_DETALLE_PAGE_SIZE).get_page(
+        request.GET.get("page")
     )
 
-    if q:
-        movs_qs = movs_qs.filter(
-            Q(inscripcion__estudiante__apellido__icontains=q)
-            | Q(inscripcion__estudiante__nombre__icontains=q)
-            | Q(inscripcion__estudiante__dni__icontains=q)
+    insc_page = list(page_obj.object_list)
+    ultimos = (
+        Movimiento.objects.filter(
+            pk__in=[i.ult_mov_id for i in insc_page if i.ult_mov_id]
         )
+        .select_related("condicion")
+        .in_bulk()
+    )
 
-    # agrupar por inscripción (alumno)
-    alumnos = []
-    cur_insc = None
-    cur_movs = []
-    for m in movs_qs:
-        if cur_insc is None:
-            cur_insc = m.inscripcion
-        if m.inscripcion_id != cur_insc.id:
-            alumnos.append((cur_insc, cur_movs))
-            cur_insc = m.inscripcion
-            cur_movs = []
-        cur_movs.append(m)
-    if cur_insc is not None:
-        alumnos.append((cur_insc, cur_movs))
-
-    # calcular estado por alumno en este espacio
     filas = []
-    aprob, desa, pend = 0, 0, 0
-    for insc, movs in alumnos:
-        last = movs[-1] if movs else None
-        if any(_es_aprobada(m) for m in movs):
-            estado = "Aprobada"
-            aprob += 1
-        elif last and _es_desaprobada(last):
-            estado = "Desaprobada"
-            desa += 1
-        else:
-            estado = "Pendiente"
-            pend += 1
-
+    for insc in insc_page:
+        last = ultimos.get(insc.ult_mov_id)
         ult = ""
         if last:
             ult = f"{last.tipo} • {last.condicion} • {_fmt_nota(last)} • {_fmt_fecha(last.fecha)}".strip(
                 " •"
             )
-
         e = insc.estudiante
         filas.append(
             {
@@ -491,28 +576,26 @@ def docente_espacio_detalle(request, espacio_id: int):
                 "nombre": e.nombre,
                 "dni": e.dni,
                 "cohorte": insc.cohorte or "—",
-                "estado": estado,
+                "estado": ESTADOS_ESPACIO[insc.estado_orden],
                 "ultimo": ult or "—",
             }
         )
 
-    # ordenar por estado (pendientes primero), luego apellido
-    order_key = {"Pendiente": 0, "Desaprobada": 1, "Aprobada": 2}
-    filas.sort(
-        key=lambda r: (order_key.get(r["estado"], 9), r["apellido"], r["nombre"])
-    )
+    filtros = request.GET.copy()
+    filtros.pop("page", None)
 
     ctx = {
         "docente": perfil.docente,
         "espacio": esp,
         "profesorado": prof,
-        "resumen": {
-            "aprobadas": aprob,
-            "desaprobadas": desa,
-            "pendientes": pend,
-            "total": len(filas),
-        },
+        "resumen": resumen,
         "filas": filas,
+        "page_obj": page_obj,
         "q": q,
+        "cohorte": cohorte or "",
+        "anio": anio or "",
+        "estado": estado if estado_cod is not None else "",
+        "estados": list(ESTADOS_ESPACIO.values()),
+        "filtros_qs": filtros.urlencode(),
     }
     return render(request, "docente_espacio_detalle.html", ctx)
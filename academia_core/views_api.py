@@ -1,6 +1,10 @@
-from django.http import JsonResponse
+from typing import Optional
+
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_GET, require_POST
-from django.db.models import Q
+from django.db.models import Value
+from django.db.models.functions import Concat
 from django.shortcuts import get_object_or_404
 from academia_core.models import (
     EspacioCurricular,
@@ -10,8 +14,12 @@ from academia_core.models import (
     Docente,
     Movimiento,
     Correlatividad,
+    InscripcionEspacio,
 )  # Added Correlatividad
-from academia_core.eligibilidad import habilitado
+from academia_core import admision, catalogo, cursada, idempotencia
+from academia_core.access import get_access_scope
+from academia_core.exportar import EXPORTS, FORMATOS, generar_export, queryset_export
+from academia_core.paginacion import ParametroInvalido, paginar_keyset, parsear_campos
 from django.apps import apps
 
 Estudiante = apps.get_model("academia_core", "Estudiante")
@@ -20,55 +28,81 @@ Profesorado = apps.get_model("academia_core", "Profesorado")
 PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
 
 
+# ---------- Listados paginados por cursor (ver paginacion.py) ----------
+# ?cursor=<next_cursor>&limit=<n>&fields=id,dni,...
+# Respuesta: {"items": [...], "next_cursor": "..." | null}
+ORDEN_PERSONAS = ("apellido", "nombre", "id")
+
+CAMPOS_PERSONA = {
+    "id": "id",
+    "apellido": "apellido",
+    "nombre": "nombre",
+    "nombre_completo": Concat("apellido", Value(", "), "nombre"),
+    "dni": "dni",
+    "email": "email",
+}
+DEFAULT_PERSONA = ("id", "nombre_completo", "dni", "email")
+
+
+def _listado(request, qs, orden, campos, default, transformar=None):
+    try:
+        pedidos = parsear_campos(request, campos, default)
+        items, siguiente = paginar_keyset(
+            qs, orden, request, campos, pedidos, transformar
+        )
+    except ParametroInvalido as e:
+        return HttpResponseBadRequest(str(e))
+    return JsonResponse({"items": items, "next_cursor": siguiente})
+
+
 @require_GET
 def api_listar_estudiantes(request):
-    estudiantes = Estudiante.objects.filter(activo=True).order_by("apellido", "nombre")
-    data = [
-        {
-            "id": e.id,
-            "nombre_completo": f"{e.apellido}, {e.nombre}",
-            "dni": e.dni,
-            "email": e.email,
-        }
-        for e in estudiantes
-    ]
-    return JsonResponse({"items": data})
+    return _listado(
+        request,
+        Estudiante.objects.filter(activo=True),
+        ORDEN_PERSONAS,
+        CAMPOS_PERSONA,
+        DEFAULT_PERSONA,
+    )
 
 
 @require_GET
 def api_listar_docentes(request):
-    docentes = Docente.objects.filter(activo=True).order_by("apellido", "nombre")
-    data = [
-        {
-            "id": d.id,
-            "nombre_completo": f"{d.apellido}, {d.nombre}",
-            "dni": d.dni,
-            "email": d.email,
-        }
-        for d in docentes
-    ]
-    return JsonResponse({"items": data})
+    return _listado(
+        request,
+        Docente.objects.filter(activo=True),
+        ORDEN_PERSONAS,
+        CAMPOS_PERSONA,
+        DEFAULT_PERSONA,
+    )
 
 
 @require_GET
+@catalogo.respuesta_condicional("profesorados")
 def api_listar_profesorados(request):
-    profesorados = Profesorado.objects.all().order_by("nombre")
     data = [
         {
             "id": p.id,
             "nombre": p.nombre,
         }
-        for p in profesorados
+        for p in catalogo.profesorados()
     ]
     return JsonResponse({"items": data})
 
 
 @require_GET
+@catalogo.respuesta_condicional("planes", "profesorados")
 def api_listar_planes_estudios(request):
     profesorado_id = request.GET.get("profesorado_id")
-    planes = PlanEstudios.objects.all().order_by("profesorado__nombre", "nombre")
     if profesorado_id:
-        planes = planes.filter(profesorado_id=profesorado_id)
+        if not profesorado_id.isdigit():
+            return HttpResponseBadRequest("profesorado_id debe ser un número")
+        planes = catalogo.planes_de_profesorado(profesorado_id)
+    else:
+        planes = [
+            plan for ps in catalogo.planes_por_profesorado().values() for plan in ps
+        ]
+    planes = sorted(planes, key=lambda p: (p.profesorado.nombre, p.nombre))
     data = [
         {
             "id": p.id,
@@ -129,45 +163,63 @@ def api_get_espacio_curricular_detalle(request, pk):
     return JsonResponse(data)
 
 
+CAMPOS_ESPACIO = {
+    "id": "id",
+    "plan_id": "plan_id",
+    "nombre": "nombre",
+    "anio": "anio",
+    "cuatrimestre": "cuatrimestre",
+    "horas": "horas",
+    "formato": "formato",
+    "libre_habilitado": "libre_habilitado",
+}
+DEFAULT_ESPACIO = ("id", "nombre", "anio", "cuatrimestre")
+
+
 # NUEVO: API para listar espacios curriculares (filtrado por plan)
 @require_GET
 def api_listar_espacios_curriculares(request):
     plan_id = request.GET.get("plan_id")
-    espacios = EspacioCurricular.objects.all().order_by("nombre")
+    espacios = EspacioCurricular.objects.all()
     if plan_id:
         espacios = espacios.filter(plan_id=plan_id)
-    data = [
-        {
-            "id": e.id,
-            "nombre": e.nombre,
-            "anio": e.anio,
-            "cuatrimestre": e.cuatrimestre,
-        }
-        for e in espacios
-    ]
-    return JsonResponse({"items": data})
+    return _listado(
+        request, espacios, ("nombre", "id"), CAMPOS_ESPACIO, DEFAULT_ESPACIO
+    )
+
+
+CAMPOS_MOVIMIENTO = {
+    "id": "id",
+    "espacio_id": "espacio_id",
+    "espacio": "espacio__nombre",
+    "tipo": "tipo",
+    "fecha": "fecha",
+    "condicion": "condicion__nombre",
+    "nota_num": "nota_num",
+    "nota_texto": "nota_texto",
+}
+DEFAULT_MOVIMIENTO = (
+    "id",
+    "espacio",
+    "tipo",
+    "fecha",
+    "condicion",
+    "nota_num",
+    "nota_texto",
+)
+_TIPO_MOV_DISPLAY = dict(Movimiento._meta.get_field("tipo").choices)
 
 
 @require_GET
 def api_get_movimientos_estudiante(request, estudiante_id):
-    movimientos = (
-        Movimiento.objects.filter(inscripcion__estudiante_id=estudiante_id)
-        .select_related("espacio", "condicion")
-        .order_by("-fecha")
+    return _listado(
+        request,
+        Movimiento.objects.filter(inscripcion__estudiante_id=estudiante_id),
+        ("-fecha", "-id"),
+        CAMPOS_MOVIMIENTO,
+        DEFAULT_MOVIMIENTO,
+        transformar={"tipo": lambda t: _TIPO_MOV_DISPLAY.get(t, t)},
     )
-    data = [
-        {
-            "id": m.id,
-            "espacio": m.espacio.nombre,
-            "tipo": m.get_tipo_display(),
-            "fecha": m.fecha,
-            "condicion": m.condicion.nombre,
-            "nota_num": m.nota_num,
-            "nota_texto": m.nota_texto,
-        }
-        for m in movimientos
-    ]
-    return JsonResponse({"items": data})
 
 
 @require_GET
@@ -198,129 +250,141 @@ def api_get_correlatividades(request, espacio_id, insc_id=None):
     return JsonResponse({"items": data})
 
 
-InscripcionEspacio = (
-    apps.get_model("academia_core", "InscripcionEspacio")
-    or apps.get_model("academia_core", "InscripcionCursada")
-    or apps.get_model("academia_core", "InscripcionMateria")
-)
+# ---------- Inscripción a cursada (ver cursada.py; versión async en views_async.py) ----------
+def _entero(valor) -> Optional[int]:
+    return int(valor) if (valor and str(valor).isdigit()) else None
 
 
+@login_required
 @require_GET
 def api_espacios_habilitados(request):
-    est = int(request.GET["est"])
-    plan = int(request.GET["plan"])
-    para = (request.GET.get("para") or "PARA_CURSAR").upper()
-    periodo = (request.GET.get("periodo") or "").upper()
-    ciclo = request.GET.get("ciclo")
-    ciclo = int(ciclo) if (ciclo and ciclo.isdigit()) else None
-
-    qs = EspacioCurricular.objects.filter(plan_id=plan)
-    if periodo and hasattr(EspacioCurricular, "periodo"):
-        if periodo == "ANUAL":
-            qs = qs.filter(periodo="ANUAL")
-        else:
-            qs = qs.filter(Q(periodo=periodo) | Q(periodo="ANUAL"))
-
-    items = []
-    for e in qs.order_by("anio", "nombre"):
-        ok, info = habilitado(est, plan, e, para, ciclo)
-        row = {
-            "id": e.id,
-            "nombre": e.nombre,
-            "anio": getattr(e, "anio", None),
-            "habilitado": ok,
-        }
-        if not ok:
-            row["bloqueo"] = info
-        items.append(row)
-    return JsonResponse({"items": items})
+    """GET ?est=<id>&plan=<id>[&ciclo=<año>] -> {"items": [...]}"""
+    est, plan = _entero(request.GET.get("est")), _entero(request.GET.get("plan"))
+    if not (est and plan):
+        return HttpResponseBadRequest("est y plan son obligatorios")
+    if not cursada.puede_operar(get_access_scope(request), est):
+        return JsonResponse({"error": "Sin permiso"}, status=403)
+    ciclo = _entero(request.GET.get("ciclo"))
+    return JsonResponse({"items": cursada.espacios_habilitados(est, plan, ciclo)})
 
 
+@login_required
 @require_POST
+@idempotencia.idempotente
 def api_inscribir_espacio(request):
-    if InscripcionEspacio is None:
+    """
+    POST estudiante_id, plan_id, espacio_id[, ciclo]
+    -> 201 {"ok": true, "id": ..., "creada": true}, o 200 con creada=false si
+    ya estaba inscripto; sin cupo, 202 {"ok": true, "en_espera": true,
+    "posicion": n}. Acepta `Idempotency-Key` (ver idempotencia.py).
+    """
+    est = _entero(request.POST.get("estudiante_id"))
+    plan = _entero(request.POST.get("plan_id"))
+    esp = _entero(request.POST.get("espacio_id"))
+    if not (est and plan and esp):
+        return HttpResponseBadRequest(
+            "estudiante_id, plan_id y espacio_id son obligatorios"
+        )
+    if not cursada.puede_operar(get_access_scope(request), est):
+        return JsonResponse({"ok": False, "error": "Sin permiso"}, status=403)
+    try:
+        obj, creada = cursada.inscribir(
+            est, plan, esp, _entero(request.POST.get("ciclo")), request.user.pk
+        )
+    except cursada.InscripcionRechazada as e:
+        return JsonResponse({"ok": False, "error": e.error}, status=e.status)
+    except cursada.EnListaEspera as e:
         return JsonResponse(
-            {"ok": False, "error": "No existe el modelo de inscripción a cursada."},
-            status=500,
+            {"ok": True, "en_espera": True, "posicion": e.posicion}, status=202
         )
-
-    est = int(request.POST["estudiante_id"])
-    plan = int(request.POST["plan_id"])
-    esp = int(request.POST["espacio_id"])
-    ciclo = request.POST.get("ciclo")
-    ciclo = int(ciclo) if (ciclo and ciclo.isdigit()) else None
-
-    e = get_object_or_404(EspacioCurricular, id=esp, plan_id=plan)
-    ok, info = habilitado(est, plan, e, "PARA_CURSAR", ciclo)
-    if not ok:
-        return JsonResponse({"ok": False, "error": info}, status=400)
-
-    # obtener nombres de campos por introspección (estudiante/espacio/plan/ciclo)
-    def fk_name_to(model, related):
-        for f in model._meta.get_fields():
-            if (
-                getattr(f, "is_relation", False)
-                and getattr(f, "many_to_one", False)
-                and f.related_model is related
-            ):
-                return f.name
-        return None
-
-    fk_est = fk_name_to(InscripcionEspacio, Estudiante) or "estudiante"
-    fk_esp = fk_name_to(InscripcionEspacio, EspacioCurricular) or "espacio"
-    fk_plan = fk_name_to(InscripcionEspacio, PlanEstudios) or "plan"
-    f_ciclo = (
-        "ciclo"
-        if "ciclo" in {f.name for f in InscripcionEspacio._meta.get_fields()}
-        else None
+    return JsonResponse(
+        {"ok": True, "id": obj.id, "creada": creada, "estado": obj.estado},
+        status=201 if creada else 200,
     )
 
-    # evitar duplicado por servidor
-    create_kwargs = {
-        f"{fk_est}_id": est,
-        f"{fk_esp}_id": esp,
-        f"{fk_plan}_id": plan,
-    }
-    if f_ciclo and ciclo:
-        create_kwargs[f_ciclo] = ciclo
 
-    exists = InscripcionEspacio.objects.filter(**create_kwargs).exists()
-    if exists:
-        return JsonResponse({"ok": False, "error": "ya_inscripto"}, status=400)
+@login_required
+@require_POST
+@idempotencia.idempotente
+def api_baja_espacio(request):
+    """
+    POST insc_espacio_id -> {"ok": true, "id": ..., "promovida": id | null}.
+    El lugar liberado pasa al primero de la lista de espera, si hay cupo.
+    """
+    insc_id = _entero(request.POST.get("insc_espacio_id"))
+    if not insc_id:
+        return HttpResponseBadRequest("insc_espacio_id es obligatorio")
+    est = (
+        InscripcionEspacio.objects.filter(pk=insc_id)
+        .values_list("inscripcion__estudiante_id", flat=True)
+        .first()
+    )
+    if est is None:
+        return JsonResponse(
+            {"ok": False, "error": "inscripcion_inexistente"}, status=404
+        )
+    if not cursada.puede_operar(get_access_scope(request), est):
+        return JsonResponse({"ok": False, "error": "Sin permiso"}, status=403)
+    obj, promovida = cursada.dar_de_baja(insc_id, request.user.pk)
+    return JsonResponse(
+        {
+            "ok": True,
+            "id": obj.id,
+            "estado": obj.estado,
+            "promovida": promovida.id if promovida else None,
+        }
+    )
+
 
-    obj = InscripcionEspacio.objects.create(**create_kwargs)
-    return JsonResponse({"ok": True, "id": obj.id})
+@require_GET
+def api_admision_estado(request):
+    """
+    Consulta de la sala de espera (ver admision.py). Solo lee la cookie del
+    ticket, el usuario de la sesión y el cache: no toca la base. Un ticket
+    de otro usuario cuenta como ausente.
+    -> {"admitido": bool, "posicion": n}
+    """
+    usuario_id = admision.usuario_de_sesion(request)
+    ticket = admision.Ticket.leer(request.COOKIES.get(admision.COOKIE), usuario_id)
+    if ticket is None:
+        return JsonResponse({"admitido": False, "error": "sin_ticket"}, status=400)
+    if ticket.lugar is not None:
+        if admision.renovar(ticket):
+            return JsonResponse({"admitido": True})
+        ticket = admision.emitir(ticket.prof, usuario_id)  # venció por inactividad
+    admitido = admision.intentar(ticket)
+    response = JsonResponse(
+        {"admitido": bool(admitido), "posicion": admision.posicion(ticket)}
+    )
+    response["Cache-Control"] = "no-store"
+    admision.poner_cookie(request, response, admitido or ticket)
+    return response
 
 
 @require_GET
 def api_get_planes_for_profesorado(request):
     profesorado_id = request.GET.get("profesorado_id")
-    if not profesorado_id:
+    if not profesorado_id or not profesorado_id.isdigit():
         return JsonResponse({"items": []})
 
-    planes = PlanEstudios.objects.filter(profesorado_id=profesorado_id).order_by(
-        "resolucion"
-    )
     data = [
         {
             "id": p.id,
             "nombre": str(p),
             "resolucion": p.resolucion,
         }
-        for p in planes
+        for p in catalogo.planes_de_profesorado(profesorado_id)
     ]
     return JsonResponse({"items": data})
 
 
 @require_GET
+@catalogo.respuesta_condicional("espacios")
 def api_get_espacios_for_plan(request):
     plan_id = request.GET.get("plan_id")
-    if not plan_id:
+    if not plan_id or not plan_id.isdigit():
         return JsonResponse({"items": []})
 
-    espacios = EspacioCurricular.objects.filter(plan_id=plan_id).order_by(
-        "anio", "cuatrimestre", "nombre"
-    )
     data = [
         {
             "id": e.id,
@@ -328,7 +392,7 @@ def api_get_espacios_for_plan(request):
             "anio": e.anio,
             "cuatrimestre": e.cuatrimestre,
         }
-        for e in espacios
+        for e in catalogo.espacios_de_plan(plan_id)
     ]
     return JsonResponse({"items": data})
 
@@ -360,3 +424,45 @@ def api_correlatividades_por_materia(request):
     return JsonResponse(
         {"regulares": list(regulares_ids), "aprobadas": list(aprobadas_ids)}
     )
+
+
+# ---------- Exportaciones en streaming (ver exportar.py) ----------
+ROLES_EXPORTAN = {"SECRETARIA", "BEDEL", "TUTOR"}
+
+
+@login_required
+@require_GET
+def api_exportar(request, entidad):
+    """
+    GET /api/exportar/<entidad>/?formato=csv|ndjson&profesorado_id=<id>
+    entidad: estudiantes | inscripciones | movimientos | correlatividades
+    BEDEL/TUTOR quedan acotados a sus profesorados permitidos.
+    """
+    if entidad not in EXPORTS:
+        return JsonResponse({"error": f"Export desconocido: {entidad}"}, status=404)
+    formato = (request.GET.get("formato") or "ndjson").lower()
+    if formato not in FORMATOS:
+        return HttpResponseBadRequest("formato debe ser csv o ndjson")
+
+    scope = get_access_scope(request)
+    if not (scope.ve_todos_los_profesorados or scope.rol in ROLES_EXPORTAN):
+        return JsonResponse({"error": "Sin permiso para exportar"}, status=403)
+
+    prof_ids = None if scope.ve_todos_los_profesorados else set(scope.profesorado_ids)
+    prof_id = request.GET.get("profesorado_id")
+    if prof_id:
+        if not prof_id.isdigit():
+            return HttpResponseBadRequest("profesorado_id debe ser un número")
+        pedido = {int(prof_id)}
+        prof_ids = pedido if prof_ids is None else prof_ids & pedido
+
+    qs, columnas = queryset_export(entidad, prof_ids)
+    response = StreamingHttpResponse(
+        generar_export(formato, qs, columnas),
+        content_type=FORMATOS[formato],
+    )
+    ext = "csv" if formato == "csv" else "ndjson"
+    response["Content-Disposition"] = f'attachment; filename="{entidad}.{ext}"'
+    # que los proxies (nginx) no acumulen la respuesta antes de mandarla
+    response["X-Accel-Buffering"] = "no"
+    return response
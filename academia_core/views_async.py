@@ -0,0 +1,82 @@
+# academia_core/views_async.py
+"""
+Versiones async de las APIs de inscripción a cursada, para servir bajo ASGI
+(ver academia_project/asgi.py) durante las ventanas de inscripción.
+
+Mismo contrato que views_api.api_espacios_habilitados / api_inscribir_espacio;
+las consultas van por el ORM async (cursada.acargar / ainscribir). Pasan por
+sync_to_async el AccessScope, que lee sesión/cache/perfil con la API
+sincrónica (una sola vez por request y casi siempre desde la sesión), y el
+insert de la inscripción, que necesita una transacción.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.views.decorators.http import require_GET, require_POST
+
+from . import cursada, idempotencia
+from .access import get_access_scope
+from .views_api import _entero
+
+
+def _scope_sync(request):
+    scope = get_access_scope(request)
+    scope.user_id  # fuerza el SimpleLazyObject del middleware acá, en el thread
+    return scope
+
+
+async def _scope(request):
+    return await sync_to_async(_scope_sync)(request)
+
+
+@login_required
+@require_GET
+async def api_espacios_habilitados(request):
+    """GET ?est=<id>&plan=<id>[&ciclo=<año>] -> {"items": [...]}"""
+    est, plan = _entero(request.GET.get("est")), _entero(request.GET.get("plan"))
+    if not (est and plan):
+        return HttpResponseBadRequest("est y plan son obligatorios")
+    if not cursada.puede_operar(await _scope(request), est):
+        return JsonResponse({"error": "Sin permiso"}, status=403)
+    ciclo = _entero(request.GET.get("ciclo"))
+    items = await cursada.aespacios_habilitados(est, plan, ciclo)
+    return JsonResponse({"items": items})
+
+
+@login_required
+@require_POST
+@idempotencia.idempotente
+async def api_inscribir_espacio(request):
+    """
+    POST estudiante_id, plan_id, espacio_id[, ciclo]
+    -> 201 {"ok": true, "id": ..., "creada": true}, o 200 con creada=false si
+    ya estaba inscripto; sin cupo, 202 {"ok": true, "en_espera": true,
+    "posicion": n}. Acepta `Idempotency-Key` (ver idempotencia.py).
+    """
+    est = _entero(request.POST.get("estudiante_id"))
+    plan = _entero(request.POST.get("plan_id"))
+    esp = _entero(request.POST.get("espacio_id"))
+    if not (est and plan and esp):
+        return HttpResponseBadRequest(
+            "estudiante_id, plan_id y espacio_id son obligatorios"
+        )
+    if not cursada.puede_operar(await _scope(request), est):
+        return JsonResponse({"ok": False, "error": "Sin permiso"}, status=403)
+    try:
+        obj, creada = await cursada.ainscribir(
+            est,
+            plan,
+            esp,
+            _entero(request.POST.get("ciclo")),
+            (await request.auser()).pk,
+        )
+    except cursada.InscripcionRechazada as e:
+        return JsonResponse({"ok": False, "error": e.error}, status=e.status)
+    except cursada.EnListaEspera as e:
+        return JsonResponse(
+            {"ok": True, "en_espera": True, "posicion": e.posicion}, status=202
+        )
+    return JsonResponse(
+        {"ok": True, "id": obj.id, "creada": creada, "estado": obj.estado},
+        status=201 if creada else 200,
+    )
@@ -1,5 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from academia_core import busqueda, catalogo
+from academia_core.access import get_access_scope
 from academia_core.auth_mixins import StaffOrGroupsRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import PermissionDenied
@@ -11,7 +13,6 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from .models import (
     Estudiante,
     Docente,
-    Profesorado,
     Actividad,
     EspacioCurricular,  # ← Materias
     # === para Calificaciones (Movimiento) y alcances ===
@@ -24,9 +25,8 @@ from .forms_espacios import EspacioForm  # ← Form para Materias/Espacios
 # ---------------- helpers de contexto para usar panel.html ----------------
 
 
-def _rol(user):
-    perfil = getattr(user, "perfil", None)
-    return getattr(perfil, "rol", None)
+def _rol(request):
+    return get_access_scope(request).rol
 
 
 def _can_admin(user):
@@ -39,17 +39,18 @@ def _can_admin(user):
     )
 
 
-def _puede_editar(user) -> bool:
-    if _can_admin(user):
+def _puede_editar(request) -> bool:
+    if _can_admin(request.user):
         return True
-    return _rol(user) in {"SECRETARIA", "BEDEL"}
+    return _rol(request) in {"SECRETARIA", "BEDEL"}
 
 
-def _profes_visibles(user):
-    perfil = getattr(user, "perfil", None)
-    if perfil and perfil.rol in {"BEDEL", "TUTOR"}:
-        return perfil.profesorados_permitidos.all().order_by("nombre")
-    return Profesorado.objects.all().order_by("nombre")
+def _profes_visibles(request):
+    scope = get_access_scope(request)
+    profesorados = catalogo.profesorados()
+    if scope.rol in {"BEDEL", "TUTOR"}:
+        return [p for p in profesorados if p.pk in scope.profesorado_ids]
+    return profesorados
 
 
 class PanelContextMixin:
@@ -61,17 +62,18 @@ class PanelContextMixin:
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        u = self.request.user
+        r = self.request
+        puede_editar = _puede_editar(r)
         ctx.update(
             {
-                "rol": _rol(u),
-                "puede_editar": _puede_editar(u),
-                "puede_cargar": _puede_editar(u),
-                "can_admin": _can_admin(u),
+                "rol": _rol(r),
+                "puede_editar": puede_editar,
+                "puede_cargar": puede_editar,
+                "can_admin": _can_admin(r.user),
                 "action": self.panel_action,
                 "action_title": self.panel_title,
                 "action_subtitle": self.panel_subtitle,
-                "profesorados": _profes_visibles(u),
+                "profesorados": _profes_visibles(r),
                 "events": Actividad.objects.order_by("-creado")[:20],
                 "logout_url": "/accounts/logout/",
                 "login_url": "/accounts/login/",
@@ -84,9 +86,12 @@ class PanelContextMixin:
 class SearchQueryMixin:
     search_param = "busqueda"
     search_fields = ()
+    search_index = None  # "estudiantes" / "docentes" / "espacios" (ver busqueda.py)
 
     def apply_search(self, qs):
         term = (self.request.GET.get(self.search_param) or "").strip()
+        if term and self.search_index:
+            return busqueda.filtrar_queryset(qs, self.search_index, term)
         if not term or not self.search_fields:
             return qs
         q = Q()
@@ -107,7 +112,7 @@ class EstudianteListView(
     paginate_by = 25
     panel_action = "alumnos_list"
     panel_title = "Listado de Alumnos"
-    search_fields = ("apellido", "nombre", "dni", "email")
+    search_index = "estudiantes"
 
     def get_queryset(self):
         return self.apply_search(super().get_queryset().order_by("apellido", "nombre"))
@@ -216,7 +221,7 @@ class DocenteListView(
     panel_action = "doc_list"
     panel_title = "Listado de Docentes"
     panel_subtitle = "Búsqueda por nombre, apellido, DNI o email"
-    search_fields = ("apellido", "nombre", "dni", "email")
+    search_index = "docentes"
 
     def get_queryset(self):
         return self.apply_search(super().get_queryset().order_by("apellido", "nombre"))
@@ -306,12 +311,16 @@ class MateriaListView(
     panel_action = "mat_list"
     panel_title = "Materias / Espacios"
     panel_subtitle = "Listado y búsqueda"
-    search_fields = ("nombre", "plan__resolucion", "profesorado__nombre", "anio")
+    search_index = "espacios"
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related("plan", "profesorado")
+        qs = super().get_queryset().select_related("plan__profesorado")
         return self.apply_search(qs).order_by(
-            "profesorado__nombre", "plan__resolucion", "anio", "cuatrimestre", "nombre"
+            "plan__profesorado__nombre",
+            "plan__resolucion",
+            "anio",
+            "cuatrimestre",
+            "nombre",
         )
 
 
@@ -25,7 +25,6 @@ from django.views.decorators.http import require_GET, require_POST
 from xhtml2pdf import pisa
 
 from .models import (
-    Profesorado,
     PlanEstudios,
     Estudiante,
     EstudianteProfesorado,
@@ -37,6 +36,7 @@ from .models import (
     Correlatividad,
     Horario,
 )
+from . import busqueda, catalogo
 from .forms_admin import EstudianteCreateForm
 from .forms_correlativas import CorrelatividadForm
 from .forms_carga import CargaNotaForm
@@ -85,7 +85,7 @@ def panel(request: HttpRequest, **kwargs) -> HttpResponse:
         ctx.update(
             {
                 "total_estudiantes": Estudiante.objects.count(),
-                "total_profesorados": Profesorado.objects.count(),
+                "total_profesorados": len(catalogo.profesorados()),
                 "total_espacios": EspacioCurricular.objects.count(),
                 "total_inscripciones_carrera": EstudianteProfesorado.objects.count(),
                 "total_inscripciones_materia": InscripcionEspacio.objects.count(),
@@ -154,19 +154,19 @@ def panel(request: HttpRequest, **kwargs) -> HttpResponse:
         ctx["form"] = form
 
     elif action in ("insc_carrera", "insc_prof"):
+        est = request.GET.get("est")
         ctx.update(
             {
-                "estudiantes": Estudiante.objects.filter(activo=True).order_by(
-                    "apellido", "nombre"
-                ),
-                "profesorados": Profesorado.objects.all().order_by("nombre"),
+                # el selector busca por /ui/api/buscar; solo va el preseleccionado
+                "estudiante_sel": busqueda.item("estudiantes", est) if est else None,
+                "profesorados": catalogo.profesorados(),
                 "planes_map": json.dumps(
                     {
                         p.id: [
                             {"id": plan.id, "label": plan.resolucion}
-                            for plan in p.planes.all()
+                            for plan in catalogo.planes_de_profesorado(p.id)
                         ]
-                        for p in Profesorado.objects.prefetch_related("planes")
+                        for p in catalogo.profesorados()
                     }
                 ),
                 "base_checks": [
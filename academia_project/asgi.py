@@ -5,6 +5,33 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Perfil ASGI (ventanas de inscripción)
+-------------------------------------
+Las APIs de inscripción a cursada tienen versión async
+(/api/async/cursada/habilitados y /api/async/cursada/inscribir, ver
+academia_core/views_async.py). Bajo ASGI esperan a la base sin ocupar un
+thread; el resto de las vistas son sync y Django las corre en su pool.
+
+    pip install "uvicorn[standard]" gunicorn
+    gunicorn academia_project.asgi:application \\
+        -k uvicorn.workers.UvicornWorker -w 4 --bind 0.0.0.0:8000 \\
+        --timeout 60 --graceful-timeout 30
+
+    # o, sin gunicorn:
+    uvicorn academia_project.asgi:application --workers 4 --lifespan off
+
+- Workers: uno por núcleo alcanza (el event loop no se bloquea en la base).
+- CONN_MAX_AGE en 0 (el default): con vistas async las conexiones persistentes
+  quedan atadas a threads y se acumulan; MySQL no tiene pool en Django.
+- Con varios workers hace falta REDIS_URL (cache compartido para sesiones,
+  AccessScope, catálogos e índice de búsqueda).
+- Todos los middlewares de MIDDLEWARE son async-capable; si se agrega uno que
+  no lo sea, Django vuelve a pasar cada request async por un thread.
+- Los archivos estáticos los sirve el proxy (nginx), no el worker ASGI.
+
+Para comparar con WSGI (gunicorn academia_project.wsgi) bajo carga:
+scripts/carga_inscripcion.py.
 """
 
 import os
@@ -112,6 +112,10 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Alcance de permisos por request (rol, profesorados, espacios docentes)
+    "academia_core.access.AccessScopeMiddleware",
+    # Sala de espera en las rutas de inscripción (inactiva si ADMISION_POR_PROFESORADO=0)
+    "academia_core.admision.SalaDeEsperaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -170,6 +174,35 @@ DATABASES = {
     }
 }
 
+# -----------------------------
+# Cache / Sesiones
+# -----------------------------
+# LocMem por defecto (un cache por proceso). Con REDIS_URL se comparte entre
+# workers, que es lo recomendable en producción (versiones de AccessScope, catálogos).
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "academia",
+        }
+    }
+
+# Segundos que vale la copia del AccessScope en la sesión antes de recalcularla.
+# Con un cache compartido la invalidación es inmediata; con LocMem y varios
+# workers este es el tope para que un permiso revocado deje de valer.
+ACCESS_SCOPE_MAX_AGE = int(os.getenv("ACCESS_SCOPE_MAX_AGE", "300"))
+
+# Lecturas de sesión desde el cache; la base solo se toca al escribir
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
 # -----------------------------
 # Password validators
 # -----------------------------
@@ -222,8 +255,24 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # /api/v1/ (academia_core.api_v1.RolThrottle): por usuario y por rol.
+    # En los picos de inscripción se pueden bajar con las variables de entorno.
+    "DEFAULT_THROTTLE_RATES": {
+        "api_v1_estudiante": os.getenv("API_V1_RATE_ESTUDIANTE", "60/min"),
+        "api_v1_docente": os.getenv("API_V1_RATE_DOCENTE", "240/min"),
+        "api_v1_staff": os.getenv("API_V1_RATE_STAFF", "1200/min"),
+    },
 }
 
+# -----------------------------
+# Sala de espera de inscripciones (academia_core/admision.py)
+# -----------------------------
+# Estudiantes admitidos a la vez por profesorado en las rutas de inscripción;
+# 0 la desactiva. Se prende para la apertura de una ventana. Requiere REDIS_URL
+# con más de un worker. ADMISION_TTL: segundos sin actividad hasta liberar el lugar.
+ADMISION_POR_PROFESORADO = int(os.getenv("ADMISION_POR_PROFESORADO", "0"))
+ADMISION_TTL = int(os.getenv("ADMISION_TTL", "300"))
+
 # -----------------------------
 # Varios
 # -----------------------------
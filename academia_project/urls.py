@@ -15,6 +15,7 @@ urlpatterns = [
         ).LogoutView.as_view(),
         name="logout",
     ),
+    path("api/v1/", include("academia_core.api_v1")),
     path("", include("ui.urls")),
 ]
 
@@ -0,0 +1,191 @@
+"""
+Prueba de carga local de las APIs de inscripción a cursada: WSGI vs ASGI.
+
+Levantar el mismo código de dos formas (ver academia_project/asgi.py):
+
+    gunicorn academia_project.wsgi -w 4 --threads 1 --bind 127.0.0.1:8001
+    gunicorn academia_project.asgi:application -k uvicorn.workers.UvicornWorker \
+        -w 4 --bind 127.0.0.1:8002
+
+y medir cada uno con la ruta que le corresponde:
+
+    python scripts/carga_inscripcion.py --base http://127.0.0.1:8001 --ruta sync \
+        --usuario bedel --clave ... --est 1 --plan 1 --clientes 100 --segundos 30
+    python scripts/carga_inscripcion.py --base http://127.0.0.1:8002 --ruta async \
+        --usuario bedel --clave ... --est 1 --plan 1 --clientes 100 --segundos 30
+
+Cada cliente es un thread con su propia sesión que consulta
+/api/[async/]cursada/habilitados sin pausa (como el polling de los
+estudiantes); con --escrituras 0.1, uno de cada diez requests es un POST a
+.../inscribir. Informa requests/s, latencias p50/p95/p99 y los códigos HTTP.
+Usar una base de prueba: los POST crean inscripciones de verdad.
+
+Con la sala de espera activa (ADMISION_POR_PROFESORADO, ver
+academia_core/admision.py) y un usuario Estudiante, --sala hace que cada
+cliente que recibe 503 {"en_espera": true} consulte estado_url hasta ser
+admitido, como el navegador. La latencia se informa solo para los requests
+atendidos y el tiempo en la fila aparte.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+
+import requests
+
+RUTAS = {
+    "sync": ("/api/cursada/habilitados", "/api/cursada/inscribir"),
+    "async": ("/api/async/cursada/habilitados", "/api/async/cursada/inscribir"),
+}
+
+
+def login(base, usuario, clave):
+    s = requests.Session()
+    url = f"{base}/accounts/login/"
+    s.get(url)
+    r = s.post(
+        url,
+        data={
+            "username": usuario,
+            "password": clave,
+            "csrfmiddlewaretoken": s.cookies.get("csrftoken", ""),
+        },
+        headers={"Referer": url},
+        allow_redirects=False,
+    )
+    if r.status_code not in (302, 303):
+        raise SystemExit(f"No se pudo iniciar sesión ({r.status_code})")
+    return s
+
+
+def esperar_turno(s, args, datos):
+    """Consulta la sala de espera hasta ser admitido. Devuelve los segundos."""
+    t0 = time.perf_counter()
+    while time.perf_counter() < args.hasta:
+        time.sleep(args.encuesta or datos.get("reintentar_en", 5))
+        r = s.get(args.base + datos["estado_url"])
+        if r.ok and r.json().get("admitido"):
+            break
+    return time.perf_counter() - t0
+
+
+def en_espera(r):
+    if r.status_code != 503:
+        return None
+    try:
+        datos = r.json()
+    except ValueError:
+        return None
+    return datos if datos.get("en_espera") else None
+
+
+def cliente(args, reloj, largada, latencias, esperas, codigos, lock, n):
+    leer, escribir = RUTAS[args.ruta]
+    s = login(args.base, args.usuario, args.clave)
+    params = {"est": args.est, "plan": args.plan}
+    largada.wait()  # todos logueados: arranca la medición
+    args.hasta = reloj["hasta"]
+    i = 0
+    while time.perf_counter() < reloj["hasta"]:
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            if args.escrituras and (i + n) % round(1 / args.escrituras) == 0:
+                r = s.post(
+                    args.base + escribir,
+                    data={
+                        "estudiante_id": args.est,
+                        "plan_id": args.plan,
+                        "espacio_id": args.espacio or 0,
+                        "csrfmiddlewaretoken": s.cookies.get("csrftoken", ""),
+                    },
+                    headers={"Referer": args.base},
+                )
+            else:
+                r = s.get(args.base + leer, params=params)
+            codigo = r.status_code
+            datos = en_espera(r) if args.sala else None
+        except requests.RequestException as e:
+            codigo, datos = type(e).__name__, None
+        dt = time.perf_counter() - t0
+        if datos:
+            espera = esperar_turno(s, args, datos)
+            with lock:
+                esperas.append(espera)
+                codigos[codigo] += 1
+            continue
+        with lock:
+            latencias.append(dt)
+            codigos[codigo] += 1
+
+
+def percentil(datos, p):
+    if not datos:
+        return 0.0
+    datos = sorted(datos)
+    return datos[min(len(datos) - 1, int(len(datos) * p / 100))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--base", default="http://127.0.0.1:8000")
+    ap.add_argument("--ruta", choices=sorted(RUTAS), default="sync")
+    ap.add_argument("--usuario", required=True)
+    ap.add_argument("--clave", required=True)
+    ap.add_argument("--est", type=int, required=True)
+    ap.add_argument("--plan", type=int, required=True)
+    ap.add_argument("--espacio", type=int, help="espacio para los POST")
+    ap.add_argument("--clientes", type=int, default=50)
+    ap.add_argument("--segundos", type=float, default=20)
+    ap.add_argument("--escrituras", type=float, default=0.0, help="fracción de POST")
+    ap.add_argument(
+        "--sala", action="store_true", help="esperar el turno ante un 503 en_espera"
+    )
+    ap.add_argument(
+        "--encuesta", type=float, help="segundos entre consultas (def.: el server)"
+    )
+    args = ap.parse_args()
+
+    latencias, esperas, codigos, lock = [], [], Counter(), threading.Lock()
+    reloj = {}
+
+    def largar():
+        reloj["inicio"] = time.perf_counter()
+        reloj["hasta"] = reloj["inicio"] + args.segundos
+
+    largada = threading.Barrier(args.clientes, action=largar)
+    hilos = [
+        threading.Thread(
+            target=cliente,
+            args=(args, reloj, largada, latencias, esperas, codigos, lock, n),
+        )
+        for n in range(args.clientes)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    total = time.perf_counter() - reloj["inicio"]
+
+    ms = [x * 1000 for x in latencias]
+    print(f"ruta={args.ruta} clientes={args.clientes} duración={total:.1f}s")
+    print(f"requests={len(ms)}  req/s={len(ms) / total:.1f}")
+    if ms:
+        print(
+            f"latencia ms: media={statistics.mean(ms):.1f} "
+            f"p50={percentil(ms, 50):.1f} p95={percentil(ms, 95):.1f} "
+            f"p99={percentil(ms, 99):.1f} máx={max(ms):.1f}"
+        )
+    if esperas:
+        print(
+            f"sala de espera: {len(esperas)} esperas, "
+            f"p50={percentil(esperas, 50):.1f}s p95={percentil(esperas, 95):.1f}s "
+            f"máx={max(esperas):.1f}s"
+        )
+    print("códigos:", dict(codigos))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 (function () {
   const form = document.getElementById("form-insc-mat");
   const API_PLANES = form.dataset.apiPlanes;
-  const API_MATS = form.dataset.apiMats;
-  const API_CORR = form.dataset.apiCorr;
+  // "/ui/api/planes/0/bundle" -> se reemplaza el 0 por el id del plan
+  const API_BUNDLE = form.dataset.apiBundle;
+  const BUNDLE_KEY = "ipes:plan_bundle:";
 
   const selProf = document.getElementById("sel-prof");
   const selPlan = document.getElementById("sel-plan");
@@ -43,18 +44,25 @@
   function renderCorrCell(cell, corr) {
     cell.innerHTML = "";
     const wrap = el("div", "flex flex-wrap gap-1");
+    const nombre = x => (x && typeof x === "object" ? x.label : x);
     if (corr && corr.regular && corr.regular.length) {
-      corr.regular.forEach(name => {
-        const chip = el("span", "px-2 py-0.5 text-xs rounded bg-sky-100 text-sky-800", `REG: ${name}`);
+      corr.regular.forEach(req => {
+        const chip = el("span", "px-2 py-0.5 text-xs rounded bg-sky-100 text-sky-800", `REG: ${nombre(req)}`);
         wrap.appendChild(chip);
       });
     }
     if (corr && corr.aprobada && corr.aprobada.length) {
-      corr.aprobada.forEach(name => {
-        const chip = el("span", "px-2 py-0.5 text-xs rounded bg-emerald-100 text-emerald-800", `APR: ${name}`);
+      corr.aprobada.forEach(req => {
+        const chip = el("span", "px-2 py-0.5 text-xs rounded bg-emerald-100 text-emerald-800", `APR: ${nombre(req)}`);
         wrap.appendChild(chip);
       });
     }
+    if (corr && corr.hasta_anio && corr.hasta_anio.length) {
+      corr.hasta_anio.forEach(h => {
+        const pre = h.requisito === "aprobada" ? "APR" : "REG";
+        wrap.appendChild(el("span", "px-2 py-0.5 text-xs rounded bg-amber-100 text-amber-800", `${pre}: todo hasta ${h.anio}° año`));
+      });
+    }
     if (!wrap.childNodes.length) {
       wrap.appendChild(el("span", "text-slate-400", "—"));
     }
@@ -62,27 +70,43 @@
   }
 
   function passesFilters(row, anio, cuat) {
-    if (anio && String(row.plan_anio) !== String(anio)) return false;
+    // anio del espacio viene como "1°", "2°"...
+    if (anio && parseInt(row.anio, 10) !== parseInt(anio, 10)) return false;
     if (cuat && String(row.cuatrimestre) !== String(cuat)) return false;
     return true;
   }
 
-  function renderRows(rows, corrMap) {
+  function horariosLabel(hs) {
+    if (!hs || !hs.length) return "";
+    return hs.map(h => `${h.dia_label} ${h.inicio}-${h.fin}`).join(" · ");
+  }
+
+  // Bundle actual (espacios + correlatividades + horarios) para refiltrar sin pedir de nuevo
+  let bundleActual = null;
+
+  function renderRows(bundle) {
     tb.innerHTML = "";
+    if (!bundle) {
+      setCount(0);
+      return;
+    }
     let count = 0;
     const anio = selAnio.value;
     const cuat = selCuat.value;
 
-    rows.forEach(r => {
+    bundle.espacios.forEach(r => {
       if (!passesFilters(r, anio, cuat)) return;
 
       const tr = el("tr", "align-top");
-      tr.appendChild(el("td", "py-2 pr-3", r.plan_anio ?? "—"));
+      tr.appendChild(el("td", "py-2 pr-3", r.anio ?? "—"));
       tr.appendChild(el("td", "py-2 pr-3", r.cuatrimestre ?? "—"));
-      tr.appendChild(el("td", "py-2 pr-3", r.nombre));
+      const tdNom = el("td", "py-2 pr-3", r.nombre);
+      const hs = horariosLabel(bundle.horarios[String(r.id)]);
+      if (hs) tdNom.appendChild(el("div", "text-xs text-slate-500", hs));
+      tr.appendChild(tdNom);
 
       const tdCorr = el("td", "py-2 pr-3");
-      const corr = corrMap.get(String(r.id)) || { regular: [], aprobada: [] };
+      const corr = bundle.correlatividades[String(r.id)] || { regular: [], aprobada: [] };
       renderCorrCell(tdCorr, corr);
       tr.appendChild(tdCorr);
 
@@ -106,33 +130,46 @@
     setCount(count);
   }
 
-  async function loadCorrelatividades(spaces) {
-    // Llamadas paralelas a /ui/api/correlatividades?espacio_id=...
-    const map = new Map();
-    await Promise.all(spaces.map(async s => {
-      try {
-        const data = await fetchJSON(`${API_CORR}?espacio_id=${s.id}`);
-        // data => { regular: [names], aprobada: [names] }
-        map.set(String(s.id), data);
-      } catch (e) {
-        console.warn("corr fail", s.id, e);
-        map.set(String(s.id), { regular: [], aprobada: [] });
-      }
-    }));
-    return map;
+  // ---- Cache del bundle en localStorage, validado con ETag ----
+  function leerCache(planId) {
+    try {
+      return JSON.parse(localStorage.getItem(BUNDLE_KEY + planId));
+    } catch (e) {
+      return null;
+    }
+  }
+
+  function guardarCache(planId, etag, data) {
+    try {
+      localStorage.setItem(BUNDLE_KEY + planId, JSON.stringify({ etag, data }));
+    } catch (e) {
+      // cuota llena o modo privado: seguimos sin cache
+    }
+  }
+
+  async function fetchBundle(planId) {
+    const url = API_BUNDLE.replace("/0/", `/${encodeURIComponent(planId)}/`);
+    const cached = leerCache(planId);
+    const headers = {};
+    if (cached && cached.etag) headers["If-None-Match"] = cached.etag;
+
+    const r = await fetch(url, { credentials: "same-origin", headers });
+    if (r.status === 304 && cached) return cached.data;
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    const data = await r.json();
+    guardarCache(planId, r.headers.get("ETag"), data);
+    return data;
   }
 
   async function loadMateriasByPlan(planId) {
+    bundleActual = null;
     if (!planId) {
-      tb.innerHTML = "";
-      setCount(0);
+      renderRows(null);
       return;
     }
     try {
-      const res = await fetchJSON(`${API_MATS}?plan_id=${planId}`);
-      const rows = res.items || [];
-      const corrMap = await loadCorrelatividades(rows);
-      renderRows(rows, corrMap);
+      bundleActual = await fetchBundle(planId);
+      renderRows(bundleActual);
     } catch (e) {
       console.error(e);
       alert("No se pudieron cargar las materias del plan.");
@@ -141,11 +178,9 @@
 
   // Listeners
   selPlan.addEventListener("change", () => loadMateriasByPlan(selPlan.value));
-  selAnio.addEventListener("change", () => {
-    // Refiltrar sin volver a pedir
-    const rows = Array.from(tb.querySelectorAll("tr")).map(tr => tr.__row).filter(Boolean);
-  });
-  selCuat.addEventListener("change", selAnio.onchange);
+  // Refiltrar sin volver a pedir
+  selAnio.addEventListener("change", () => renderRows(bundleActual));
+  selCuat.addEventListener("change", () => renderRows(bundleActual));
 
   // Bootstrap: si venimos preseleccionados, cargamos straight
   (async function init() {
@@ -1,12 +1,21 @@
 # ui/api.py
 import logging
-from django.apps import apps
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_GET
-from django.http import JsonResponse, HttpResponseBadRequest
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseNotModified,
+    JsonResponse,
+)
+from django.utils.cache import patch_cache_control
 from django.conf import settings
 from django.utils import timezone
 
+from academia_core import busqueda, catalogo
+from academia_core.access import get_access_scope
+from academia_core.models import Correlatividad
+from academia_core.plan_bundle import bundle_cacheado, etag_plan, version_plan
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,83 +40,12 @@ def _best_label(obj):
     return str(obj)
 
 
-def _find_plan_model():
-    """
-    Busca un modelo que represente 'Plan' (PlanEstudio/Plan/etc.) con un FK a Profesorado/Carrera.
-    """
-    candidates = []
-    for m in apps.get_models():
-        n = m.__name__.lower()
-        # el nombre del modelo debe insinuar que es un plan
-        if "plan" in n:
-            # Heurística: que tenga algún FK que suene a profesorados/carreras
-            fks = [f for f in m._meta.get_fields() if getattr(f, "many_to_one", False)]
-            for fk in fks:
-                fkname = fk.name.lower()
-                target = fk.related_model.__name__.lower()
-                if any(k in fkname for k in ("prof", "carr")) or any(
-                    k in target for k in ("prof", "carr")
-                ):
-                    candidates.append(m)
-                    break
-    # si hay muchos, priorizo los que incluyan 'estudio' en el nombre
-    for m in candidates:
-        if "estudio" in m.__name__.lower():
-            return m
-    return candidates[0] if candidates else None
-
-
-def _find_espacio_model():
-    """
-    Busca un modelo de 'materias/espacios/asignaturas' asociado a Plan.
-    """
-    for m in apps.get_models():
-        n = m.__name__.lower()
-        if any(k in n for k in ("espacio", "materia", "asignatura")):
-            # que tenga FK a un modelo cuyo nombre contenga 'plan'
-            fks = [f for f in m._meta.get_fields() if getattr(f, "many_to_one", False)]
-            for fk in fks:
-                target = fk.related_model.__name__.lower()
-                if "plan" in target:
-                    return m
-    # fallback: el primero que tenga muchos campos tipo 'anio', 'cuatrimestre' y algún FK a plan
-    for m in apps.get_models():
-        n = m.__name__.lower()
-        if any(k in n for k in ("espacio", "materia", "asignatura")):
-            return m
-    return None
-
-
-def _first_matching_fk_name(model, *candidates):
-    """
-    Devuelve el nombre de FK del 'model' cuyo nombre coincida con alguno de 'candidates'.
-    Si no hay match exacto, intenta por el modelo de destino (profesorado/carrera/plan).
-    """
-    fks = [f for f in model._meta.get_fields() if getattr(f, "many_to_one", False)]
-    # 1) por nombre del campo
-    for wanted in candidates:
-        for fk in fks:
-            if fk.name.lower() == wanted.lower():
-                return fk.name
-    # 2) por nombre del modelo de destino
-    for fk in fks:
-        target = fk.related_model.__name__.lower()
-        for wanted in candidates:
-            if wanted.lower() in target:
-                return fk.name
-    # 3) por heurística: el primero que “suena”
-    for fk in fks:
-        nm = fk.name.lower()
-        if any(k in nm for k in candidates):
-            return fk.name
-    return fks[0].name if fks else None
-
-
 # ============ Endpoints ============
 
 
 @login_required
 @require_GET
+@catalogo.respuesta_condicional("planes", "profesorados")
 def api_planes_por_carrera(request):
     """
     GET /ui/api/planes?prof_id=<id>
@@ -116,50 +54,22 @@ def api_planes_por_carrera(request):
     prof_id = request.GET.get("prof_id")
     if not prof_id:
         return HttpResponseBadRequest("Falta prof_id")
+    if not prof_id.isdigit():
+        return HttpResponseBadRequest("prof_id debe ser un número")
 
-    PlanModel = _find_plan_model()
-    if not PlanModel:
-        logger.error("No se pudo inferir el modelo de Plan (Plan/PlanEstudio).")
-        return HttpResponseBadRequest("No se pudo inferir el modelo de Plan.")
-
-    fk_name = _first_matching_fk_name(
-        PlanModel, "profesorado", "carrera", "titulo", "prof"
-    )
-    logger.debug("PlanModel=%s, FK a profesorados=%s", PlanModel.__name__, fk_name)
-
-    qs = PlanModel.objects.all()
-    # filtrar por el FK descubierto
-    if fk_name:
-        qs = qs.filter(**{f"{fk_name}_id": prof_id})
-
-    # filtros típicos de soft delete / activo si existieran
-    if hasattr(PlanModel, "activo"):
-        qs = qs.filter(activo=True)
-    if hasattr(PlanModel, "is_active"):
-        qs = qs.filter(is_active=True)
-
-    planes_qs = qs.order_by("pk")
     items = []
-    for p in planes_qs:
-        # Ajustá estos getattr a tus campos reales
-        nombre = getattr(p, "nombre", None) or str(p)
-        resol = getattr(p, "resolucion", "") or getattr(p, "codigo", "")
-        anio = getattr(p, "anio", "")
-
-        partes = [nombre]
-        if resol:
-            partes.append(f"Res. {resol}")
-        if anio:
-            partes.append(str(anio))
-
-        label = " — ".join(partes)
-        items.append({"id": p.id, "label": label})
+    for p in catalogo.planes_de_profesorado(prof_id):
+        partes = [p.nombre or str(p)]
+        if p.resolucion:
+            partes.append(f"Res. {p.resolucion}")
+        items.append({"id": p.id, "label": " — ".join(partes)})
 
     return JsonResponse({"items": items})
 
 
 @login_required
 @require_GET
+@catalogo.respuesta_condicional("espacios")
 def api_materias_por_plan(request):
     """
     GET /ui/api/materias?plan_id=<id>
@@ -168,28 +78,13 @@ def api_materias_por_plan(request):
     plan_id = request.GET.get("plan_id")
     if not plan_id:
         return HttpResponseBadRequest("Falta plan_id")
+    if not plan_id.isdigit():
+        return HttpResponseBadRequest("plan_id debe ser un número")
 
-    EspacioModel = _find_espacio_model()
-    PlanModel = _find_plan_model()
-    if not EspacioModel or not PlanModel:
-        logger.error("No se pudieron inferir modelos de Espacio/Materia o Plan.")
-        return HttpResponseBadRequest("No se pudieron inferir modelos (Materias/Plan).")
-
-    fk_name = _first_matching_fk_name(
-        EspacioModel, "plan", "plan_estudio", "planestudio"
-    )
-    logger.debug("EspacioModel=%s, FK a plan=%s", EspacioModel.__name__, fk_name)
-
-    qs = EspacioModel.objects.all()
-    if fk_name:
-        qs = qs.filter(**{f"{fk_name}_id": plan_id})
-
-    if hasattr(EspacioModel, "activo"):
-        qs = qs.filter(activo=True)
-    if hasattr(EspacioModel, "is_active"):
-        qs = qs.filter(is_active=True)
-
-    items = [{"id": obj.pk, "label": _best_label(obj)} for obj in qs.order_by("pk")]
+    items = [
+        {"id": e.pk, "label": _best_label(e)}
+        for e in sorted(catalogo.espacios_de_plan(plan_id), key=lambda e: e.pk)
+    ]
     return JsonResponse({"items": items})
 
 
@@ -226,13 +121,12 @@ def api_cohortes_por_plan(request):
 
 @login_required
 @require_GET
+@catalogo.respuesta_condicional("correlatividades", "espacios")
 def api_correlatividades_por_espacio(request):
     """
     GET /ui/api/correlatividades?espacio_id=<ID>
-    Respuesta:
-      {"regular": [id_requisito,...], "aprobada": [id_requisito,...]}
-
-    Es robusto: si el modelo no existe aún, devuelve listas vacías (no rompe el frontend).
+    Respuesta (correlativas para cursar):
+      {"regular": [{"id", "label"},...], "aprobada": [{"id", "label"},...]}
     """
     esp_id = request.GET.get("espacio_id")
     if not esp_id:
@@ -243,51 +137,89 @@ def api_correlatividades_por_espacio(request):
     except (ValueError, TypeError):
         return HttpResponseBadRequest("espacio_id debe ser un número")
 
-    # Buscamos el modelo Correlatividad en posibles apps
-    Cor = None
-    for app_label in ("academico", "ui", "academia_core"):
-        try:
-            Cor = apps.get_model(app_label, "Correlatividad")
-            break
-        except LookupError:
-            continue
-
-    if Cor is None:
-        # Aún no creaste el modelo → devolvemos vacío para que el JS no falle
-        logger.warning(
-            "api_correlatividades_por_espacio: No se encontró el modelo Correlatividad."
+    regular, aprobada = [], []
+    qs = (
+        Correlatividad.objects.filter(
+            espacio_id=esp_id_int, tipo="CURSAR", requiere_espacio__isnull=False
         )
-        return JsonResponse({"regular": [], "aprobada": []})
+        .select_related("requiere_espacio")
+        .order_by("requiere_espacio__nombre")
+    )
+    for c in qs:
+        item = {"id": c.requiere_espacio_id, "label": _best_label(c.requiere_espacio)}
+        (aprobada if c.requisito == "APROBADA" else regular).append(item)
+
+    logger.info(
+        "api_correlatividades_por_espacio: espacio=%s reg=%s apr=%s",
+        esp_id,
+        len(regular),
+        len(aprobada),
+    )
+    return JsonResponse({"regular": regular, "aprobada": aprobada})
 
-    try:
-        # Tipos admitidos (por si en DB usás abreviaturas)
-        reg_vals = ["REGULAR", "REG", "regular", "reg"]
-        apr_vals = ["APROBADA", "APR", "aprobada", "apr"]
-
-        # Asumiendo que el modelo Correlatividad tiene un FK 'requisito' a Espacio/Materia
-        # y un campo de texto 'tipo'
-        qs = Cor.objects.filter(espacio_id=esp_id_int).select_related("requisito")
-
-        qs_reg = qs.filter(tipo__in=reg_vals)
-        qs_apr = qs.filter(tipo__in=apr_vals)
-
-        reg = [
-            {"id": c.requisito.pk, "label": _best_label(c.requisito)} for c in qs_reg
-        ]
-        apr = [
-            {"id": c.requisito.pk, "label": _best_label(c.requisito)} for c in qs_apr
-        ]
-
-        logger.info(
-            "api_correlatividades_por_espacio: espacio=%s reg=%s apr=%s",
-            esp_id,
-            len(reg),
-            len(apr),
-        )
-        return JsonResponse({"regular": reg, "aprobada": apr})
 
-    except Exception as e:
-        logger.exception(
-            f"api_correlatividades_por_espacio: error para espacio_id={esp_id}"
-        )
-        return HttpResponseBadRequest(f"Error en servidor: {e}")
+@login_required
+@require_GET
+def api_plan_bundle(request, plan_id):
+    """
+    GET /ui/api/planes/<plan_id>/bundle
+    Respuesta (una sola para toda la pantalla de inscripción):
+      {"plan_id": .., "version": "..",
+       "espacios": [{"id", "nombre", "anio", "cuatrimestre", "horas", "formato"}],
+       "correlatividades": {"<espacio_id>": {"regular": [{"id", "label"}],
+                                             "aprobada": [...], "hasta_anio": [...]}},
+       "horarios": {"<espacio_id>": [{"dia", "dia_label", "inicio", "fin", "docente"}]}}
+
+    Lleva ETag con la versión del plan; con If-None-Match vigente responde 304.
+    """
+    version = version_plan(plan_id)
+    etag = etag_plan(plan_id, version)
+
+    inm = request.headers.get("If-None-Match", "")
+    if etag in [t.strip() for t in inm.split(",")] or inm.strip() == "*":
+        resp = HttpResponseNotModified()
+    else:
+        data = bundle_cacheado(plan_id, version)
+        if data is None:
+            return JsonResponse({"detail": "Plan inexistente"}, status=404)
+        resp = JsonResponse(data)
+
+    resp["ETag"] = etag
+    # el navegador siempre revalida: el 304 es barato y evita datos viejos
+    patch_cache_control(resp, private=True, no_cache=True)
+    return resp
+
+
+BUSQUEDA_LIMIT_MAX = 50
+
+
+@login_required
+@require_GET
+def api_buscar(request):
+    """
+    GET /ui/api/buscar?tipo=estudiantes|docentes|espacios&q=<texto>&limit=10&offset=0
+    Typeahead sobre el índice en memoria (sin acentos, por prefijo, rankeado).
+    `activos=1` deja afuera a las personas inactivas.
+    Respuesta: {"items": [{"id", "label", ...}], "has_more": bool}
+    """
+    tipo = request.GET.get("tipo") or "estudiantes"
+    if tipo not in busqueda.INDICES:
+        return HttpResponseBadRequest("tipo inválido")
+    if not get_access_scope(request).es_personal:
+        return JsonResponse({"detail": "Sin permiso"}, status=403)
+    try:
+        limit = min(int(request.GET.get("limit") or 10), BUSQUEDA_LIMIT_MAX)
+        offset = max(int(request.GET.get("offset") or 0), 0)
+    except ValueError:
+        return HttpResponseBadRequest("limit/offset inválidos")
+    if limit < 1:
+        return HttpResponseBadRequest("limit inválido")
+
+    items, hay_mas = busqueda.buscar(
+        tipo,
+        request.GET.get("q") or "",
+        limit,
+        offset,
+        solo_activos=request.GET.get("activos") == "1",
+    )
+    return JsonResponse({"items": items, "has_more": hay_mas})
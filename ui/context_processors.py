@@ -4,7 +4,9 @@ from __future__ import annotations
 from typing import Optional, Iterable
 from django.conf import settings
 from django.http import HttpRequest
-from .menu import for_role  # generador de secciones del menú
+
+from academia_core.access import get_access_scope
+from .menu import for_role, preparar  # generador de secciones del menú
 
 # Soportamos varias claves posibles (compatibilidad con código previo)
 POSSIBLE_ROLE_SESSION_KEYS = [
@@ -15,11 +17,8 @@ POSSIBLE_ROLE_SESSION_KEYS = [
     "user_role",
 ]
 
-def _first_group_name(user) -> Optional[str]:
-    if not getattr(user, "is_authenticated", False):
-        return None
-    names: Iterable[str] = user.groups.values_list("name", flat=True)
-    return next(iter(names), None)
+def _first_group_name(names: Iterable[str]) -> Optional[str]:
+    return next(iter(sorted(names)), None)
 
 def _role_from_session(request: HttpRequest) -> Optional[str]:
     for key in POSSIBLE_ROLE_SESSION_KEYS:
@@ -51,23 +50,32 @@ def _detect_role(request: HttpRequest) -> Optional[str]:
     else:
         # 3) Grupos preferidos
         preferred = ["Bedel", "Secretaría", "Secretaria", "Docente", "Estudiante", "Admin"]
-        user_groups = set(user.groups.values_list("name", flat=True))
+        user_groups = get_access_scope(request).grupos
         role = next((g for g in preferred if g in user_groups), None)
         # 4) Primer grupo si no coincidió ninguno
         if role is None:
-            role = _first_group_name(user)
+            role = _first_group_name(user_groups)
 
-    # Guardamos también en una de nuestras claves para futuras vistas
-    request.session["ui_current_role"] = role
+    # Guardamos también en una de nuestras claves para futuras vistas.
+    # Solo si cambió: asignar a la sesión la marca como modificada y fuerza un save.
+    session = request.session
+    if "ui_current_role" not in session or session["ui_current_role"] != role:
+        session["ui_current_role"] = role
     return role
 
+_ROLE_ATTR = "_ui_role"
+
 def role_from_request(request: HttpRequest) -> Optional[str]:
-    return _detect_role(request)
+    """Rol detectado una sola vez por request (menu y ui_globals lo comparten)."""
+    if not hasattr(request, _ROLE_ATTR):
+        setattr(request, _ROLE_ATTR, _detect_role(request))
+    return getattr(request, _ROLE_ATTR)
 
 def menu(request: HttpRequest) -> dict:
     role = role_from_request(request)
-    sections = for_role(role)
+    sections = preparar(for_role(role))
     return {
+        "menu": sections,  # el que recorre ui/partials/sidebar.html
         "menu_sections": sections,
         # nombres que pueden usar tus plantillas
         "role": role,
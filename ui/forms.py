@@ -554,3 +554,61 @@ class CorrelatividadesForm(forms.Form):
                 "Una correlativa no puede ser simultáneamente REGULAR y APROBADA."
             )
         return cleaned
+
+
+class InscripcionCohorteForm(forms.Form):
+    """
+    Inscripción masiva: todos los estudiantes de una cohorte a los espacios
+    elegidos del plan (por defecto, los de 1° año).
+    """
+
+    profesorado = forms.ModelChoiceField(
+        queryset=apps.get_model("academia_core", "Profesorado")
+        .objects.all()
+        .order_by("nombre"),
+        label="Profesorado / Carrera",
+        widget=forms.Select(attrs={"class": _SELECT}),
+    )
+    plan = forms.ModelChoiceField(
+        queryset=apps.get_model("academia_core", "PlanEstudios").objects.all(),
+        label="Plan",
+        widget=forms.Select(attrs={"class": _SELECT}),
+    )
+    cohorte = forms.IntegerField(
+        min_value=1990, label="Cohorte", widget=NumberInput(attrs={"class": _INPUT})
+    )
+    anio_academico = forms.IntegerField(
+        min_value=1990,
+        label="Ciclo lectivo",
+        widget=NumberInput(attrs={"class": _INPUT}),
+    )
+    espacios = forms.ModelMultipleChoiceField(
+        queryset=apps.get_model("academia_core", "EspacioCurricular").objects.none(),
+        label="Espacios",
+        widget=forms.CheckboxSelectMultiple,
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # al instanciar, no al importar: un worker que arrancó en diciembre
+        # tiene que proponer el ciclo nuevo en marzo
+        self.initial.setdefault("anio_academico", date.today().year)
+        plan_id = self.data.get("plan") or self.initial.get("plan")
+        if plan_id and str(plan_id).isdigit():
+            self.fields["espacios"].queryset = apps.get_model(
+                "academia_core", "EspacioCurricular"
+            ).objects.filter(plan_id=plan_id)
+            if not self.is_bound:
+                self.initial.setdefault(
+                    "espacios",
+                    [e.pk for e in self.fields["espacios"].queryset if e.anio_num == 1],
+                )
+
+    def clean(self):
+        cleaned = super().clean()
+        prof, plan = cleaned.get("profesorado"), cleaned.get("plan")
+        if prof and plan and plan.profesorado_id != prof.pk:
+            raise forms.ValidationError(
+                "El plan seleccionado no pertenece al profesorado."
+            )
+        return cleaned
@@ -3,6 +3,11 @@
 # Estructura: lista de secciones. Cada sección tiene un título y sus items.
 # Usamos rutas absolutas (strings) para la mayoría, y 'url_name' sólo donde necesitamos
 # que Django resuelva la URL (por ejemplo, inscribir_materias).
+# 'ventana' marca los items que muestran si la ventana de inscripción de ese
+# tipo está abierta (el badge lo arma preparar(), ver academia_core/ventanas.py).
+from django.urls import reverse
+
+from academia_core import ventanas
 
 BEDEL_MENU = [
     {
@@ -28,13 +33,18 @@ BEDEL_MENU = [
                 "label": "Inscribir a Materias",
                 "url_name": "ui:inscribir_materias",
                 "icon": "book-plus",
-                "badge": {"text": "Abierto", "tone": "success"},
+                "ventana": ventanas.CURSADA,
             },
             {
                 "label": "Inscribir a Mesa de Final",
                 "path": "/inscripciones/mesa-final",
                 "icon": "calendar-x",
-                "badge": {"text": "Cerrado", "tone": "danger"},
+                "ventana": ventanas.FINAL,
+            },
+            {
+                "label": "Inscribir cohorte",
+                "url_name": "ui:inscribir_cohorte",
+                "icon": "users",
             },
             {"label": "Cartón", "path": "/carton", "icon": "id-card"},
             {"label": "Histórico", "path": "/historico", "icon": "clock"},
@@ -99,11 +109,13 @@ ESTUDIANTE_MENU = [
                 "label": "Inscribirme a Materias",
                 "url_name": "ui:inscribir_materias",
                 "icon": "book-plus",
+                "ventana": ventanas.CURSADA,
             },
             {
                 "label": "Inscribirme a Mesa de Final",
                 "path": "/inscripciones/mesa-final",
                 "icon": "calendar-x",
+                "ventana": ventanas.FINAL,
             },
         ],
     },
@@ -131,3 +143,31 @@ def for_role(role):
         return ESTUDIANTE_MENU
     # Fallback sensato
     return ESTUDIANTE_MENU
+
+
+BADGE_ABIERTO = {"text": "Abierto", "tone": "success"}
+BADGE_CERRADO = {"text": "Cerrado", "tone": "danger"}
+
+
+def preparar(sections):
+    """
+    Copia de `sections` lista para el sidebar: resuelve 'url_name' a 'path' y
+    pone el badge Abierto/Cerrado en los items con 'ventana' (ventanas.py está
+    en memoria: no consulta la base). Los menús de arriba no se modifican.
+    """
+    estado = {}
+    resultado = []
+    for sec in sections:
+        items = []
+        for item in sec["items"]:
+            item = dict(item)
+            if "url_name" in item and "path" not in item:
+                item["path"] = reverse(item["url_name"])
+            tipo = item.get("ventana")
+            if tipo:
+                if tipo not in estado:
+                    estado[tipo] = ventanas.abierta(tipo)
+                item["badge"] = BADGE_ABIERTO if estado[tipo] else BADGE_CERRADO
+            items.append(item)
+        resultado.append({**sec, "items": items})
+    return resultado
@@ -1,15 +1,16 @@
 # ui/mixins.py
 from django.core.exceptions import PermissionDenied
-from .auth_views import resolve_role
+from academia_core.access import get_access_scope
 
 
 class RolesAllowedMixin:
     allowed_roles = tuple()  # ("Admin", "Secretaría", "Bedel", "Docente", "Estudiante")
 
     def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_authenticated:
+        scope = get_access_scope(request)
+        if not scope.is_authenticated:
             raise PermissionDenied
-        role = request.session.get("active_role") or resolve_role(request.user)
+        role = request.session.get("active_role") or scope.ui_role
         if self.allowed_roles and role not in self.allowed_roles:
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
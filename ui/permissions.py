@@ -1,22 +1,37 @@
 # ui/permissions.py
 from django.contrib.auth.mixins import UserPassesTestMixin
 
+from academia_core.access import get_access_scope
+
+
+# grupos de setup_roles (mayúsculas) equivalentes a los de la UI
+GRUPOS_EQUIVALENTES = {
+    "Secretaría": "SECRETARIA",
+    "Bedel": "BEDEL",
+    "Docente": "DOCENTE",
+    "Estudiante": "ESTUDIANTE",
+}
+
 
 class RolesPermitidosMixin(UserPassesTestMixin):
     """
-    Permite acceso si el usuario es superusuario o pertenece a alguno de los grupos en `allowed`.
+    Permite acceso si el usuario es superusuario o pertenece a alguno de los grupos en `allowed`
+    (con su nombre de la UI o el de setup_roles).
     """
 
     allowed_roles = {"Admin", "Secretaría", "Bedel"}  # ajustá si lo necesitás
 
     def test_func(self):
-        u = self.request.user
-        if not u.is_authenticated:
+        scope = get_access_scope(self.request)
+        if not scope.is_authenticated:
             return False
-        if getattr(u, "is_superuser", False):
+        if scope.is_superuser:
             return True
-        names = set(u.groups.values_list("name", flat=True))
-        return bool(self.allowed_roles & names)
+        permitidos = set(self.allowed_roles)
+        permitidos.update(
+            GRUPOS_EQUIVALENTES[r] for r in self.allowed_roles if r in GRUPOS_EQUIVALENTES
+        )
+        return scope.en_grupos(permitidos)
 
 
 # Alias retrocompatible: cualquier vista que use RolesAllowedMixin seguirá funcionando
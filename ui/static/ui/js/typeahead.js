@@ -0,0 +1,167 @@
+// static/ui/js/typeahead.js
+// Selector por búsqueda (typeahead) contra /ui/api/buscar.
+//
+// Marcado esperado:
+//   <div data-typeahead data-url="/ui/api/buscar" data-tipo="estudiantes" [data-activos="1"]>
+//     <input type="text" data-typeahead-input value="(label del preseleccionado)">
+//     <input type="hidden" id="..." name="..." value="(id del preseleccionado)">
+//   </div>
+//
+// El valor elegido queda en el <input type="hidden"> (mismo id/name que tenía el
+// <select>), que dispara "change" al elegir una opción. Las consultas van con debounce y
+// la anterior se cancela (AbortController); "Ver más…" trae la página siguiente.
+(function () {
+  const DEBOUNCE_MS = 250;
+  const MIN_CHARS = 2;
+  const LIMIT = 10;
+
+  function init(root) {
+    const input = root.querySelector("[data-typeahead-input]");
+    const hidden = root.querySelector('input[type="hidden"]');
+    if (!input || !hidden) return;
+
+    const url = root.dataset.url;
+    const tipo = root.dataset.tipo || "estudiantes";
+    const activos = root.dataset.activos === "1";
+
+    root.style.position = "relative";
+    const list = document.createElement("ul");
+    list.setAttribute("role", "listbox");
+    Object.assign(list.style, {
+      position: "absolute", left: 0, right: 0, top: "100%", zIndex: 1000,
+      margin: 0, padding: 0, listStyle: "none", background: "#fff",
+      border: "1px solid #cbd5e1", borderRadius: "0.375rem",
+      maxHeight: "18rem", overflowY: "auto", display: "none",
+    });
+    root.appendChild(list);
+    input.setAttribute("autocomplete", "off");
+    input.setAttribute("role", "combobox");
+
+    let timer = null;
+    let ctrl = null;
+    let query = "";
+    let offset = 0;
+    let activo = -1;
+    let labelElegido = input.value;
+
+    function cerrar() {
+      list.style.display = "none";
+      activo = -1;
+    }
+
+    function elegir(item) {
+      labelElegido = item.label;
+      input.value = item.label;
+      cerrar();
+      if (hidden.value !== String(item.id)) {
+        hidden.value = item.id;
+        hidden.dispatchEvent(new Event("change", { bubbles: true }));
+      }
+    }
+
+    // sin "change": mientras se tipea no hay selección, pero tampoco una nueva
+    function limpiar() {
+      labelElegido = "";
+      hidden.value = "";
+    }
+
+    function marcar(i) {
+      const opts = list.querySelectorAll("li");
+      opts.forEach((li, j) => (li.style.background = j === i ? "#e2e8f0" : ""));
+      activo = i;
+      if (opts[i]) opts[i].scrollIntoView({ block: "nearest" });
+    }
+
+    function opcion(texto, onPick, extra) {
+      const li = document.createElement("li");
+      li.textContent = texto;
+      Object.assign(li.style, { padding: "0.375rem 0.75rem", cursor: "pointer" }, extra || {});
+      li.addEventListener("mousedown", (ev) => {
+        ev.preventDefault(); // que el input no pierda el foco antes del click
+        onPick();
+      });
+      return li;
+    }
+
+    function render(data, agregar) {
+      if (!agregar) list.innerHTML = "";
+      list.querySelector("[data-mas]")?.remove();
+      (data.items || []).forEach((item) => list.appendChild(opcion(item.label, () => elegir(item))));
+      if (!list.children.length) {
+        list.appendChild(opcion("Sin resultados", cerrar, { color: "#64748b", cursor: "default" }));
+      }
+      if (data.has_more) {
+        const mas = opcion("Ver más…", () => pedir(query, offset + LIMIT, true), { color: "#2563eb" });
+        mas.dataset.mas = "1";
+        list.appendChild(mas);
+      }
+      list.style.display = "block";
+    }
+
+    async function pedir(q, off, agregar) {
+      if (ctrl) ctrl.abort();
+      ctrl = new AbortController();
+      const params = new URLSearchParams({ tipo, q, limit: LIMIT, offset: off });
+      if (activos) params.set("activos", "1");
+      try {
+        const r = await fetch(`${url}?${params}`, {
+          headers: { Accept: "application/json" },
+          credentials: "same-origin",
+          signal: ctrl.signal,
+        });
+        if (!r.ok) throw new Error(`HTTP ${r.status}`);
+        const data = await r.json();
+        query = q;
+        offset = off;
+        render(data, agregar);
+      } catch (e) {
+        if (e.name !== "AbortError") console.error("typeahead:", e);
+      }
+    }
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      const q = input.value.trim();
+      if (input.value !== labelElegido) limpiar();
+      if (q.length < MIN_CHARS) {
+        if (ctrl) ctrl.abort();
+        cerrar();
+        return;
+      }
+      timer = setTimeout(() => pedir(q, 0, false), DEBOUNCE_MS);
+    });
+
+    input.addEventListener("keydown", (ev) => {
+      const opts = list.querySelectorAll("li");
+      if (list.style.display === "none" || !opts.length) return;
+      if (ev.key === "ArrowDown") {
+        ev.preventDefault();
+        marcar(Math.min(activo + 1, opts.length - 1));
+      } else if (ev.key === "ArrowUp") {
+        ev.preventDefault();
+        marcar(Math.max(activo - 1, 0));
+      } else if (ev.key === "Enter" && activo >= 0) {
+        ev.preventDefault();
+        opts[activo].dispatchEvent(new MouseEvent("mousedown"));
+      } else if (ev.key === "Escape") {
+        cerrar();
+      }
+    });
+
+    // al salir sin elegir, vuelve a mostrar la selección vigente
+    input.addEventListener("blur", () => {
+      cerrar();
+      if (hidden.value) input.value = labelElegido;
+    });
+  }
+
+  function initAll() {
+    document.querySelectorAll("[data-typeahead]").forEach(init);
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", initAll);
+  } else {
+    initAll();
+  }
+})();
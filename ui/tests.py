@@ -43,3 +43,320 @@ class DashboardViewTest(TestCase):
         response = self.client.get(reverse("ui:dashboard"))
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, f'{reverse("login")}?next={reverse("ui:dashboard")}')
+
+
+class SessionWritesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='bedel', password='password')
+        self.user.groups.add(Group.objects.create(name="Bedel"))
+        self.client.login(username='bedel', password='password')
+
+    def test_get_en_estado_estable_no_escribe_la_sesion(self):
+        from unittest import mock
+        from django.contrib.sessions.backends.cached_db import SessionStore
+
+        # Primer GET: se cachean rol y AccessScope en la sesión
+        self.client.get(reverse("ui:dashboard"))
+
+        with mock.patch.object(SessionStore, "save", autospec=True) as save:
+            for _ in range(3):
+                response = self.client.get(reverse("ui:dashboard"))
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(save.call_count, 0)
+
+    def test_usuario_sin_grupos_tampoco_escribe(self):
+        from unittest import mock
+        from django.contrib.sessions.backends.cached_db import SessionStore
+
+        self.user.groups.clear()
+        self.client.get(reverse("ui:dashboard"))
+        with mock.patch.object(SessionStore, "save", autospec=True) as save:
+            self.client.get(reverse("ui:dashboard"))
+        self.assertEqual(save.call_count, 0)
+
+
+class PlanBundleTest(TestCase):
+    def setUp(self):
+        from datetime import time
+        from academia_core.models import (
+            Correlatividad, EspacioCurricular, Horario, PlanEstudios, Profesorado,
+        )
+
+        prof = Profesorado.objects.create(nombre="Profesorado de Historia")
+        self.plan = PlanEstudios.objects.create(profesorado=prof, resolucion="1/24")
+        self.esp1 = EspacioCurricular.objects.create(
+            plan=self.plan, anio="1°", cuatrimestre="1", nombre="Historia I"
+        )
+        self.esp2 = EspacioCurricular.objects.create(
+            plan=self.plan, anio="2°", cuatrimestre="1", nombre="Historia II"
+        )
+        Correlatividad.objects.create(
+            plan=self.plan, espacio=self.esp2, tipo="CURSAR",
+            requisito="REGULARIZADA", requiere_espacio=self.esp1,
+        )
+        Correlatividad.objects.create(
+            plan=self.plan, espacio=self.esp2, tipo="RENDIR",
+            requisito="APROBADA", requiere_espacio=self.esp1,
+        )
+        self.horario = Horario.objects.create(
+            espacio=self.esp1, dia_semana=1, hora_inicio=time(8), hora_fin=time(10)
+        )
+
+        self.user = User.objects.create_user(username='bedel', password='password')
+        self.client.login(username='bedel', password='password')
+        self.url = reverse("ui:api_plan_bundle", args=[self.plan.pk])
+        # primer request: carga sesión y AccessScope
+        self.client.get(reverse("ui:api_cohortes"))
+
+    def test_bundle_en_tres_consultas(self):
+        from academia_core.plan_bundle import invalidar_plan
+
+        invalidar_plan(self.plan.pk)  # versión nueva: bundle sin cachear
+
+        # usuario (la sesión sale del cache) + 3 del bundle
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([e["nombre"] for e in data["espacios"]], ["Historia I", "Historia II"])
+        corr = data["correlatividades"][str(self.esp2.pk)]
+        self.assertEqual(corr["regular"], [{"id": self.esp1.pk, "label": "Historia I"}])
+        self.assertEqual(corr["aprobada"], [])  # la de RENDIR no aplica a cursar
+        self.assertEqual(data["horarios"][str(self.esp1.pk)][0]["inicio"], "08:00")
+        self.assertTrue(response["ETag"])
+
+    def test_etag_304_y_cambio_de_version(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.horario.hora_fin = self.horario.hora_fin.replace(hour=11)
+        self.horario.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["horarios"][str(self.esp1.pk)][0]["fin"], "11:00")
+
+    def test_mismo_etag_en_otro_worker_sin_cambios(self):
+        from django.core.cache import cache
+
+        from academia_core.plan_bundle import etag_plan
+
+        cache.clear()
+        etag = etag_plan(self.plan.pk)
+        cache.clear()  # otro worker con su propio LocMem
+        self.assertEqual(etag_plan(self.plan.pk), etag)
+
+    def test_plan_inexistente(self):
+        response = self.client.get(reverse("ui:api_plan_bundle", args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class CatalogoCondicionalTest(TestCase):
+    def setUp(self):
+        from academia_core.models import PlanEstudios, Profesorado
+
+        self.prof = Profesorado.objects.create(nombre="Profesorado de Letras")
+        PlanEstudios.objects.create(profesorado=self.prof, resolucion="2/24")
+        self.user = User.objects.create_user(username='bedel', password='password')
+        self.client.login(username='bedel', password='password')
+        self.url = f'{reverse("ui:api_planes")}?prof_id={self.prof.pk}'
+
+    def test_304_sin_consultar_y_200_tras_un_cambio(self):
+        from academia_core.models import PlanEstudios
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        etag = response["ETag"]
+
+        # solo la del usuario autenticado: la vista no corre
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        PlanEstudios.objects.create(profesorado=self.prof, resolucion="3/24")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 2)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_304_vence_aunque_la_version_no_cambie(self):
+        from unittest import mock
+
+        from academia_core import catalogo
+
+        etag = self.client.get(self.url)["ETag"]
+        siguiente = catalogo._tramo() + 1
+        with mock.patch("academia_core.catalogo._tramo", return_value=siguiente):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class InscribirMateriaTypeaheadTest(TestCase):
+    def setUp(self):
+        from academia_core.models import Estudiante
+
+        self.elegido = Estudiante.objects.create(dni="30111222", apellido="Pérez", nombre="María")
+        Estudiante.objects.bulk_create(
+            Estudiante(dni=str(40000000 + i), apellido=f"Otro{i}", nombre="X")
+            for i in range(30)
+        )
+        self.user = User.objects.create_user(username='bedel', password='password')
+        self.user.groups.add(Group.objects.create(name="Bedel"))
+        self.client.login(username='bedel', password='password')
+        self.url = reverse("ui:inscribir_materias")
+
+    def test_solo_se_renderiza_el_preseleccionado(self):
+        response = self.client.get(self.url, {"est": self.elegido.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Pérez, María (30111222)")
+        self.assertNotContains(response, "Otro1")
+        self.assertContains(response, reverse("ui:api_buscar"))
+
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context["estudiante_sel"])
+        self.assertNotContains(response, "Pérez")
+
+    def test_estudiante_solo_se_ve_a_si_mismo(self):
+        self.user.groups.set([Group.objects.create(name="Estudiante")])
+        self.user.perfil.estudiante = self.elegido
+        self.user.perfil.save()
+        otro = self.elegido.__class__.objects.get(dni="40000001")
+        response = self.client.get(self.url, {"est": otro.pk})
+        self.assertEqual(response.context["prefill_est"], self.elegido.pk)
+        self.assertTrue(response.context["estudiante_fijo"])
+
+    def test_staff_con_grupo_de_setup_roles_elige_estudiante(self):
+        staff = User.objects.create_user(username='bedel_mayus', password='x', is_staff=True)
+        staff.groups.add(Group.objects.create(name="BEDEL"))
+        self.client.force_login(staff)
+        response = self.client.get(self.url, {"est": self.elegido.pk})
+        self.assertFalse(response.context["estudiante_fijo"])
+        self.assertEqual(response.context["prefill_est"], self.elegido.pk)
+
+
+class VentanasMenuTest(TestCase):
+    def setUp(self):
+        from academia_core import ventanas
+
+        ventanas.invalidar()
+        self.user = User.objects.create_user(username='bedel', password='password')
+        self.user.groups.add(Group.objects.create(name="Bedel"))
+        self.client.login(username='bedel', password='password')
+        self.url = reverse("ui:inscribir_final")
+
+    def test_badges_y_aviso_segun_la_ventana(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from academia_core.models import VentanaInscripcion
+
+        response = self.client.get(self.url)
+        self.assertContains(response, "La inscripción a mesas de final está cerrada.")
+        self.assertNotContains(response, "Abierto")
+
+        ahora = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            VentanaInscripcion.objects.create(
+                tipo="FINAL", inicio=ahora - timedelta(hours=1), fin=ahora + timedelta(days=2)
+            )
+        response = self.client.get(self.url)
+        self.assertContains(response, "Inscripción a mesas abierta")
+        # la de cursada sigue cerrada
+        self.assertContains(response, "Abierto")
+        self.assertContains(response, "Cerrado")
+
+
+class InscripcionCohorteViewTest(TestCase):
+    def setUp(self):
+        from academia_core.models import (
+            EspacioCurricular,
+            Estudiante,
+            EstudianteProfesorado,
+            PlanEstudios,
+            Profesorado,
+        )
+
+        self.prof = Profesorado.objects.create(nombre="Prof UI Cohorte")
+        self.plan = PlanEstudios.objects.create(profesorado=self.prof, resolucion="U/1")
+        self.primero = EspacioCurricular.objects.create(
+            plan=self.plan, nombre="Pedagogía", anio="1°", cuatrimestre="1"
+        )
+        EspacioCurricular.objects.create(
+            plan=self.plan, nombre="Didáctica", anio="2°", cuatrimestre="1"
+        )
+        for i in range(3):
+            est = Estudiante.objects.create(dni=f"4100000{i}", apellido=f"Ui{i}", nombre="Est")
+            EstudianteProfesorado.objects.create(
+                estudiante=est, profesorado=self.prof, plan=self.plan, cohorte=2025
+            )
+        self.user = User.objects.create_user(username='bedel', password='password')
+        self.user.groups.add(Group.objects.create(name="Bedel"))
+        self.client.login(username='bedel', password='password')
+        self.url = reverse("ui:inscribir_cohorte")
+
+    def test_preselecciona_primer_anio_e_inscribe(self):
+        from academia_core.models import InscripcionEspacio
+
+        response = self.client.get(self.url, {"profesorado": self.prof.pk, "plan": self.plan.pk})
+        self.assertEqual(response.context["form"].initial["espacios"], [self.primero.pk])
+
+        response = self.client.post(
+            self.url,
+            {
+                "profesorado": self.prof.pk,
+                "plan": self.plan.pk,
+                "cohorte": 2025,
+                "anio_academico": 2025,
+                "espacios": [self.primero.pk],
+            },
+            follow=True,
+        )
+        self.assertContains(response, "3 inscripciones nuevas")
+        self.assertEqual(
+            InscripcionEspacio.objects.filter(espacio=self.primero, anio_academico=2025).count(), 3
+        )
+
+    def test_ciclo_propuesto_es_el_de_hoy(self):
+        from datetime import date
+        from unittest import mock
+
+        with mock.patch("ui.forms.date") as fecha:
+            fecha.today.return_value = date(2031, 3, 1)
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["form"].initial["anio_academico"], 2031)
+
+    def test_avisa_horarios_superpuestos(self):
+        from datetime import time
+
+        from academia_core.models import EspacioCurricular, Horario
+
+        otro = EspacioCurricular.objects.create(
+            plan=self.plan, nombre="Filosofía", anio="1°", cuatrimestre="1"
+        )
+        for esp, ini in ((self.primero, 18), (otro, 19)):
+            Horario.objects.create(
+                espacio=esp, dia_semana=2, hora_inicio=time(ini), hora_fin=time(ini + 2)
+            )
+        response = self.client.post(
+            self.url,
+            {
+                "profesorado": self.prof.pk,
+                "plan": self.plan.pk,
+                "cohorte": 2025,
+                "anio_academico": 2025,
+                "espacios": [self.primero.pk, otro.pk],
+            },
+            follow=True,
+        )
+        self.assertContains(response, "Horarios superpuestos")
+        self.assertContains(response, "Pedagogía / Filosofía")
+
+    def test_solo_personal(self):
+        self.user.groups.clear()
+        self.user.groups.add(Group.objects.get_or_create(name="Estudiante")[0])
+        self.assertEqual(self.client.get(self.url).status_code, 403)
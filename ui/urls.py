@@ -8,6 +8,7 @@ from .views import (
     NuevoDocenteView,
     InscribirMateriaView,
     InscribirFinalView,
+    InscripcionCohorteView,
     InscripcionProfesoradoView,
     CartonEstudianteView,
     HistoricoEstudianteView,
@@ -15,6 +16,7 @@ from .views import (
     CorrelatividadesView,
 )
 from . import api
+from academia_core import views_api, views_async
 
 app_name = "ui"
 
@@ -46,6 +48,11 @@ urlpatterns = [
     path(
         "inscripciones/mesa-final", InscribirFinalView.as_view(), name="inscribir_final"
     ),
+    path(
+        "inscripciones/cohorte",
+        InscripcionCohorteView.as_view(),
+        name="inscribir_cohorte",
+    ),
     path(
         "inscripciones/profesorado",
         InscripcionProfesoradoView.as_view(),
@@ -68,6 +75,12 @@ urlpatterns = [
     path("cambiar-rol", SwitchRoleView.as_view(), name="switch_role"),
     # API Endpoints
     path("api/planes", api.api_planes_por_carrera, name="api_planes"),
+    path(
+        "api/planes/<int:plan_id>/bundle",
+        api.api_plan_bundle,
+        name="api_plan_bundle",
+    ),
+    path("api/buscar", api.api_buscar, name="api_buscar"),
     path("api/cohortes", api.api_cohortes_por_plan, name="api_cohortes"),
     path("api/materias", api.api_materias_por_plan, name="api_materias_por_plan"),
     path(
@@ -75,4 +88,41 @@ urlpatterns = [
         api.api_correlatividades_por_espacio,
         name="api_correlatividades_por_espacio",
     ),
+    # Inscripción a cursada: sync (WSGI) y async (ASGI), mismo contrato
+    path(
+        "api/cursada/habilitados",
+        views_api.api_espacios_habilitados,
+        name="api_cursada_habilitados",
+    ),
+    path(
+        "api/cursada/inscribir",
+        views_api.api_inscribir_espacio,
+        name="api_cursada_inscribir",
+    ),
+    path(
+        "api/admision/estado",
+        views_api.api_admision_estado,
+        name="api_admision_estado",
+    ),
+    path(
+        "api/cursada/baja",
+        views_api.api_baja_espacio,
+        name="api_cursada_baja",
+    ),
+    # Exportaciones en streaming (CSV / NDJSON)
+    path(
+        "api/exportar/<str:entidad>",
+        views_api.api_exportar,
+        name="api_exportar",
+    ),
+    path(
+        "api/async/cursada/habilitados",
+        views_async.api_espacios_habilitados,
+        name="api_async_cursada_habilitados",
+    ),
+    path(
+        "api/async/cursada/inscribir",
+        views_async.api_inscribir_espacio,
+        name="api_async_cursada_inscribir",
+    ),
 ]
@@ -9,7 +9,6 @@ from django.views.generic import (
     DetailView,
 )
 from django.shortcuts import redirect
-from django.db.models import Q
 from django.views import View
 from django.http import HttpResponseForbidden
 from django.contrib import messages
@@ -17,6 +16,8 @@ from django.db import transaction
 from django.apps import apps
 
 # Modelos del core
+from academia_core import busqueda, cursada, superposiciones, ventanas
+from academia_core.access import get_access_scope
 from academia_core.models import Estudiante, Docente, EstudianteProfesorado
 
 # Formularios de la app UI
@@ -27,6 +28,7 @@ from .forms import (
     NuevoDocenteForm,
     CERT_DOCENTE_LABEL,
     CorrelatividadesForm,
+    InscripcionCohorteForm,
 )
 
 # Mixin de permisos por rol
@@ -91,15 +93,7 @@ class EstudianteListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         qs = super().get_queryset().order_by("apellido", "nombre")
-        q = (self.request.GET.get("q") or "").strip()
-        if q:
-            qs = qs.filter(
-                Q(apellido__icontains=q)
-                | Q(nombre__icontains=q)
-                | Q(dni__icontains=q)
-                | Q(email__icontains=q)
-            )
-        return qs
+        return busqueda.filtrar_queryset(qs, "estudiantes", self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -142,15 +136,7 @@ class DocenteListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         qs = super().get_queryset().order_by("apellido", "nombre")
-        q = (self.request.GET.get("q") or "").strip()
-        if q:
-            qs = qs.filter(
-                Q(apellido__icontains=q)
-                | Q(nombre__icontains=q)
-                | Q(dni__icontains=q)
-                | Q(email__icontains=q)
-            )
-        return qs
+        return busqueda.filtrar_queryset(qs, "docentes", self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -185,14 +171,16 @@ class InscribirMateriaView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        # para preselección por ?est=
-        ctx["prefill_est"] = self.request.GET.get("est") or ""
-        # selector de estudiantes
-        ctx["estudiantes"] = (
-            Estudiante.objects.all()
-            .order_by("apellido", "nombre")
-            .values("id", "apellido", "nombre", "dni")
+        scope = get_access_scope(self.request)
+        # el estudiante solo se inscribe a sí mismo (no puede usar /api/buscar)
+        solo_propio = not scope.es_personal
+        est = scope.estudiante_id if solo_propio else self.request.GET.get("est")
+        # selector por typeahead: solo se renderiza el preseleccionado por ?est=
+        ctx["estudiante_sel"] = busqueda.item("estudiantes", est) if est else None
+        ctx["prefill_est"] = (
+            ctx["estudiante_sel"]["id"] if ctx["estudiante_sel"] else ""
         )
+        ctx["estudiante_fijo"] = solo_propio
         return ctx
 
 
@@ -207,6 +195,76 @@ class InscribirFinalView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
     template_name = "ui/inscripciones/final.html"
     extra_context = {"page_title": "Inscribir a Mesa de Final"}
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # en memoria (academia_core/ventanas.py): no consulta la base
+        ctx["ventanas_abiertas"] = ventanas.abiertas(ventanas.FINAL)
+        if not ctx["ventanas_abiertas"]:
+            ctx["proxima_ventana"] = ventanas.proxima(ventanas.FINAL)
+        return ctx
+
+
+class InscripcionCohorteView(LoginRequiredMixin, RolesAllowedMixin, FormView):
+    """
+    Inscripción masiva de una cohorte a espacios del plan (inicio de año).
+    Una sola operación en lote: ver academia_core.cursada.inscribir_cohorte.
+    """
+
+    allowed_roles = ["Secretaría", "Admin", "Bedel"]
+    template_name = "ui/inscripciones/cohorte_form.html"
+    form_class = InscripcionCohorteForm
+    extra_context = {"page_title": "Inscribir cohorte a materias"}
+
+    def get_initial(self):
+        initial = super().get_initial()
+        for campo in ("profesorado", "plan", "cohorte", "anio_academico"):
+            if self.request.GET.get(campo):
+                initial[campo] = self.request.GET[campo]
+        return initial
+
+    def form_valid(self, form):
+        cd = form.cleaned_data
+        try:
+            res = cursada.inscribir_cohorte(
+                cd["profesorado"].pk,
+                cd["plan"].pk,
+                cd["cohorte"],
+                [e.pk for e in cd["espacios"]],
+                ciclo=cd["anio_academico"],
+                usuario_id=self.request.user.pk,
+            )
+        except cursada.InscripcionRechazada as e:
+            form.add_error(None, str(e.error))
+            return self.form_invalid(form)
+        if not res.estudiantes:
+            messages.warning(self.request, "La cohorte no tiene estudiantes.")
+        else:
+            messages.success(
+                self.request,
+                f"{res.estudiantes} estudiantes: {res.creadas} inscripciones nuevas, "
+                f"{res.existentes} ya existentes, {res.en_espera} en lista de espera.",
+            )
+        if res.rechazadas:
+            messages.warning(
+                self.request,
+                f"{len(res.rechazadas)} inscripciones no se hicieron "
+                "(correlativas, ya regular/aprobada o dada de baja).",
+            )
+        nombres = {e.pk: e.nombre for e in cd["espacios"]}
+        pares = superposiciones.indice(cd["plan"].pk).pares(nombres)
+        if pares:
+            messages.warning(
+                self.request,
+                "Horarios superpuestos entre los espacios elegidos: "
+                + "; ".join(f"{nombres[a]} / {nombres[b]}" for a, b in pares)
+                + ".",
+            )
+        return redirect(
+            f"{reverse('ui:inscribir_cohorte')}?profesorado={cd['profesorado'].pk}"
+            f"&plan={cd['plan'].pk}&cohorte={cd['cohorte']}"
+            f"&anio_academico={cd['anio_academico']}"
+        )
+
 
 class InscripcionProfesoradoView(RolesPermitidosMixin, LoginRequiredMixin, CreateView):
     allowed_roles = {"Admin", "Secretaría", "Bedel"}  # roles habilitados
@@ -338,7 +396,7 @@ class HistoricoEstudianteView(LoginRequiredMixin, RolesAllowedMixin, TemplateVie
 class SwitchRoleView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         new_role = request.POST.get("role")
-        allowed = set(request.user.groups.values_list("name", flat=True))
+        allowed = set(get_access_scope(request).grupos)
         if request.user.is_superuser:
             allowed.add("Admin")
         if new_role not in allowed: